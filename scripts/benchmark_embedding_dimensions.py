@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+埋め込み次元削減（Matryoshka truncation）ベンチマークスクリプト
+
+各次元で以下を計測する:
+- recall@k: フル次元の厳密検索結果に対する、切り詰めベクトルでの検索結果の再現率
+- クエリレイテンシ: 一時ChromaDBコレクションでの検索時間（p50 / p95）
+- ストレージ量: float32換算のベクトルサイズ
+
+ベクトルは既存のChromaDBコレクション（本番と同じGeminiベクトル）から読み込む。
+コレクションが空の場合はローカル埋め込みプロバイダーで合成コーパスを生成する
+（ローカルベクトルはMatryoshka学習されていないため、recallは参考値）。
+
+使用方法:
+- python scripts/benchmark_embedding_dimensions.py
+- python scripts/benchmark_embedding_dimensions.py --dimensions 768 512 256 --queries 200
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import chromadb  # type: ignore[import-untyped]
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.nescordbot.services.embedding import truncate_embedding  # noqa: E402
+from src.nescordbot.services.embedding_providers import LocalEmbeddingProvider  # noqa: E402
+
+
+def load_vectors(limit: int) -> np.ndarray:
+    """既存コレクションからベクトルを読み込む（空なら合成コーパス）."""
+    persist_directory = os.getenv("CHROMADB_PERSIST_DIRECTORY", "data/chromadb")
+    collection_name = os.getenv("CHROMADB_COLLECTION_NAME", "nescord_knowledge")
+    client = chromadb.PersistentClient(path=persist_directory)
+
+    for existing in client.list_collections():
+        name = getattr(existing, "name", existing)
+        if not name.startswith(collection_name):
+            continue
+        data = client.get_collection(name).get(limit=limit, include=["embeddings"])
+        if len(data["ids"]) > 0:
+            print(f"コレクション {name} から {len(data['ids'])} 件のベクトルを読み込みました")
+            return np.asarray(data["embeddings"], dtype=np.float32)
+
+    print("既存ベクトルがないため、ローカルプロバイダーで合成コーパスを生成します")
+    provider = LocalEmbeddingProvider(dimension=768)
+    words = "note meeting research project design bug voice memo idea plan review".split()
+    rng = np.random.default_rng(42)
+    texts = [" ".join(rng.choice(words, size=12)) + f" #{i}" for i in range(limit)]
+    return np.asarray([provider.embed_sync(text) for text in texts], dtype=np.float32)
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """コサイン類似度での厳密top-kインデックスを計算."""
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = queries @ normalized.T
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+def benchmark_dimension(
+    vectors: np.ndarray, query_idx: np.ndarray, truth: np.ndarray, dimension: int, k: int
+) -> Dict[str, float]:
+    """指定次元でrecall@kとChromaDBクエリレイテンシを計測."""
+    truncated = np.asarray(
+        [truncate_embedding(v.tolist(), dimension) for v in vectors], dtype=np.float32
+    )
+    queries = truncated[query_idx]
+    approx = exact_top_k(truncated, queries, k)
+    recall = float(
+        np.mean([len(set(a) & set(t)) / k for a, t in zip(approx.tolist(), truth.tolist())])
+    )
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        client = chromadb.PersistentClient(path=temp_dir)
+        collection = client.create_collection("bench", metadata={"hnsw:space": "cosine"})
+        ids = [str(i) for i in range(len(truncated))]
+        for i in range(0, len(ids), 1000):
+            collection.add(ids=ids[i : i + 1000], embeddings=truncated[i : i + 1000].tolist())
+
+        latencies: List[float] = []
+        for query in queries:
+            started = time.perf_counter()
+            collection.query(query_embeddings=[query.tolist()], n_results=k, include=[])
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        "dimension": dimension,
+        "recall": recall,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "storage_mb": len(truncated) * dimension * 4 / (1024 * 1024),
+    }
+
+
+def main() -> int:
+    """ベンチマークを実行して結果を表示."""
+    parser = argparse.ArgumentParser(description="埋め込み次元削減ベンチマーク")
+    parser.add_argument("--dimensions", type=int, nargs="+", default=[768, 512, 384, 256])
+    parser.add_argument("--limit", type=int, default=10000, help="読み込むベクトル数の上限")
+    parser.add_argument("--queries", type=int, default=100, help="クエリ数")
+    parser.add_argument("-k", type=int, default=10, help="recall@k の k")
+    args = parser.parse_args()
+
+    vectors = load_vectors(args.limit)
+    full_dimension = vectors.shape[1]
+    rng = np.random.default_rng(0)
+    query_idx = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    full_queries = vectors[query_idx] / np.linalg.norm(vectors[query_idx], axis=1, keepdims=True)
+    truth = exact_top_k(vectors, full_queries, args.k)
+
+    print(f"\n{'dim':>6} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p95 ms':>8} {'MB':>8}")
+    for dimension in args.dimensions:
+        if dimension > full_dimension:
+            continue
+        result = benchmark_dimension(vectors, query_idx, truth, dimension, args.k)
+        print(
+            f"{result['dimension']:>6} {result['recall']:>10.3f} {result['p50_ms']:>8.2f} "
+            f"{result['p95_ms']:>8.2f} {result['storage_mb']:>8.2f}"
+        )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
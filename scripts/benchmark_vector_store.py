@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+ベクトルストア比較ベンチマークスクリプト（ChromaDB vs NumPy）
+
+合成コーパス（ローカル埋め込みプロバイダー）に対して、両バックエンドで以下を計測する:
+- 投入時間: add_documents_batch による全件投入
+- 起動時間: 永続化ディレクトリからの再オープン（initialize）
+- クエリレイテンシ: search_documents の p50 / p95
+- recall@k: 厳密検索結果に対する再現率（NumPyは総当たりのため常に1.0）
+- ディスク使用量
+
+使用方法:
+- python scripts/benchmark_vector_store.py
+- python scripts/benchmark_vector_store.py --documents 50000 --queries 200
+"""
+
+import argparse
+import asyncio
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.nescordbot.config import BotConfig  # noqa: E402
+from src.nescordbot.services.chromadb_service import ChromaDBService  # noqa: E402
+from src.nescordbot.services.embedding_providers import LocalEmbeddingProvider  # noqa: E402
+from src.nescordbot.services.numpy_vector_store import NumpyVectorStore  # noqa: E402
+from src.nescordbot.services.vector_store import DocumentMetadata, VectorStore  # noqa: E402
+
+
+def build_corpus(count: int, dimension: int) -> List[List[float]]:
+    """ローカルプロバイダーで合成コーパスのベクトルを生成."""
+    provider = LocalEmbeddingProvider(dimension=dimension)
+    words = "note meeting research project design bug voice memo idea plan review".split()
+    rng = np.random.default_rng(42)
+    texts = [" ".join(rng.choice(words, size=12)) + f" #{i}" for i in range(count)]
+    return [provider.embed_sync(text) for text in texts]
+
+
+def create_store(backend: str, config: BotConfig) -> VectorStore:
+    """バックエンド名からストアを生成."""
+    if backend == "numpy":
+        return NumpyVectorStore(config)
+    return ChromaDBService(config)
+
+
+async def benchmark_backend(
+    backend: str, vectors: List[List[float]], query_idx: np.ndarray, truth: np.ndarray, k: int
+) -> Dict[str, float]:
+    """1バックエンドの投入・起動・検索を計測."""
+    temp_dir = tempfile.mkdtemp()
+    try:
+        config = BotConfig(
+            discord_token="Bot BENCHMARK",
+            openai_api_key="sk-benchmark",
+            chromadb_persist_directory=temp_dir,
+            chromadb_collection_name="bench",
+            chromadb_max_batch_size=1000,
+            max_search_results=k,
+            vector_store_backend=backend,
+        )
+
+        store = create_store(backend, config)
+        await store.initialize()
+        documents = [
+            (f"doc-{i}", f"doc {i}", vector, DocumentMetadata(document_id=f"note-{i}"))
+            for i, vector in enumerate(vectors)
+        ]
+        started = time.perf_counter()
+        await store.add_documents_batch(documents)
+        ingest_s = time.perf_counter() - started
+        await store.close()
+
+        store = create_store(backend, config)
+        started = time.perf_counter()
+        await store.initialize()
+        await store.get_document_count()
+        startup_s = time.perf_counter() - started
+
+        latencies: List[float] = []
+        hits = 0
+        for query_row, expected in zip(query_idx.tolist(), truth.tolist()):
+            started = time.perf_counter()
+            results = await store.search_documents(vectors[query_row], n_results=k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            found = {int(result.document_id.split("-")[1]) for result in results}
+            hits += len(found & set(expected))
+        await store.close()
+
+        disk_mb = sum(p.stat().st_size for p in Path(temp_dir).rglob("*") if p.is_file())
+        return {
+            "ingest_s": ingest_s,
+            "startup_s": startup_s,
+            "p50_ms": float(np.percentile(latencies, 50)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+            "recall": hits / (len(query_idx) * k),
+            "disk_mb": disk_mb / (1024 * 1024),
+        }
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+async def run(args: argparse.Namespace) -> int:
+    """ベンチマークを実行して結果を表示."""
+    print(f"合成コーパス {args.documents} 件（{args.dimension}次元）を生成しています...")
+    vectors = build_corpus(args.documents, args.dimension)
+    matrix = np.asarray(vectors, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+
+    rng = np.random.default_rng(0)
+    query_idx = rng.choice(len(vectors), size=min(args.queries, len(vectors)), replace=False)
+    truth = np.argsort(-(matrix[query_idx] @ matrix.T), axis=1)[:, : args.k]
+
+    print(
+        f"\n{'backend':>8} {'ingest s':>9} {'start s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+        f"{'recall@' + str(args.k):>10} {'MB':>8}"
+    )
+    for backend in ("chromadb", "numpy"):
+        result = await benchmark_backend(backend, vectors, query_idx, truth, args.k)
+        print(
+            f"{backend:>8} {result['ingest_s']:>9.2f} {result['startup_s']:>8.3f} "
+            f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['recall']:>10.3f} "
+            f"{result['disk_mb']:>8.2f}"
+        )
+
+    return 0
+
+
+def main() -> int:
+    """引数を解析してベンチマークを実行."""
+    parser = argparse.ArgumentParser(description="ベクトルストア比較ベンチマーク")
+    parser.add_argument("--documents", type=int, default=10000, help="コーパスの件数")
+    parser.add_argument("--dimension", type=int, default=768, help="ベクトル次元")
+    parser.add_argument("--queries", type=int, default=100, help="クエリ数")
+    parser.add_argument("-k", type=int, default=10, help="recall@k の k")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Obsidian Vault一括インポートスクリプト
+
+Vaultディレクトリまたはzipをストリーミングで読み込み、knowledge_notesへ
+バッチ単位のトランザクションで取り込む。[[リンク]]は全ノート投入後に解決する。
+中断しても同じVaultを再実行すれば、取り込み済みのファイルをスキップして再開する。
+
+埋め込みは生成しないため、取り込み後にBotで /reindex start（missing）を実行する。
+
+使用方法:
+- python scripts/import_vault.py ~/Obsidian/MyVault
+- python scripts/import_vault.py vault.zip --database sqlite:///data/nescordbot.db --guild-id 123
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Any, cast
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.nescordbot.config import BotConfig  # noqa: E402
+from src.nescordbot.services.database import DatabaseService  # noqa: E402
+from src.nescordbot.services.knowledge_manager import KnowledgeManager  # noqa: E402
+from src.nescordbot.services.vault_importer import (  # noqa: E402
+    VaultImport,
+    VaultImporter,
+    VaultImportError,
+    VaultImportStatus,
+)
+
+
+def print_progress(record: VaultImport) -> None:
+    """バッチごとの進捗を表示."""
+    print(
+        f"  {record.files_seen} 件検出 / {record.imported} 件取り込み / "
+        f"{record.skipped} 件スキップ / {record.failed} 件失敗",
+        flush=True,
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    """インポートを実行して結果を表示."""
+    config = BotConfig(
+        discord_token="Bot IMPORT",
+        openai_api_key="sk-import",
+        database_url=args.database,
+    )
+
+    database_service = DatabaseService(args.database)
+    await database_service.initialize()
+    try:
+        # ノートの取り込みとリンク解決にはデータベースのみを使用する
+        knowledge_manager = KnowledgeManager(
+            config, database_service, cast(Any, None), cast(Any, None), cast(Any, None), None
+        )
+        importer = VaultImporter(config, knowledge_manager)
+        importer.batch_size = args.batch_size
+
+        print(f"{args.vault} をインポートしています...")
+        try:
+            record = await importer.import_vault(
+                args.vault,
+                user_id=args.user_id,
+                guild_id=args.guild_id,
+                created_by="import_vault.py",
+                progress_callback=print_progress,
+            )
+        except VaultImportError as e:
+            print(f"❌ {e}")
+            return 1
+
+        print(f"\nインポート #{record.import_id}: {record.status.value}")
+        print(f"  取り込み: {record.imported} 件 / スキップ: {record.skipped} 件")
+        print(f"  失敗: {record.failed} 件")
+        print(f"  リンク: 解決 {record.links_resolved} 件 / 未解決 {record.links_unresolved} 件")
+        if record.status != VaultImportStatus.COMPLETED:
+            print(f"❌ {record.last_error}（同じコマンドで再開できます）")
+            return 1
+
+        print("埋め込みを生成するには Bot で /reindex start を実行してください。")
+        return 0
+    finally:
+        await database_service.close()
+
+
+def main() -> int:
+    """引数を解析してインポートを実行."""
+    parser = argparse.ArgumentParser(description="Obsidian Vault一括インポート")
+    parser.add_argument("vault", help="Vaultディレクトリまたはzipファイルのパス")
+    parser.add_argument(
+        "--database",
+        default=os.getenv("DATABASE_URL", "sqlite:///data/nescordbot.db"),
+        help="データベースURL",
+    )
+    parser.add_argument("--user-id", help="ノートの所有者として記録するDiscordユーザーID")
+    parser.add_argument("--guild-id", help="ノートを割り当てるDiscordサーバーID")
+    parser.add_argument("--batch-size", type=int, default=500, help="1トランザクションのノート数")
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,12 +8,12 @@ integrated configuration management and logging services.
 import asyncio
 import traceback
 from pathlib import Path
-from typing import Optional
+from typing import Optional, cast
 
 import discord
 from discord.ext import commands
 
-from .config import get_config_manager
+from .config import BotConfig, get_config_manager
 from .logger import get_logger
 from .security import SecurityValidator
 from .services import (
@@ -27,13 +27,20 @@ from .services import (
     GitHubService,
     GitOperationService,
     KnowledgeManager,
+    LLMCache,
     NoteProcessingService,
+    NumpyVectorStore,
     ObsidianGitHubService,
     Phase4Monitor,
     PrivacyManager,
+    ReindexJobManager,
     SearchEngine,
     SyncManager,
+    SyncOutbox,
+    TenantVectorStore,
     TokenManager,
+    VaultImporter,
+    VectorStore,
     create_service_container,
 )
 
@@ -88,8 +95,11 @@ class NescordBot(commands.Bot):
         else:
             self.logger.info("GitHub integration disabled (missing configuration)")
 
+        # Persistent LLM response cache shared by every LLM call site
+        self.llm_cache = LLMCache(self.config, self.database_service)
+
         # Initialize NoteProcessingService
-        self.note_processing_service = NoteProcessingService()
+        self.note_processing_service = NoteProcessingService(llm_cache=self.llm_cache)
         self.logger.info("NoteProcessingService initialized")
 
         # Initialize ObsidianGitHub integration services
@@ -114,6 +124,13 @@ class NescordBot(commands.Bot):
             await self.database_service.initialize()
             self.logger.info("Database service initialized")
 
+            # Drop expired LLM responses left from previous runs
+            try:
+                pruned = await self.llm_cache.prune()
+                self.logger.info(f"LLM cache pruned: {pruned} entries removed")
+            except Exception as e:
+                self.logger.error(f"Failed to prune LLM cache: {e}")
+
             # Start GitHub service if available
             if self.github_service:
                 await self.github_service.start()
@@ -143,6 +160,28 @@ class NescordBot(commands.Bot):
                         await alert_manager.start_monitoring()
                         self.logger.info("AlertManager started")
 
+                    # Start draining the note sync outbox
+                    if self.service_container.has_service(SyncOutbox):
+                        knowledge_manager = self.service_container.get_service(KnowledgeManager)
+                        await knowledge_manager.start_sync_worker()
+                        self.logger.info("Sync outbox worker started")
+
+                    # Retry failed note syncs on their backoff schedule
+                    if self.service_container.has_service(SyncManager):
+                        sync_manager = self.service_container.get_service(SyncManager)
+                        await sync_manager.start_retry_worker()
+
+                    # Keep precomputed related notes and the link term index current
+                    if self.service_container.has_service(KnowledgeManager):
+                        knowledge_manager = self.service_container.get_service(KnowledgeManager)
+                        await knowledge_manager.note_neighbors.start_worker()
+                        await knowledge_manager.link_suggestor.start_index_worker()
+
+                    # Continue re-index jobs interrupted by the last shutdown
+                    if self.service_container.has_service(ReindexJobManager):
+                        reindex_jobs = self.service_container.get_service(ReindexJobManager)
+                        await reindex_jobs.resume_interrupted_jobs()
+
                 except Exception as e:
                     self.logger.error(f"Failed to initialize Phase 4 services: {e}")
 
@@ -341,8 +380,56 @@ class NescordBot(commands.Bot):
         """Clean up resources when bot is shutting down."""
         self.logger.info("Bot is shutting down...")
 
+        # Stop the sync outbox worker before the database it drains is closed
+        if hasattr(self, "service_container") and self.service_container:
+            try:
+                if self.service_container.has_service(SyncOutbox):
+                    sync_outbox = self.service_container.get_service(SyncOutbox)
+                    await sync_outbox.stop_worker()
+            except Exception as e:
+                self.logger.error(f"Error stopping sync outbox worker: {e}")
+
+            try:
+                if self.service_container.has_service(SyncManager):
+                    sync_manager = self.service_container.get_service(SyncManager)
+                    await sync_manager.stop_retry_worker()
+            except Exception as e:
+                self.logger.error(f"Error stopping sync retry worker: {e}")
+
+            try:
+                if self.service_container.has_service(KnowledgeManager):
+                    knowledge_manager = self.service_container.get_service(KnowledgeManager)
+                    await knowledge_manager.note_neighbors.stop_worker()
+            except Exception as e:
+                self.logger.error(f"Error stopping note neighbour worker: {e}")
+
+            try:
+                if self.service_container.has_service(KnowledgeManager):
+                    knowledge_manager = self.service_container.get_service(KnowledgeManager)
+                    await knowledge_manager.link_suggestor.stop_index_worker()
+            except Exception as e:
+                self.logger.error(f"Error stopping link index worker: {e}")
+
+            try:
+                if self.service_container.has_service(ReindexJobManager):
+                    reindex_jobs = self.service_container.get_service(ReindexJobManager)
+                    await reindex_jobs.shutdown()
+            except Exception as e:
+                self.logger.error(f"Error stopping re-index jobs: {e}")
+
+            try:
+                if self.service_container.has_service(VaultImporter):
+                    vault_importer = self.service_container.get_service(VaultImporter)
+                    await vault_importer.shutdown()
+            except Exception as e:
+                self.logger.error(f"Error stopping vault import: {e}")
+
         # Close database service
         if hasattr(self, "database_service") and self.database_service.is_initialized:
+            try:
+                await self.llm_cache.flush_access()
+            except Exception as e:
+                self.logger.error(f"Error writing LLM cache access times: {e}")
             await self.database_service.close()
             self.logger.info("Database service closed")
 
@@ -459,7 +546,8 @@ class NescordBot(commands.Bot):
 
             # Register EmbeddingService factory
             def create_embedding_service() -> EmbeddingService:
-                return EmbeddingService(self.config)
+                fallback_manager = self.service_container.get_service(FallbackManager)
+                return EmbeddingService(self.config, fallback_manager)
 
             self.service_container.register_factory(EmbeddingService, create_embedding_service)
 
@@ -471,6 +559,34 @@ class NescordBot(commands.Bot):
 
             self.service_container.register_factory(ChromaDBService, create_chromadb_service)
 
+            # Register VectorStore factory (backend selected by VECTOR_STORE_BACKEND)
+            def create_backend_store(
+                config: BotConfig, shared: Optional[VectorStore]
+            ) -> VectorStore:
+                if config.vector_store_backend == "numpy":
+                    return NumpyVectorStore(config, cast(Optional[NumpyVectorStore], shared))
+                return ChromaDBService(config, cast(Optional[ChromaDBService], shared))
+
+            def create_vector_store() -> VectorStore:
+                if self.config.vector_tenant_collections:
+                    # One collection per guild (VECTOR_TENANT_COLLECTIONS)
+                    return TenantVectorStore(
+                        self.config, create_backend_store, self.database_service
+                    )
+                if self.config.vector_store_backend == "numpy":
+                    return NumpyVectorStore(self.config)
+                return self.service_container.get_service(ChromaDBService)
+
+            # VectorStore is abstract and only used as the container key
+            self.service_container.register_factory(
+                VectorStore, create_vector_store  # type: ignore[type-abstract]
+            )
+
+            def get_vector_store() -> VectorStore:
+                return self.service_container.get_service(
+                    VectorStore  # type: ignore[type-abstract]
+                )
+
             # Register TokenManager factory
             def create_token_manager() -> TokenManager:
                 return TokenManager(self.config, self.database_service)
@@ -481,13 +597,32 @@ class NescordBot(commands.Bot):
             def create_sync_manager() -> SyncManager:
                 # Get dependencies from service container
                 embedding_service = self.service_container.get_service(EmbeddingService)
-                chromadb_service = self.service_container.get_service(ChromaDBService)
+                chromadb_service = get_vector_store()
                 return SyncManager(
                     self.config, self.database_service, chromadb_service, embedding_service
                 )
 
             self.service_container.register_factory(SyncManager, create_sync_manager)
 
+            # ReindexJobManager factory (resumable bulk re-embedding)
+            def create_reindex_job_manager() -> ReindexJobManager:
+                return ReindexJobManager(
+                    self.config,
+                    self.database_service,
+                    self.service_container.get_service(SyncManager),
+                    self.service_container.get_service(EmbeddingService),
+                )
+
+            self.service_container.register_factory(ReindexJobManager, create_reindex_job_manager)
+
+            # SyncOutbox factory (background ChromaDB/Obsidian sync for note changes)
+            if getattr(self.config, "sync_outbox_enabled", True):
+
+                def create_sync_outbox() -> SyncOutbox:
+                    return SyncOutbox(self.config, self.database_service)
+
+                self.service_container.register_factory(SyncOutbox, create_sync_outbox)
+
             # ObsidianGitHubService factory (only register if service is available)
             if hasattr(self, "obsidian_service") and self.obsidian_service is not None:
 
@@ -503,7 +638,7 @@ class NescordBot(commands.Bot):
             # KnowledgeManager factory
             def create_knowledge_manager() -> KnowledgeManager:
                 database_service = self.database_service
-                chromadb_service = self.service_container.get_service(ChromaDBService)
+                chromadb_service = get_vector_store()
                 embedding_service = self.service_container.get_service(EmbeddingService)
                 sync_manager = self.service_container.get_service(SyncManager)
 
@@ -514,6 +649,10 @@ class NescordBot(commands.Bot):
                         ObsidianGitHubService
                     )
 
+                sync_outbox = None
+                if self.service_container.has_service(SyncOutbox):
+                    sync_outbox = self.service_container.get_service(SyncOutbox)
+
                 return KnowledgeManager(
                     self.config,
                     database_service,
@@ -521,22 +660,37 @@ class NescordBot(commands.Bot):
                     embedding_service,
                     sync_manager,
                     obsidian_github_service,
+                    sync_outbox=sync_outbox,
+                    llm_cache=self.llm_cache,
                 )
 
             def create_search_engine() -> SearchEngine:
                 database_service = self.database_service
-                chromadb_service = self.service_container.get_service(ChromaDBService)
+                chromadb_service = get_vector_store()
                 embedding_service = self.service_container.get_service(EmbeddingService)
                 return SearchEngine(
                     chroma_service=chromadb_service,
                     db_service=database_service,
                     embedding_service=embedding_service,
                     config=self.config,
+                    tag_vocabulary=self.service_container.get_service(
+                        KnowledgeManager
+                    ).tag_vocabulary,
                 )
 
             self.service_container.register_factory(KnowledgeManager, create_knowledge_manager)
             self.service_container.register_factory(SearchEngine, create_search_engine)
 
+            # VaultImporter factory (Obsidian vault bulk import)
+            def create_vault_importer() -> VaultImporter:
+                return VaultImporter(
+                    self.config,
+                    self.service_container.get_service(KnowledgeManager),
+                    self.service_container.get_service(ReindexJobManager),
+                )
+
+            self.service_container.register_factory(VaultImporter, create_vault_importer)
+
             # FallbackManager factory
             def create_fallback_manager() -> FallbackManager:
                 from .services.fallback_manager import FallbackManager
@@ -563,7 +717,7 @@ class NescordBot(commands.Bot):
                 api_monitor = self.service_container.get_service(APIMonitor)
                 search_engine = self.service_container.get_service(SearchEngine)
                 knowledge_manager = self.service_container.get_service(KnowledgeManager)
-                chromadb_service = self.service_container.get_service(ChromaDBService)
+                chromadb_service = get_vector_store()
                 return Phase4Monitor(
                     config=self.config,
                     token_manager=token_manager,
@@ -6,7 +6,11 @@ and database operations.
 """
 
 import logging
+import shutil
+import tempfile
 from datetime import datetime
+from functools import partial
+from pathlib import Path
 from typing import Optional
 
 import discord
@@ -123,6 +127,23 @@ class AdminCog(commands.Cog):
                 name="初期化状態", value="✅ 初期化済み" if stats["is_initialized"] else "❌ 未初期化", inline=True
             )
 
+            from ..services.llm_cache import LLMCache
+
+            llm_cache = getattr(self.bot, "llm_cache", None)
+            if isinstance(llm_cache, LLMCache):
+                cache_stats = await llm_cache.get_stats()
+                embed.add_field(
+                    name="LLMキャッシュ",
+                    value=(
+                        f"{cache_stats['entries']:,} 件 "
+                        f"({cache_stats['total_bytes'] / (1024 * 1024):.2f} MB)\n"
+                        f"ヒット率: {cache_stats['hit_rate']:.1%} "
+                        f"({cache_stats['hits']:,} / "
+                        f"{cache_stats['hits'] + cache_stats['misses']:,})"
+                    ),
+                    inline=False,
+                )
+
             embed.set_footer(text="NescordBot データベース管理")
 
             await interaction.followup.send(embed=embed)
@@ -1150,6 +1171,328 @@ class AdminCog(commands.Cog):
             )
             await interaction.followup.send(embed=embed)
 
+    @app_commands.command(name="reindex", description="ベクトルインデックスの再構築ジョブ管理")
+    @app_commands.describe(
+        action="実行するアクション",
+        mode="再構築モード（startで使用）",
+        job_id="対象ジョブID（省略時は実行中のジョブ）",
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="開始 (start)", value="start"),
+            app_commands.Choice(name="状態 (status)", value="status"),
+            app_commands.Choice(name="一時停止 (pause)", value="pause"),
+            app_commands.Choice(name="再開 (resume)", value="resume"),
+            app_commands.Choice(name="中止 (cancel)", value="cancel"),
+        ],
+        mode=[
+            app_commands.Choice(name="未同期のノートのみ (missing)", value="missing"),
+            app_commands.Choice(name="全ノートを再埋め込み (full)", value="full"),
+        ],
+    )
+    async def reindex(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        mode: str = "missing",
+        job_id: Optional[int] = None,
+    ):
+        """ベクトルインデックスの再構築ジョブを管理します。"""
+        logger.info(f"Reindex command: {action} by {interaction.user}")
+
+        if not await self._check_admin_permissions(interaction):
+            await interaction.response.send_message("❌ この操作を実行する権限がありません。", ephemeral=True)
+            return
+
+        await interaction.response.defer()
+
+        try:
+            from ..services.reindex_jobs import ReindexJobError, ReindexJobManager
+            from ..services.service_container import get_service_container
+
+            reindex_jobs = get_service_container().get_service(ReindexJobManager)
+
+            try:
+                if action == "start":
+                    job = await reindex_jobs.start_job(mode, created_by=str(interaction.user))
+                    title = "🔄 再構築ジョブを開始しました"
+                else:
+                    if job_id is None:
+                        active = await reindex_jobs.get_active_job()
+                        if active is None:
+                            recent = await reindex_jobs.list_jobs(limit=1)
+                            active = recent[0] if recent else None
+                        if active is None:
+                            await interaction.followup.send("📂 再構築ジョブはありません。")
+                            return
+                        job_id = active.job_id
+
+                    if action == "pause":
+                        job = await reindex_jobs.pause_job(job_id)
+                        title = "⏸️ 再構築ジョブを一時停止しました"
+                    elif action == "resume":
+                        job = await reindex_jobs.resume_job(job_id)
+                        title = "▶️ 再構築ジョブを再開しました"
+                    elif action == "cancel":
+                        job = await reindex_jobs.cancel_job(job_id)
+                        title = "⏹️ 再構築ジョブを中止しました"
+                    else:
+                        found = await reindex_jobs.get_job(job_id)
+                        if found is None:
+                            raise ReindexJobError(f"Re-index job #{job_id} not found")
+                        job = found
+                        title = "📊 再構築ジョブの状態"
+            except ReindexJobError as e:
+                await interaction.followup.send(f"⚠️ {e}")
+                return
+
+            await interaction.followup.send(
+                embed=self._build_reindex_embed(title, reindex_jobs.get_progress(job))
+            )
+
+        except Exception as e:
+            logger.error(f"Reindex command error: {e}")
+            embed = discord.Embed(
+                title="❌ 再構築エラー",
+                description=f"再構築ジョブの操作中にエラーが発生しました: {e}",
+                colour=discord.Colour.red(),
+            )
+            await interaction.followup.send(embed=embed)
+
+    def _build_reindex_embed(self, title: str, progress: dict) -> discord.Embed:
+        """再構築ジョブの進捗Embedを作成"""
+        embed = discord.Embed(
+            title=title,
+            description=f"ジョブ #{progress['job_id']}（{progress['mode']}）",
+            colour=discord.Colour.blue(),
+        )
+        embed.add_field(name="📌 状態", value=progress["status"], inline=True)
+        embed.add_field(
+            name="📈 進捗",
+            value=(
+                f"{progress['processed']}/{progress['total_notes']} "
+                f"({progress['percent']:.1f}%)\n"
+                f"失敗: {progress['failed']}"
+            ),
+            inline=True,
+        )
+        if progress["running"]:
+            embed.add_field(
+                name="⏱️ 速度",
+                value=(
+                    f"{progress['rate_per_second']:.1f} 件/秒\n"
+                    f"残り約 {progress['eta_seconds']:.0f} 秒"
+                ),
+                inline=True,
+            )
+        return embed
+
+    @app_commands.command(name="dimension", description="ChromaDBの埋め込み次元の移行を管理")
+    @app_commands.describe(
+        action="実行するアクション",
+        dimension="移行先の次元数（startで使用）",
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="開始 (start)", value="start"),
+            app_commands.Choice(name="状態 (status)", value="status"),
+        ]
+    )
+    async def dimension(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        dimension: Optional[int] = None,
+    ):
+        """保存済みベクトルを切り詰めて、次元数の小さいコレクションへ移行します。"""
+        logger.info(f"Dimension command: {action} by {interaction.user}")
+
+        if not await self._check_admin_permissions(interaction):
+            await interaction.response.send_message("❌ この操作を実行する権限がありません。", ephemeral=True)
+            return
+
+        await interaction.response.defer()
+
+        try:
+            from ..services.chromadb_service import ChromaDBOperationError, ChromaDBService
+            from ..services.service_container import get_service_container
+
+            container = get_service_container()
+            if (
+                not container.has_service(ChromaDBService)
+                or getattr(self.bot.config, "vector_store_backend", "chromadb") != "chromadb"
+                or getattr(self.bot.config, "vector_tenant_collections", False)
+            ):
+                await interaction.followup.send("⚠️ 次元の移行は単一のChromaDBコレクションでのみ使用できます。")
+                return
+
+            chromadb_service = container.get_service(ChromaDBService)
+
+            if action == "start":
+                if dimension is None:
+                    await interaction.followup.send("⚠️ 移行先の次元数を指定してください。")
+                    return
+                try:
+                    chromadb_service.start_dimension_migration(dimension)
+                except ChromaDBOperationError as e:
+                    await interaction.followup.send(f"⚠️ {e}")
+                    return
+                title = "🔄 次元の移行を開始しました"
+            else:
+                title = "📊 次元の移行の状態"
+
+            await interaction.followup.send(
+                embed=self._build_dimension_embed(title, chromadb_service.get_migration_status())
+            )
+
+        except Exception as e:
+            logger.error(f"Dimension command error: {e}")
+            embed = discord.Embed(
+                title="❌ 次元の移行エラー",
+                description=f"次元の移行の操作中にエラーが発生しました: {e}",
+                colour=discord.Colour.red(),
+            )
+            await interaction.followup.send(embed=embed)
+
+    def _build_dimension_embed(self, title: str, status: dict) -> discord.Embed:
+        """次元の移行の状態Embedを作成"""
+        embed = discord.Embed(title=title, colour=discord.Colour.blue())
+        embed.add_field(name="📌 状態", value=status["state"], inline=True)
+        if "target_dimension" in status or "dimension" in status:
+            target = status.get("target_dimension", status.get("dimension"))
+            embed.add_field(name="📐 移行先の次元", value=str(target), inline=True)
+        if "total" in status:
+            embed.add_field(
+                name="📈 進捗", value=f"{status['migrated']}/{status['total']}", inline=True
+            )
+        elif "migrated" in status:
+            embed.add_field(name="📈 移行件数", value=str(status["migrated"]), inline=True)
+        if status["state"] == "completed":
+            embed.set_footer(text="再起動後も使うには EMBEDDING_DIMENSION を移行先の次元に設定してください")
+        if "error" in status:
+            embed.add_field(name="⚠️ エラー", value=status["error"][:1000], inline=False)
+        return embed
+
+    @app_commands.command(name="import", description="Obsidian Vaultを一括インポートします")
+    @app_commands.describe(
+        action="実行するアクション",
+        path="サーバー上のVaultディレクトリまたはzipのパス",
+        archive="Vaultのzipファイル（pathの代わりに添付）",
+    )
+    @app_commands.choices(
+        action=[
+            app_commands.Choice(name="開始 (start)", value="start"),
+            app_commands.Choice(name="状態 (status)", value="status"),
+        ]
+    )
+    async def import_vault(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        path: Optional[str] = None,
+        archive: Optional[discord.Attachment] = None,
+    ):
+        """Obsidian Vaultのインポートを開始・確認します。"""
+        logger.info(f"Import command: {action} by {interaction.user}")
+
+        if not await self._check_admin_permissions(interaction):
+            await interaction.response.send_message("❌ この操作を実行する権限がありません。", ephemeral=True)
+            return
+
+        await interaction.response.defer()
+
+        try:
+            from ..services.service_container import get_service_container
+            from ..services.vault_importer import VaultImporter, VaultImportError
+
+            importer = get_service_container().get_service(VaultImporter)
+
+            if action == "start":
+                cleanup = None
+                if archive is not None:
+                    # Note IDs derive from the file name, so keeping it makes a
+                    # re-upload of the same vault skip the notes already imported
+                    target = Path(tempfile.gettempdir()) / "nescord_vault_imports" / str(archive.id)
+                    target.mkdir(parents=True, exist_ok=True)
+                    source = str(target / Path(archive.filename).name)
+                    cleanup = partial(shutil.rmtree, target, ignore_errors=True)
+                    try:
+                        await archive.save(Path(source))
+                    except Exception:
+                        cleanup()
+                        raise
+                elif path:
+                    source = path
+                else:
+                    await interaction.followup.send("⚠️ pathまたはarchiveを指定してください。")
+                    return
+
+                try:
+                    record = await importer.start_import(
+                        source,
+                        user_id=str(interaction.user.id),
+                        guild_id=str(interaction.guild_id) if interaction.guild_id else None,
+                        created_by=str(interaction.user),
+                        cleanup=cleanup,
+                    )
+                except Exception as e:
+                    if cleanup is not None:
+                        cleanup()
+                    if not isinstance(e, VaultImportError):
+                        raise
+                    await interaction.followup.send(f"⚠️ {e}")
+                    return
+                title = "📥 インポートを開始しました"
+            else:
+                recent = await importer.list_imports(limit=1)
+                if not recent:
+                    await interaction.followup.send("📂 インポート履歴はありません。")
+                    return
+                record = recent[0]
+                title = "📊 インポートの状態"
+
+            await interaction.followup.send(
+                embed=self._build_import_embed(title, record, importer.is_running)
+            )
+
+        except Exception as e:
+            logger.error(f"Import command error: {e}")
+            embed = discord.Embed(
+                title="❌ インポートエラー",
+                description=f"インポートの操作中にエラーが発生しました: {e}",
+                colour=discord.Colour.red(),
+            )
+            await interaction.followup.send(embed=embed)
+
+    def _build_import_embed(self, title: str, record, running: bool) -> discord.Embed:
+        """インポート進捗Embedを作成"""
+        embed = discord.Embed(
+            title=title,
+            description=f"インポート #{record.import_id}\n`{record.source}`",
+            colour=discord.Colour.blue(),
+        )
+        status = record.status.value
+        if status == "running" and not running:
+            status += "（中断: 再度startで再開）"
+        embed.add_field(name="📌 状態", value=status, inline=True)
+        embed.add_field(
+            name="📄 ファイル",
+            value=(
+                f"検出: {record.files_seen}\n"
+                f"取り込み: {record.imported}\n"
+                f"スキップ: {record.skipped} / 失敗: {record.failed}"
+            ),
+            inline=True,
+        )
+        embed.add_field(
+            name="🔗 リンク",
+            value=f"解決: {record.links_resolved}\n未解決: {record.links_unresolved}",
+            inline=True,
+        )
+        if record.last_error:
+            embed.add_field(name="⚠️ エラー", value=record.last_error[:1000], inline=False)
+        return embed
+
 
 class StatsDetailView(discord.ui.View):
     """詳細なシステム統計情報の表示用View."""
@@ -57,6 +57,7 @@ class PKMCog(commands.Cog):
         self.knowledge_manager: Optional[KnowledgeManager] = None
         self.search_engine: Optional[SearchEngine] = None
         self.review_service: Optional[ReviewService] = None
+        self.guild_scoped_search = False
         self._initialized = False
 
         logger.info("PKMCog initialized")
@@ -86,6 +87,8 @@ class PKMCog(commands.Cog):
             config: BotConfig = service_container.get_service(BotConfig)
             db: DatabaseService = service_container.get_service(DatabaseService)
             self.review_service = ReviewService(config, db, self.knowledge_manager)
+            # ギルドごとのコレクション有効時は検索をギルド内に限定
+            self.guild_scoped_search = config.vector_tenant_collections
 
             # サービス初期化確認
             await self.knowledge_manager.initialize()
@@ -106,6 +109,12 @@ class PKMCog(commands.Cog):
         except Exception as e:
             logger.error(f"PKMCog initialization failed: {e}")
 
+    def _search_guild_id(self, interaction: discord.Interaction) -> Optional[str]:
+        """Get the guild to scope searches to when tenant collections are enabled."""
+        if self.guild_scoped_search and interaction.guild_id:
+            return str(interaction.guild_id)
+        return None
+
     async def _check_services(self, interaction: discord.Interaction) -> bool:
         """Check if services are properly initialized."""
         if not self._initialized or self.knowledge_manager is None:
@@ -185,6 +194,7 @@ class PKMCog(commands.Cog):
                     tags=tags_list,
                     source_type="manual",
                     user_id=user_id,
+                    guild_id=str(interaction.guild_id) if interaction.guild_id else None,
                 ),
                 timeout=COMMAND_TIMEOUT,
             )
@@ -290,6 +300,7 @@ class PKMCog(commands.Cog):
                 user_id=user_id,
                 content_type=note_type if note_type != "all" else None,
                 min_score=min_score,
+                guild_id=self._search_guild_id(interaction),
             )
 
             # Convert search mode string to enum
@@ -459,6 +470,35 @@ class PKMCog(commands.Cog):
             embed = PKMEmbed.error("予期しないエラーが発生しました", "管理者にお問い合わせください。")
             await interaction.followup.send(embed=embed, ephemeral=True)
 
+    @list_command.autocomplete("tag")
+    async def list_tag_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest existing tags for the list filter."""
+        return self._tag_choices(current)
+
+    @note_command.autocomplete("tags")
+    async def note_tags_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        """Suggest existing tags for the last comma-separated tag being typed."""
+        head, _, partial = current.rpartition(",")
+        prefix = f"{head}, " if head else ""
+        return self._tag_choices(partial, prefix)
+
+    def _tag_choices(self, text: str, prefix: str = "") -> List[app_commands.Choice[str]]:
+        """Autocomplete choices from the tag vocabulary, most used first."""
+        if self.knowledge_manager is None:
+            return []
+
+        choices = []
+        for usage in self.knowledge_manager.tag_vocabulary.complete(text, limit=25):
+            value = f"{prefix}{usage.name}"
+            if len(value) > 100:  # Discord limit for choice values
+                continue
+            choices.append(app_commands.Choice(name=f"{value} ({usage.count})"[:100], value=value))
+        return choices
+
     @pkm_group.command(name="help", description="PKM機能のヘルプを表示")
     async def help_command(self, interaction: discord.Interaction) -> None:
         """Show PKM help information."""
@@ -1142,7 +1182,9 @@ class PKMCog(commands.Cog):
             elif query:
                 # Search and select
                 assert self.search_engine is not None
-                filters = SearchFilters(user_id=user_id, min_score=0.3)
+                filters = SearchFilters(
+                    user_id=user_id, min_score=0.3, guild_id=self._search_guild_id(interaction)
+                )
 
                 search_results = await asyncio.wait_for(
                     self.search_engine.hybrid_search(
@@ -1489,6 +1531,12 @@ class NoteMergeView(discord.ui.View):
             # Multi-phase search for comprehensive coverage
             all_candidate_notes = set()
 
+            # Phase 0: Precomputed embedding neighbours of each selected note
+            for note in self.selected_notes:
+                related_notes = await self.knowledge_manager.get_related_notes(note["id"], limit=10)
+                for related in related_notes:
+                    all_candidate_notes.add(related["id"])
+
             # Phase 1: Content-based semantic search
             content_query = (
                 combined_content[:500] if len(combined_content) > 500 else combined_content
@@ -342,6 +342,7 @@ class FleetingNoteView(discord.ui.View):
         self.knowledge_manager = knowledge_manager
         self.note_type = note_type
         self.message = message
+        self.saved_note_id: Optional[str] = None
 
     def _generate_filename(self, user_name: str) -> str:
         """Generate filename following vault specification.
@@ -521,6 +522,7 @@ class FleetingNoteView(discord.ui.View):
                     channel_id=str(interaction.channel.id) if interaction.channel else None,
                     guild_id=str(interaction.guild.id) if interaction.guild else None,
                 )
+                self.saved_note_id = note_id
 
                 # Search for related notes
                 related_notes = []
@@ -599,9 +601,16 @@ class FleetingNoteView(discord.ui.View):
             search_query = f"{self.summary} {self.content[:200]}"  # Limit to avoid token limit
 
             try:
-                related_notes = await self.knowledge_manager.search_notes(
-                    query=search_query, limit=5
-                )
+                # Saved notes have precomputed neighbours; otherwise search by content
+                related_notes = []
+                if self.saved_note_id:
+                    related_notes = await self.knowledge_manager.get_related_notes(
+                        self.saved_note_id, limit=5
+                    )
+                if not related_notes:
+                    related_notes = await self.knowledge_manager.search_notes(
+                        query=search_query, limit=5
+                    )
 
                 if not related_notes:
                     await interaction.followup.send("🔍 関連するノートが見つかりませんでした。", ephemeral=True)
@@ -10,7 +10,7 @@ from discord import app_commands
 from discord.ext import commands
 from openai import OpenAI
 
-from ..services import NoteProcessingService, ObsidianGitHubService
+from ..services import LLMCache, NoteProcessingService, ObsidianGitHubService
 
 if TYPE_CHECKING:
     from ..services.knowledge_manager import KnowledgeManager
@@ -25,6 +25,7 @@ class Voice(commands.Cog):
         obsidian_service: Optional[ObsidianGitHubService] = None,
         note_processing_service: Optional[NoteProcessingService] = None,
         knowledge_manager: Optional["KnowledgeManager"] = None,
+        llm_cache: Optional[LLMCache] = None,
     ):
         self.bot = bot
         self.obsidian_service = obsidian_service
@@ -34,7 +35,7 @@ class Voice(commands.Cog):
         # TranscriptionServiceを初期化
         from ..services.transcription import get_transcription_service
 
-        self.transcription_service = get_transcription_service()
+        self.transcription_service = get_transcription_service(llm_cache)
 
         # 後方互換性のためにopenai_clientも保持（setup_openaiで初期化）
         self.openai_client: Optional[OpenAI] = None
@@ -242,6 +243,7 @@ class TranscriptionView(discord.ui.View):
         self.obsidian_service = obsidian_service
         self.knowledge_manager = knowledge_manager
         self.message = message
+        self.saved_note_id: Optional[str] = None
 
     @discord.ui.button(label="📝 Obsidianに保存", style=discord.ButtonStyle.primary)
     async def save_to_obsidian(self, interaction: discord.Interaction, button: discord.ui.Button):
@@ -362,6 +364,7 @@ class TranscriptionView(discord.ui.View):
                     channel_id=str(interaction.channel.id) if interaction.channel else None,
                     guild_id=str(interaction.guild.id) if interaction.guild else None,
                 )
+                self.saved_note_id = note_id
 
                 # Search for related notes
                 related_notes = []
@@ -442,9 +445,16 @@ class TranscriptionView(discord.ui.View):
             )
 
             try:
-                related_notes = await self.knowledge_manager.search_notes(
-                    query=search_query, limit=5
-                )
+                # Saved notes have precomputed neighbours; otherwise search by content
+                related_notes = []
+                if self.saved_note_id:
+                    related_notes = await self.knowledge_manager.get_related_notes(
+                        self.saved_note_id, limit=5
+                    )
+                if not related_notes:
+                    related_notes = await self.knowledge_manager.search_notes(
+                        query=search_query, limit=5
+                    )
 
                 if not related_notes:
                     await interaction.followup.send("🔍 関連するノートが見つかりませんでした。", ephemeral=True)
@@ -514,4 +524,7 @@ async def setup(bot):
     obsidian_service = getattr(bot, "obsidian_service", None)
     note_processing_service = getattr(bot, "note_processing_service", None)
     knowledge_manager = getattr(bot, "knowledge_manager", None)
-    await bot.add_cog(Voice(bot, obsidian_service, note_processing_service, knowledge_manager))
+    llm_cache = getattr(bot, "llm_cache", None)
+    await bot.add_cog(
+        Voice(bot, obsidian_service, note_processing_service, knowledge_manager, llm_cache)
+    )
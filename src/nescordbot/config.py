@@ -58,6 +58,12 @@ class BotConfig(BaseModel):
     chromadb_max_batch_size: int = Field(
         default=100, description="Maximum batch size for ChromaDB operations"
     )
+    vector_store_backend: str = Field(
+        default="chromadb", description="Vector store backend: chromadb or numpy"
+    )
+    vector_tenant_collections: bool = Field(
+        default=False, description="Route each guild to its own vector collection"
+    )
 
     # GitHub integration settings
     github_token: Optional[str] = Field(default=None, description="GitHub API token")
@@ -111,6 +117,13 @@ class BotConfig(BaseModel):
         default=10, description="Maximum number of search results to return"
     )
     embedding_dimension: int = Field(default=768, description="Embedding vector dimension")
+    embedding_provider: str = Field(
+        default="gemini", description="Embedding provider: gemini or local"
+    )
+    embedding_local_fallback: bool = Field(
+        default=False,
+        description="Switch to the local embedding provider under API pressure",
+    )
 
     # Phase 4: Advanced RRF settings
     rrf_k_value: int = Field(
@@ -396,6 +409,24 @@ class BotConfig(BaseModel):
             raise ValueError(f"Embedding dimension must be one of: {dimensions_str}")
         return v
 
+    @field_validator("vector_store_backend")
+    @classmethod
+    def validate_vector_store_backend(cls, v):
+        """Validate vector store backend."""
+        valid_backends = ["chromadb", "numpy"]
+        if v not in valid_backends:
+            raise ValueError(f"Vector store backend must be one of: {', '.join(valid_backends)}")
+        return v
+
+    @field_validator("embedding_provider")
+    @classmethod
+    def validate_embedding_provider(cls, v):
+        """Validate embedding provider."""
+        valid_providers = ["gemini", "local"]
+        if v not in valid_providers:
+            raise ValueError(f"Embedding provider must be one of: {', '.join(valid_providers)}")
+        return v
+
     @field_validator("ai_api_mode")
     @classmethod
     def validate_ai_api_mode(cls, v):
@@ -627,12 +658,18 @@ class ConfigManager:
                 chromadb_collection_name=os.getenv("CHROMADB_COLLECTION_NAME", "nescord_knowledge"),
                 chromadb_distance_metric=os.getenv("CHROMADB_DISTANCE_METRIC", "cosine"),
                 chromadb_max_batch_size=int(os.getenv("CHROMADB_MAX_BATCH_SIZE", "100")),
+                vector_store_backend=os.getenv("VECTOR_STORE_BACKEND", "chromadb"),
+                vector_tenant_collections=os.getenv("VECTOR_TENANT_COLLECTIONS", "false").lower()
+                == "true",
                 # Phase 4: PKM feature settings
                 pkm_enabled=os.getenv("PKM_ENABLED", "false").lower() == "true",
                 hybrid_search_enabled=os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true",
                 hybrid_search_alpha=float(os.getenv("HYBRID_SEARCH_ALPHA", "0.7")),
                 max_search_results=int(os.getenv("MAX_SEARCH_RESULTS", "10")),
                 embedding_dimension=int(os.getenv("EMBEDDING_DIMENSION", "768")),
+                embedding_provider=os.getenv("EMBEDDING_PROVIDER", "gemini"),
+                embedding_local_fallback=os.getenv("EMBEDDING_LOCAL_FALLBACK", "false").lower()
+                == "true",
                 # Phase 4: Advanced RRF settings
                 rrf_k_value=int(os.getenv("RRF_K_VALUE", "60")),
                 enable_dynamic_rrf_k=os.getenv("ENABLE_DYNAMIC_RRF_K", "true").lower() == "true",
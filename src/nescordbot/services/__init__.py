@@ -16,15 +16,20 @@ from .backup_manager import (
     RestoreError,
 )
 from .batch_processor import BatchProcessor, GitHubIntegratedQueue
-from .chromadb_service import ChromaDBService, DocumentMetadata, SearchResult
+from .chromadb_service import ChromaDBService, DocumentMetadata, SearchResult, StoredDocument
 from .database import DatabaseService, IDataStore
 from .embedding import EmbeddingResult, EmbeddingService, EmbeddingServiceError
+from .embedding_providers import EmbeddingProvider, LocalEmbeddingProvider
 from .fallback_manager import FallbackLevel, FallbackManager, FallbackManagerError
 from .git_operations import FileOperation, GitOperationService
 from .github import GitHubService
 from .github_auth import GitHubAuthManager
 from .knowledge_manager import KnowledgeManager, KnowledgeManagerError
+from .llm_cache import LLMCache, content_digest
+from .note_history import NoteHistoryStore
+from .note_neighbors import NoteNeighborIndex
 from .note_processing import NoteProcessingService
+from .numpy_vector_store import NumpyVectorStore, NumpyVectorStoreError
 from .obsidian_github import ObsidianGitHubService, ObsidianSyncStatus
 from .persistent_queue import FileRequest, PersistentQueue
 from .phase4_monitor import Phase4Monitor, Phase4MonitorError
@@ -37,6 +42,7 @@ from .privacy_manager import (
     SecurityEvent,
     SecurityEventType,
 )
+from .reindex_jobs import ReindexJob, ReindexJobError, ReindexJobManager, ReindexJobStatus
 from .search_engine import (
     SearchEngine,
     SearchEngineError,
@@ -65,7 +71,12 @@ from .sync_manager import (
     SyncServiceUnavailableError,
     SyncStatus,
 )
+from .sync_outbox import OutboxEntry, SyncOutbox, SyncOutboxError
+from .tag_vocabulary import TagUsage, TagVocabulary
+from .tenant_vector_store import TenantVectorStore, TenantVectorStoreError
 from .token_manager import TokenLimitExceededError, TokenManager, TokenUsageError
+from .vault_importer import VaultImport, VaultImporter, VaultImportError, VaultImportStatus
+from .vector_store import VectorStore, VectorStoreError
 
 __all__ = [
     "Alert",
@@ -83,9 +94,18 @@ __all__ = [
     "ChromaDBService",
     "DocumentMetadata",
     "SearchResult",
+    "StoredDocument",
+    "VectorStore",
+    "VectorStoreError",
+    "NumpyVectorStore",
+    "NumpyVectorStoreError",
+    "TenantVectorStore",
+    "TenantVectorStoreError",
     "EmbeddingService",
     "EmbeddingResult",
     "EmbeddingServiceError",
+    "EmbeddingProvider",
+    "LocalEmbeddingProvider",
     "GitHubService",
     "PersistentQueue",
     "FileRequest",
@@ -94,6 +114,10 @@ __all__ = [
     "FileOperation",
     "BatchProcessor",
     "GitHubIntegratedQueue",
+    "LLMCache",
+    "content_digest",
+    "NoteHistoryStore",
+    "NoteNeighborIndex",
     "NoteProcessingService",
     "ObsidianGitHubService",
     "ObsidianSyncStatus",
@@ -125,6 +149,19 @@ __all__ = [
     "SyncError",
     "SyncServiceUnavailableError",
     "SyncConsistencyError",
+    "SyncOutbox",
+    "SyncOutboxError",
+    "OutboxEntry",
+    "TagUsage",
+    "TagVocabulary",
+    "ReindexJob",
+    "ReindexJobError",
+    "ReindexJobManager",
+    "ReindexJobStatus",
+    "VaultImport",
+    "VaultImporter",
+    "VaultImportError",
+    "VaultImportStatus",
     "FallbackManager",
     "FallbackManagerError",
     "FallbackLevel",
@@ -8,47 +8,46 @@ and performing semantic search using ChromaDB in-process database.
 import asyncio
 import json
 import logging
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 
 import chromadb  # type: ignore[import-untyped]
 from chromadb.config import Settings  # type: ignore[import-untyped]
 from chromadb.errors import NotFoundError  # type: ignore[import-untyped]
 
 from ..config import BotConfig
+from .embedding import truncate_embedding
+from .vector_store import (
+    SEARCH_INCLUDE_ALL,
+    DocumentBatch,
+    DocumentMetadata,
+    SearchResult,
+    StoredDocument,
+    VectorStore,
+    VectorStoreError,
+)
 
 # Logging configuration
 logger = logging.getLogger(__name__)
 
 
 @dataclass
-class DocumentMetadata:
-    """Metadata for a document stored in ChromaDB."""
+class _QueryBatch:
+    """Queries with the same shape waiting to be sent as one collection.query."""
 
-    document_id: str
-    title: Optional[str] = None
-    source: Optional[str] = None
-    created_at: Optional[str] = None
-    updated_at: Optional[str] = None
-    tags: Optional[List[str]] = None
-    user_id: Optional[str] = None
-    content_type: Optional[str] = None
+    n_results: int
+    where: Optional[Dict[str, Any]]
+    include: Tuple[str, ...]
+    embeddings: List[List[float]] = field(default_factory=list)
+    futures: List["asyncio.Future[Any]"] = field(default_factory=list)
+    flush_handle: Optional[asyncio.TimerHandle] = None
 
 
-@dataclass
-class SearchResult:
-    """Result from ChromaDB vector search."""
-
-    document_id: str
-    content: str
-    score: float
-    metadata: DocumentMetadata
-
-
-class ChromaDBServiceError(Exception):
+class ChromaDBServiceError(VectorStoreError):
     """Base exception for ChromaDB service errors."""
 
     pass
@@ -72,7 +71,7 @@ class ChromaDBOperationError(ChromaDBServiceError):
     pass
 
 
-class ChromaDBService:
+class ChromaDBService(VectorStore):
     """
     ChromaDB service for vector database operations.
 
@@ -80,19 +79,43 @@ class ChromaDBService:
     functionality using ChromaDB in-process database.
     """
 
-    def __init__(self, config: BotConfig):
+    def __init__(self, config: BotConfig, shared: Optional["ChromaDBService"] = None):
         """
         Initialize ChromaDB service.
 
         Args:
             config: Bot configuration containing ChromaDB settings
+            shared: Service whose client and executor this one reuses for its collection
         """
         self.config = config
         self.client: Optional[Any] = None
         self.collection: Optional[Any] = None
-        self.executor = ThreadPoolExecutor(max_workers=4)
+        self._shared = shared
+        self.executor: ThreadPoolExecutor = (
+            shared.executor if shared else ThreadPoolExecutor(max_workers=4)
+        )
         self._initialized = False
 
+        # Reduced-dimension (Matryoshka) support: dimension of the active
+        # collection when it was created by a dimension migration
+        self.embedding_dimension: Optional[int] = None
+        self._migration_target: Optional[Any] = None
+        self._migration_dimension: Optional[int] = None
+        self._migration_status: Dict[str, Any] = {"state": "idle"}
+        self._migration_task: Optional["asyncio.Task[Dict[str, Any]]"] = None
+        # Serializes writes with migration copy batches so mirrored writes are
+        # never overwritten by a stale copy
+        self._write_lock = threading.Lock()
+
+        # Micro-batching of concurrent searches: while a query is running, queries
+        # arriving within the window are sent as one multi-embedding query; a query
+        # with nothing else in flight runs at once (window 0 disables batching)
+        self.query_batch_window = getattr(config, "chromadb_query_batch_window", 0.002)
+        self.query_batch_max_size = getattr(config, "chromadb_query_batch_max_size", 32)
+        self._query_batches: Dict[str, _QueryBatch] = {}
+        self._query_batch_tasks: Set["asyncio.Task[None]"] = set()
+        self._queries_in_flight = 0
+
         # Ensure persist directory exists
         self.persist_dir = Path(config.chromadb_persist_directory)
         self.persist_dir.mkdir(parents=True, exist_ok=True)
@@ -105,15 +128,20 @@ class ChromaDBService:
             return
 
         try:
-            # Initialize client in thread pool to avoid blocking
-            self.client = await asyncio.get_event_loop().run_in_executor(
-                self.executor, self._init_client
-            )
+            if self._shared is not None:
+                await self._shared.initialize()
+                self.client = self._shared.client
+            else:
+                # Initialize client in thread pool to avoid blocking
+                self.client = await asyncio.get_event_loop().run_in_executor(
+                    self.executor, self._init_client
+                )
 
             # Get or create collection
             self.collection = await asyncio.get_event_loop().run_in_executor(
                 self.executor, self._get_or_create_collection
             )
+            self.embedding_dimension = self._get_collection_dimension(self.collection)
 
             self._initialized = True
             logger.info("ChromaDB service successfully initialized")
@@ -142,33 +170,64 @@ class ChromaDBService:
             logger.error(f"Failed to create ChromaDB client: {e}")
             raise ChromaDBConnectionError(f"Client creation failed: {e}")
 
+    def _dimension_collection_name(self, dimension: int) -> str:
+        """Get the collection name used for a reduced-dimension collection."""
+        return f"{self.config.chromadb_collection_name}_d{dimension}"
+
+    def _get_collection_dimension(self, collection: Any) -> Optional[int]:
+        """Get the declared embedding dimension of a collection, if any."""
+        metadata = getattr(collection, "metadata", None) or {}
+        dimension = metadata.get("embedding_dimension")
+        return int(dimension) if dimension else None
+
     def _get_or_create_collection(self) -> Any:
         """Get or create ChromaDB collection (runs in thread pool)."""
         try:
             if not self.client:
                 raise ChromaDBConnectionError("Client not initialized")
 
-            # Try to get existing collection first
-            try:
-                collection = self.client.get_collection(name=self.config.chromadb_collection_name)
-                logger.info(
-                    f"Retrieved existing collection: {self.config.chromadb_collection_name}"
-                )
-                return collection
-
-            except NotFoundError:
-                # Collection doesn't exist, create it
-                collection = self.client.create_collection(
-                    name=self.config.chromadb_collection_name,
-                    metadata={"hnsw:space": self.config.chromadb_distance_metric},
-                )
-                logger.info(f"Created new collection: {self.config.chromadb_collection_name}")
-                return collection
+            # Prefer a migrated collection matching the configured dimension,
+            # then the base collection
+            candidates = [
+                self._dimension_collection_name(self.config.embedding_dimension),
+                self.config.chromadb_collection_name,
+            ]
+            for name in candidates:
+                try:
+                    collection = self.client.get_collection(name=name)
+                    logger.info(f"Retrieved existing collection: {name}")
+                    return collection
+                except (NotFoundError, ValueError):
+                    continue
+
+            # Fall back to any collection left by a completed dimension migration
+            prefix = f"{self.config.chromadb_collection_name}_d"
+            for existing in self.client.list_collections():
+                name = getattr(existing, "name", existing)
+                if name.startswith(prefix):
+                    logger.warning(
+                        f"Using migrated collection {name}; set EMBEDDING_DIMENSION to match"
+                    )
+                    return self.client.get_collection(name=name)
+
+            # Collection doesn't exist, create it
+            collection = self.client.create_collection(
+                name=self.config.chromadb_collection_name,
+                metadata={"hnsw:space": self.config.chromadb_distance_metric},
+            )
+            logger.info(f"Created new collection: {self.config.chromadb_collection_name}")
+            return collection
 
         except Exception as e:
             logger.error(f"Failed to get or create collection: {e}")
             raise ChromaDBCollectionError(f"Collection setup failed: {e}")
 
+    def _fit_embedding(self, embedding: List[float]) -> List[float]:
+        """Truncate an embedding to the active collection dimension if needed."""
+        if self.embedding_dimension:
+            return truncate_embedding(embedding, self.embedding_dimension)
+        return embedding
+
     async def add_document(
         self,
         document_id: str,
@@ -221,13 +280,16 @@ class ChromaDBService:
         if not self.collection:
             raise ChromaDBCollectionError("Collection not initialized")
 
-        self.collection.add(
-            ids=[document_id], documents=[content], embeddings=[embedding], metadatas=[metadata]
-        )
+        with self._write_lock:
+            self.collection.add(
+                ids=[document_id],
+                documents=[content],
+                embeddings=[self._fit_embedding(embedding)],
+                metadatas=[metadata],
+            )
+            self._mirror_upsert_sync([document_id], [content], [embedding], [metadata])
 
-    async def add_documents_batch(
-        self, documents: List[Tuple[str, str, List[float], Optional[DocumentMetadata]]]
-    ) -> int:
+    async def add_documents_batch(self, documents: DocumentBatch) -> int:
         """
         Add multiple documents in batch.
 
@@ -285,13 +347,88 @@ class ChromaDBService:
         if not self.collection:
             raise ChromaDBCollectionError("Collection not initialized")
 
-        self.collection.add(ids=ids, documents=contents, embeddings=embeddings, metadatas=metadatas)
+        with self._write_lock:
+            self.collection.add(
+                ids=ids,
+                documents=contents,
+                embeddings=[self._fit_embedding(embedding) for embedding in embeddings],
+                metadatas=metadatas,
+            )
+            self._mirror_upsert_sync(ids, contents, embeddings, metadatas)
+
+    async def upsert_documents_batch(self, documents: DocumentBatch) -> int:
+        """
+        Insert or replace multiple documents in batch.
+
+        Unlike add_documents_batch, existing IDs are overwritten instead of
+        being ignored, so re-synced documents never keep stale vectors.
+
+        Args:
+            documents: List of tuples (document_id, content, embedding, metadata)
+
+        Returns:
+            Number of documents written
+
+        Raises:
+            ChromaDBOperationError: If batch upsert fails
+        """
+        await self._ensure_initialized()
+
+        if not documents:
+            return 0
+
+        batch_size = self.config.chromadb_max_batch_size
+        total_written = 0
+
+        try:
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i : i + batch_size]
+
+                ids = [doc[0] for doc in batch]
+                contents = [doc[1] for doc in batch]
+                embeddings = [doc[2] for doc in batch]
+                metadatas = [self._prepare_metadata(doc[3]) for doc in batch]
+
+                await asyncio.get_event_loop().run_in_executor(
+                    self.executor, self._upsert_batch_sync, ids, contents, embeddings, metadatas
+                )
+
+                total_written += len(batch)
+
+            logger.debug(f"Upserted {total_written} documents in batch")
+            return total_written
+
+        except Exception as e:
+            logger.error(f"Batch document upsert failed: {e}")
+            raise ChromaDBOperationError(f"Batch upsert failed: {e}")
+
+    def _upsert_batch_sync(
+        self,
+        ids: List[str],
+        contents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Upsert batch synchronously (runs in thread pool)."""
+        if not self.collection:
+            raise ChromaDBCollectionError("Collection not initialized")
+
+        with self._write_lock:
+            self.collection.upsert(
+                ids=ids,
+                documents=contents,
+                embeddings=[self._fit_embedding(embedding) for embedding in embeddings],
+                metadatas=metadatas,
+            )
+            self._mirror_upsert_sync(ids, contents, embeddings, metadatas)
 
     async def search_documents(
         self,
         query_embedding: List[float],
         n_results: int = 10,
         where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
+        max_results: Optional[int] = None,
     ) -> List[SearchResult]:
         """
         Search documents by embedding similarity.
@@ -300,6 +437,9 @@ class ChromaDBService:
             query_embedding: Query vector for similarity search
             n_results: Maximum number of results to return
             where: Optional metadata filters
+            include: Fields to fetch besides IDs and distances
+                ("documents", "metadatas"); pass () for IDs and scores only
+            max_results: Cap on n_results; defaults to max_search_results
 
         Returns:
             List of search results ordered by similarity
@@ -310,13 +450,22 @@ class ChromaDBService:
         await self._ensure_initialized()
 
         try:
-            # Ensure n_results doesn't exceed configured maximum
-            n_results = min(n_results, self.config.max_search_results)
-
-            # Perform search in thread pool
-            results = await asyncio.get_event_loop().run_in_executor(
-                self.executor, self._search_sync, query_embedding, n_results, where
-            )
+            # Ensure n_results doesn't exceed the caller's or the configured maximum
+            cap = self.config.max_search_results if max_results is None else max_results
+            n_results = min(n_results, cap)
+            fields = tuple(name for name in SEARCH_INCLUDE_ALL if name in include)
+
+            if self.query_batch_window > 0 and (self._queries_in_flight or self._query_batches):
+                results = await self._query_batched(query_embedding, n_results, where, fields)
+            else:
+                # Perform search in thread pool
+                self._queries_in_flight += 1
+                try:
+                    results = await asyncio.get_event_loop().run_in_executor(
+                        self.executor, self._search_sync, query_embedding, n_results, where, fields
+                    )
+                finally:
+                    self._queries_in_flight -= 1
 
             # Convert to SearchResult objects
             search_results = self._process_search_results(results)
@@ -329,19 +478,118 @@ class ChromaDBService:
             raise ChromaDBOperationError(f"Search failed: {e}")
 
     def _search_sync(
-        self, query_embedding: List[float], n_results: int, where: Optional[Dict[str, Any]]
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
     ) -> Any:
         """Perform search synchronously (runs in thread pool)."""
         if not self.collection:
             raise ChromaDBCollectionError("Collection not initialized")
 
         return self.collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=[self._fit_embedding(query_embedding)],
             n_results=n_results,
             where=where,
-            include=["documents", "metadatas", "distances"],
+            include=[*include, "distances"],
         )
 
+    async def _query_batched(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        include: Tuple[str, ...] = SEARCH_INCLUDE_ALL,
+    ) -> Any:
+        """
+        Queue a query for the next micro-batch of the same shape.
+
+        The batch is flushed when the window elapses or it reaches
+        query_batch_max_size, whichever comes first.
+
+        Returns:
+            Raw single-query ChromaDB result for this embedding
+        """
+        loop = asyncio.get_running_loop()
+        key = json.dumps([n_results, where, include], sort_keys=True, default=str)
+
+        batch = self._query_batches.get(key)
+        if batch is None:
+            batch = _QueryBatch(n_results=n_results, where=where, include=include)
+            batch.flush_handle = loop.call_later(
+                self.query_batch_window, self._flush_query_batch, key
+            )
+            self._query_batches[key] = batch
+
+        future: "asyncio.Future[Any]" = loop.create_future()
+        batch.embeddings.append(query_embedding)
+        batch.futures.append(future)
+
+        if len(batch.embeddings) >= self.query_batch_max_size:
+            self._flush_query_batch(key)
+
+        return await future
+
+    def _flush_query_batch(self, key: str) -> None:
+        """Send a pending micro-batch to the executor."""
+        batch = self._query_batches.pop(key, None)
+        if batch is None:
+            return
+
+        if batch.flush_handle is not None:
+            batch.flush_handle.cancel()
+
+        self._queries_in_flight += 1
+        task = asyncio.get_running_loop().create_task(self._run_query_batch(batch))
+        self._query_batch_tasks.add(task)
+        task.add_done_callback(self._query_batch_tasks.discard)
+
+    async def _run_query_batch(self, batch: _QueryBatch) -> None:
+        """Run one multi-embedding query and hand each caller its slice."""
+        try:
+            results = await asyncio.get_event_loop().run_in_executor(
+                self.executor,
+                self._search_batch_sync,
+                batch.embeddings,
+                batch.n_results,
+                batch.where,
+                batch.include,
+            )
+        except Exception as e:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._queries_in_flight -= 1
+
+        logger.debug(f"Executed micro-batch of {len(batch.futures)} queries")
+        for i, future in enumerate(batch.futures):
+            if not future.done():
+                future.set_result(
+                    {key: [value[i]] if value else value for key, value in results.items()}
+                )
+
+    def _search_batch_sync(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
+    ) -> Any:
+        """Perform a multi-embedding search synchronously (runs in thread pool)."""
+        if not self.collection:
+            raise ChromaDBCollectionError("Collection not initialized")
+
+        results = self.collection.query(
+            query_embeddings=[self._fit_embedding(embedding) for embedding in query_embeddings],
+            n_results=n_results,
+            where=where,
+            include=[*include, "distances"],
+        )
+        return {key: results.get(key) for key in ("ids", "documents", "metadatas", "distances")}
+
     def _process_search_results(self, results: Any) -> List[SearchResult]:
         """Process ChromaDB search results into SearchResult objects."""
         search_results: List[SearchResult] = []
@@ -350,10 +598,11 @@ class ChromaDBService:
             return search_results
 
         # ChromaDB returns nested lists for batch queries, take first query results
+        # Fields left out of the projection come back as None
         ids = results["ids"][0] if results["ids"] else []
-        documents = results["documents"][0] if results["documents"] else []
-        metadatas = results["metadatas"][0] if results["metadatas"] else []
-        distances = results["distances"][0] if results["distances"] else []
+        documents = results["documents"][0] if results.get("documents") else []
+        metadatas = results["metadatas"][0] if results.get("metadatas") else []
+        distances = results["distances"][0] if results.get("distances") else []
 
         for i, doc_id in enumerate(ids):
             # Convert distance to similarity score (lower distance = higher similarity)
@@ -403,7 +652,7 @@ class ChromaDBService:
             if content is not None:
                 update_data["documents"] = [content]
             if embedding is not None:
-                update_data["embeddings"] = [embedding]
+                update_data["embeddings"] = [self._fit_embedding(embedding)]
             if metadata is not None:
                 update_data["metadatas"] = [self._prepare_metadata(metadata)]
 
@@ -428,7 +677,19 @@ class ChromaDBService:
         if not self.collection:
             raise ChromaDBCollectionError("Collection not initialized")
 
-        self.collection.update(ids=[document_id], **update_data)
+        with self._write_lock:
+            self.collection.update(ids=[document_id], **update_data)
+
+            if self._migration_target is not None and self._migration_dimension:
+                if "embeddings" in update_data:
+                    update_data = {
+                        **update_data,
+                        "embeddings": [
+                            truncate_embedding(e, self._migration_dimension)
+                            for e in update_data["embeddings"]
+                        ],
+                    }
+                self._migration_target.update(ids=[document_id], **update_data)
 
     async def delete_document(self, document_id: str) -> bool:
         """
@@ -462,7 +723,99 @@ class ChromaDBService:
         if not self.collection:
             raise ChromaDBCollectionError("Collection not initialized")
 
-        self.collection.delete(ids=[document_id])
+        with self._write_lock:
+            self.collection.delete(ids=[document_id])
+
+            if self._migration_target is not None:
+                self._migration_target.delete(ids=[document_id])
+
+    async def delete_documents_batch(self, document_ids: List[str]) -> int:
+        """
+        Delete multiple documents in batch.
+
+        Unknown IDs are ignored.
+
+        Args:
+            document_ids: Document identifiers
+
+        Returns:
+            Number of IDs submitted for deletion
+
+        Raises:
+            ChromaDBOperationError: If batch deletion fails
+        """
+        await self._ensure_initialized()
+
+        if not document_ids:
+            return 0
+
+        batch_size = self.config.chromadb_max_batch_size
+
+        try:
+            for i in range(0, len(document_ids), batch_size):
+                await asyncio.get_event_loop().run_in_executor(
+                    self.executor, self._delete_batch_sync, document_ids[i : i + batch_size]
+                )
+
+            logger.debug(f"Deleted {len(document_ids)} documents in batch")
+            return len(document_ids)
+
+        except Exception as e:
+            logger.error(f"Batch document deletion failed: {e}")
+            raise ChromaDBOperationError(f"Batch deletion failed: {e}")
+
+    def _delete_batch_sync(self, document_ids: List[str]) -> None:
+        """Delete batch synchronously (runs in thread pool)."""
+        if not self.collection:
+            raise ChromaDBCollectionError("Collection not initialized")
+
+        with self._write_lock:
+            self.collection.delete(ids=document_ids)
+
+            if self._migration_target is not None:
+                self._migration_target.delete(ids=document_ids)
+
+    async def count_where(self, where: Dict[str, Any]) -> int:
+        """
+        Count documents matching a metadata filter.
+
+        Matching IDs are read page by page (chromadb_max_batch_size per page)
+        without fetching documents, metadata or embeddings.
+
+        Args:
+            where: ChromaDB metadata filter
+
+        Returns:
+            Number of matching documents
+
+        Raises:
+            ChromaDBOperationError: If counting fails
+        """
+        await self._ensure_initialized()
+
+        page_size = self.config.chromadb_max_batch_size
+        total = 0
+
+        try:
+            while True:
+                result = await asyncio.get_event_loop().run_in_executor(
+                    self.executor, self._get_where_sync, where, page_size, total
+                )
+                page_count = len(result["ids"])
+                total += page_count
+                if page_count < page_size:
+                    return total
+
+        except Exception as e:
+            logger.error(f"Failed to count documents: {e}")
+            raise ChromaDBOperationError(f"Count retrieval failed: {e}")
+
+    def _get_where_sync(self, where: Dict[str, Any], limit: int, offset: int) -> Any:
+        """Get IDs matching a filter synchronously (runs in thread pool)."""
+        if not self.collection:
+            raise ChromaDBCollectionError("Collection not initialized")
+
+        return self.collection.get(where=where, limit=limit, offset=offset, include=[])
 
     async def get_document_count(self) -> int:
         """
@@ -490,6 +843,111 @@ class ChromaDBService:
 
         return int(self.collection.count())
 
+    async def get_documents(
+        self, ids: List[str], include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """
+        Fetch documents by ID.
+
+        IDs are looked up directly (no vector query) in chunks of
+        chromadb_max_batch_size. Missing IDs are skipped.
+
+        Args:
+            ids: Document identifiers
+            include: Fields to fetch ("metadatas", "documents", "embeddings")
+
+        Returns:
+            Documents found, in ChromaDB order
+
+        Raises:
+            ChromaDBOperationError: If retrieval fails
+        """
+        await self._ensure_initialized()
+
+        if not ids:
+            return []
+
+        batch_size = self.config.chromadb_max_batch_size
+        documents: List[StoredDocument] = []
+
+        try:
+            for i in range(0, len(ids), batch_size):
+                result = await asyncio.get_event_loop().run_in_executor(
+                    self.executor, self._get_sync, ids[i : i + batch_size], None, None, include
+                )
+                documents.extend(self._process_get_results(result))
+
+            return documents
+
+        except Exception as e:
+            logger.error(f"Failed to get documents: {e}")
+            raise ChromaDBOperationError(f"Document retrieval failed: {e}")
+
+    async def list_documents(
+        self, limit: int, offset: int = 0, include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """
+        List one page of documents.
+
+        Args:
+            limit: Page size
+            offset: Number of documents to skip
+            include: Fields to fetch ("metadatas", "documents", "embeddings")
+
+        Returns:
+            Documents of the page (empty when past the end)
+
+        Raises:
+            ChromaDBOperationError: If retrieval fails
+        """
+        await self._ensure_initialized()
+
+        try:
+            result = await asyncio.get_event_loop().run_in_executor(
+                self.executor, self._get_sync, None, limit, offset, include
+            )
+            return self._process_get_results(result)
+
+        except Exception as e:
+            logger.error(f"Failed to list documents: {e}")
+            raise ChromaDBOperationError(f"Document listing failed: {e}")
+
+    def _get_sync(
+        self,
+        ids: Optional[List[str]],
+        limit: Optional[int],
+        offset: Optional[int],
+        include: Sequence[str],
+    ) -> Any:
+        """Get documents by ID or page synchronously (runs in thread pool)."""
+        if not self.collection:
+            raise ChromaDBCollectionError("Collection not initialized")
+
+        return self.collection.get(ids=ids, limit=limit, offset=offset, include=list(include))
+
+    def _process_get_results(self, results: Any) -> List[StoredDocument]:
+        """Convert ChromaDB get() results into StoredDocument objects."""
+        if not results or not results.get("ids"):
+            return []
+
+        ids = results["ids"]
+        metadatas = results.get("metadatas")
+        documents = results.get("documents")
+        embeddings = results.get("embeddings")
+
+        stored: List[StoredDocument] = []
+        for i, doc_id in enumerate(ids):
+            metadata_dict = metadatas[i] if metadatas is not None and metadatas[i] else {}
+            stored.append(
+                StoredDocument(
+                    document_id=doc_id,
+                    metadata=self._parse_metadata(metadata_dict),
+                    content=documents[i] if documents is not None else None,
+                    embedding=list(embeddings[i]) if embeddings is not None else None,
+                )
+            )
+        return stored
+
     async def reset_collection(self) -> bool:
         """
         Reset (delete all documents from) the collection.
@@ -519,65 +977,195 @@ class ChromaDBService:
         if not self.collection or not self.client:
             raise ChromaDBCollectionError("Collection not initialized")
 
-        # Delete and recreate collection
-        self.client.delete_collection(name=self.config.chromadb_collection_name)
-        self.collection = self.client.create_collection(
-            name=self.config.chromadb_collection_name,
-            metadata={"hnsw:space": self.config.chromadb_distance_metric},
+        # Delete and recreate collection, keeping its name and declared dimension
+        name = self.collection.name
+        metadata: Dict[str, Any] = {"hnsw:space": self.config.chromadb_distance_metric}
+        if self.embedding_dimension:
+            metadata["embedding_dimension"] = self.embedding_dimension
+
+        self.client.delete_collection(name=name)
+        self.collection = self.client.create_collection(name=name, metadata=metadata)
+
+    def _mirror_upsert_sync(
+        self,
+        ids: List[str],
+        contents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]],
+    ) -> None:
+        """Mirror writes into the migration target collection (runs in thread pool)."""
+        if self._migration_target is None or not self._migration_dimension:
+            return
+
+        self._migration_target.upsert(
+            ids=ids,
+            documents=contents,
+            embeddings=[truncate_embedding(e, self._migration_dimension) for e in embeddings],
+            metadatas=metadatas,
         )
 
-    def _prepare_metadata(self, metadata: Optional[DocumentMetadata]) -> Dict[str, Any]:
-        """Convert DocumentMetadata to ChromaDB metadata format."""
-        chroma_metadata = {}
-
-        if metadata:
-            # ChromaDB metadata values must be strings, numbers, or booleans
-            if metadata.title:
-                chroma_metadata["title"] = metadata.title
-            if metadata.source:
-                chroma_metadata["source"] = metadata.source
-            if metadata.created_at:
-                chroma_metadata["created_at"] = metadata.created_at
-            if metadata.updated_at:
-                chroma_metadata["updated_at"] = metadata.updated_at
-            if metadata.user_id:
-                chroma_metadata["user_id"] = metadata.user_id
-            if metadata.content_type:
-                chroma_metadata["content_type"] = metadata.content_type
-            if metadata.tags:
-                # Convert list to JSON string for storage
-                chroma_metadata["tags"] = json.dumps(metadata.tags)
-
-        # ChromaDB requires non-empty metadata, add default if empty
-        if not chroma_metadata:
-            chroma_metadata["_default"] = "true"
-
-        return chroma_metadata
-
-    def _parse_metadata(self, metadata_dict: Dict[str, Any]) -> DocumentMetadata:
-        """Convert ChromaDB metadata to DocumentMetadata object."""
-        tags = None
-        if "tags" in metadata_dict:
-            try:
-                tags = json.loads(metadata_dict["tags"])
-            except (json.JSONDecodeError, TypeError):
-                tags = None
-
-        return DocumentMetadata(
-            document_id=metadata_dict.get("document_id", ""),
-            title=metadata_dict.get("title"),
-            source=metadata_dict.get("source"),
-            created_at=metadata_dict.get("created_at"),
-            updated_at=metadata_dict.get("updated_at"),
-            user_id=metadata_dict.get("user_id"),
-            content_type=metadata_dict.get("content_type"),
-            tags=tags,
+    async def migrate_dimension(
+        self, target_dimension: int, batch_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Migrate the collection to a reduced embedding dimension without downtime.
+
+        Stored vectors are truncated and re-normalized into a new collection
+        (no re-embedding needed). Reads keep using the current collection and
+        writes are mirrored into the new one until the copy completes, then the
+        service switches over and the old collection is dropped.
+
+        Args:
+            target_dimension: Dimension of the new collection
+            batch_size: Documents copied per batch (defaults to chromadb_max_batch_size)
+
+        Returns:
+            Migration summary
+
+        Raises:
+            ChromaDBOperationError: If migration fails or is already running
+        """
+        await self._ensure_initialized()
+
+        if self._migration_target is not None:
+            raise ChromaDBOperationError("Dimension migration already in progress")
+        if target_dimension <= 0:
+            raise ChromaDBOperationError("Target dimension must be positive")
+
+        batch_size = batch_size or self.config.chromadb_max_batch_size
+        loop = asyncio.get_event_loop()
+        source = self.collection
+        source_name = source.name if source else ""
+        target_name = self._dimension_collection_name(target_dimension)
+        started_at = time.time()
+
+        if source_name == target_name:
+            return {"source": source_name, "target": target_name, "migrated": 0, "skipped": True}
+
+        try:
+            self._migration_status = {
+                "state": "running",
+                "target_dimension": target_dimension,
+                "migrated": 0,
+                "total": 0,
+            }
+            self._migration_target = await loop.run_in_executor(
+                self.executor, self._create_migration_target_sync, target_name, target_dimension
+            )
+            self._migration_dimension = target_dimension
+
+            # Snapshot IDs first so concurrent deletes cannot shift paging offsets
+            ids = await loop.run_in_executor(self.executor, self._get_all_ids_sync, source)
+            self._migration_status["total"] = len(ids)
+
+            migrated = 0
+            for i in range(0, len(ids), batch_size):
+                batch_ids = ids[i : i + batch_size]
+                migrated += await loop.run_in_executor(
+                    self.executor, self._copy_batch_sync, source, batch_ids, target_dimension
+                )
+                self._migration_status["migrated"] = migrated
+                # Let queued reads/writes run between batches
+                await asyncio.sleep(0)
+
+            # Switch over; run on the executor so no write is in flight
+            await loop.run_in_executor(self.executor, self._switch_collection_sync, source_name)
+
+            summary = {
+                "source": source_name,
+                "target": target_name,
+                "migrated": migrated,
+                "dimension": target_dimension,
+                "duration_seconds": time.time() - started_at,
+            }
+            self._migration_status = {"state": "completed", **summary}
+            logger.info(f"Dimension migration completed: {summary}")
+            return summary
+
+        except Exception as e:
+            self._migration_target = None
+            self._migration_dimension = None
+            self._migration_status = {"state": "failed", "error": str(e)}
+            logger.error(f"Dimension migration failed: {e}")
+            raise ChromaDBOperationError(f"Dimension migration failed: {e}")
+
+    def start_dimension_migration(self, target_dimension: int) -> "asyncio.Task[Dict[str, Any]]":
+        """
+        Start a dimension migration as a background task.
+
+        Progress is reported by get_migration_status().
+
+        Args:
+            target_dimension: Dimension of the new collection
+
+        Returns:
+            The running asyncio task
+
+        Raises:
+            ChromaDBOperationError: If a migration is already running
+        """
+        if self._migration_task is not None and not self._migration_task.done():
+            raise ChromaDBOperationError("Dimension migration already in progress")
+        if target_dimension <= 0:
+            raise ChromaDBOperationError("Target dimension must be positive")
+
+        self._migration_task = asyncio.create_task(self.migrate_dimension(target_dimension))
+        # Failures are recorded in the migration status
+        self._migration_task.add_done_callback(
+            lambda task: task.exception() if not task.cancelled() else None
+        )
+        return self._migration_task
+
+    def get_migration_status(self) -> Dict[str, Any]:
+        """Get the status of the current or last dimension migration."""
+        return dict(self._migration_status)
+
+    def _create_migration_target_sync(self, name: str, dimension: int) -> Any:
+        """Create the migration target collection (runs in thread pool)."""
+        if not self.client:
+            raise ChromaDBConnectionError("Client not initialized")
+
+        return self.client.get_or_create_collection(
+            name=name,
+            metadata={
+                "hnsw:space": self.config.chromadb_distance_metric,
+                "embedding_dimension": dimension,
+            },
         )
 
-    async def _ensure_initialized(self) -> None:
-        """Ensure service is initialized before operations."""
-        if not self._initialized:
-            await self.initialize()
+    def _get_all_ids_sync(self, collection: Any) -> List[str]:
+        """Get all document IDs of a collection (runs in thread pool)."""
+        return list(collection.get(include=[])["ids"])
+
+    def _copy_batch_sync(self, source: Any, ids: List[str], dimension: int) -> int:
+        """Copy a batch of documents with truncated embeddings (runs in thread pool)."""
+        if self._migration_target is None:
+            raise ChromaDBCollectionError("Migration target not initialized")
+
+        with self._write_lock:
+            batch = source.get(ids=ids, include=["embeddings", "documents", "metadatas"])
+            if not batch["ids"]:
+                return 0
+
+            self._migration_target.upsert(
+                ids=batch["ids"],
+                documents=batch["documents"],
+                embeddings=[truncate_embedding(list(e), dimension) for e in batch["embeddings"]],
+                metadatas=batch["metadatas"],
+            )
+            return len(batch["ids"])
+
+    def _switch_collection_sync(self, source_name: str) -> None:
+        """Switch to the migrated collection and drop the old one (runs in thread pool)."""
+        if not self.client or self._migration_target is None:
+            raise ChromaDBCollectionError("Migration target not initialized")
+
+        with self._write_lock:
+            self.collection = self._migration_target
+            self.embedding_dimension = self._migration_dimension
+            self._migration_target = None
+            self._migration_dimension = None
+        self.client.delete_collection(name=source_name)
 
     async def verify_persistence(self) -> bool:
         """
@@ -608,7 +1196,8 @@ class ChromaDBService:
             # 3. Test document operations
             test_doc_id = "persistence_test_doc"
             test_content = "This is a persistence test document"
-            test_embedding = [0.1] * 384  # Simple test embedding vector
+            # Simple test embedding vector
+            test_embedding = [0.1] * (self.embedding_dimension or 384)
             test_metadata = DocumentMetadata(
                 document_id=test_doc_id,
                 created_at=str(int(time.time())),
@@ -649,7 +1238,18 @@ class ChromaDBService:
 
     async def close(self) -> None:
         """Clean up resources."""
-        if self.executor:
+        for key in list(self._query_batches):
+            self._flush_query_batch(key)
+        if self._query_batch_tasks:
+            await asyncio.gather(*self._query_batch_tasks, return_exceptions=True)
+
+        # An interrupted migration keeps serving from the source collection on restart
+        if self._migration_task is not None and not self._migration_task.done():
+            self._migration_task.cancel()
+            await asyncio.gather(self._migration_task, return_exceptions=True)
+
+        # A shared executor is shut down by the service owning it
+        if self.executor and self._shared is None:
             self.executor.shutdown(wait=True)
         self.client = None
         self.collection = None
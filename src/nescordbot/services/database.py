@@ -402,6 +402,17 @@ class DatabaseService(IDataStore):
         """Get a context manager for the database connection."""
         return DatabaseConnectionManager(self)
 
+    def transaction(self):
+        """
+        Get a context manager running its statements as one isolated transaction.
+
+        The connection lock is held from the start of the transaction until
+        it is committed or rolled back, so statements of other coroutines
+        sharing the connection cannot interleave with it. The block is
+        committed when it exits normally and rolled back when it raises.
+        """
+        return DatabaseTransaction(self)
+
     async def search_notes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search knowledge notes using FTS5 or fallback to LIKE search."""
         if not self.is_initialized or self.connection is None:
@@ -616,6 +627,13 @@ class DatabaseConnectionProxy:
         async with self.db_service._lock:
             return await self.db_service.connection.execute(query, parameters or [])
 
+    async def executemany(self, query: str, parameters):
+        """Execute a query for each parameter set with proper locking."""
+        if self.db_service.connection is None:
+            raise RuntimeError("Database connection is None")
+        async with self.db_service._lock:
+            return await self.db_service.connection.executemany(query, parameters)
+
     async def executescript(self, script: str):
         """Execute a script with proper locking."""
         if self.db_service.connection is None:
@@ -629,3 +647,69 @@ class DatabaseConnectionProxy:
             raise RuntimeError("Database connection is None")
         async with self.db_service._lock:
             await self.db_service.connection.commit()
+
+    async def rollback(self):
+        """Roll back the current transaction with proper locking."""
+        if self.db_service.connection is None:
+            raise RuntimeError("Database connection is None")
+        async with self.db_service._lock:
+            await self.db_service.connection.rollback()
+
+
+class DatabaseTransaction:
+    """
+    Context manager holding the connection lock for a whole transaction.
+
+    The transaction is a savepoint: work another coroutine left uncommitted
+    on the shared connection is neither committed nor rolled back with it,
+    and becomes durable together with this block only if that work was
+    still pending.
+    """
+
+    SAVEPOINT = "nescordbot_transaction"
+
+    def __init__(self, db_service: DatabaseService):
+        self.db_service = db_service
+
+    async def __aenter__(self) -> "DatabaseTransactionProxy":
+        if not self.db_service.is_initialized or self.db_service.connection is None:
+            raise RuntimeError("Database not initialized")
+
+        await self.db_service._lock.acquire()
+        try:
+            await self.db_service.connection.execute(f"SAVEPOINT {self.SAVEPOINT}")
+        except BaseException:
+            self.db_service._lock.release()
+            raise
+        return DatabaseTransactionProxy(self.db_service)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        connection = self.db_service.connection
+        try:
+            if connection is not None:
+                if exc_type is not None:
+                    await connection.execute(f"ROLLBACK TO SAVEPOINT {self.SAVEPOINT}")
+                await connection.execute(f"RELEASE SAVEPOINT {self.SAVEPOINT}")
+        finally:
+            self.db_service._lock.release()
+
+
+class DatabaseTransactionProxy:
+    """Connection proxy used inside DatabaseTransaction, which already holds the lock."""
+
+    def __init__(self, db_service: DatabaseService):
+        self.db_service = db_service
+
+    @property
+    def _connection(self) -> aiosqlite.Connection:
+        if self.db_service.connection is None:
+            raise RuntimeError("Database connection is None")
+        return self.db_service.connection
+
+    async def execute(self, query: str, parameters=None):
+        """Execute a query in the transaction."""
+        return await self._connection.execute(query, parameters or [])
+
+    async def executemany(self, query: str, parameters):
+        """Execute a query for each parameter set in the transaction."""
+        return await self._connection.executemany(query, parameters)
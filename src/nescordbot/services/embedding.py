@@ -3,19 +3,51 @@ EmbeddingService for Gemini API integration.
 
 Provides text embedding functionality using Google's Gemini API
 with caching, batch processing, and error handling capabilities.
+Alternative backends (e.g. the local hashing provider) can be plugged
+in through the EmbeddingProvider interface.
 """
 
 import asyncio
 import hashlib
+import math
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, cast
 
 import google.generativeai as genai
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from ..config import BotConfig
 from ..logger import get_logger
+from .embedding_providers import EmbeddingProvider, LocalEmbeddingProvider
+
+if TYPE_CHECKING:
+    from .fallback_manager import FallbackManager
+
+
+def truncate_embedding(embedding: List[float], dimension: int) -> List[float]:
+    """
+    Truncate an embedding to its first ``dimension`` components and re-normalize.
+
+    Matryoshka-trained models such as text-embedding-004 keep most of their
+    quality in the leading components, so truncated vectors remain usable for
+    cosine similarity once re-normalized to unit length.
+
+    Args:
+        embedding: Source embedding vector
+        dimension: Target dimension
+
+    Returns:
+        Truncated, L2-normalized embedding (unchanged if already short enough)
+    """
+    if len(embedding) <= dimension:
+        return embedding
+
+    truncated = embedding[:dimension]
+    norm = math.sqrt(sum(value * value for value in truncated))
+    if norm == 0:
+        return truncated
+    return [value / norm for value in truncated]
 
 
 @dataclass
@@ -68,23 +100,41 @@ class EmbeddingService:
     - Batch processing support
     - Rate limiting and error handling
     - Usage monitoring
+    - Pluggable providers with local fallback under API pressure
     """
 
-    def __init__(self, config: BotConfig):
+    GEMINI_PROVIDER = "gemini"
+    GEMINI_MODEL_NAME = "models/text-embedding-004"
+    GEMINI_NATIVE_DIMENSION = 768
+    GEMINI_MAX_BATCH_SIZE = 100
+
+    def __init__(self, config: BotConfig, fallback_manager: Optional["FallbackManager"] = None):
         """Initialize EmbeddingService.
 
         Args:
             config: Bot configuration containing API settings
+            fallback_manager: Optional FallbackManager deciding when to switch
+                to the local provider
         """
         self.config = config
+        self.fallback_manager = fallback_manager
         self.logger = get_logger(__name__)
 
         # Gemini API setup
         self._setup_gemini_client()
 
         # Model configuration
-        self.model_name = "models/text-embedding-004"
         self.embedding_dimension = config.embedding_dimension
+        if self.embedding_dimension > self.GEMINI_NATIVE_DIMENSION:
+            self.logger.warning(
+                f"Embedding dimension {self.embedding_dimension} exceeds Gemini native "
+                f"dimension {self.GEMINI_NATIVE_DIMENSION}; vectors will not be truncated"
+            )
+
+        # Pluggable providers (Gemini is built in)
+        self._providers: Dict[str, EmbeddingProvider] = {}
+        self.register_provider(LocalEmbeddingProvider(self.embedding_dimension))
+        self.provider_name = config.embedding_provider
 
         # Caching
         self._cache: Dict[str, EmbeddingCacheEntry] = {}
@@ -118,8 +168,51 @@ class EmbeddingService:
             self.logger.error(f"Failed to setup Gemini client: {e}")
             self._gemini_available = False
 
+    def register_provider(self, provider: EmbeddingProvider) -> None:
+        """
+        Register an embedding provider.
+
+        Args:
+            provider: Provider instance, registered under its ``name``
+        """
+        if provider.dimension != self.embedding_dimension:
+            raise EmbeddingServiceError(
+                f"Provider {provider.name} dimension {provider.dimension} "
+                f"does not match configured dimension {self.embedding_dimension}"
+            )
+        self._providers[provider.name] = provider
+
+    @property
+    def active_provider(self) -> str:
+        """Name of the provider used for the next embedding request."""
+        if (
+            self.provider_name == self.GEMINI_PROVIDER
+            and self.fallback_manager is not None
+            and self.fallback_manager.should_use_local_embeddings()
+        ):
+            return LocalEmbeddingProvider.name
+        return self.provider_name
+
+    def _get_provider(self) -> Optional[EmbeddingProvider]:
+        """Get the active non-Gemini provider, if any."""
+        if self.active_provider == self.GEMINI_PROVIDER:
+            return None
+        provider = self._providers.get(self.active_provider)
+        if provider is None:
+            raise EmbeddingServiceError(f"Unknown embedding provider: {self.active_provider}")
+        return provider
+
+    @property
+    def model_name(self) -> str:
+        """Model name of the active provider (part of cache and sync hashes)."""
+        provider = self._get_provider()
+        return provider.model_name if provider else self.GEMINI_MODEL_NAME
+
     def is_available(self) -> bool:
-        """Check if Gemini API is available."""
+        """Check if the active embedding provider is available."""
+        provider = self._get_provider()
+        if provider is not None:
+            return provider.is_available()
         return self._gemini_available
 
     def _get_text_hash(self, text: str) -> str:
@@ -197,7 +290,7 @@ class EmbeddingService:
 
             # Generate embedding
             response = genai.embed_content(
-                model=self.model_name, content=text, task_type="RETRIEVAL_DOCUMENT"
+                model=self.GEMINI_MODEL_NAME, content=text, task_type="RETRIEVAL_DOCUMENT"
             )
 
             if not response.get("embedding"):
@@ -218,6 +311,54 @@ class EmbeddingService:
             else:
                 raise EmbeddingAPIError(f"Gemini API error: {e}")
 
+    async def _wait_for_rate_limit(self) -> None:
+        """Sleep until a request fits within the per-minute rate limit."""
+        while True:
+            current_time = time.time()
+            self._request_times = [t for t in self._request_times if current_time - t < 60]
+            if len(self._request_times) < self._requests_per_minute:
+                return
+
+            wait_time = 60 - (current_time - self._request_times[0])
+            self.logger.debug(f"Rate limit reached, waiting {wait_time:.1f}s for batch request")
+            await asyncio.sleep(max(wait_time, 0.1))
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        retry=retry_if_exception_type((EmbeddingAPIError,)),
+        reraise=True,
+    )
+    async def _generate_embeddings_batch_api(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in a single Gemini API request."""
+        try:
+            self._check_rate_limit()
+
+            response = genai.embed_content(
+                model=self.GEMINI_MODEL_NAME, content=texts, task_type="RETRIEVAL_DOCUMENT"
+            )
+
+            embeddings = response.get("embedding")
+            if not embeddings or len(embeddings) != len(texts):
+                raise EmbeddingAPIError(
+                    f"Expected {len(texts)} embeddings, received {len(embeddings or [])}"
+                )
+
+            # Update usage tracking
+            self._request_count += 1
+            self._token_usage += sum(len(text.split()) for text in texts)
+            self._last_request_time = time.time()
+
+            return embeddings  # type: ignore[no-any-return]
+
+        except EmbeddingAPIError:
+            raise
+        except Exception as e:
+            if "rate_limit" in str(e).lower() or "quota" in str(e).lower():
+                raise EmbeddingRateLimitError(f"Gemini API rate limit: {e}")
+            else:
+                raise EmbeddingAPIError(f"Gemini API error: {e}")
+
     async def generate_embedding(self, text: str) -> EmbeddingResult:
         """
         Generate embedding for a single text.
@@ -238,6 +379,7 @@ class EmbeddingService:
             raise EmbeddingServiceError("Gemini API not available")
 
         text = text.strip()
+        provider = self._get_provider()
 
         # Check cache first
         cached_result = self._get_cached_embedding(text)
@@ -249,7 +391,12 @@ class EmbeddingService:
             # Generate new embedding
             self.logger.debug(f"Generating embedding for text: {text[:50]}...")
 
-            embedding = await self._generate_embedding_api(text)
+            if provider is not None:
+                embedding = await provider.embed(text)
+            else:
+                embedding = await self._generate_embedding_api(text)
+                # Reduced-dimension mode: keep the leading Matryoshka components
+                embedding = truncate_embedding(embedding, self.embedding_dimension)
 
             # Cache result
             self._cache_embedding(text, embedding)
@@ -257,7 +404,7 @@ class EmbeddingService:
             result = EmbeddingResult(
                 text=text,
                 embedding=embedding,
-                model=self.model_name,
+                model=provider.model_name if provider else self.GEMINI_MODEL_NAME,
                 timestamp=time.time(),
                 cached=False,
             )
@@ -270,17 +417,21 @@ class EmbeddingService:
             raise
 
     async def generate_embeddings_batch(
-        self, texts: List[str], batch_size: int = 10
+        self, texts: List[str], batch_size: int = GEMINI_MAX_BATCH_SIZE
     ) -> List[EmbeddingResult]:
         """
         Generate embeddings for multiple texts in batches.
 
+        Cached texts are served from the cache; the rest are sent to Gemini
+        as batch requests of up to ``batch_size`` texts, waiting for the rate
+        limit between requests instead of failing.
+
         Args:
             texts: List of texts to embed
-            batch_size: Number of texts to process per batch
+            batch_size: Number of texts to send per API request
 
         Returns:
-            List of EmbeddingResult objects
+            List of EmbeddingResult objects in the same order as texts
         """
         if not texts:
             return []
@@ -288,36 +439,73 @@ class EmbeddingService:
         if not self.is_available():
             raise EmbeddingServiceError("Gemini API not available")
 
-        results = []
+        provider = self._get_provider()
+        if provider is not None:
+            # Local providers have no rate limit; embed everything in one call
+            texts = [text.strip() for text in texts]
+            embeddings = await provider.embed_batch(texts)
+            timestamp = time.time()
+            return [
+                EmbeddingResult(
+                    text=text, embedding=embedding, model=provider.model_name, timestamp=timestamp
+                )
+                for text, embedding in zip(texts, embeddings)
+            ]
 
-        # Process in batches to avoid rate limits
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i : i + batch_size]
+        texts = [text.strip() for text in texts]
+        if not all(texts):
+            raise EmbeddingServiceError("Empty text provided")
 
-            self.logger.debug(f"Processing batch {i//batch_size + 1}: {len(batch)} texts")
+        results: List[Optional[EmbeddingResult]] = [None] * len(texts)
+        missing: List[int] = []
+        for i, text in enumerate(texts):
+            cached_result = self._get_cached_embedding(text)
+            if cached_result:
+                results[i] = cached_result
+            else:
+                missing.append(i)
 
-            # Process batch items concurrently but with limit
-            batch_tasks = [self.generate_embedding(text) for text in batch]
+        batch_size = max(1, min(batch_size, self.GEMINI_MAX_BATCH_SIZE))
 
-            try:
-                batch_results = await asyncio.gather(*batch_tasks)
-                results.extend(batch_results)
+        # One API request per batch of uncached texts
+        for start in range(0, len(missing), batch_size):
+            indices = missing[start : start + batch_size]
 
-                # Small delay between batches
-                if i + batch_size < len(texts):
-                    await asyncio.sleep(1.0)
+            self.logger.debug(f"Processing batch {start // batch_size + 1}: {len(indices)} texts")
 
+            try:
+                await self._wait_for_rate_limit()
+                embeddings = await self._generate_embeddings_batch_api([texts[i] for i in indices])
             except Exception as e:
-                self.logger.error(f"Batch processing failed at batch {i//batch_size + 1}: {e}")
+                self.logger.error(
+                    f"Batch processing failed at batch {start // batch_size + 1}: {e}"
+                )
                 raise
 
-        self.logger.info(f"Generated embeddings for {len(results)} texts")
-        return results
+            timestamp = time.time()
+            for i, embedding in zip(indices, embeddings):
+                # Reduced-dimension mode: keep the leading Matryoshka components
+                embedding = truncate_embedding(embedding, self.embedding_dimension)
+                self._cache_embedding(texts[i], embedding)
+                results[i] = EmbeddingResult(
+                    text=texts[i],
+                    embedding=embedding,
+                    model=self.GEMINI_MODEL_NAME,
+                    timestamp=timestamp,
+                )
+
+        self.logger.info(
+            f"Generated embeddings for {len(texts)} texts "
+            f"({len(texts) - len(missing)} cached, {len(missing)} requested)"
+        )
+        return cast(List[EmbeddingResult], results)
 
     def get_usage_stats(self) -> Dict[str, Any]:
         """Get usage statistics."""
         return {
             "api_available": self.is_available(),
+            "provider": self.active_provider,
+            "model": self.model_name,
             "request_count": self._request_count,
             "token_usage": self._token_usage,
             "cache_size": len(self._cache),
@@ -327,6 +515,15 @@ class EmbeddingService:
             "current_rpm": len([t for t in self._request_times if time.time() - t < 60]),
         }
 
+    def get_rate_limit_headroom(self) -> float:
+        """Fraction of the per-minute request budget that is still unused."""
+        if self._requests_per_minute <= 0:
+            return 1.0
+
+        current_time = time.time()
+        recent = sum(1 for t in self._request_times if current_time - t < 60)
+        return max(0.0, 1.0 - recent / self._requests_per_minute)
+
     def _calculate_cache_hit_ratio(self) -> float:
         """Calculate cache hit ratio."""
         total_accesses = sum(entry.access_count for entry in self._cache.values())
@@ -0,0 +1,183 @@
+"""
+Embedding providers for EmbeddingService.
+
+Defines the pluggable EmbeddingProvider interface and a deterministic
+local CPU backend that needs no API key, for offline operation, CI and
+load testing of the sync/search pipeline.
+"""
+
+import asyncio
+import hashlib
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, List
+
+import numpy as np
+
+
+class EmbeddingProvider(ABC):
+    """
+    Interface for embedding backends used by EmbeddingService.
+
+    Providers must return vectors of ``dimension`` floats and must be
+    deterministic for a given ``model_name`` so that sync change detection
+    (which hashes content together with the model name) stays valid.
+    """
+
+    name: str = "base"
+
+    @property
+    @abstractmethod
+    def model_name(self) -> str:
+        """Identifier of the model that produced the vectors."""
+
+    @property
+    @abstractmethod
+    def dimension(self) -> int:
+        """Length of the vectors produced by this provider."""
+
+    @abstractmethod
+    def is_available(self) -> bool:
+        """Check if the provider can currently produce embeddings."""
+
+    @abstractmethod
+    async def embed(self, text: str) -> List[float]:
+        """
+        Generate an embedding for a single text.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for multiple texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        return [await self.embed(text) for text in texts]
+
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Deterministic CPU embedding backend based on feature hashing.
+
+    Word unigrams/bigrams and character n-grams are hashed into a signed
+    vector of the configured dimension (a random projection of the sparse
+    TF vector) and L2-normalised. Character n-grams keep the backend useful
+    for Japanese text, which has no whitespace word boundaries.
+
+    Vectors are only comparable with other vectors from this provider; they
+    live in a different space from Gemini embeddings.
+    """
+
+    name = "local"
+    VERSION = "v1"
+
+    _WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(
+        self,
+        dimension: int,
+        char_ngram_range: tuple = (2, 4),
+        word_weight: float = 1.0,
+        char_weight: float = 0.5,
+    ):
+        """Initialize LocalEmbeddingProvider.
+
+        Args:
+            dimension: Output vector dimension
+            char_ngram_range: Inclusive (min, max) character n-gram lengths
+            word_weight: Weight applied to word features
+            char_weight: Weight applied to character n-gram features
+        """
+        if dimension <= 0:
+            raise ValueError("Embedding dimension must be positive")
+
+        self._dimension = dimension
+        self.char_ngram_range = char_ngram_range
+        self.word_weight = word_weight
+        self.char_weight = char_weight
+
+    @property
+    def model_name(self) -> str:
+        """Identifier of the local hashing model."""
+        return f"local-hash-ngram-{self.VERSION}-{self._dimension}"
+
+    @property
+    def dimension(self) -> int:
+        """Length of the produced vectors."""
+        return self._dimension
+
+    def is_available(self) -> bool:
+        """The local backend is always available."""
+        return True
+
+    def _extract_features(self, text: str) -> Dict[str, float]:
+        """Extract weighted features from text."""
+        normalized = " ".join(text.lower().split())
+        features: Dict[str, float] = defaultdict(float)
+
+        words = self._WORD_PATTERN.findall(normalized)
+        for word in words:
+            features[f"w:{word}"] += self.word_weight
+        for first, second in zip(words, words[1:]):
+            features[f"b:{first} {second}"] += self.word_weight
+
+        min_n, max_n = self.char_ngram_range
+        for n in range(min_n, max_n + 1):
+            for i in range(len(normalized) - n + 1):
+                features[f"c:{normalized[i : i + n]}"] += self.char_weight
+
+        return features
+
+    def embed_sync(self, text: str) -> List[float]:
+        """
+        Generate an embedding synchronously.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            L2-normalised embedding vector
+        """
+        features = self._extract_features(text)
+        vector = np.zeros(self._dimension, dtype=np.float64)
+
+        if features:
+            indices = np.empty(len(features), dtype=np.int64)
+            values = np.empty(len(features), dtype=np.float64)
+            for i, (feature, weight) in enumerate(features.items()):
+                digest = int.from_bytes(
+                    hashlib.blake2b(feature.encode(), digest_size=8).digest(), "big"
+                )
+                indices[i] = digest % self._dimension
+                sign = 1.0 if digest >> 63 else -1.0
+                # Sublinear TF weighting
+                values[i] = sign * math.log1p(weight)
+            np.add.at(vector, indices, values)
+
+        norm = float(np.linalg.norm(vector))
+        if norm == 0:
+            # Cosine distance is undefined for zero vectors
+            vector[:] = 1.0
+            norm = math.sqrt(self._dimension)
+
+        return (vector / norm).tolist()  # type: ignore[no-any-return]
+
+    async def embed(self, text: str) -> List[float]:
+        """Generate an embedding for a single text."""
+        return self.embed_sync(text)
+
+    async def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for multiple texts off the event loop."""
+        return await asyncio.to_thread(lambda: [self.embed_sync(text) for text in texts])
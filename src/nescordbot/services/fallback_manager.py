@@ -175,6 +175,16 @@ class FallbackManager:
         """指定されたサービスが利用可能かチェック."""
         return self._service_states.get(service_name, False)
 
+    def should_use_local_embeddings(self) -> bool:
+        """ローカル埋め込みプロバイダーへ切り替えるべきか判定.
+
+        CRITICAL以上のレベルで、設定で有効化されている場合のみ切り替える。
+        ローカルのベクトルはGeminiと別空間のため、既定では無効。
+        """
+        if not self.config.embedding_local_fallback:
+            return False
+        return self._current_level in [FallbackLevel.CRITICAL, FallbackLevel.EMERGENCY]
+
     def get_current_level(self) -> FallbackLevel:
         """現在のフォールバックレベルを取得."""
         return self._current_level
@@ -12,17 +12,22 @@ import re
 import time
 import uuid
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional, cast
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, cast
 
 from ..config import BotConfig
-from .chromadb_service import ChromaDBService
 from .database import DatabaseService
 from .embedding import EmbeddingService
 from .link_graph_builder import LinkCluster, LinkGraphBuilder
 from .link_suggestor import LinkSuggestor
 from .link_validator import LinkValidationResult, LinkValidator
+from .llm_cache import LLMCache, content_digest
+from .note_history import DEFAULT_SNAPSHOT_INTERVAL, NoteHistoryStore
+from .note_neighbors import NoteNeighborIndex
 from .obsidian_github import ObsidianGitHubService
 from .sync_manager import SyncManager
+from .sync_outbox import OutboxEntry, SyncOutbox
+from .tag_vocabulary import TagVocabulary
+from .vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
@@ -45,15 +50,26 @@ class KnowledgeManager:
     - ObsidianGitHub integration for external persistence
     """
 
+    _NOTE_COLUMNS = (
+        "id, title, content, tags, source_type, source_id, "
+        "user_id, channel_id, guild_id, created_at, updated_at, vector_updated_at"
+    )
+
+    # Bump the prompt version when tag prompts change so cached responses are not reused
+    _TAG_MODEL = "gemini-1.5-flash"
+    _TAG_PROMPT_VERSION = "1"
+
     def __init__(
         self,
         config: BotConfig,
         database_service: DatabaseService,
-        chromadb_service: ChromaDBService,
+        chromadb_service: VectorStore,
         embedding_service: EmbeddingService,
         sync_manager: SyncManager,
         obsidian_github_service: Optional[ObsidianGitHubService],
         fallback_manager: Optional[Any] = None,
+        sync_outbox: Optional[SyncOutbox] = None,
+        llm_cache: Optional[LLMCache] = None,
     ) -> None:
         """
         Initialize KnowledgeManager.
@@ -66,6 +82,9 @@ class KnowledgeManager:
             sync_manager: Synchronization manager for data consistency
             obsidian_github_service: Optional ObsidianGitHub service for external storage
             fallback_manager: Optional fallback manager for API limiting
+            sync_outbox: Optional outbox; when set, external sync runs in the
+                background worker instead of inline
+            llm_cache: Optional persistent cache of Gemini tag suggestion responses
         """
         self.config = config
         self.db = database_service
@@ -74,14 +93,45 @@ class KnowledgeManager:
         self.sync_manager = sync_manager
         self.obsidian_github = obsidian_github_service
         self.fallback_manager = fallback_manager
+        self.sync_outbox = sync_outbox
+        self.llm_cache = llm_cache
         self._initialized = False
 
         # Link and tag extraction patterns
         self.link_pattern = re.compile(r"\[\[([^\]]+)\]\]")
         self.tag_pattern = re.compile(r"#(\w+)")
 
+        # Title -> note ID map used to resolve [[links]] without per-link queries
+        self._title_index: Dict[str, str] = {}
+
+        # Case-insensitive tags in use with usage counts, kept current on note writes
+        self.tag_vocabulary = TagVocabulary()
+
+        # Edit history stored as a compressed reverse-delta chain
+        self.note_history = NoteHistoryStore(
+            getattr(config, "note_history_snapshot_interval", DEFAULT_SNAPSHOT_INTERVAL)
+        )
+
+        # Tag suggestion prompts in flight during auto-categorization
+        self.auto_tag_concurrency = getattr(config, "auto_tag_concurrency", 4)
+        self._tag_model: Optional[Any] = None
+
+        # Related notes precomputed from embeddings, refreshed by a background worker
+        self.note_neighbors = NoteNeighborIndex(config, database_service, chromadb_service)
+
         # Initialize link management services
-        self.link_suggestor = LinkSuggestor(database_service)
+        self.link_suggestor = LinkSuggestor(
+            database_service,
+            shortlist_size=getattr(config, "link_suggestion_shortlist_size", 100),
+            request_index_limit=getattr(config, "link_index_request_limit", 50),
+            index_interval=getattr(config, "link_index_interval", 60.0),
+            vector_store=chromadb_service,
+            neighbor_index=self.note_neighbors,
+        )
+        # "vector" ranks embedding neighbours blended with lexical similarity,
+        # "lexical" uses the keyword index only
+        self.link_suggestion_method = getattr(config, "link_suggestion_method", "vector")
+        self.link_suggestion_lexical_weight = getattr(config, "link_suggestion_lexical_weight", 0.3)
         self.link_validator = LinkValidator(database_service)
         self.link_graph_builder = LinkGraphBuilder(database_service)
 
@@ -109,6 +159,14 @@ class KnowledgeManager:
                 if not await cursor.fetchone():
                     raise KnowledgeManagerError("note_links table not found")
 
+                # Load the title index; the first note created with a title wins
+                cursor = await conn.execute(
+                    "SELECT id, title FROM knowledge_notes ORDER BY rowid DESC"
+                )
+                self._title_index = {row[1]: row[0] for row in await cursor.fetchall()}
+
+            await self.tag_vocabulary.load(self.db)
+
             # Initialize link management services
             await self.link_suggestor.initialize()
             await self.link_validator.initialize()
@@ -191,14 +249,18 @@ class KnowledgeManager:
                         now,
                     ),
                 )
+                await self._backfill_links(conn, note_id, title)
+                queued = await self._enqueue_sync(conn, note_id, SyncOutbox.UPSERT)
                 await conn.commit()
+            self._title_index.setdefault(title, note_id)
+            self.tag_vocabulary.add(all_tags, now)
 
             # Process links
             if extracted_links:
                 await self.update_links(note_id, content)
 
             # Sync with external services
-            await self._sync_note_to_services(note_id)
+            await self._dispatch_sync(note_id, queued)
 
             logger.info(f"Created note: {note_id} - {title}")
             return note_id
@@ -278,10 +340,12 @@ class KnowledgeManager:
                 return True  # Nothing to update
 
             # Update updated_at timestamp
+            now = datetime.now().isoformat()
             update_fields.append("updated_at = ?")
-            update_values.append(datetime.now().isoformat())
+            update_values.append(now)
 
-            async with self.db.get_connection() as conn:
+            # One transaction, so concurrent edits of a note get consecutive history versions
+            async with self.db.transaction() as conn:
                 # Execute update
                 update_sql = f"UPDATE knowledge_notes SET {', '.join(update_fields)} WHERE id = ?"
                 update_values.append(note_id)
@@ -301,10 +365,19 @@ class KnowledgeManager:
                         user_id=user_id,
                     )
 
-                await conn.commit()
+                if title is not None and title != title_before:
+                    await self._backfill_links(conn, note_id, title)
+
+                queued = await self._enqueue_sync(conn, note_id, SyncOutbox.UPSERT)
+
+            if title is not None and title != title_before:
+                self._unindex_title(title_before, note_id)
+                self._title_index.setdefault(title, note_id)
+            if tags is not None:
+                self.tag_vocabulary.replace(tags_before, final_tags, now)
 
             # Sync with external services
-            await self._sync_note_to_services(note_id)
+            await self._dispatch_sync(note_id, queued)
 
             logger.info(f"Updated note: {note_id}")
             return True
@@ -326,23 +399,12 @@ class KnowledgeManager:
         user_id: str,
     ) -> None:
         """Save edit history record."""
-        await conn.execute(
-            """
-            INSERT INTO note_history (
-                note_id, title_before, content_before, tags_before,
-                title_after, content_after, tags_after, user_id, edit_type
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'update')
-        """,
-            (
-                note_id,
-                title_before,
-                content_before,
-                json.dumps(tags_before, ensure_ascii=False),
-                title_after,
-                content_after,
-                json.dumps(tags_after, ensure_ascii=False),
-                user_id,
-            ),
+        await self.note_history.append(
+            conn,
+            note_id,
+            before={"title": title_before, "content": content_before, "tags": tags_before},
+            after={"title": title_after, "content": content_after, "tags": tags_after},
+            user_id=user_id,
         )
 
     async def get_note_history(self, note_id: str, limit: int = 10) -> List[Dict[str, Any]]:
@@ -354,7 +416,7 @@ class KnowledgeManager:
             limit: Maximum number of history records to return
 
         Returns:
-            List of history records with diff information
+            List of history records with diff information, newest first
 
         Raises:
             KnowledgeManagerError: If history retrieval fails
@@ -364,73 +426,84 @@ class KnowledgeManager:
 
         try:
             async with self.db.get_connection() as conn:
-                cursor = await conn.execute(
-                    """
-                    SELECT id, title_before, content_before, tags_before,
-                           title_after, content_after, tags_after,
-                           user_id, edit_type, timestamp
-                    FROM note_history
-                    WHERE note_id = ?
-                    ORDER BY timestamp DESC, id DESC
-                    LIMIT ?
-                """,
-                    (note_id, limit),
+                edits = await self.note_history.get_recent(conn, note_id, limit)
+
+            history = []
+            for edit in edits:
+                before, after = edit["before"], edit["after"]
+
+                # Generate diff information
+                diffs = self._generate_edit_diff(
+                    before["title"],
+                    before["content"],
+                    before["tags"],
+                    after["title"],
+                    after["content"],
+                    after["tags"],
                 )
 
-                rows = await cursor.fetchall()
-                await cursor.close()
-
-                history = []
-                for row in rows:
-                    (
-                        history_id,
-                        title_before,
-                        content_before,
-                        tags_before,
-                        title_after,
-                        content_after,
-                        tags_after,
-                        user_id,
-                        edit_type,
-                        timestamp,
-                    ) = row
-
-                    # Parse tags from JSON
-                    tags_before_parsed = json.loads(tags_before) if tags_before else []
-                    tags_after_parsed = json.loads(tags_after) if tags_after else []
-
-                    # Generate diff information
-                    diffs = self._generate_edit_diff(
-                        title_before,
-                        content_before,
-                        tags_before_parsed,
-                        title_after,
-                        content_after,
-                        tags_after_parsed,
-                    )
-
-                    history.append(
-                        {
-                            "id": history_id,
-                            "user_id": user_id,
-                            "edit_type": edit_type,
-                            "timestamp": timestamp,
-                            "changes": diffs,
-                            "title_before": title_before,
-                            "content_before": content_before,
-                            "tags_before": tags_before_parsed,
-                            "title_after": title_after,
-                            "content_after": content_after,
-                            "tags_after": tags_after_parsed,
-                        }
-                    )
+                history.append(
+                    {
+                        "id": edit["id"],
+                        "version": edit["version"],
+                        "user_id": edit["user_id"],
+                        "edit_type": edit["edit_type"],
+                        "timestamp": edit["timestamp"],
+                        "changes": diffs,
+                        "title_before": before["title"],
+                        "content_before": before["content"],
+                        "tags_before": before["tags"],
+                        "title_after": after["title"],
+                        "content_after": after["content"],
+                        "tags_after": after["tags"],
+                    }
+                )
 
-                return history
+            return history
 
         except Exception as e:
             logger.error(f"Failed to get note history for {note_id}: {e}")
             raise KnowledgeManagerError(f"Failed to get note history: {e}")
 
+    async def get_note_version(self, note_id: str, version: int) -> Optional[Dict[str, Any]]:
+        """
+        Rebuild a past version of a note from its edit history.
+
+        Args:
+            note_id: Note ID
+            version: 0 for the note before its first tracked edit, N for the
+                note after its N-th tracked edit
+
+        Returns:
+            Dictionary with version, title, content and tags, or None if the
+            version does not exist
+
+        Raises:
+            KnowledgeManagerError: If history retrieval fails
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        try:
+            async with self.db.get_connection() as conn:
+                state = await self.note_history.get_version(conn, note_id, version)
+
+            if state is None and version == 0:
+                # A note without tracked edits is still at version 0
+                note = await self.get_note(note_id)
+                if note is not None:
+                    state = {
+                        "title": note["title"],
+                        "content": note["content"],
+                        "tags": note["tags"],
+                    }
+
+            return {"version": version, **state} if state is not None else None
+
+        except Exception as e:
+            logger.error(f"Failed to get version {version} of note {note_id}: {e}")
+            raise KnowledgeManagerError(f"Failed to get note version: {e}")
+
     def _generate_edit_diff(
         self,
         title_before: str,
@@ -514,6 +587,19 @@ class KnowledgeManager:
                 return False
 
             async with self.db.get_connection() as conn:
+                # Incoming links become unresolved until a note with this title appears
+                await conn.execute(
+                    """
+                    INSERT OR IGNORE INTO unresolved_links (from_note_id, target_title, created_at)
+                    SELECT from_note_id, ?, ? FROM note_links
+                    WHERE to_note_id = ? AND from_note_id != ?
+                    """,
+                    (existing_note["title"], datetime.now().isoformat(), note_id, note_id),
+                )
+                await conn.execute(
+                    "DELETE FROM unresolved_links WHERE from_note_id = ?", (note_id,)
+                )
+
                 # Delete from note_links (both directions)
                 await conn.execute(
                     "DELETE FROM note_links WHERE from_note_id = ? OR to_note_id = ?",
@@ -523,13 +609,19 @@ class KnowledgeManager:
                 # Delete from knowledge_notes
                 await conn.execute("DELETE FROM knowledge_notes WHERE id = ?", (note_id,))
 
+                queued = await self._enqueue_sync(conn, note_id, SyncOutbox.DELETE)
                 await conn.commit()
+            self._unindex_title(existing_note["title"], note_id)
+            self.tag_vocabulary.remove(existing_note["tags"])
 
             # Remove from ChromaDB
-            try:
-                await self.chromadb.delete_document(note_id)
-            except Exception as e:
-                logger.warning(f"Failed to delete from ChromaDB: {e}")
+            if queued and self.sync_outbox is not None:
+                self.sync_outbox.notify()
+            else:
+                try:
+                    await self.sync_manager.delete_note_from_chromadb(note_id)
+                except Exception as e:
+                    logger.warning(f"Failed to delete from ChromaDB: {e}")
 
             logger.info(f"Deleted note: {note_id}")
             return True
@@ -555,12 +647,7 @@ class KnowledgeManager:
             await self.initialize()
 
         try:
-            query_sql = """
-            SELECT id, title, content, tags, source_type, source_id,
-                   user_id, channel_id, guild_id, created_at, updated_at, vector_updated_at
-            FROM knowledge_notes
-            WHERE id = ?
-            """
+            query_sql = f"SELECT {self._NOTE_COLUMNS} FROM knowledge_notes WHERE id = ?"
 
             async with self.db.get_connection() as conn:
                 cursor = await conn.execute(query_sql, (note_id,))
@@ -569,32 +656,40 @@ class KnowledgeManager:
             if not row:
                 return None
 
-            # Parse tags JSON
-            tags = json.loads(row[3]) if row[3] else []
-
-            return {
-                "id": row[0],
-                "title": row[1],
-                "content": row[2],
-                "tags": tags,
-                "source_type": row[4],
-                "source_id": row[5],
-                "user_id": row[6],
-                "channel_id": row[7],
-                "guild_id": row[8],
-                "created_at": row[9],
-                "updated_at": row[10],
-                "vector_updated_at": row[11],
-            }
+            return self._row_to_note(row)
 
         except Exception as e:
             logger.error(f"Failed to get note {note_id}: {e}")
             raise KnowledgeManagerError(f"Failed to retrieve note: {e}")
 
+    @staticmethod
+    def _row_to_note(row: Any) -> Dict[str, Any]:
+        """Convert a knowledge_notes row selected with _NOTE_COLUMNS to a note dict."""
+        # Parse tags JSON
+        tags = json.loads(row[3]) if row[3] else []
+
+        return {
+            "id": row[0],
+            "title": row[1],
+            "content": row[2],
+            "tags": tags,
+            "source_type": row[4],
+            "source_id": row[5],
+            "user_id": row[6],
+            "channel_id": row[7],
+            "guild_id": row[8],
+            "created_at": row[9],
+            "updated_at": row[10],
+            "vector_updated_at": row[11],
+        }
+
     def extract_links(self, content: str) -> List[str]:
         """
         Extract [[note_name]] pattern links from content.
 
+        Obsidian aliases and heading anchors ([[note|alias]], [[note#heading]])
+        resolve to the note name.
+
         Args:
             content: Text content to extract links from
 
@@ -602,19 +697,22 @@ class KnowledgeManager:
             List of extracted link names
         """
         matches = self.link_pattern.findall(content)
-        return [match.strip() for match in matches if match.strip()]
+        names = [re.split(r"[|#]", match, maxsplit=1)[0].strip() for match in matches]
+        return [name for name in names if name]
 
     def extract_tags(self, content: str) -> List[str]:
         """
         Extract #tag pattern tags from content.
 
+        Heading anchors inside [[links]] (``[[Note#Heading]]``) are not tags.
+
         Args:
             content: Text content to extract tags from
 
         Returns:
             List of extracted tag names
         """
-        matches = self.tag_pattern.findall(content)
+        matches = self.tag_pattern.findall(self.link_pattern.sub(" ", content))
         return [match.lower() for match in matches if match]
 
     async def suggest_tags_for_content(
@@ -646,7 +744,7 @@ class KnowledgeManager:
             ):
                 logger.info("Tag suggestion service unavailable due to API limits, checking cache")
                 # Try to get cached suggestions
-                cache_key = f"{hash(content + title)}"
+                cache_key = content_digest(content, title)
                 cached_suggestions = await self.fallback_manager.get_cached_data(
                     "tag_suggestions", cache_key
                 )
@@ -663,22 +761,16 @@ class KnowledgeManager:
             # Get existing tags from database for context
             all_existing_tags = await self._get_all_existing_tags()
 
-            # Call Gemini for content analysis
-            import google.generativeai as genai
-
-            genai.configure(api_key=self.config.gemini_api_key)
-            model = genai.GenerativeModel("gemini-1.5-flash")
-
             # Create prompt for tag suggestion
             prompt = self._create_tag_suggestion_prompt(
                 analysis_text, all_existing_tags, existing_tags or [], max_suggestions
             )
 
-            # Generate suggestions
-            response = await model.generate_content_async(prompt)
+            # Generate suggestions with Gemini, or reuse the response to the same prompt
+            response_text = await self._generate_tag_response(prompt)
 
             # Parse response
-            suggestions = self._parse_tag_suggestions(response.text)
+            suggestions = self._parse_tag_suggestions(response_text)
 
             # Filter and score suggestions
             filtered_suggestions = self._filter_and_score_suggestions(
@@ -689,7 +781,7 @@ class KnowledgeManager:
 
             # Cache the suggestions for fallback
             if self.fallback_manager:
-                cache_key = f"{hash(content + title)}"
+                cache_key = content_digest(content, title)
                 await self.fallback_manager.cache_data(
                     "tag_suggestions", cache_key, final_suggestions
                 )
@@ -700,7 +792,7 @@ class KnowledgeManager:
             logger.error(f"Error in tag suggestion: {str(e)}")
             # Try fallback cache on error
             if self.fallback_manager:
-                cache_key = f"{hash(content + title)}"
+                cache_key = content_digest(content, title)
                 cached_suggestions = await self.fallback_manager.get_cached_data(
                     "tag_suggestions", cache_key
                 )
@@ -709,6 +801,36 @@ class KnowledgeManager:
                     return cast(List[Dict[str, Any]], cached_suggestions[:max_suggestions])
             return []
 
+    def _get_tag_model(self) -> Any:
+        """Return the Gemini model used for tag suggestions, created on first use."""
+        if self._tag_model is None:
+            import google.generativeai as genai
+
+            genai.configure(api_key=self.config.gemini_api_key)
+            self._tag_model = genai.GenerativeModel(self._TAG_MODEL)
+        return self._tag_model
+
+    async def _generate_tag_response(self, prompt: str, json_output: bool = False) -> str:
+        """Gemini response text for a tag prompt, served from the LLM cache when possible."""
+
+        async def generate() -> str:
+            if json_output:
+                response = await self._get_tag_model().generate_content_async(
+                    prompt, generation_config={"response_mime_type": "application/json"}
+                )
+            else:
+                response = await self._get_tag_model().generate_content_async(prompt)
+            return str(response.text)
+
+        if self.llm_cache is None:
+            return await generate()
+        return cast(
+            str,
+            await self.llm_cache.get_or_compute(
+                "gemini", self._TAG_MODEL, self._TAG_PROMPT_VERSION, prompt, generate
+            ),
+        )
+
     async def auto_categorize_notes(
         self,
         note_ids: Optional[List[str]] = None,
@@ -718,26 +840,33 @@ class KnowledgeManager:
         """
         Auto-categorize notes using semantic analysis.
 
+        Notes are streamed from the database a page at a time. Each page is
+        split into prompts of ``batch_size`` notes that run concurrently
+        (``auto_tag_concurrency`` prompts per page), and the resulting tag
+        updates of the page are written in one transaction.
+
         Args:
             note_ids: Specific note IDs to categorize (None for all)
-            batch_size: Number of notes to process at once
+            batch_size: Number of notes packed into one suggestion prompt
             progress_callback: Optional progress callback
 
         Returns:
             Dictionary with categorization results
         """
+        if not self._initialized:
+            await self.initialize()
+
         try:
-            # Get notes to categorize
             if note_ids:
-                notes = []
-                for note_id in note_ids:
-                    note = await self.get_note(note_id)
-                    if note:
-                        notes.append(note)
+                note_ids = list(dict.fromkeys(note_ids))
+                total = len(note_ids)
             else:
-                notes = await self.list_notes(limit=1000)  # Use large limit instead of None
+                async with self.db.get_connection() as conn:
+                    cursor = await conn.execute("SELECT COUNT(*) FROM knowledge_notes")
+                    row = await cursor.fetchone()
+                total = row[0] if row else 0
 
-            if not notes:
+            if not total:
                 return {"processed": 0, "categorized": 0, "errors": []}
 
             categorization_results: Dict[str, Any] = {
@@ -747,49 +876,85 @@ class KnowledgeManager:
                 "categories": {},
             }
 
-            # Process notes in batches
-            for i in range(0, len(notes), batch_size):
-                batch = notes[i : i + batch_size]
-
-                for note in batch:
-                    try:
-                        # Suggest categories for this note
-                        suggestions = await self.suggest_tags_for_content(
-                            content=note["content"],
-                            title=note["title"],
-                            existing_tags=note.get("tags", []),
-                            max_suggestions=3,
-                        )
-
-                        if suggestions:
-                            # Apply high-confidence suggestions automatically
-                            high_confidence_tags = [
-                                s["tag"] for s in suggestions if s["confidence"] >= 0.8
-                            ]
-
-                            if high_confidence_tags:
-                                # Update note with new tags
-                                current_tags = set(note.get("tags", []))
-                                new_tags = list(current_tags.union(high_confidence_tags))
-
-                                await self.update_note(note_id=note["id"], tags=new_tags)
-
-                                categorization_results["categorized"] += 1
-                                categorization_results["categories"][note["id"]] = {
-                                    "added_tags": high_confidence_tags,
-                                    "suggestions": suggestions,
-                                }
+            # Shared by every prompt of the run
+            all_existing_tags = await self._get_all_existing_tags()
+            use_ai = not (
+                self.fallback_manager
+                and not self.fallback_manager.is_service_available("tag_suggestion")
+            )
+            if not use_ai:
+                logger.info(
+                    "Tag suggestion service unavailable due to API limits, using basic tags"
+                )
 
+            batch_size = max(1, batch_size)
+            page_size = batch_size * max(1, self.auto_tag_concurrency)
+
+            async for notes in self._iter_notes_for_categorization(note_ids, page_size):
+                groups = [notes[i : i + batch_size] for i in range(0, len(notes), batch_size)]
+                if use_ai:
+                    group_results = await asyncio.gather(
+                        *(
+                            self._suggest_tags_for_notes(group, all_existing_tags)
+                            for group in groups
+                        ),
+                        return_exceptions=True,
+                    )
+                else:
+                    group_results = [
+                        {
+                            note["id"]: self._generate_basic_tag_suggestions(
+                                note["content"], note["title"], note["tags"]
+                            )
+                            for note in group
+                        }
+                        for group in groups
+                    ]
+
+                updated_notes = []
+                previous_tags: Dict[str, List[str]] = {}
+                page_categories = {}
+                for group, group_result in zip(groups, group_results):
+                    if isinstance(group_result, BaseException):
+                        for note in group:
+                            error_msg = f"Error processing note {note['id']}: {group_result}"
+                            logger.error(error_msg)
+                            categorization_results["errors"].append(error_msg)
+                        continue
+
+                    for note in group:
+                        suggestions = self._filter_and_score_suggestions(
+                            group_result.get(note["id"], []), note["tags"], all_existing_tags
+                        )[:3]
                         categorization_results["processed"] += 1
 
-                        # Progress callback
-                        if progress_callback:
-                            progress_callback(categorization_results["processed"], len(notes))
-
+                        # Apply high-confidence suggestions automatically
+                        high_confidence_tags = [
+                            s["tag"] for s in suggestions if s["confidence"] >= 0.8
+                        ]
+                        if high_confidence_tags:
+                            previous_tags[note["id"]] = note["tags"]
+                            note["tags"] = list(dict.fromkeys(note["tags"] + high_confidence_tags))
+                            updated_notes.append(note)
+                            page_categories[note["id"]] = {
+                                "added_tags": high_confidence_tags,
+                                "suggestions": suggestions,
+                            }
+
+                if updated_notes:
+                    try:
+                        await self._apply_tag_updates(updated_notes, previous_tags)
                     except Exception as e:
-                        error_msg = f"Error processing note {note['id']}: {str(e)}"
+                        error_msg = f"Error saving tags of {len(updated_notes)} notes: {e}"
                         logger.error(error_msg)
                         categorization_results["errors"].append(error_msg)
+                    else:
+                        categorization_results["categorized"] += len(updated_notes)
+                        categorization_results["categories"].update(page_categories)
+
+                # Progress callback
+                if progress_callback:
+                    progress_callback(categorization_results["processed"], total)
 
             return categorization_results
 
@@ -797,6 +962,95 @@ class KnowledgeManager:
             logger.error(f"Error in batch categorization: {str(e)}")
             return {"processed": 0, "categorized": 0, "errors": [str(e)]}
 
+    async def _iter_notes_for_categorization(
+        self, note_ids: Optional[List[str]], page_size: int
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield notes a page at a time, by ID list or in rowid order."""
+        if note_ids:
+            for start in range(0, len(note_ids), page_size):
+                chunk = note_ids[start : start + page_size]
+                placeholders = ",".join("?" * len(chunk))
+                async with self.db.get_connection() as conn:
+                    cursor = await conn.execute(
+                        f"SELECT {self._NOTE_COLUMNS} FROM knowledge_notes "
+                        f"WHERE id IN ({placeholders})",
+                        chunk,
+                    )
+                    rows = {row[0]: row for row in await cursor.fetchall()}
+                notes = [self._row_to_note(rows[note_id]) for note_id in chunk if note_id in rows]
+                if notes:
+                    yield notes
+            return
+
+        last_rowid = 0
+        while True:
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    f"SELECT rowid, {self._NOTE_COLUMNS} FROM knowledge_notes "
+                    "WHERE rowid > ? ORDER BY rowid LIMIT ?",
+                    (last_rowid, page_size),
+                )
+                rows = await cursor.fetchall()
+            if not rows:
+                return
+            last_rowid = rows[-1][0]
+            yield [self._row_to_note(row[1:]) for row in rows]
+
+    async def _suggest_tags_for_notes(
+        self, notes: List[Dict[str, Any]], all_existing_tags: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Suggest tags for several notes with a single Gemini request.
+
+        Returns:
+            Mapping of note ID to its unfiltered tag suggestions
+
+        Raises:
+            KnowledgeManagerError: If the response cannot be parsed
+        """
+        prompt = self._create_batch_tag_suggestion_prompt(notes, all_existing_tags, 3)
+        response_text = await self._generate_tag_response(prompt, json_output=True)
+        suggestions = self._parse_batch_tag_suggestions(response_text, notes)
+
+        if self.fallback_manager:
+            for note in notes:
+                cache_key = content_digest(note["content"], note["title"])
+                await self.fallback_manager.cache_data(
+                    "tag_suggestions", cache_key, suggestions.get(note["id"], [])
+                )
+
+        return suggestions
+
+    async def _apply_tag_updates(
+        self, notes: List[Dict[str, Any]], previous_tags: Dict[str, List[str]]
+    ) -> None:
+        """Write new tags of several notes in one transaction and sync them together."""
+        now = datetime.now().isoformat()
+        queued = False
+
+        async with self.db.transaction() as conn:
+            await conn.executemany(
+                "UPDATE knowledge_notes SET tags = ?, updated_at = ? WHERE id = ?",
+                [(json.dumps(note["tags"], ensure_ascii=False), now, note["id"]) for note in notes],
+            )
+            for note in notes:
+                note["updated_at"] = now
+                queued = await self._enqueue_sync(conn, note["id"], SyncOutbox.UPSERT)
+
+        for note in notes:
+            self.tag_vocabulary.replace(previous_tags.get(note["id"], []), note["tags"], now)
+
+        if queued and self.sync_outbox is not None:
+            self.sync_outbox.notify()
+            return
+
+        try:
+            await self.sync_manager.sync_notes_batch([note["id"] for note in notes])
+            for note in notes:
+                await self._save_note_to_obsidian(note)
+        except Exception as e:
+            logger.warning(f"Failed to sync {len(notes)} re-tagged notes to services: {e}")
+
     def _create_tag_suggestion_prompt(
         self,
         content: str,
@@ -866,6 +1120,93 @@ TAG2: [信頼度0.0-1.0] - 理由
 
         return suggestions
 
+    def _create_batch_tag_suggestion_prompt(
+        self,
+        notes: List[Dict[str, Any]],
+        existing_tags: List[str],
+        max_suggestions: int,
+    ) -> str:
+        """Create a prompt asking for tag suggestions for several notes as JSON."""
+        sections = []
+        for index, note in enumerate(notes, 1):
+            content = note["content"]
+            current_tags = ", ".join(note["tags"]) if note["tags"] else "なし"
+            sections.append(
+                f"""### id: {index}
+タイトル: {note["title"]}
+現在のタグ: {current_tags}
+内容:
+{content[:2000]}{"..." if len(content) > 2000 else ""}"""
+            )
+
+        example = (
+            '{"notes": [{"id": "1", "tags": ['
+            '{"tag": "プロジェクト管理", "confidence": 0.9, "reason": "コンテンツの主要テーマ"}]}]}'
+        )
+        notes_text = "\n\n".join(sections)
+
+        return f"""あなたは知識管理システムの専門家です。以下の{len(notes)}件のノートそれぞれに最適なタグを提案してください。
+
+システム内の既存タグ例: {", ".join(existing_tags[:20])}
+
+要求:
+1. 各ノートの主要テーマを表すタグを{max_suggestions}個以下で提案
+2. 既存タグがある場合は再利用を優先
+3. 日本語または英語の単語・短いフレーズ
+4. 各タグの信頼度(0.0-1.0)と理由も説明
+
+出力形式（JSONのみ、idはノートの番号）:
+{example}
+
+ノート:
+{notes_text}"""
+
+    def _parse_batch_tag_suggestions(
+        self, response_text: str, notes: List[Dict[str, Any]]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Parse a JSON batch response into tag suggestions per note ID.
+
+        Raises:
+            KnowledgeManagerError: If the response is not valid JSON
+        """
+        text = response_text.strip()
+        if text.startswith("```"):
+            text = text.strip("`").removeprefix("json").strip()
+
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise KnowledgeManagerError(f"Invalid tag suggestion response: {e}")
+
+        entries = data.get("notes", []) if isinstance(data, dict) else data
+        suggestions: Dict[str, List[Dict[str, Any]]] = {}
+
+        for entry in entries if isinstance(entries, list) else []:
+            try:
+                index = int(entry["id"]) - 1
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= index < len(notes):
+                continue
+
+            note = notes[index]
+
+            note_suggestions = suggestions.setdefault(note["id"], [])
+            for item in entry.get("tags") or []:
+                try:
+                    note_suggestions.append(
+                        {
+                            "tag": str(item["tag"]).strip(),
+                            "confidence": float(item.get("confidence", 0.0)),
+                            "reason": str(item.get("reason", "")),
+                        }
+                    )
+                except (KeyError, TypeError, ValueError, AttributeError):
+                    continue
+
+        return suggestions
+
     def _filter_and_score_suggestions(
         self,
         suggestions: List[Dict[str, Any]],
@@ -874,16 +1215,18 @@ TAG2: [信頼度0.0-1.0] - 理由
     ) -> List[Dict[str, Any]]:
         """Filter and adjust scoring for tag suggestions."""
         filtered = []
+        current_keys = {TagVocabulary.normalize(tag) for tag in existing_tags}
+        system_keys = {TagVocabulary.normalize(tag) for tag in all_system_tags}
 
         for suggestion in suggestions:
-            tag = suggestion["tag"].lower()
+            tag = TagVocabulary.normalize(suggestion["tag"])
 
             # Skip if already exists as current tag
-            if tag in [t.lower() for t in existing_tags]:
+            if tag in current_keys:
                 continue
 
             # Boost confidence if tag exists in system
-            if tag in [t.lower() for t in all_system_tags]:
+            if tag in system_keys:
                 suggestion["confidence"] = min(1.0, suggestion["confidence"] + 0.1)
                 suggestion["existing"] = True
             else:
@@ -955,12 +1298,11 @@ TAG2: [信頼度0.0-1.0] - 理由
         return suggestions[:3]
 
     async def _get_all_existing_tags(self) -> List[str]:
-        """Get all existing tags from the database."""
+        """Get all existing tags, most used first, from the tag vocabulary."""
         try:
-            async with self.db.get_connection() as conn:
-                cursor = await conn.execute("SELECT DISTINCT tag FROM note_tags ORDER BY tag")
-                rows = await cursor.fetchall()
-                return [row[0] for row in rows]
+            if not self.tag_vocabulary.loaded:
+                await self.tag_vocabulary.load(self.db)
+            return self.tag_vocabulary.names()
         except Exception as e:
             logger.error(f"Error fetching existing tags: {str(e)}")
             return []
@@ -969,6 +1311,9 @@ TAG2: [信頼度0.0-1.0] - 理由
         """
         Update note links based on content analysis.
 
+        Links whose target title does not exist yet are recorded in
+        unresolved_links and created once a note with that title appears.
+
         Args:
             note_id: Source note ID
             content: Content to analyze for links
@@ -977,30 +1322,34 @@ TAG2: [信頼度0.0-1.0] - 理由
             KnowledgeManagerError: If link update fails
         """
         try:
-            extracted_links = self.extract_links(content)
+            link_names = list(dict.fromkeys(self.extract_links(content)))
+            now = datetime.now().isoformat()
 
             async with self.db.get_connection() as conn:
-                # Remove existing outgoing links
+                targets = await self._resolve_link_targets(conn, link_names)
+
+                # Replace existing outgoing links
                 await conn.execute("DELETE FROM note_links WHERE from_note_id = ?", (note_id,))
+                await conn.execute(
+                    "DELETE FROM unresolved_links WHERE from_note_id = ?", (note_id,)
+                )
 
-                # Add new links
-                for link_name in extracted_links:
-                    # Try to find target note by title
-                    cursor = await conn.execute(
-                        "SELECT id FROM knowledge_notes WHERE title = ?",
-                        (link_name,),
+                resolved = [(note_id, targets[name], "reference", now) for name in targets]
+                unresolved = [(note_id, name, now) for name in link_names if name not in targets]
+
+                if resolved:
+                    await conn.executemany(
+                        "INSERT OR IGNORE INTO note_links "
+                        "(from_note_id, to_note_id, link_type, created_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        resolved,
+                    )
+                if unresolved:
+                    await conn.executemany(
+                        "INSERT OR IGNORE INTO unresolved_links "
+                        "(from_note_id, target_title, created_at) VALUES (?, ?, ?)",
+                        unresolved,
                     )
-                    target_row = await cursor.fetchone()
-
-                    if target_row:
-                        target_id = target_row[0]
-                        # Use NULL for id to let AUTOINCREMENT handle it
-                        await conn.execute(
-                            "INSERT INTO note_links "
-                            "(from_note_id, to_note_id, link_type, created_at) "
-                            "VALUES (?, ?, ?, ?)",
-                            (note_id, target_id, "reference", datetime.now().isoformat()),
-                        )
 
                 await conn.commit()
 
@@ -1008,6 +1357,45 @@ TAG2: [信頼度0.0-1.0] - 理由
             logger.error(f"Failed to update links for note {note_id}: {e}")
             raise KnowledgeManagerError(f"Failed to update links: {e}")
 
+    async def _resolve_link_targets(self, conn: Any, titles: List[str]) -> Dict[str, str]:
+        """Map link titles to note IDs, querying only titles missing from the index."""
+        targets = {
+            title: self._title_index[title] for title in titles if title in self._title_index
+        }
+        missing = [title for title in titles if title not in targets]
+
+        if missing:
+            placeholders = ",".join("?" * len(missing))
+            cursor = await conn.execute(
+                f"SELECT id, title FROM knowledge_notes WHERE title IN ({placeholders}) "
+                "ORDER BY rowid",
+                missing,
+            )
+            for target_id, title in await cursor.fetchall():
+                if title not in targets:
+                    targets[title] = target_id
+                    self._title_index[title] = target_id
+
+        # Preserve link order from the content
+        return {title: targets[title] for title in titles if title in targets}
+
+    async def _backfill_links(self, conn: Any, note_id: str, title: str) -> None:
+        """Create the links that were waiting for a note with this title."""
+        await conn.execute(
+            """
+            INSERT OR IGNORE INTO note_links (from_note_id, to_note_id, link_type, created_at)
+            SELECT from_note_id, ?, 'reference', ? FROM unresolved_links
+            WHERE target_title = ?
+            """,
+            (note_id, datetime.now().isoformat(), title),
+        )
+        await conn.execute("DELETE FROM unresolved_links WHERE target_title = ?", (title,))
+
+    def _unindex_title(self, title: str, note_id: str) -> None:
+        """Drop a title from the index if it points at the given note."""
+        if self._title_index.get(title) == note_id:
+            del self._title_index[title]
+
     async def get_linked_notes(self, note_id: str) -> Dict[str, List[Dict[str, Any]]]:
         """
         Get all notes linked to/from the specified note.
@@ -1089,16 +1477,19 @@ TAG2: [信頼度0.0-1.0] - 理由
             await self.initialize()
 
         try:
-            query_sql = """
+            # Every spelling of the tag, matched case-insensitively through the vocabulary
+            spellings = self.tag_vocabulary.variants([tag])
+            placeholders = ",".join("?" * len(spellings))
+            query_sql = f"""
             SELECT id, title, content, tags, source_type, created_at, updated_at
             FROM knowledge_notes
-            WHERE JSON_EXTRACT(tags, '$') LIKE ?
+            WHERE id IN (SELECT note_id FROM note_tags WHERE tag IN ({placeholders}))
             ORDER BY updated_at DESC
             LIMIT ?
             """
 
             async with self.db.get_connection() as conn:
-                cursor = await conn.execute(query_sql, (f'%"{tag}"%', limit))
+                cursor = await conn.execute(query_sql, (*spellings, limit))
                 rows = await cursor.fetchall()
 
             return [
@@ -1204,6 +1595,10 @@ TAG2: [信頼度0.0-1.0] - 理由
         """
         Merge multiple notes into a single permanent note.
 
+        The merged note is created, links pointing at the source notes are
+        repointed to it and the sources are deleted in one transaction. The
+        ChromaDB deletes and the upsert are then applied as one sync step.
+
         Args:
             note_ids: List of note IDs to merge
             new_title: Title for merged note (optional)
@@ -1221,15 +1616,18 @@ TAG2: [信頼度0.0-1.0] - 理由
             raise KnowledgeManagerError("At least 2 notes required for merge")
 
         try:
-            # Get all notes to merge
-            notes = []
-            all_tags = set()
+            unique_ids = list(dict.fromkeys(note_ids))
+            placeholders = ",".join("?" * len(unique_ids))
 
-            for note_id in note_ids:
-                note = await self.get_note(note_id)
-                if note:
-                    notes.append(note)
-                    all_tags.update(note["tags"])
+            # Get all notes to merge
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    f"SELECT {self._NOTE_COLUMNS} FROM knowledge_notes "
+                    f"WHERE id IN ({placeholders})",
+                    unique_ids,
+                )
+                rows = {row[0]: row for row in await cursor.fetchall()}
+            notes = [self._row_to_note(rows[note_id]) for note_id in unique_ids if note_id in rows]
 
             if not notes:
                 raise KnowledgeManagerError("No valid notes found for merge")
@@ -1239,30 +1637,175 @@ TAG2: [信頼度0.0-1.0] - 理由
                 new_title or f"Merged: {', '.join([note['title'] for note in notes[:3]])}"
             )
             merged_content = self._generate_merged_content(notes)
-            merged_tags = list(all_tags)
-
-            # Create new merged note
-            merged_note_id = await self.create_note(
-                title=merged_title,
-                content=merged_content,
-                tags=merged_tags,
-                source_type="merged",
-                user_id=notes[0]["user_id"],
-                channel_id=notes[0]["channel_id"],
-                guild_id=notes[0]["guild_id"],
-            )
+            merged_tags = {tag for note in notes for tag in note["tags"]}
+            merged_tags.update(self.extract_tags(merged_content))
+            link_names = list(dict.fromkeys(self.extract_links(merged_content)))
+
+            merged_note_id = str(uuid.uuid4())
+            source_ids = [note["id"] for note in notes]
+            now = datetime.now().isoformat()
+
+            # Source titles must not resolve to the deleted notes; misses fall back to the DB
+            for note in notes:
+                self._unindex_title(note["title"], note["id"])
+
+            async with self.db.transaction() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO knowledge_notes (
+                        id, title, content, tags, source_type, source_id,
+                        user_id, channel_id, guild_id, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, 'merged', NULL, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        merged_note_id,
+                        merged_title,
+                        merged_content,
+                        json.dumps(list(merged_tags), ensure_ascii=False),
+                        notes[0]["user_id"],
+                        notes[0]["channel_id"],
+                        notes[0]["guild_id"],
+                        now,
+                        now,
+                    ),
+                )
+
+                # Repoint incoming links from other notes to the merged note
+                await conn.execute(
+                    f"""
+                    INSERT OR IGNORE INTO note_links
+                        (from_note_id, to_note_id, link_type, created_at)
+                    SELECT from_note_id, ?, link_type, ? FROM note_links
+                    WHERE to_note_id IN ({placeholders}) AND from_note_id NOT IN ({placeholders})
+                    """,
+                    [merged_note_id, now, *unique_ids, *unique_ids],
+                )
+                await conn.execute(
+                    f"""
+                    DELETE FROM note_links
+                    WHERE from_note_id IN ({placeholders}) OR to_note_id IN ({placeholders})
+                    """,
+                    [*unique_ids, *unique_ids],
+                )
+                await conn.execute(
+                    f"DELETE FROM unresolved_links WHERE from_note_id IN ({placeholders})",
+                    unique_ids,
+                )
+                await conn.execute(
+                    f"DELETE FROM knowledge_notes WHERE id IN ({placeholders})", unique_ids
+                )
 
-            # Delete original notes
-            for note_id in note_ids:
-                await self.delete_note(note_id)
+                # Outgoing links of the merged content, resolved after the sources are gone
+                targets = await self._resolve_link_targets(conn, link_names)
+                if targets:
+                    await conn.executemany(
+                        "INSERT OR IGNORE INTO note_links "
+                        "(from_note_id, to_note_id, link_type, created_at) "
+                        "VALUES (?, ?, 'reference', ?)",
+                        [(merged_note_id, target_id, now) for target_id in targets.values()],
+                    )
+                unresolved = [name for name in link_names if name not in targets]
+                if unresolved:
+                    await conn.executemany(
+                        "INSERT OR IGNORE INTO unresolved_links "
+                        "(from_note_id, target_title, created_at) VALUES (?, ?, ?)",
+                        [(merged_note_id, name, now) for name in unresolved],
+                    )
+                await self._backfill_links(conn, merged_note_id, merged_title)
+
+                queued = await self._enqueue_sync(conn, merged_note_id, SyncOutbox.UPSERT)
+                for note_id in source_ids:
+                    await self._enqueue_sync(conn, note_id, SyncOutbox.DELETE)
+            self._title_index.setdefault(merged_title, merged_note_id)
+            for note in notes:
+                self.tag_vocabulary.remove(note["tags"])
+            self.tag_vocabulary.add(merged_tags, now)
+
+            if queued and self.sync_outbox is not None:
+                self.sync_outbox.notify()
+            else:
+                if not await self.sync_manager.delete_notes_from_chromadb(source_ids):
+                    logger.warning(f"Failed to delete merged notes {source_ids} from ChromaDB")
+                await self._sync_note_to_services(merged_note_id)
 
-            logger.info(f"Merged {len(note_ids)} notes into {merged_note_id}")
+            logger.info(f"Merged {len(source_ids)} notes into {merged_note_id}")
             return merged_note_id
 
         except Exception as e:
             logger.error(f"Failed to merge notes {note_ids}: {e}")
             raise KnowledgeManagerError(f"Failed to merge notes: {e}")
 
+    async def _enqueue_sync(self, conn: Any, note_id: str, operation: str) -> bool:
+        """
+        Write a sync outbox row in the caller's transaction.
+
+        Returns:
+            True if the row was queued, False if no outbox is configured
+        """
+        if self.sync_outbox is None:
+            return False
+
+        await self.sync_outbox.enqueue(conn, note_id, operation)
+        return True
+
+    async def _dispatch_sync(self, note_id: str, queued: bool) -> None:
+        """Wake the outbox worker, or sync inline when no outbox is configured."""
+        if queued and self.sync_outbox is not None:
+            self.sync_outbox.notify()
+        else:
+            await self._sync_note_to_services(note_id)
+
+    async def start_sync_worker(self) -> None:
+        """Start draining the sync outbox in the background."""
+        if self.sync_outbox is None:
+            return
+
+        await self.sync_outbox.start_worker(
+            self._process_outbox_entry, self._process_outbox_deletes
+        )
+
+    async def stop_sync_worker(self) -> None:
+        """Stop the sync outbox worker; undelivered entries are kept."""
+        if self.sync_outbox is not None:
+            await self.sync_outbox.stop_worker()
+
+    async def _process_outbox_entry(self, entry: OutboxEntry) -> None:
+        """
+        Apply a sync outbox entry to ChromaDB and ObsidianGitHub.
+
+        Args:
+            entry: Coalesced outbox entry
+
+        Raises:
+            KnowledgeManagerError: If the sync failed and should be retried
+        """
+        if entry.operation == SyncOutbox.DELETE:
+            if not await self.sync_manager.delete_note_from_chromadb(entry.note_id):
+                raise KnowledgeManagerError(f"Failed to delete note {entry.note_id} from ChromaDB")
+            return
+
+        note = await self.get_note(entry.note_id)
+        if not note:
+            # Deleted after the entry was written; the delete entry cleans up
+            return
+
+        result = await self.sync_manager.sync_note_to_chromadb(entry.note_id)
+        if not result.success:
+            raise KnowledgeManagerError(f"Failed to sync note {entry.note_id}: {result.error}")
+
+        await self._save_note_to_obsidian(note)
+
+    async def _process_outbox_deletes(self, entries: List[OutboxEntry]) -> None:
+        """
+        Apply delete entries to ChromaDB with one batch call.
+
+        Raises:
+            KnowledgeManagerError: If the deletion failed and should be retried
+        """
+        note_ids = [entry.note_id for entry in entries]
+        if not await self.sync_manager.delete_notes_from_chromadb(note_ids):
+            raise KnowledgeManagerError(f"Failed to delete {len(note_ids)} notes from ChromaDB")
+
     async def _sync_note_to_services(self, note_id: str) -> None:
         """
         Sync note to external services (ChromaDB, ObsidianGitHub).
@@ -1276,16 +1819,32 @@ TAG2: [信頼度0.0-1.0] - 理由
 
             # Save to ObsidianGitHub if configured
             note = await self.get_note(note_id)
-            if note and self.config.github_obsidian_enabled:
-                # Create markdown filename from note title
-                safe_title = "".join(
-                    c for c in note["title"] if c.isalnum() or c in (" ", "-", "_")
-                ).strip()
-                filename = f"{safe_title}.md"
-
-                # Create markdown content with frontmatter
-                tags = note["tags"]
-                frontmatter = f"""---
+            if note:
+                await self._save_note_to_obsidian(note)
+
+        except Exception as e:
+            logger.warning(f"Failed to sync note {note_id} to services: {e}")
+
+    async def _save_note_to_obsidian(self, note: Dict[str, Any]) -> None:
+        """
+        Save note to ObsidianGitHub as markdown with frontmatter.
+
+        Args:
+            note: Note data from get_note()
+        """
+        note_id = note["id"]
+        if not self.config.github_obsidian_enabled:
+            return
+
+        # Create markdown filename from note title
+        safe_title = "".join(
+            c for c in note["title"] if c.isalnum() or c in (" ", "-", "_")
+        ).strip()
+        filename = f"{safe_title}.md"
+
+        # Create markdown content with frontmatter
+        tags = note["tags"]
+        frontmatter = f"""---
 title: {note["title"]}
 tags: {', '.join(tags)}
 created: {note["created_at"]}
@@ -1293,26 +1852,21 @@ updated: {note["updated_at"]}
 ---
 
 """
-                content = frontmatter + note["content"]
-
-                if self.obsidian_github is not None:
-                    await self.obsidian_github.save_to_obsidian(
-                        filename=filename,
-                        content=content,
-                        directory="knowledge_notes",
-                        metadata={
-                            "note_id": note_id,
-                            "source_type": note["source_type"],
-                            "user_id": note["user_id"],
-                        },
-                    )
-                else:
-                    logger.info(
-                        f"ObsidianGitHub integration disabled, skipping save for note {note_id}"
-                    )
-
-        except Exception as e:
-            logger.warning(f"Failed to sync note {note_id} to services: {e}")
+        content = frontmatter + note["content"]
+
+        if self.obsidian_github is not None:
+            await self.obsidian_github.save_to_obsidian(
+                filename=filename,
+                content=content,
+                directory="knowledge_notes",
+                metadata={
+                    "note_id": note_id,
+                    "source_type": note["source_type"],
+                    "user_id": note["user_id"],
+                },
+            )
+        else:
+            logger.info(f"ObsidianGitHub integration disabled, skipping save for note {note_id}")
 
     def _generate_merged_content(self, notes: List[Dict[str, Any]]) -> str:
         """
@@ -1369,7 +1923,7 @@ updated: {note["updated_at"]}
             ):
                 logger.info("Knowledge search service unavailable due to API limits, using cache")
                 # Try to get cached search results
-                cache_key = f"{hash(query + str(tags))}"
+                cache_key = content_digest(query, tags)
                 cached_results = await self.fallback_manager.get_cached_data(
                     "search_results", cache_key
                 )
@@ -1395,7 +1949,7 @@ updated: {note["updated_at"]}
 
             # Cache the results for fallback
             if self.fallback_manager:
-                cache_key = f"{hash(query + str(tags))}"
+                cache_key = content_digest(query, tags)
                 await self.fallback_manager.cache_data("search_results", cache_key, final_results)
 
             return final_results
@@ -1404,7 +1958,7 @@ updated: {note["updated_at"]}
             logger.error(f"Failed to search notes: {e}")
             # Try fallback cache on error
             if self.fallback_manager:
-                cache_key = f"{hash(query + str(tags))}"
+                cache_key = content_digest(query, tags)
                 cached_results = await self.fallback_manager.get_cached_data(
                     "search_results", cache_key
                 )
@@ -1427,11 +1981,15 @@ updated: {note["updated_at"]}
                 cursor = await conn.execute("SELECT COUNT(*) FROM note_links")
                 link_count = (await cursor.fetchone())[0]
 
+                cursor = await conn.execute("SELECT COUNT(*) FROM unresolved_links")
+                unresolved_link_count = (await cursor.fetchone())[0]
+
             return {
                 "status": "healthy",
                 "initialized": self._initialized,
                 "note_count": note_count,
                 "link_count": link_count,
+                "unresolved_link_count": unresolved_link_count,
                 "services": {
                     "database": self.db.is_initialized,
                     "chromadb": self.chromadb._initialized
@@ -1448,7 +2006,11 @@ updated: {note["updated_at"]}
     # Link Management Methods
 
     async def suggest_links_for_note(
-        self, note_id: str, max_suggestions: int = 5, min_similarity: float = 0.3
+        self,
+        note_id: str,
+        max_suggestions: int = 5,
+        min_similarity: float = 0.3,
+        method: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """
         Suggest potential links for a note based on content similarity.
@@ -1457,6 +2019,7 @@ updated: {note["updated_at"]}
             note_id: ID of the note to suggest links for
             max_suggestions: Maximum number of suggestions to return
             min_similarity: Minimum similarity threshold (0.0-1.0)
+            method: "vector" or "lexical"; defaults to link_suggestion_method
 
         Returns:
             List of suggested notes with similarity scores
@@ -1464,10 +2027,36 @@ updated: {note["updated_at"]}
         if not self._initialized:
             await self.initialize()
 
+        if (method or self.link_suggestion_method) == "vector":
+            return await self.link_suggestor.suggest_by_vector(
+                note_id, max_suggestions, min_similarity, self.link_suggestion_lexical_weight
+            )
+
         return await self.link_suggestor.suggest_links_for_note(
             note_id, max_suggestions, min_similarity
         )
 
+    async def get_related_notes(self, note_id: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Precomputed related notes of a note.
+
+        Args:
+            note_id: Note ID
+            limit: Maximum number of notes
+
+        Returns:
+            Note dicts with id, title, content, tags, source_type, created_at
+            and score, most related first; empty until the note is indexed
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        try:
+            return await self.note_neighbors.get_neighbors(note_id, limit)
+        except Exception as e:
+            logger.error(f"Failed to get related notes for {note_id}: {e}")
+            return []
+
     async def suggest_links_by_content(
         self, content: str, exclude_note_id: Optional[str] = None, max_suggestions: int = 5
     ) -> List[Dict[str, Any]]:
@@ -1641,17 +2230,18 @@ updated: {note["updated_at"]}
         self,
         note_ids: Optional[List[str]] = None,
         batch_size: int = 10,
-        max_concurrent: int = 3,
         progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
     ) -> Dict[str, Any]:
         """
-        Process large numbers of notes for embedding in batches with memory optimization.
+        Embed notes into the vector store in one pass through the sync pipeline.
+
+        Large or long-running re-embeds should use ReindexJobManager, which
+        checkpoints its progress and can be paused and resumed.
 
         Args:
             note_ids: Optional list of specific note IDs.
-                If None, processes all notes without embeddings
+                If None, processes all notes that are not synced
             batch_size: Number of notes to process in each batch
-            max_concurrent: Maximum number of concurrent embedding operations
             progress_callback: Optional callback for progress updates
 
         Returns:
@@ -1660,42 +2250,28 @@ updated: {note["updated_at"]}
         if not self._initialized:
             await self.initialize()
 
-        from ..utils.memory import MemoryOptimizedProcessor
         from ..utils.progress import BatchProgressTracker
 
         start_time = time.time()
 
         try:
-            # Get notes to process
+            await self.sync_manager.init_async()
+
             if note_ids is None:
-                # Find notes without embeddings
+                # Find notes that were never synced or are out of date
                 async with self.db.get_connection() as connection:
                     cursor = await connection.execute(
                         """
-                        SELECT n.id, n.title, n.content
+                        SELECT n.id
                         FROM knowledge_notes n
-                        LEFT JOIN chromadb_sync cs ON n.id = cs.note_id
-                        WHERE cs.note_id IS NULL OR cs.sync_status != 'synced'
+                        LEFT JOIN sync_metadata sm ON n.id = sm.note_id
+                        WHERE sm.note_id IS NULL OR sm.sync_status != 'synced'
                         ORDER BY n.created_at DESC
                     """
                     )
-                    notes_data = await cursor.fetchall()
-            else:
-                # Get specific notes
-                placeholders = ",".join("?" * len(note_ids))
-                async with self.db.get_connection() as connection:
-                    cursor = await connection.execute(
-                        f"""
-                        SELECT id, title, content
-                        FROM knowledge_notes
-                        WHERE id IN ({placeholders})
-                        ORDER BY created_at DESC
-                        """,
-                        note_ids,
-                    )
-                    notes_data = await cursor.fetchall()
+                    note_ids = [row[0] for row in await cursor.fetchall()]
 
-            if not notes_data:
+            if not note_ids:
                 return {
                     "success": True,
                     "message": "No notes to process",
@@ -1704,10 +2280,9 @@ updated: {note["updated_at"]}
                     "elapsed_time": 0.0,
                 }
 
-            total_notes = len(notes_data)
+            total_notes = len(note_ids)
             logger.info(f"Starting bulk embedding for {total_notes} notes")
 
-            # Setup progress tracking
             progress_tracker = BatchProgressTracker(
                 total_items=total_notes,
                 batch_size=batch_size,
@@ -1715,101 +2290,20 @@ updated: {note["updated_at"]}
                 callback=progress_callback,
             )
 
-            # Memory-optimized processor
-            class NoteEmbeddingProcessor(MemoryOptimizedProcessor):
-                def __init__(self, knowledge_manager):
-                    super().__init__(memory_threshold_mb=400.0)
-                    self.km = knowledge_manager
-
-                async def process_note(self, note_data):
-                    """Process a single note for embedding."""
-                    note_id, title, content = note_data
-                    try:
-                        # Generate embedding
-                        embedding = await self.km.embedding.embed_text(content)
-
-                        # Store in ChromaDB
-                        await self.km.chromadb.add_document(
-                            id=note_id,
-                            text=content,
-                            embedding=embedding,
-                            metadata={"title": title, "note_id": note_id, "type": "knowledge_note"},
-                        )
-
-                        # Update sync status
-                        async with self.km.db.get_connection() as connection:
-                            await connection.execute(
-                                """
-                                INSERT OR REPLACE INTO chromadb_sync
-                                (note_id, sync_status, last_sync, vector_id)
-                                VALUES (?, 'synced', datetime('now'), ?)
-                                """,
-                                (note_id, note_id),
-                            )
-                            await connection.commit()
-
-                        return {"success": True, "note_id": note_id}
-
-                    except Exception as e:
-                        logger.error(f"Failed to process note {note_id}: {e}")
-                        return {"success": False, "note_id": note_id, "error": str(e)}
-
-            processor = NoteEmbeddingProcessor(self)
-
-            # Process notes in batches with concurrency control
             processed = 0
             failed = 0
-            semaphore = asyncio.Semaphore(max_concurrent)
-
-            async def process_batch(batch_notes):
-                """Process a batch of notes with concurrency control."""
-
-                async def process_single(note_data):
-                    async with semaphore:
-                        return await processor.process_note(note_data)
-
-                # Process batch concurrently
-                tasks = [process_single(note) for note in batch_notes]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                batch_processed = 0
-                batch_failed = 0
-                for result in results:
-                    if isinstance(result, Exception):
-                        batch_failed += 1
-                        logger.error(f"Batch processing exception: {result}")
-                    elif isinstance(result, dict) and result.get("success"):
-                        batch_processed += 1
-                    else:
-                        batch_failed += 1
-
-                return batch_processed, batch_failed
-
-            # Process all batches
             for i in range(0, total_notes, batch_size):
-                batch = notes_data[i : i + batch_size]
+                batch = note_ids[i : i + batch_size]
                 progress_tracker.start_batch(i // batch_size)
 
-                batch_processed, batch_failed = await process_batch(batch)
+                results = await self.sync_manager.sync_notes_batch(batch)
+                batch_processed = sum(1 for result in results.values() if result.success)
                 processed += batch_processed
-                failed += batch_failed
-
-                # Update progress
-                for _ in range(len(batch)):
-                    progress_tracker.update_item()
+                failed += len(batch) - batch_processed
 
+                progress_tracker.update_item(len(batch))
                 progress_tracker.complete_batch()
 
-                # Memory optimization between batches
-                from ..utils.memory import optimize_memory
-
-                gc_result = optimize_memory()
-                if gc_result and gc_result["memory_freed_mb"] > 5.0:
-                    logger.debug(f"Freed {gc_result['memory_freed_mb']:.2f}MB between batches")
-
-                # Small delay between batches to prevent overwhelming
-                await asyncio.sleep(0.5)
-
             elapsed_time = time.time() - start_time
 
             result = {
@@ -1820,7 +2314,6 @@ updated: {note["updated_at"]}
                 "success_rate": processed / total_notes if total_notes > 0 else 0,
                 "elapsed_time": elapsed_time,
                 "rate_per_second": processed / elapsed_time if elapsed_time > 0 else 0,
-                "memory_stats": processor.get_memory_stats(),
             }
 
             logger.info(
@@ -1,11 +1,23 @@
-"""Link suggestion functionality for note connections."""
-
+"""
+Link suggestion functionality for note connections.
+
+Candidates come from the note_terms inverted index, which maps keywords,
+title words and tags to notes. Triggers queue written notes for reindexing;
+a background worker indexes the queue, and a suggestion request indexes at
+most a few queued notes itself before it scores a short list of notes that share rare terms
+instead of scanning every note. suggest_by_vector() instead takes candidates
+from the nearest neighbours of the note's stored embedding.
+"""
+
+import asyncio
 import logging
 import re
 from difflib import SequenceMatcher
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .database import DatabaseService
+from .note_neighbors import NoteNeighborIndex, get_note_embedding
+from .vector_store import VectorStore
 
 logger = logging.getLogger(__name__)
 
@@ -17,16 +29,52 @@ class LinkSuggestionError(Exception):
 class LinkSuggestor:
     """Suggests links between notes based on content similarity and relationships."""
 
-    def __init__(self, db: DatabaseService):
+    # Most terms indexed per note, taken from its most frequent keywords
+    MAX_TERMS_PER_NOTE = 64
+
+    # Vector searches per suggestion, each fetching four times more hits
+    MAX_SEARCH_ROUNDS = 3
+
+    def __init__(
+        self,
+        db: DatabaseService,
+        shortlist_size: int = 100,
+        max_query_terms: int = 32,
+        index_batch_size: int = 500,
+        request_index_limit: int = 50,
+        index_interval: float = 60.0,
+        vector_store: Optional[VectorStore] = None,
+        chunk_overfetch: int = 3,
+        neighbor_index: Optional[NoteNeighborIndex] = None,
+    ):
         """
         Initialize LinkSuggestor.
 
         Args:
             db: Database service instance
+            shortlist_size: Candidates scored exactly per suggestion request
+            max_query_terms: Rarest terms of a note used to find candidates
+            index_batch_size: Notes indexed per transaction by refresh_index()
+            request_index_limit: Queued notes indexed inline per suggestion request
+            index_interval: Seconds between queue checks of the index worker
+            vector_store: Optional store of note embeddings for suggest_by_vector()
+            chunk_overfetch: Vector hits fetched per suggestion, as chunks share notes
+            neighbor_index: Optional precomputed neighbours read before querying the store
         """
         self.db = db
+        self.shortlist_size = shortlist_size
+        self.max_query_terms = max_query_terms
+        self.index_batch_size = index_batch_size
+        self.request_index_limit = request_index_limit
+        self.index_interval = index_interval
+        self.vector_store = vector_store
+        self.chunk_overfetch = chunk_overfetch
+        self.neighbor_index = neighbor_index
         self._initialized = False
 
+        self._index_task: Optional[asyncio.Task] = None
+        self._index_shutdown = asyncio.Event()
+
     async def initialize(self) -> None:
         """Initialize the link suggestor."""
         if not self._initialized:
@@ -41,6 +89,9 @@ class LinkSuggestor:
         """
         Suggest potential links for a given note.
 
+        Candidates are the notes sharing the most rare terms with the note in
+        the note_terms index; only that shortlist is loaded and scored.
+
         Args:
             note_id: ID of the note to suggest links for
             max_suggestions: Maximum number of suggestions to return
@@ -56,6 +107,9 @@ class LinkSuggestor:
             await self.initialize()
 
         try:
+            # The index worker drains the rest of the queue
+            await self.refresh_index(limit=self.request_index_limit)
+
             # Check if note exists first
             async with self.db.get_connection() as conn:
                 cursor = await conn.execute(
@@ -68,62 +122,87 @@ class LinkSuggestor:
                 raise LinkSuggestionError(f"Note {note_id} not found")
 
             # Proceed with processing
-            source_note = {
-                "id": source_row[0],
-                "title": source_row[1],
-                "content": source_row[2],
-                "tags": self._parse_tags(source_row[3]),
-            }
+            source_note = self._prepare_note(source_row)
+            terms = self._index_terms(source_note)
+            if not terms:
+                return []
 
             async with self.db.get_connection() as conn:
-                # Get all other notes (excluding current one and already linked)
+                # Weight each term by rarity; common terms would match most notes
+                term_placeholders = ", ".join("?" * len(terms))
                 cursor = await conn.execute(
-                    """
-                    SELECT kn.id, kn.title, kn.content, kn.tags
-                    FROM knowledge_notes kn
-                    WHERE kn.id != ?
-                    AND kn.id NOT IN (
-                        SELECT to_note_id FROM note_links WHERE from_note_id = ?
-                        UNION
-                        SELECT from_note_id FROM note_links WHERE to_note_id = ?
+                    f"""
+                    SELECT term, COUNT(*) FROM note_terms
+                    WHERE term IN ({term_placeholders})
+                    GROUP BY term
+                    """,
+                    terms,
+                )
+                frequencies = {term: count for term, count in await cursor.fetchall()}
+                query_terms = sorted(
+                    (term for term in terms if frequencies.get(term, 0) > 0),
+                    key=lambda term: frequencies[term],
+                )[: self.max_query_terms]
+                if not query_terms:
+                    return []
+
+                # Shortlist notes sharing the most weighted terms, excluding the
+                # note itself and notes already linked in either direction
+                weighted_terms = ", ".join("(?, ?)" for _ in query_terms)
+                params: List[Any] = []
+                for term in query_terms:
+                    params.extend([term, 1.0 / frequencies[term]])
+                params.extend([note_id, note_id, note_id, self.shortlist_size])
+
+                cursor = await conn.execute(
+                    f"""
+                    WITH query_terms(term, weight) AS (VALUES {weighted_terms}),
+                    shortlist AS (
+                        SELECT nt.note_id, SUM(qt.weight) AS overlap
+                        FROM query_terms qt
+                        JOIN note_terms nt ON nt.term = qt.term
+                        WHERE nt.note_id != ?
+                        AND NOT EXISTS (
+                            SELECT 1 FROM note_links
+                            WHERE from_note_id = ? AND to_note_id = nt.note_id
+                        )
+                        AND NOT EXISTS (
+                            SELECT 1 FROM note_links
+                            WHERE to_note_id = ? AND from_note_id = nt.note_id
+                        )
+                        GROUP BY nt.note_id
+                        ORDER BY overlap DESC
+                        LIMIT ?
                     )
+                    SELECT kn.id, kn.title, kn.content, kn.tags
+                    FROM shortlist s
+                    JOIN knowledge_notes kn ON kn.id = s.note_id
                     """,
-                    (note_id, note_id, note_id),
+                    params,
                 )
                 candidate_rows = await cursor.fetchall()
 
-                # Initialize candidates after we know source note exists
-                candidates = []
-                for row in candidate_rows:
-                    candidates.append(
+            # Calculate exact similarity scores for the shortlist only
+            suggestions = []
+            for row in candidate_rows:
+                candidate = self._prepare_note(row)
+                similarity_score, title_sim = self._score(source_note, candidate)
+
+                if similarity_score >= min_similarity:
+                    suggestions.append(
                         {
-                            "id": row[0],
-                            "title": row[1],
-                            "content": row[2],
-                            "tags": self._parse_tags(row[3]),
+                            "note_id": candidate["id"],
+                            "title": candidate["title"],
+                            "similarity_score": similarity_score,
+                            "similarity_reasons": self._similarity_reasons(
+                                source_note, candidate, title_sim
+                            ),
                         }
                     )
 
-                # Calculate similarity scores
-                suggestions = []
-                for candidate in candidates:
-                    similarity_score = self._calculate_similarity(source_note, candidate)
-
-                    if similarity_score >= min_similarity:
-                        suggestions.append(
-                            {
-                                "note_id": candidate["id"],
-                                "title": candidate["title"],
-                                "similarity_score": similarity_score,
-                                "similarity_reasons": self._get_similarity_reasons(
-                                    source_note, candidate
-                                ),
-                            }
-                        )
-
-                # Sort by similarity score and return top suggestions
-                suggestions.sort(key=lambda x: x["similarity_score"], reverse=True)
-                return suggestions[:max_suggestions]
+            # Sort by similarity score and return top suggestions
+            suggestions.sort(key=lambda x: x["similarity_score"], reverse=True)
+            return suggestions[:max_suggestions]
 
         except LinkSuggestionError:
             # Re-raise LinkSuggestionError as-is to preserve error semantics
@@ -132,6 +211,270 @@ class LinkSuggestor:
             logger.error(f"Failed to suggest links for note {note_id}: {e}")
             raise LinkSuggestionError(f"Failed to suggest links: {e}")
 
+    async def refresh_index(self, limit: Optional[int] = None) -> int:
+        """
+        Index the terms of notes queued by the note_terms triggers.
+
+        Note inserts and title, content or tag updates queue the note in
+        note_terms_pending; this replaces the queued notes' terms.
+
+        Args:
+            limit: Maximum number of notes to index (defaults to the whole queue)
+
+        Returns:
+            Number of notes reindexed
+        """
+        indexed = 0
+        while limit is None or indexed < limit:
+            batch_size = self.index_batch_size
+            if limit is not None:
+                batch_size = min(batch_size, limit - indexed)
+
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    """
+                    SELECT kn.id, kn.title, kn.content, kn.tags
+                    FROM note_terms_pending p
+                    JOIN knowledge_notes kn ON kn.id = p.note_id
+                    LIMIT ?
+                    """,
+                    (batch_size,),
+                )
+                rows = await cursor.fetchall()
+                if not rows:
+                    break
+
+                note_ids = [(row[0],) for row in rows]
+                term_rows = [
+                    (term, row[0])
+                    for row in rows
+                    for term in self._index_terms(self._prepare_note(row))
+                ]
+                await conn.executemany("DELETE FROM note_terms WHERE note_id = ?", note_ids)
+                await conn.executemany(
+                    "INSERT OR IGNORE INTO note_terms (term, note_id) VALUES (?, ?)", term_rows
+                )
+                await conn.executemany("DELETE FROM note_terms_pending WHERE note_id = ?", note_ids)
+                await conn.commit()
+
+            indexed += len(rows)
+            if len(rows) < batch_size:
+                break
+
+        if indexed:
+            logger.debug(f"Indexed terms of {indexed} notes")
+        return indexed
+
+    async def start_index_worker(self) -> None:
+        """Start indexing queued notes in the background, beginning with the whole queue."""
+        if self._index_task and not self._index_task.done():
+            logger.warning("Link index worker already running")
+            return
+
+        self._index_shutdown.clear()
+        self._index_task = asyncio.create_task(self._index_worker_loop())
+        logger.info("Link index worker started")
+
+    async def stop_index_worker(self) -> None:
+        """Stop the background index worker; queued notes are kept."""
+        self._index_shutdown.set()
+
+        if self._index_task and not self._index_task.done():
+            try:
+                await asyncio.wait_for(self._index_task, timeout=10.0)
+            except asyncio.TimeoutError:
+                self._index_task.cancel()
+                try:
+                    await self._index_task
+                except asyncio.CancelledError:
+                    pass
+
+        self._index_task = None
+        logger.info("Link index worker stopped")
+
+    async def _index_worker_loop(self) -> None:
+        """Drain the index queue, then poll it every index_interval seconds."""
+        while not self._index_shutdown.is_set():
+            try:
+                await self.refresh_index()
+            except Exception as e:
+                logger.error(f"Link index refresh error: {e}")
+
+            try:
+                await asyncio.wait_for(self._index_shutdown.wait(), timeout=self.index_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def suggest_by_vector(
+        self,
+        note_id: str,
+        max_suggestions: int = 5,
+        min_similarity: float = 0.3,
+        lexical_weight: float = 0.0,
+    ) -> List[Dict[str, Any]]:
+        """
+        Suggest links from the nearest neighbours of a note's stored embedding.
+
+        One nearest-neighbour query replaces the corpus scan. Notes without a
+        stored embedding, or a suggestor without a vector store, fall back to
+        suggest_links_for_note().
+
+        Args:
+            note_id: ID of the note to suggest links for
+            max_suggestions: Maximum number of suggestions to return
+            min_similarity: Minimum similarity threshold (0.0-1.0)
+            lexical_weight: Share of the lexical similarity in the score (0.0-1.0)
+
+        Returns:
+            List of suggested notes with similarity scores
+
+        Raises:
+            LinkSuggestionError: If suggestion generation fails
+        """
+        if self.vector_store is None:
+            return await self.suggest_links_for_note(note_id, max_suggestions, min_similarity)
+
+        if not self._initialized:
+            await self.initialize()
+
+        try:
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    "SELECT id, title, content, tags, guild_id FROM knowledge_notes WHERE id = ?",
+                    (note_id,),
+                )
+                source_row = await cursor.fetchone()
+
+            if not source_row:
+                raise LinkSuggestionError(f"Note {note_id} not found")
+
+            # Precomputed neighbours avoid the store query once the note is indexed
+            vector_scores: Dict[str, float] = {}
+            candidate_rows: List[Any] = []
+            if self.neighbor_index is not None:
+                vector_scores = await self.neighbor_index.get_scores(note_id)
+                candidate_rows = await self._unlinked_notes(note_id, vector_scores)
+
+            # A full precomputed list may hide further candidates behind linked notes
+            precomputed_full = (
+                self.neighbor_index is not None
+                and len(vector_scores) >= self.neighbor_index.neighbors_per_note
+            )
+            if len(candidate_rows) < max_suggestions and (not vector_scores or precomputed_full):
+                embedding = await get_note_embedding(self.db, self.vector_store, note_id)
+                if embedding is None and not vector_scores:
+                    return await self.suggest_links_for_note(
+                        note_id, max_suggestions, min_similarity
+                    )
+                if embedding is not None:
+                    vector_scores, candidate_rows = await self._search_unlinked_neighbours(
+                        note_id, embedding, source_row[4], max_suggestions
+                    )
+
+            source_note = self._prepare_note(source_row)
+            suggestions = []
+            for row in candidate_rows:
+                vector_score = vector_scores[row[0]]
+                similarity_score = vector_score
+                reasons = [f"Similar meaning ({vector_score:.1%})"]
+
+                if lexical_weight > 0:
+                    candidate = self._prepare_note(row)
+                    lexical_score, title_sim = self._score(source_note, candidate)
+                    similarity_score = (
+                        1 - lexical_weight
+                    ) * vector_score + lexical_weight * lexical_score
+                    reasons.extend(self._similarity_reasons(source_note, candidate, title_sim))
+
+                if similarity_score >= min_similarity:
+                    suggestions.append(
+                        {
+                            "note_id": row[0],
+                            "title": row[1],
+                            "similarity_score": similarity_score,
+                            "vector_score": vector_score,
+                            "similarity_reasons": reasons,
+                        }
+                    )
+
+            suggestions.sort(key=lambda x: x["similarity_score"], reverse=True)
+            return suggestions[:max_suggestions]
+
+        except LinkSuggestionError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to suggest vector links for note {note_id}: {e}")
+            raise LinkSuggestionError(f"Failed to suggest links: {e}")
+
+    async def _search_unlinked_neighbours(
+        self,
+        note_id: str,
+        embedding: List[float],
+        guild_id: Optional[str],
+        max_suggestions: int,
+    ) -> Tuple[Dict[str, float], List[Any]]:
+        """
+        Nearest unlinked notes of an embedding, fetching more hits as needed.
+
+        Chunked notes return several hits each and linked notes are dropped
+        after the search, so the number of hits grows until enough candidates
+        survive or the store has no more hits to give.
+
+        Returns:
+            Best vector score per note, and rows of the unlinked candidates
+        """
+        assert self.vector_store is not None
+
+        where = {"guild_id": guild_id} if guild_id else None
+        n_results = (max_suggestions + 1) * self.chunk_overfetch
+        vector_scores: Dict[str, float] = {}
+        candidate_rows: List[Any] = []
+        for _ in range(self.MAX_SEARCH_ROUNDS):
+            results = await self.vector_store.search_documents(
+                embedding,
+                n_results=n_results,
+                where=where,
+                include=("metadatas",),
+                max_results=n_results,
+            )
+            for result in results:
+                neighbour_id = result.metadata.document_id or result.document_id
+                if neighbour_id != note_id and result.score > vector_scores.get(neighbour_id, -1.0):
+                    vector_scores[neighbour_id] = result.score
+
+            candidate_rows = await self._unlinked_notes(note_id, vector_scores)
+            if len(candidate_rows) >= max_suggestions or len(results) < n_results:
+                break
+            n_results *= 4
+
+        return vector_scores, candidate_rows
+
+    async def _unlinked_notes(self, note_id: str, note_ids: Iterable[str]) -> List[Any]:
+        """Rows of the given notes that are not linked to note_id in either direction."""
+        note_ids = list(note_ids)
+        if not note_ids:
+            return []
+
+        placeholders = ", ".join("?" * len(note_ids))
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT kn.id, kn.title, kn.content, kn.tags
+                FROM knowledge_notes kn
+                WHERE kn.id IN ({placeholders})
+                AND NOT EXISTS (
+                    SELECT 1 FROM note_links
+                    WHERE from_note_id = ? AND to_note_id = kn.id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM note_links
+                    WHERE to_note_id = ? AND from_note_id = kn.id
+                )
+                """,
+                [*note_ids, note_id, note_id],
+            )
+            return list(await cursor.fetchall())
+
     async def suggest_by_content_keywords(
         self, content: str, exclude_note_id: Optional[str] = None, max_suggestions: int = 5
     ) -> List[Dict[str, Any]]:
@@ -214,6 +557,35 @@ class LinkSuggestor:
             logger.error(f"Failed to suggest by content keywords: {e}")
             raise LinkSuggestionError(f"Failed to suggest by keywords: {e}")
 
+    def _prepare_note(self, row: Any) -> Dict[str, Any]:
+        """Note dict from an (id, title, content, tags) row, with its keywords."""
+        return {
+            "id": row[0],
+            "title": row[1],
+            "content": row[2],
+            "tags": self._parse_tags(row[3]),
+            "keywords": self._extract_keywords(row[2]),
+        }
+
+    def _index_terms(self, note: Dict[str, Any]) -> List[str]:
+        """
+        Terms of a note in the note_terms index.
+
+        Terms are the note's most frequent content keywords, its title
+        keywords and its lowercased tags prefixed with "#".
+        """
+        terms = set(note["keywords"][: self.MAX_TERMS_PER_NOTE])
+        terms.update(self._extract_keywords(note["title"]))
+        terms.update(f"#{tag.lower()}" for tag in note["tags"])
+        return sorted(terms)
+
+    def _keywords(self, note: Dict[str, Any]) -> List[str]:
+        """Keywords of a note, extracted once per note dict."""
+        if "keywords" not in note:
+            note["keywords"] = self._extract_keywords(note["content"])
+        keywords: List[str] = note["keywords"]
+        return keywords
+
     def _calculate_similarity(self, note1: Dict[str, Any], note2: Dict[str, Any]) -> float:
         """
         Calculate similarity between two notes.
@@ -225,23 +597,33 @@ class LinkSuggestor:
         Returns:
             Similarity score (0.0-1.0)
         """
+        return self._score(note1, note2)[0]
+
+    def _score(self, note1: Dict[str, Any], note2: Dict[str, Any]) -> Tuple[float, float]:
+        """Similarity of two notes and the title similarity it was built from."""
         # Title similarity (weight: 0.4)
         title_sim = SequenceMatcher(None, note1["title"].lower(), note2["title"].lower()).ratio()
 
         # Content similarity (weight: 0.4)
-        content_sim = self._content_similarity(note1["content"], note2["content"])
+        content_sim = self._keyword_similarity(self._keywords(note1), self._keywords(note2))
 
         # Tag similarity (weight: 0.2)
         tag_sim = self._tag_similarity(note1["tags"], note2["tags"])
 
         # Weighted average
         total_similarity = title_sim * 0.4 + content_sim * 0.4 + tag_sim * 0.2
-        return min(total_similarity, 1.0)
+        return min(total_similarity, 1.0), title_sim
 
     def _content_similarity(self, content1: str, content2: str) -> float:
         """Calculate content similarity using keyword overlap."""
-        keywords1 = set(self._extract_keywords(content1))
-        keywords2 = set(self._extract_keywords(content2))
+        return self._keyword_similarity(
+            self._extract_keywords(content1), self._extract_keywords(content2)
+        )
+
+    def _keyword_similarity(self, words1: List[str], words2: List[str]) -> float:
+        """Jaccard similarity of two keyword lists."""
+        keywords1 = set(words1)
+        keywords2 = set(words2)
 
         if not keywords1 or not keywords2:
             return 0.0
@@ -332,10 +714,16 @@ class LinkSuggestor:
 
     def _get_similarity_reasons(self, note1: Dict[str, Any], note2: Dict[str, Any]) -> List[str]:
         """Get reasons why two notes are similar."""
+        title_sim = SequenceMatcher(None, note1["title"].lower(), note2["title"].lower()).ratio()
+        return self._similarity_reasons(note1, note2, title_sim)
+
+    def _similarity_reasons(
+        self, note1: Dict[str, Any], note2: Dict[str, Any], title_sim: float
+    ) -> List[str]:
+        """Reasons why two notes are similar, given their title similarity."""
         reasons = []
 
         # Title similarity
-        title_sim = SequenceMatcher(None, note1["title"].lower(), note2["title"].lower()).ratio()
         if title_sim > 0.5:
             reasons.append(f"Similar titles ({title_sim:.1%})")
 
@@ -347,8 +735,8 @@ class LinkSuggestor:
             reasons.append(f"Common tags: {', '.join(common_tags)}")
 
         # Common keywords
-        keywords1 = set(self._extract_keywords(note1["content"])[:10])
-        keywords2 = set(self._extract_keywords(note2["content"])[:10])
+        keywords1 = set(self._keywords(note1)[:10])
+        keywords2 = set(self._keywords(note2)[:10])
         common_keywords = keywords1 & keywords2
         if common_keywords:
             reasons.append(f"Common keywords: {', '.join(list(common_keywords)[:3])}")
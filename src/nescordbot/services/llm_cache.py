@@ -0,0 +1,407 @@
+"""
+Persistent, content-addressed cache of LLM responses.
+
+Responses are stored in the ``llm_cache`` table under the SHA-256 of the
+provider, model, prompt template version and input, so identical requests
+are answered from SQLite across restarts and by every instance sharing the
+database. Bumping a call site's prompt version invalidates its old entries.
+Entries expire after a TTL, and the least recently used ones are evicted
+when the cache exceeds its entry or byte limit. The entry and byte totals
+are tracked in memory and recounted every few hundred stores, and the
+access times of hits are written in batches, so a lookup is one indexed
+read and a store does not scan the table.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..config import BotConfig
+from .database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+def content_digest(*parts: Any) -> str:
+    """
+    Stable SHA-256 hex digest of the given parts.
+
+    Unlike ``hash()``, the digest is the same in every process, so it can key
+    caches that outlive the bot or are shared between instances. Bytes are
+    hashed as-is, strings as UTF-8 and anything else as canonical JSON.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode("utf-8")
+        else:
+            data = json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        # Length prefix keeps ("ab", "c") and ("a", "bc") apart
+        digest.update(f"{len(data)}:".encode("ascii"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def file_digest(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 hex digest of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LLMCache:
+    """
+    Durable LLM response cache backed by the llm_cache table.
+
+    Features:
+    - Keys derived from provider, model, prompt version and input
+    - Per-entry TTL, with expired entries dropped on read and on prune
+    - Entry count and byte caps enforced by least-recently-used eviction
+    - Running entry and byte totals, recounted periodically to pick up
+      writes of other instances
+    - Access times of hits buffered and written in batches
+    - Hit, miss, store and eviction counters with hit rate
+    - Cache failures are logged and treated as misses, never raised to callers
+    """
+
+    def __init__(self, config: BotConfig, database_service: DatabaseService) -> None:
+        """
+        Initialize LLMCache.
+
+        Args:
+            config: Bot configuration
+            database_service: Database service holding the llm_cache table
+        """
+        self.config = config
+        self.db = database_service
+
+        self.enabled = getattr(config, "llm_cache_enabled", True)
+        self.ttl_seconds = getattr(config, "llm_cache_ttl_seconds", 30 * 24 * 3600)
+        self.max_entries = getattr(config, "llm_cache_max_entries", 10000)
+        self.max_bytes = getattr(config, "llm_cache_max_bytes", 64 * 1024 * 1024)
+        self.recount_interval = getattr(config, "llm_cache_recount_interval", 500)
+        self.access_flush_size = getattr(config, "llm_cache_access_flush_size", 64)
+
+        # Running totals of the table; None until counted
+        self._entries: Optional[int] = None
+        self._total_bytes = 0
+        self._stores_since_recount = 0
+        # Hits not yet written: cache key -> (last access time, hit count)
+        self._pending_access: Dict[str, Tuple[str, int]] = {}
+
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    @staticmethod
+    def make_key(provider: str, model: str, prompt_version: str, payload: Any) -> str:
+        """
+        Cache key of an LLM request.
+
+        Args:
+            provider: API provider, e.g. "openai" or "gemini"
+            model: Model name
+            prompt_version: Version of the call site's prompt template
+            payload: Request input; bytes, text or JSON-serializable data
+
+        Returns:
+            SHA-256 hex digest identifying the request
+        """
+        return content_digest(provider, model, prompt_version, payload)
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Cached response for a key.
+
+        Returns:
+            The stored response, or None on a miss, an expired entry or when
+            the cache is disabled
+        """
+        if not self.enabled or not self.db.is_initialized:
+            return None
+
+        now = datetime.now().isoformat()
+        try:
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    "SELECT response, expires_at, size_bytes FROM llm_cache WHERE cache_key = ?",
+                    (key,),
+                )
+                row = await cursor.fetchone()
+
+                if row is None or (row[1] is not None and row[1] <= now):
+                    if row is not None:
+                        await conn.execute("DELETE FROM llm_cache WHERE cache_key = ?", (key,))
+                        await conn.commit()
+                        self._pending_access.pop(key, None)
+                        self._track(-1, -row[2])
+                    self._stats["misses"] += 1
+                    return None
+
+            self._stats["hits"] += 1
+            hits = self._pending_access.get(key, ("", 0))[1]
+            self._pending_access[key] = (now, hits + 1)
+            if len(self._pending_access) >= self.access_flush_size:
+                await self.flush_access()
+            return json.loads(row[0])
+
+        except Exception as e:
+            self._stats["errors"] += 1
+            self._stats["misses"] += 1
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        provider: str,
+        model: str,
+        prompt_version: str,
+        ttl_seconds: Optional[int] = None,
+    ) -> None:
+        """
+        Store a response and evict entries over the size limits.
+
+        Args:
+            key: Key from make_key()
+            value: JSON-serializable response
+            provider: API provider, recorded for clear() and stats
+            model: Model name
+            prompt_version: Prompt template version
+            ttl_seconds: Lifetime of the entry; defaults to llm_cache_ttl_seconds,
+                0 or less keeps it until evicted
+        """
+        if not self.enabled or not self.db.is_initialized:
+            return
+
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        now = datetime.now()
+        expires_at = (now + timedelta(seconds=ttl)).isoformat() if ttl > 0 else None
+
+        try:
+            response = json.dumps(value, ensure_ascii=False)
+            size = len(response.encode("utf-8"))
+            if size > self.max_bytes:
+                logger.debug(f"LLM response of {size} bytes exceeds the cache limit; not cached")
+                return
+
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    "SELECT size_bytes FROM llm_cache WHERE cache_key = ?", (key,)
+                )
+                replaced = await cursor.fetchone()
+                await conn.execute(
+                    """
+                    INSERT OR REPLACE INTO llm_cache (
+                        cache_key, provider, model, prompt_version, response, size_bytes,
+                        created_at, expires_at, last_accessed_at, hit_count
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                    """,
+                    (
+                        key,
+                        provider,
+                        model,
+                        prompt_version,
+                        response,
+                        size,
+                        now.isoformat(),
+                        expires_at,
+                        now.isoformat(),
+                    ),
+                )
+                await conn.commit()
+            self._stats["stores"] += 1
+            self._pending_access.pop(key, None)
+            if replaced is not None:
+                self._track(0, size - replaced[0])
+            else:
+                self._track(1, size)
+
+            self._stores_since_recount += 1
+            if self._stores_since_recount >= self.recount_interval:
+                self._entries = None
+            await self._evict_over_limit()
+
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"LLM cache write failed: {e}")
+
+    async def get_or_compute(
+        self,
+        provider: str,
+        model: str,
+        prompt_version: str,
+        payload: Any,
+        compute: Callable[[], Awaitable[Any]],
+        ttl_seconds: Optional[int] = None,
+    ) -> Any:
+        """
+        Cached response of a request, calling the LLM only on a miss.
+
+        None results are returned without being cached, so failed or empty
+        responses are retried on the next call. Exceptions from compute
+        propagate to the caller.
+
+        Args:
+            provider: API provider
+            model: Model name
+            prompt_version: Version of the call site's prompt template
+            payload: Request input
+            compute: Coroutine function performing the LLM call
+            ttl_seconds: Optional lifetime overriding llm_cache_ttl_seconds
+
+        Returns:
+            The cached or freshly computed response
+        """
+        key = self.make_key(provider, model, prompt_version, payload)
+        cached = await self.get(key)
+        if cached is not None:
+            return cached
+
+        value = await compute()
+        if value is not None:
+            await self.set(key, value, provider, model, prompt_version, ttl_seconds)
+        return value
+
+    async def prune(self) -> int:
+        """
+        Delete expired entries and evict entries over the size limits.
+
+        Returns:
+            Number of entries removed
+        """
+        if not self.db.is_initialized:
+            return 0
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (datetime.now().isoformat(),),
+            )
+            await conn.commit()
+            expired: int = max(cursor.rowcount, 0)
+
+        self._entries = None
+        return expired + await self._evict_over_limit()
+
+    async def flush_access(self) -> None:
+        """Write the buffered access times and hit counts of cache hits."""
+        if not self._pending_access or not self.db.is_initialized:
+            return
+
+        pending = self._pending_access
+        self._pending_access = {}
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                """
+                UPDATE llm_cache SET hit_count = hit_count + ?, last_accessed_at = ?
+                WHERE cache_key = ?
+                """,
+                [(hits, accessed_at, key) for key, (accessed_at, hits) in pending.items()],
+            )
+            await conn.commit()
+
+    def _track(self, entries: int, size: int) -> None:
+        """Apply a change to the running totals, if they are counted."""
+        if self._entries is not None:
+            self._entries += entries
+            self._total_bytes += size
+
+    async def _recount(self) -> None:
+        """Count the entries and bytes of the table."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM llm_cache"
+            )
+            self._entries, self._total_bytes = await cursor.fetchone()
+        self._stores_since_recount = 0
+
+    async def _evict_over_limit(self) -> int:
+        """Evict least recently used entries until both size limits hold."""
+        if self._entries is None:
+            await self._recount()
+        count, total_bytes = self._entries or 0, self._total_bytes
+        if count <= self.max_entries and total_bytes <= self.max_bytes:
+            return 0
+
+        # Eviction order must see the buffered hits
+        await self.flush_access()
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT cache_key, size_bytes FROM llm_cache ORDER BY last_accessed_at, created_at"
+            )
+            victims: List[Tuple[str]] = []
+            async for cache_key, size in cursor:
+                if count <= self.max_entries and total_bytes <= self.max_bytes:
+                    break
+                victims.append((cache_key,))
+                count -= 1
+                total_bytes -= size
+
+            await conn.executemany("DELETE FROM llm_cache WHERE cache_key = ?", victims)
+            await conn.commit()
+
+        self._entries, self._total_bytes = count, total_bytes
+        self._stats["evictions"] += len(victims)
+        logger.debug(f"Evicted {len(victims)} LLM cache entries")
+        return len(victims)
+
+    async def clear(self, provider: Optional[str] = None) -> int:
+        """
+        Delete cached responses.
+
+        Args:
+            provider: Only delete responses of this provider; all when None
+
+        Returns:
+            Number of entries deleted
+        """
+        async with self.db.get_connection() as conn:
+            if provider:
+                cursor = await conn.execute("DELETE FROM llm_cache WHERE provider = ?", (provider,))
+            else:
+                cursor = await conn.execute("DELETE FROM llm_cache")
+            await conn.commit()
+        self._entries = None
+
+        deleted: int = max(cursor.rowcount, 0)
+        logger.info(f"Cleared {deleted} LLM cache entries")
+        return deleted
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate counters of this process and the size of the stored cache."""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        stats: Dict[str, Any] = {
+            **self._stats,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            "entries": 0,
+            "total_bytes": 0,
+            "providers": {},
+        }
+
+        if self.db.is_initialized:
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    """
+                    SELECT provider, COUNT(*), COALESCE(SUM(size_bytes), 0)
+                    FROM llm_cache GROUP BY provider
+                    """
+                )
+                for provider, count, size in await cursor.fetchall():
+                    stats["providers"][provider] = count
+                    stats["entries"] += count
+                    stats["total_bytes"] += size
+
+        return stats
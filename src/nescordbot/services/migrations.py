@@ -6,6 +6,7 @@ execution, rollback capabilities, and integrity verification.
 """
 
 import asyncio
+import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
@@ -14,6 +15,7 @@ from typing import Any, Dict, List, Optional
 import aiosqlite
 
 from ..logger import get_logger
+from .note_history import NoteHistoryStore
 
 
 @dataclass
@@ -27,6 +29,16 @@ class MigrationInfo:
     checksum: Optional[str] = None
 
 
+async def fts5_available(connection: aiosqlite.Connection) -> bool:
+    """Check whether this SQLite build can create FTS5 tables."""
+    try:
+        await connection.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(probe)")
+    except aiosqlite.OperationalError:
+        return False
+    await connection.execute("DROP TABLE temp.fts5_probe")
+    return True
+
+
 class Migration(ABC):
     """Base class for database migrations."""
 
@@ -311,9 +323,7 @@ class CreateFTS5IndexMigration(Migration):
     async def up(self, connection: aiosqlite.Connection) -> None:
         """Create FTS5 virtual table."""
         # Check if FTS5 is available
-        try:
-            await connection.execute("SELECT fts5_version()")
-        except aiosqlite.OperationalError:
+        if not await fts5_available(connection):
             # FTS5 not available - log warning and skip
             import logging
 
@@ -532,6 +542,675 @@ class CreateReviewCacheMigration(Migration):
         await connection.execute("DROP TABLE IF EXISTS review_cache")
 
 
+class CreateSyncOutboxMigration(Migration):
+    """Migration 009: Create sync_outbox table for transactional note sync."""
+
+    def __init__(self):
+        super().__init__(
+            version=9,
+            name="create_sync_outbox",
+            description="Create sync_outbox table for background ChromaDB/Obsidian sync",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create sync_outbox table."""
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                note_id TEXT NOT NULL,
+                operation TEXT NOT NULL CHECK (operation IN ('upsert', 'delete')),
+                status TEXT NOT NULL DEFAULT 'pending'
+                    CHECK (status IN ('pending', 'failed')),
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_error TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+        # Create indexes for draining due entries and coalescing per note
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_sync_outbox_due
+            ON sync_outbox(status, next_attempt_at)
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_sync_outbox_note_id
+            ON sync_outbox(note_id)
+        """
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop sync_outbox table."""
+        await connection.execute("DROP INDEX IF EXISTS idx_sync_outbox_due")
+        await connection.execute("DROP INDEX IF EXISTS idx_sync_outbox_note_id")
+        await connection.execute("DROP TABLE IF EXISTS sync_outbox")
+
+
+class PartitionKnowledgeNotesByGuildMigration(Migration):
+    """Migration 010: Index knowledge notes by guild and partition the FTS5 index."""
+
+    FTS_COLUMNS = {
+        "with_guild": ("title", "content", "tags", "guild_id"),
+        "without_guild": ("title", "content", "tags"),
+    }
+
+    def __init__(self):
+        super().__init__(
+            version=10,
+            name="partition_notes_by_guild",
+            description="Add guild_id index and guild_id column to the FTS5 index",
+        )
+
+    async def _fts_available(self, connection: aiosqlite.Connection) -> bool:
+        """Check whether the FTS5 index exists."""
+        cursor = await connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name='knowledge_notes_fts'"
+        )
+        return await cursor.fetchone() is not None
+
+    async def _rebuild_fts(self, connection: aiosqlite.Connection, columns: tuple) -> None:
+        """Recreate the FTS5 table and triggers over the given columns."""
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        await connection.execute("DROP TRIGGER IF EXISTS knowledge_notes_fts_insert")
+        await connection.execute("DROP TRIGGER IF EXISTS knowledge_notes_fts_delete")
+        await connection.execute("DROP TRIGGER IF EXISTS knowledge_notes_fts_update")
+        await connection.execute("DROP TABLE IF EXISTS knowledge_notes_fts")
+
+        await connection.execute(
+            f"""
+            CREATE VIRTUAL TABLE knowledge_notes_fts USING fts5(
+                {column_list},
+                content=knowledge_notes,
+                content_rowid=rowid,
+                tokenize='unicode61'
+            )
+        """
+        )
+
+        await connection.execute(
+            f"""
+            CREATE TRIGGER knowledge_notes_fts_insert AFTER INSERT ON knowledge_notes
+            BEGIN
+                INSERT INTO knowledge_notes_fts(rowid, {column_list})
+                VALUES (new.rowid, {new_values});
+            END
+        """
+        )
+
+        await connection.execute(
+            f"""
+            CREATE TRIGGER knowledge_notes_fts_delete AFTER DELETE ON knowledge_notes
+            BEGIN
+                INSERT INTO knowledge_notes_fts(knowledge_notes_fts, rowid, {column_list})
+                VALUES ('delete', old.rowid, {old_values});
+            END
+        """
+        )
+
+        await connection.execute(
+            f"""
+            CREATE TRIGGER knowledge_notes_fts_update AFTER UPDATE ON knowledge_notes
+            BEGIN
+                INSERT INTO knowledge_notes_fts(knowledge_notes_fts, rowid, {column_list})
+                VALUES ('delete', old.rowid, {old_values});
+                INSERT INTO knowledge_notes_fts(rowid, {column_list})
+                VALUES (new.rowid, {new_values});
+            END
+        """
+        )
+
+        # Re-index existing notes from the content table
+        await connection.execute(
+            "INSERT INTO knowledge_notes_fts(knowledge_notes_fts) VALUES('rebuild')"
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create guild index and add guild_id to the FTS5 index."""
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_knowledge_notes_guild_id
+            ON knowledge_notes(guild_id)
+        """
+        )
+
+        # FTS5 unavailable (migration 005 skipped) - keyword search is disabled anyway
+        if await self._fts_available(connection):
+            await self._rebuild_fts(connection, self.FTS_COLUMNS["with_guild"])
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Restore the migration 005 FTS5 index and drop the guild index."""
+        if await self._fts_available(connection):
+            await self._rebuild_fts(connection, self.FTS_COLUMNS["without_guild"])
+        await connection.execute("DROP INDEX IF EXISTS idx_knowledge_notes_guild_id")
+
+
+class CreateReindexJobsMigration(Migration):
+    """Migration 011: Create reindex_jobs table for resumable bulk re-embedding."""
+
+    def __init__(self):
+        super().__init__(
+            version=11,
+            name="create_reindex_jobs",
+            description="Create reindex_jobs table holding re-index job checkpoints",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create reindex_jobs table."""
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reindex_jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                mode TEXT NOT NULL CHECK (mode IN ('missing', 'full')),
+                status TEXT NOT NULL DEFAULT 'running'
+                    CHECK (status IN ('running', 'paused', 'cancelled', 'completed', 'failed')),
+                cursor TEXT,
+                total_notes INTEGER NOT NULL DEFAULT 0,
+                processed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_by TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                completed_at DATETIME
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_reindex_jobs_status
+            ON reindex_jobs(status)
+        """
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop reindex_jobs table."""
+        await connection.execute("DROP INDEX IF EXISTS idx_reindex_jobs_status")
+        await connection.execute("DROP TABLE IF EXISTS reindex_jobs")
+
+
+class CreateUnresolvedLinksMigration(Migration):
+    """Migration 012: Index note titles and record wiki-links awaiting a target."""
+
+    def __init__(self):
+        super().__init__(
+            version=12,
+            name="create_unresolved_links",
+            description="Index knowledge_notes titles and add unresolved_links for backfill",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create the title index and unresolved_links table."""
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_knowledge_notes_title
+            ON knowledge_notes(title)
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS unresolved_links (
+                from_note_id TEXT NOT NULL,
+                target_title TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (from_note_id, target_title),
+                FOREIGN KEY (from_note_id) REFERENCES knowledge_notes(id)
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_unresolved_links_target_title
+            ON unresolved_links(target_title)
+        """
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop unresolved_links table and the title index."""
+        await connection.execute("DROP INDEX IF EXISTS idx_unresolved_links_target_title")
+        await connection.execute("DROP TABLE IF EXISTS unresolved_links")
+        await connection.execute("DROP INDEX IF EXISTS idx_knowledge_notes_title")
+
+
+class CreateVaultImportsMigration(Migration):
+    """Migration 013: Create vault_imports table for restartable Obsidian imports."""
+
+    def __init__(self):
+        super().__init__(
+            version=13,
+            name="create_vault_imports",
+            description="Create vault_imports table tracking Obsidian vault import progress",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create vault_imports table."""
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS vault_imports (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                source TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'running'
+                    CHECK (status IN ('running', 'completed', 'failed')),
+                files_seen INTEGER NOT NULL DEFAULT 0,
+                imported INTEGER NOT NULL DEFAULT 0,
+                skipped INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                links_resolved INTEGER NOT NULL DEFAULT 0,
+                links_unresolved INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_by TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                completed_at DATETIME
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_vault_imports_source
+            ON vault_imports(source, status)
+        """
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop vault_imports table."""
+        await connection.execute("DROP INDEX IF EXISTS idx_vault_imports_source")
+        await connection.execute("DROP TABLE IF EXISTS vault_imports")
+
+
+class CreateNoteTagsMigration(Migration):
+    """Migration 014: Create note_tags, one row per tag of a note, kept by triggers."""
+
+    # knowledge_notes.tags is a JSON array; anything else contributes no tags
+    TAGS_JSON = "CASE WHEN json_valid({0}) THEN {0} ELSE '[]' END"
+
+    def __init__(self):
+        super().__init__(
+            version=14,
+            name="create_note_tags",
+            description="Create note_tags index of knowledge_notes tags with sync triggers",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create note_tags, its triggers, and backfill existing notes."""
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS note_tags (
+                note_id TEXT NOT NULL,
+                tag TEXT NOT NULL,
+                PRIMARY KEY (note_id, tag),
+                FOREIGN KEY (note_id) REFERENCES knowledge_notes(id)
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_note_tags_tag
+            ON note_tags(tag)
+        """
+        )
+
+        new_tags = self.TAGS_JSON.format("new.tags")
+        await connection.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS note_tags_insert AFTER INSERT ON knowledge_notes
+            BEGIN
+                INSERT OR IGNORE INTO note_tags (note_id, tag)
+                SELECT new.id, value FROM json_each({new_tags})
+                WHERE type = 'text' AND value != '';
+            END
+        """
+        )
+
+        await connection.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS note_tags_update
+            AFTER UPDATE OF id, tags ON knowledge_notes
+            BEGIN
+                DELETE FROM note_tags WHERE note_id = old.id;
+                INSERT OR IGNORE INTO note_tags (note_id, tag)
+                SELECT new.id, value FROM json_each({new_tags})
+                WHERE type = 'text' AND value != '';
+            END
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS note_tags_delete AFTER DELETE ON knowledge_notes
+            BEGIN
+                DELETE FROM note_tags WHERE note_id = old.id;
+            END
+        """
+        )
+
+        await connection.execute(
+            f"""
+            INSERT OR IGNORE INTO note_tags (note_id, tag)
+            SELECT kn.id, je.value
+            FROM knowledge_notes kn, json_each({self.TAGS_JSON.format("kn.tags")}) je
+            WHERE je.type = 'text' AND je.value != ''
+        """
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop note_tags table and its triggers."""
+        await connection.execute("DROP TRIGGER IF EXISTS note_tags_insert")
+        await connection.execute("DROP TRIGGER IF EXISTS note_tags_update")
+        await connection.execute("DROP TRIGGER IF EXISTS note_tags_delete")
+        await connection.execute("DROP INDEX IF EXISTS idx_note_tags_tag")
+        await connection.execute("DROP TABLE IF EXISTS note_tags")
+
+
+class CreateLLMCacheMigration(Migration):
+    """Migration 015: Create llm_cache table for persistent LLM responses."""
+
+    def __init__(self):
+        super().__init__(
+            version=15,
+            name="create_llm_cache",
+            description="Create llm_cache table of LLM responses keyed by request digest",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create llm_cache table."""
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                cache_key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                hit_count INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL,
+                expires_at TEXT,
+                last_accessed_at TEXT NOT NULL
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_last_accessed
+            ON llm_cache(last_accessed_at)
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_llm_cache_expires
+            ON llm_cache(expires_at)
+        """
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop llm_cache table."""
+        await connection.execute("DROP INDEX IF EXISTS idx_llm_cache_expires")
+        await connection.execute("DROP INDEX IF EXISTS idx_llm_cache_last_accessed")
+        await connection.execute("DROP TABLE IF EXISTS llm_cache")
+
+
+class CompactNoteHistoryMigration(Migration):
+    """Migration 016: Store note_history as a compressed reverse-delta chain."""
+
+    def __init__(self):
+        super().__init__(
+            version=16,
+            name="compact_note_history",
+            description="Add versioned delta columns to note_history and compact existing rows",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Add delta chain columns and convert full-copy history rows."""
+        for column in (
+            "version INTEGER",
+            "before_delta BLOB",
+            "after_payload BLOB",
+            "is_snapshot INTEGER NOT NULL DEFAULT 0",
+        ):
+            try:
+                await connection.execute(f"ALTER TABLE note_history ADD COLUMN {column}")
+            except aiosqlite.OperationalError:
+                pass  # Column already exists
+
+        await connection.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_note_history_version
+            ON note_history(note_id, version)
+        """
+        )
+
+        store = NoteHistoryStore()
+        cursor = await connection.execute(
+            "SELECT DISTINCT note_id FROM note_history WHERE version IS NULL"
+        )
+        for (note_id,) in await cursor.fetchall():
+            await store.compact(connection, note_id)
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Restore full before/after copies and clear the delta chain."""
+        store = NoteHistoryStore()
+        cursor = await connection.execute(
+            "SELECT DISTINCT note_id FROM note_history WHERE version IS NOT NULL"
+        )
+        for (note_id,) in await cursor.fetchall():
+            for edit in await store.get_recent(connection, note_id):
+                before, after = edit["before"], edit["after"]
+                await connection.execute(
+                    """
+                    UPDATE note_history SET
+                        title_before = ?, content_before = ?, tags_before = ?,
+                        title_after = ?, content_after = ?, tags_after = ?
+                    WHERE id = ?
+                    """,
+                    (
+                        before["title"],
+                        before["content"],
+                        json.dumps(before["tags"], ensure_ascii=False),
+                        after["title"],
+                        after["content"],
+                        json.dumps(after["tags"], ensure_ascii=False),
+                        edit["id"],
+                    ),
+                )
+
+        # SQLite cannot drop columns; clearing them lets up() compact again
+        await connection.execute(
+            """
+            UPDATE note_history
+            SET version = NULL, before_delta = NULL, after_payload = NULL, is_snapshot = 0
+        """
+        )
+        await connection.execute("DROP INDEX IF EXISTS idx_note_history_version")
+
+
+class CreateNoteTermsMigration(Migration):
+    """Migration 017: Create note_terms inverted index for link suggestion candidates."""
+
+    def __init__(self):
+        super().__init__(
+            version=17,
+            name="create_note_terms",
+            description="Create note_terms keyword index with a trigger-fed reindex queue",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create note_terms, its reindex queue and triggers, and queue existing notes."""
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS note_terms (
+                term TEXT NOT NULL,
+                note_id TEXT NOT NULL,
+                PRIMARY KEY (term, note_id),
+                FOREIGN KEY (note_id) REFERENCES knowledge_notes(id)
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_note_terms_note_id
+            ON note_terms(note_id)
+        """
+        )
+
+        # Terms are extracted in Python, so writes only queue the note for reindexing
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS note_terms_pending (
+                note_id TEXT PRIMARY KEY
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS note_terms_insert AFTER INSERT ON knowledge_notes
+            BEGIN
+                INSERT OR IGNORE INTO note_terms_pending (note_id) VALUES (new.id);
+            END
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS note_terms_update
+            AFTER UPDATE OF title, content, tags ON knowledge_notes
+            BEGIN
+                INSERT OR IGNORE INTO note_terms_pending (note_id) VALUES (new.id);
+            END
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS note_terms_delete AFTER DELETE ON knowledge_notes
+            BEGIN
+                DELETE FROM note_terms WHERE note_id = old.id;
+                DELETE FROM note_terms_pending WHERE note_id = old.id;
+            END
+        """
+        )
+
+        await connection.execute(
+            "INSERT OR IGNORE INTO note_terms_pending (note_id) SELECT id FROM knowledge_notes"
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop note_terms tables and their triggers."""
+        await connection.execute("DROP TRIGGER IF EXISTS note_terms_insert")
+        await connection.execute("DROP TRIGGER IF EXISTS note_terms_update")
+        await connection.execute("DROP TRIGGER IF EXISTS note_terms_delete")
+        await connection.execute("DROP TABLE IF EXISTS note_terms_pending")
+        await connection.execute("DROP INDEX IF EXISTS idx_note_terms_note_id")
+        await connection.execute("DROP TABLE IF EXISTS note_terms")
+
+
+class CreateNoteNeighborsMigration(Migration):
+    """Migration 018: Create note_neighbors table of precomputed related notes."""
+
+    def __init__(self):
+        super().__init__(
+            version=18,
+            name="create_note_neighbors",
+            description="Create note_neighbors nearest-neighbour table and its refresh state",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create note_neighbors, its refresh state and cleanup trigger."""
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS note_neighbors (
+                note_id TEXT NOT NULL,
+                neighbor_id TEXT NOT NULL,
+                score REAL NOT NULL,
+                method TEXT NOT NULL DEFAULT 'vector',
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (note_id, method, neighbor_id),
+                FOREIGN KEY (note_id) REFERENCES knowledge_notes(id),
+                FOREIGN KEY (neighbor_id) REFERENCES knowledge_notes(id)
+            )
+        """
+        )
+
+        # Reverse lookup of the lists a changed note appears in
+        await connection.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_note_neighbors_neighbor_id
+            ON note_neighbors(neighbor_id)
+        """
+        )
+
+        # Embedding hash each note's neighbours were last computed from
+        await connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS note_neighbors_state (
+                note_id TEXT PRIMARY KEY,
+                embedding_hash TEXT,
+                refreshed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+
+        await connection.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS note_neighbors_delete AFTER DELETE ON knowledge_notes
+            BEGIN
+                DELETE FROM note_neighbors WHERE note_id = old.id OR neighbor_id = old.id;
+                DELETE FROM note_neighbors_state WHERE note_id = old.id;
+            END
+        """
+        )
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Drop note_neighbors tables and their trigger."""
+        await connection.execute("DROP TRIGGER IF EXISTS note_neighbors_delete")
+        await connection.execute("DROP TABLE IF EXISTS note_neighbors_state")
+        await connection.execute("DROP INDEX IF EXISTS idx_note_neighbors_neighbor_id")
+        await connection.execute("DROP TABLE IF EXISTS note_neighbors")
+
+
+class CreateMissingFTS5IndexMigration(Migration):
+    """Migration 019: Create the FTS5 index where migration 005 skipped it.
+
+    Migration 005 probed for FTS5 with a function SQLite does not have, so it
+    skipped the index even on builds with FTS5 and keyword search had nothing
+    to query.
+    """
+
+    def __init__(self):
+        super().__init__(
+            version=19,
+            name="create_missing_fts5_index",
+            description="Create the guild-partitioned FTS5 index if it does not exist",
+        )
+
+    async def up(self, connection: aiosqlite.Connection) -> None:
+        """Create and fill the FTS5 index if it is missing and FTS5 is available."""
+        partition = PartitionKnowledgeNotesByGuildMigration()
+        if await partition._fts_available(connection) or not await fts5_available(connection):
+            return
+        await partition._rebuild_fts(connection, partition.FTS_COLUMNS["with_guild"])
+
+    async def down(self, connection: aiosqlite.Connection) -> None:
+        """Keep the index; migrations 005 and 010 own its removal."""
+
+
 class DatabaseMigrationManager:
     """
     Database migration management system.
@@ -565,6 +1244,17 @@ class DatabaseMigrationManager:
             CreateSearchHistoryMigration(),
             CreateNoteHistoryMigration(),
             CreateReviewCacheMigration(),
+            CreateSyncOutboxMigration(),
+            PartitionKnowledgeNotesByGuildMigration(),
+            CreateReindexJobsMigration(),
+            CreateUnresolvedLinksMigration(),
+            CreateVaultImportsMigration(),
+            CreateNoteTagsMigration(),
+            CreateLLMCacheMigration(),
+            CompactNoteHistoryMigration(),
+            CreateNoteTermsMigration(),
+            CreateNoteNeighborsMigration(),
+            CreateMissingFTS5IndexMigration(),
         ]
 
         # Verify version sequence
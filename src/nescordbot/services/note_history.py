@@ -0,0 +1,343 @@
+"""
+Delta-compressed note edit history.
+
+Each edit of a note is one ``note_history`` row with a per-note ``version``.
+Rows form a reverse-delta chain: the newest row holds a full snapshot of the
+note after the edit, and older rows hold only the delta that turns the next
+row's "before" state back into their own "after" state. Every
+``snapshot_interval``-th version also keeps its full snapshot, so rebuilding
+any version applies a bounded number of deltas. Payloads are zlib-compressed
+JSON, so a long note edited many times costs its size once plus the size of
+its changes instead of two full copies per edit.
+"""
+
+import difflib
+import json
+import logging
+import zlib
+from typing import Any, Dict, List, Optional
+
+import aiosqlite
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SNAPSHOT_INTERVAL = 20
+
+NoteState = Dict[str, Any]
+
+
+def pack(data: Any) -> bytes:
+    """Serialize data as zlib-compressed JSON."""
+    return zlib.compress(
+        json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    )
+
+
+def unpack(blob: bytes) -> Any:
+    """Inverse of pack()."""
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def make_delta(source: NoteState, target: NoteState) -> Dict[str, Any]:
+    """
+    Delta turning one note state into another.
+
+    Title and tags are stored only when they changed. Content is a list of
+    line operations: ``[i1, i2]`` copies source lines i1 to i2, a string
+    inserts text.
+
+    Args:
+        source: Note state with title, content and tags
+        target: Note state to reach from source
+
+    Returns:
+        Delta for apply_delta()
+    """
+    delta: Dict[str, Any] = {}
+    if source["title"] != target["title"]:
+        delta["title"] = target["title"]
+    if source["tags"] != target["tags"]:
+        delta["tags"] = target["tags"]
+
+    if source["content"] != target["content"]:
+        source_lines = source["content"].splitlines(keepends=True)
+        target_lines = target["content"].splitlines(keepends=True)
+        ops: List[Any] = []
+        matcher = difflib.SequenceMatcher(None, source_lines, target_lines)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                ops.append([i1, i2])
+            elif j2 > j1:
+                ops.append("".join(target_lines[j1:j2]))
+        delta["content"] = ops
+
+    return delta
+
+
+def apply_delta(source: NoteState, delta: Dict[str, Any]) -> NoteState:
+    """Apply a delta from make_delta() to a note state."""
+    content = source["content"]
+    if "content" in delta:
+        lines = content.splitlines(keepends=True)
+        parts: List[str] = []
+        for op in delta["content"]:
+            if isinstance(op, list):
+                parts.extend(lines[op[0] : op[1]])
+            else:
+                parts.append(op)
+        content = "".join(parts)
+
+    return {
+        "title": delta.get("title", source["title"]),
+        "content": content,
+        "tags": delta.get("tags", source["tags"]),
+    }
+
+
+class NoteHistoryStore:
+    """
+    Reverse-delta chain of note versions in the note_history table.
+
+    Version 0 is the note before its first tracked edit and version N the
+    note after its N-th edit. Each row stores:
+    - before_delta: delta from the row's after state to its before state
+    - after_payload: the full after state when is_snapshot is set, otherwise
+      the delta from the next version's before state to this after state
+
+    Features:
+    - Appending an edit touches only the new row and the previous head
+    - Full snapshots at the head and every snapshot_interval versions
+    - Any version rebuilt from its nearest newer snapshot
+    - Compaction of rows written with full legacy before/after columns
+    """
+
+    def __init__(self, snapshot_interval: int = DEFAULT_SNAPSHOT_INTERVAL) -> None:
+        """
+        Initialize NoteHistoryStore.
+
+        Args:
+            snapshot_interval: Keep a full snapshot every this many versions
+        """
+        self.snapshot_interval = max(1, snapshot_interval)
+
+    async def append(
+        self,
+        conn: aiosqlite.Connection,
+        note_id: str,
+        before: NoteState,
+        after: NoteState,
+        user_id: str,
+        edit_type: str = "update",
+    ) -> int:
+        """
+        Record an edit on the caller's connection.
+
+        Args:
+            conn: Connection of the transaction updating the note
+            note_id: Edited note
+            before: Note state before the edit
+            after: Note state after the edit
+            user_id: User who made the edit
+            edit_type: Kind of edit
+
+        Returns:
+            Version number of the edit
+        """
+        version = await self._demote_head(conn, note_id, before)
+        await conn.execute(
+            """
+            INSERT INTO note_history (
+                note_id, version, before_delta, after_payload, is_snapshot, user_id, edit_type
+            ) VALUES (?, ?, ?, ?, 1, ?, ?)
+            """,
+            (
+                note_id,
+                version,
+                pack(make_delta(after, before)),
+                pack(after),
+                user_id,
+                edit_type,
+            ),
+        )
+        return version
+
+    async def _demote_head(
+        self, conn: aiosqlite.Connection, note_id: str, before: NoteState
+    ) -> int:
+        """
+        Make room for a new head version.
+
+        The current head keeps its snapshot on interval boundaries and is
+        otherwise replaced by a delta from the new edit's before state.
+
+        Returns:
+            Version number of the new head
+        """
+        cursor = await conn.execute(
+            """
+            SELECT id, version, after_payload FROM note_history
+            WHERE note_id = ? AND version IS NOT NULL
+            ORDER BY version DESC LIMIT 1
+            """,
+            (note_id,),
+        )
+        head = await cursor.fetchone()
+        if head is None:
+            return 1
+
+        head_id, head_version, head_payload = head
+        if head_version % self.snapshot_interval != 0:
+            await conn.execute(
+                "UPDATE note_history SET after_payload = ?, is_snapshot = 0 WHERE id = ?",
+                (pack(make_delta(before, unpack(head_payload))), head_id),
+            )
+        return int(head_version) + 1
+
+    async def get_version(
+        self, conn: aiosqlite.Connection, note_id: str, version: int
+    ) -> Optional[NoteState]:
+        """
+        Rebuild a version of a note.
+
+        Args:
+            conn: Database connection
+            note_id: Note ID
+            version: 0 for the note before its first edit, N after its N-th edit
+
+        Returns:
+            Note state with title, content and tags, or None if the version
+            does not exist
+        """
+        if version < 0:
+            return None
+
+        first = max(version, 1)
+        cursor = await conn.execute(
+            """
+            SELECT before_delta, after_payload, is_snapshot FROM note_history
+            WHERE note_id = ? AND version >= ? AND version <= (
+                SELECT MIN(version) FROM note_history
+                WHERE note_id = ? AND is_snapshot = 1 AND version >= ?
+            )
+            ORDER BY version DESC
+            """,
+            (note_id, first, note_id, first),
+        )
+        rows = list(await cursor.fetchall())
+        if not rows:
+            return None
+
+        state: NoteState = unpack(rows[0][1])
+        before_delta = rows[0][0]
+        for row_before_delta, after_payload, is_snapshot in rows[1:]:
+            if is_snapshot:
+                state = unpack(after_payload)
+            else:
+                state = apply_delta(apply_delta(state, unpack(before_delta)), unpack(after_payload))
+            before_delta = row_before_delta
+
+        if version == 0:
+            state = apply_delta(state, unpack(before_delta))
+        return state
+
+    async def get_recent(
+        self, conn: aiosqlite.Connection, note_id: str, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Latest edits of a note with their full before and after states.
+
+        Args:
+            conn: Database connection
+            note_id: Note ID
+            limit: Maximum number of edits; all when None
+
+        Returns:
+            Edits newest first, with id, version, user_id, edit_type,
+            timestamp, before and after
+        """
+        cursor = await conn.execute(
+            """
+            SELECT id, version, before_delta, after_payload, is_snapshot,
+                   user_id, edit_type, timestamp
+            FROM note_history
+            WHERE note_id = ? AND version IS NOT NULL
+            ORDER BY version DESC
+            LIMIT ?
+            """,
+            (note_id, -1 if limit is None else limit),
+        )
+        rows = await cursor.fetchall()
+
+        edits: List[Dict[str, Any]] = []
+        next_before: Optional[NoteState] = None
+        for row in rows:
+            history_id, version, before_delta, after_payload, is_snapshot = row[:5]
+            if is_snapshot or next_before is None:
+                after = unpack(after_payload)
+            else:
+                after = apply_delta(next_before, unpack(after_payload))
+            before = apply_delta(after, unpack(before_delta))
+            next_before = before
+
+            edits.append(
+                {
+                    "id": history_id,
+                    "version": version,
+                    "user_id": row[5],
+                    "edit_type": row[6],
+                    "timestamp": row[7],
+                    "before": before,
+                    "after": after,
+                }
+            )
+
+        return edits
+
+    async def compact(self, conn: aiosqlite.Connection, note_id: str) -> int:
+        """
+        Convert a note's legacy full-copy rows into the delta chain.
+
+        Legacy rows are chained in timestamp order after any existing
+        versions, and their title/content/tags columns are cleared.
+
+        Returns:
+            Number of rows compacted
+        """
+        cursor = await conn.execute(
+            """
+            SELECT id, title_before, content_before, tags_before,
+                   title_after, content_after, tags_after
+            FROM note_history
+            WHERE note_id = ? AND version IS NULL
+            ORDER BY timestamp, id
+            """,
+            (note_id,),
+        )
+        rows = list(await cursor.fetchall())
+
+        for row in rows:
+            history_id = row[0]
+            before = _legacy_state(row[1], row[2], row[3])
+            after = _legacy_state(row[4], row[5], row[6])
+            version = await self._demote_head(conn, note_id, before)
+            await conn.execute(
+                """
+                UPDATE note_history SET
+                    version = ?, before_delta = ?, after_payload = ?, is_snapshot = 1,
+                    title_before = NULL, content_before = NULL, tags_before = NULL,
+                    title_after = NULL, content_after = NULL, tags_after = NULL
+                WHERE id = ?
+                """,
+                (version, pack(make_delta(after, before)), pack(after), history_id),
+            )
+
+        return len(rows)
+
+
+def _legacy_state(title: Optional[str], content: Optional[str], tags: Optional[str]) -> NoteState:
+    """Note state from the legacy full-copy columns."""
+    return {
+        "title": title or "",
+        "content": content or "",
+        "tags": json.loads(tags) if tags else [],
+    }
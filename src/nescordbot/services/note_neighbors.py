@@ -0,0 +1,413 @@
+"""
+Precomputed nearest-neighbour "related notes".
+
+The ``note_neighbors`` table holds the closest notes of every synced note by
+embedding similarity. A background worker compares the embedding hashes in
+``sync_metadata`` with the hashes the table was built from, and refreshes
+only the notes whose embedding changed together with the notes that listed
+them as neighbours. Related-note buttons, link suggestions and merge
+suggestions then read a note's neighbours with one indexed query instead of
+searching the vector store on every request.
+"""
+
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+import aiosqlite
+
+from ..config import BotConfig
+from .database import DatabaseService
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+
+async def get_note_embedding(
+    db: DatabaseService, vector_store: VectorStore, note_id: str
+) -> Optional[List[float]]:
+    """
+    Stored embedding of a note, averaged over its chunks.
+
+    Args:
+        db: Database service holding sync_chunks
+        vector_store: Store holding the note's documents
+        note_id: Note ID
+
+    Returns:
+        The embedding, or None if the note has not been synced
+    """
+    # Short notes are a single document; chunked notes are listed in sync_chunks
+    doc_ids = [f"note_{note_id}"]
+    try:
+        async with db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT chromadb_doc_id FROM sync_chunks WHERE note_id = ?", (note_id,)
+            )
+            doc_ids.extend(row[0] for row in await cursor.fetchall() if row[0] not in doc_ids)
+    except Exception as e:
+        logger.debug(f"No chunk records for note {note_id}: {e}")
+
+    documents = await vector_store.get_documents(doc_ids, include=("embeddings",))
+    embeddings = [document.embedding for document in documents if document.embedding]
+    if not embeddings:
+        return None
+    if len(embeddings) == 1:
+        return list(embeddings[0])
+    return [sum(values) / len(embeddings) for values in zip(*embeddings)]
+
+
+class NoteNeighborIndex:
+    """
+    Maintains the note_neighbors table of related notes.
+
+    Features:
+    - Top-k embedding neighbours per note, scoped to the note's guild
+    - Incremental refresh driven by sync_metadata embedding hashes
+    - Only changed notes and their reverse neighbours are re-queried
+    - Changed notes are merged into the lists of the notes they hit without a query
+    - Background worker polling for changed embeddings
+    """
+
+    VECTOR = "vector"
+
+    def __init__(
+        self,
+        config: BotConfig,
+        database_service: DatabaseService,
+        vector_store: Optional[VectorStore],
+    ) -> None:
+        """
+        Initialize NoteNeighborIndex.
+
+        Args:
+            config: Bot configuration
+            database_service: Database service holding note_neighbors
+            vector_store: Store of note embeddings; the index stays empty without one
+        """
+        self.config = config
+        self.db = database_service
+        self.vector_store = vector_store
+
+        self.neighbors_per_note = getattr(config, "note_neighbors_k", 10)
+        self.batch_size = getattr(config, "note_neighbors_batch_size", 50)
+        self.refresh_interval = getattr(config, "note_neighbors_refresh_interval", 300.0)
+        # Chunked notes return several hits each, so over-fetch and keep the best
+        self.chunk_overfetch = 3
+
+        self._worker_task: Optional[asyncio.Task] = None
+        self._worker_shutdown = asyncio.Event()
+
+    async def get_neighbors(
+        self,
+        note_id: str,
+        limit: int = 5,
+        method: str = VECTOR,
+        exclude_linked: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Precomputed related notes of a note.
+
+        Args:
+            note_id: Note ID
+            limit: Maximum number of notes
+            method: Relatedness measure the neighbours were computed with
+            exclude_linked: Leave out notes already linked in either direction
+
+        Returns:
+            Note dicts with id, title, content, tags, source_type, created_at
+            and score, most related first
+        """
+        link_filter = ""
+        if exclude_linked:
+            link_filter = """
+                AND NOT EXISTS (
+                    SELECT 1 FROM note_links
+                    WHERE from_note_id = nn.note_id AND to_note_id = nn.neighbor_id
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM note_links
+                    WHERE to_note_id = nn.note_id AND from_note_id = nn.neighbor_id
+                )
+            """
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT kn.id, kn.title, kn.content, kn.tags, kn.source_type, kn.created_at,
+                       nn.score
+                FROM note_neighbors nn
+                JOIN knowledge_notes kn ON kn.id = nn.neighbor_id
+                WHERE nn.note_id = ? AND nn.method = ?
+                {link_filter}
+                ORDER BY nn.score DESC
+                LIMIT ?
+                """,
+                (note_id, method, limit),
+            )
+            rows = await cursor.fetchall()
+
+        neighbors = []
+        for row in rows:
+            try:
+                tags = json.loads(row[3]) if row[3] else []
+            except (json.JSONDecodeError, TypeError):
+                tags = []
+            neighbors.append(
+                {
+                    "id": row[0],
+                    "title": row[1],
+                    "content": row[2],
+                    "tags": tags if isinstance(tags, list) else [],
+                    "source_type": row[4],
+                    "created_at": row[5],
+                    "score": row[6],
+                }
+            )
+        return neighbors
+
+    async def get_scores(self, note_id: str, method: str = VECTOR) -> Dict[str, float]:
+        """Neighbour note IDs of a note mapped to their scores."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT neighbor_id, score FROM note_neighbors WHERE note_id = ? AND method = ?",
+                (note_id, method),
+            )
+            return {row[0]: row[1] for row in await cursor.fetchall()}
+
+    async def refresh(self) -> int:
+        """
+        Refresh the neighbours of notes whose embedding changed.
+
+        Processes up to batch_size changed notes. Their neighbour lists are
+        recomputed, as are the lists of up to batch_size notes that had them
+        as neighbours; the remaining such notes are queued as changed for a
+        later call. Other notes the changed note's query hit gain it if it now
+        ranks in their top k, so no further queries are needed.
+
+        A note without a stored embedding loses its list and is retried on
+        later calls, after the notes waiting longer.
+
+        Returns:
+            Number of changed notes refreshed from their embedding
+        """
+        if self.vector_store is None or not self.db.is_initialized:
+            return 0
+
+        async with self.db.get_connection() as conn:
+            try:
+                cursor = await conn.execute(
+                    """
+                    SELECT sm.note_id, sm.embedding_hash, kn.guild_id
+                    FROM sync_metadata sm
+                    JOIN knowledge_notes kn ON kn.id = sm.note_id
+                    LEFT JOIN note_neighbors_state s ON s.note_id = sm.note_id
+                    WHERE sm.sync_status = 'synced'
+                    AND (s.note_id IS NULL OR s.embedding_hash IS NOT sm.embedding_hash)
+                    ORDER BY s.refreshed_at
+                    LIMIT ?
+                    """,
+                    (self.batch_size,),
+                )
+            except aiosqlite.OperationalError as e:
+                # sync_metadata is created by SyncManager on its first start
+                logger.debug(f"No sync metadata to refresh neighbours from: {e}")
+                return 0
+            changed = {row[0]: (row[1], row[2]) for row in await cursor.fetchall()}
+            if not changed:
+                return 0
+
+            # Lists that contain a changed note may no longer hold their true top-k
+            placeholders = ", ".join("?" * len(changed))
+            cursor = await conn.execute(
+                f"""
+                SELECT DISTINCT nn.note_id, kn.guild_id
+                FROM note_neighbors nn
+                JOIN knowledge_notes kn ON kn.id = nn.note_id
+                WHERE nn.method = ? AND nn.neighbor_id IN ({placeholders})
+                """,
+                [self.VECTOR, *changed],
+            )
+            affected = {row[0]: row[1] for row in await cursor.fetchall() if row[0] not in changed}
+
+        # Bound the queries per call; the rest are refreshed as changed notes later
+        deferred = list(affected)[self.batch_size :]
+        for note_id in deferred:
+            del affected[note_id]
+
+        hits: Dict[str, Dict[str, float]] = {}
+        missing: List[str] = []
+        for note_id, guild_id in [
+            *((note_id, guild_id) for note_id, (_, guild_id) in changed.items()),
+            *affected.items(),
+        ]:
+            scores = await self._search_neighbors(note_id, guild_id)
+            if scores is None:
+                missing.append(note_id)
+            else:
+                hits[note_id] = scores
+
+        recomputed = {note_id: self._top(scores) for note_id, scores in hits.items()}
+
+        now = datetime.now().isoformat()
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                "DELETE FROM note_neighbors WHERE note_id = ? AND method = ?",
+                [(note_id, self.VECTOR) for note_id in missing],
+            )
+            await conn.executemany(
+                "DELETE FROM note_neighbors_state WHERE note_id = ?",
+                [(note_id,) for note_id in deferred],
+            )
+
+            for note_id, neighbors in recomputed.items():
+                await conn.execute(
+                    "DELETE FROM note_neighbors WHERE note_id = ? AND method = ?",
+                    (note_id, self.VECTOR),
+                )
+                await conn.executemany(
+                    """
+                    INSERT INTO note_neighbors (note_id, neighbor_id, score, method, updated_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (note_id, neighbor_id, score, self.VECTOR, now)
+                        for neighbor_id, score in neighbors.items()
+                    ],
+                )
+
+            # Similarity is symmetric: offer each changed note to every note it hit
+            touched: Set[str] = set()
+            for note_id in changed:
+                for neighbor_id, score in hits.get(note_id, {}).items():
+                    if neighbor_id in recomputed:
+                        continue
+                    await conn.execute(
+                        """
+                        INSERT INTO note_neighbors (note_id, neighbor_id, score, method, updated_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT(note_id, method, neighbor_id) DO UPDATE SET
+                            score = excluded.score, updated_at = excluded.updated_at
+                        """,
+                        (neighbor_id, note_id, score, self.VECTOR, now),
+                    )
+                    touched.add(neighbor_id)
+
+            for note_id in touched:
+                await conn.execute(
+                    """
+                    DELETE FROM note_neighbors
+                    WHERE note_id = ? AND method = ? AND neighbor_id NOT IN (
+                        SELECT neighbor_id FROM note_neighbors
+                        WHERE note_id = ? AND method = ?
+                        ORDER BY score DESC LIMIT ?
+                    )
+                    """,
+                    (note_id, self.VECTOR, note_id, self.VECTOR, self.neighbors_per_note),
+                )
+
+            # Without an embedding no hash is recorded, so the note is retried
+            await conn.executemany(
+                """
+                INSERT INTO note_neighbors_state (note_id, embedding_hash, refreshed_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(note_id) DO UPDATE SET
+                    embedding_hash = excluded.embedding_hash,
+                    refreshed_at = excluded.refreshed_at
+                """,
+                [
+                    (note_id, embedding_hash if note_id in hits else None, now)
+                    for note_id, (embedding_hash, _) in changed.items()
+                ],
+            )
+            await conn.commit()
+
+        refreshed = sum(1 for note_id in changed if note_id in hits)
+        logger.debug(
+            f"Refreshed neighbours of {refreshed} changed and {len(affected)} affected notes"
+            f" ({len(missing)} without embedding, {len(deferred)} deferred)"
+        )
+        return refreshed
+
+    async def _search_neighbors(
+        self, note_id: str, guild_id: Optional[str]
+    ) -> Optional[Dict[str, float]]:
+        """
+        Notes near a note's stored embedding, with the best score of each.
+
+        Returns:
+            Scores of every note hit, or None if the note has no embedding
+        """
+        assert self.vector_store is not None
+
+        embedding = await get_note_embedding(self.db, self.vector_store, note_id)
+        if embedding is None:
+            return None
+
+        n_results = (self.neighbors_per_note + 1) * self.chunk_overfetch
+        results = await self.vector_store.search_documents(
+            embedding,
+            n_results=n_results,
+            where={"guild_id": guild_id} if guild_id else None,
+            include=("metadatas",),
+            max_results=n_results,
+        )
+
+        scores: Dict[str, float] = {}
+        for result in results:
+            neighbor_id = result.metadata.document_id or result.document_id
+            if neighbor_id != note_id and result.score > scores.get(neighbor_id, -1.0):
+                scores[neighbor_id] = result.score
+        return scores
+
+    def _top(self, scores: Dict[str, float]) -> Dict[str, float]:
+        """The neighbors_per_note highest scores."""
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return dict(ranked[: self.neighbors_per_note])
+
+    async def start_worker(self) -> None:
+        """Start refreshing neighbours in the background."""
+        if self._worker_task and not self._worker_task.done():
+            logger.warning("Note neighbour worker already running")
+            return
+
+        self._worker_shutdown.clear()
+        self._worker_task = asyncio.create_task(self._worker_loop())
+        logger.info("Note neighbour worker started")
+
+    async def stop_worker(self) -> None:
+        """Stop the background worker; unprocessed changes are picked up next start."""
+        self._worker_shutdown.set()
+
+        if self._worker_task and not self._worker_task.done():
+            try:
+                await asyncio.wait_for(self._worker_task, timeout=10.0)
+            except asyncio.TimeoutError:
+                self._worker_task.cancel()
+                try:
+                    await self._worker_task
+                except asyncio.CancelledError:
+                    pass
+
+        self._worker_task = None
+        logger.info("Note neighbour worker stopped")
+
+    async def _worker_loop(self) -> None:
+        """Refresh changed notes in batches, polling when none are left."""
+        while not self._worker_shutdown.is_set():
+            try:
+                processed = await self.refresh()
+            except Exception as e:
+                logger.error(f"Note neighbour refresh error: {e}")
+                processed = 0
+
+            if processed >= self.batch_size:
+                # More changed notes are likely waiting
+                continue
+
+            try:
+                await asyncio.wait_for(self._worker_shutdown.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
@@ -8,25 +8,33 @@ using OpenAI's GPT models, extracted from the Voice cog for reusability.
 import asyncio
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, cast
 
 import openai
 from openai import OpenAI
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+from .llm_cache import LLMCache
+
 
 class NoteProcessingService:
     """Service for processing notes with AI."""
 
-    def __init__(self, api_key: Optional[str] = None):
+    MODEL = "gpt-3.5-turbo"
+    # Bump when the request format changes so cached completions are not reused
+    PROMPT_VERSION = "1"
+
+    def __init__(self, api_key: Optional[str] = None, llm_cache: Optional[LLMCache] = None):
         """
         Initialize the note processing service.
 
         Args:
             api_key: OpenAI API key. If None, tries to get from environment.
+            llm_cache: Optional persistent cache; identical requests reuse the stored completion
         """
         self.logger = logging.getLogger(__name__)
         self.openai_client: Optional[OpenAI] = None
+        self.llm_cache = llm_cache
         self._setup_openai(api_key)
 
     def _setup_openai(self, api_key: Optional[str] = None) -> None:
@@ -91,8 +99,8 @@ class NoteProcessingService:
         if self.openai_client is None:
             return text
 
-        response = await self._call_openai_with_retry(
-            model="gpt-3.5-turbo",
+        content = await self._complete(
+            model=self.MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": f"以下のテキストを整形してください:\n\n{text}"},
@@ -101,7 +109,7 @@ class NoteProcessingService:
             timeout=30.0,
         )
 
-        return response.choices[0].message.content or text if response.choices else text
+        return content or text
 
     async def summarize_text(
         self, text: str, system_prompt: str = "1行で要約してください。", max_tokens: int = 100
@@ -120,8 +128,8 @@ class NoteProcessingService:
         if self.openai_client is None:
             return "要約機能は利用できません"
 
-        response = await self._call_openai_with_retry(
-            model="gpt-3.5-turbo",
+        content = await self._complete(
+            model=self.MODEL,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": str(text)},
@@ -131,8 +139,33 @@ class NoteProcessingService:
             timeout=30.0,
         )
 
-        return (
-            response.choices[0].message.content or "要約に失敗しました" if response.choices else "要約に失敗しました"
+        return content or "要約に失敗しました"
+
+    async def _complete(self, **kwargs) -> Optional[str]:
+        """
+        Chat completion text, reused from the LLM cache for identical requests.
+
+        Args:
+            **kwargs: Arguments of chat.completions.create
+
+        Returns:
+            Message content of the first choice, or None if there is none
+        """
+
+        async def create() -> Optional[str]:
+            response = await self._call_openai_with_retry(**kwargs)
+            return response.choices[0].message.content if response.choices else None
+
+        if self.llm_cache is None:
+            return await create()
+
+        # The timeout does not change the completion, so it is not part of the key
+        request = {key: value for key, value in kwargs.items() if key != "timeout"}
+        return cast(
+            Optional[str],
+            await self.llm_cache.get_or_compute(
+                "openai", kwargs["model"], self.PROMPT_VERSION, request, create
+            ),
         )
 
     def _get_prompts(
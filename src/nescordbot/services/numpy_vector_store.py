@@ -0,0 +1,705 @@
+"""
+NumPy brute-force vector store.
+
+Keeps all vectors in a float32 matrix backed by a memory-mapped ``.npy``
+file and answers queries with one vectorized dot product plus a partial
+sort. For corpora up to a few hundred thousand chunks this starts faster,
+queries faster and uses less memory than a ChromaDB PersistentClient.
+
+On-disk layout (one generation at a time, switched atomically through
+``manifest.json``):
+
+- ``vectors.<gen>.npy``: row-major float32 matrix, grown by doubling
+- ``rows.<gen>.jsonl``: append-only log of row additions and tombstones,
+  replayed on startup into the in-memory columnar metadata table
+
+Deletes and overwrites only tombstone rows; the store is compacted into a
+new generation once tombstones exceed a configurable share of the rows.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, TextIO, cast
+
+import numpy as np
+
+from ..config import BotConfig
+from .embedding import truncate_embedding
+from .vector_store import (
+    SEARCH_INCLUDE_ALL,
+    DocumentBatch,
+    DocumentMetadata,
+    SearchResult,
+    StoredDocument,
+    VectorStore,
+    VectorStoreError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NumpyVectorStoreError(VectorStoreError):
+    """Raised when NumPy vector store operations fail."""
+
+    pass
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Brute-force vector store on a memory-mapped float32 matrix.
+
+    Features:
+    - Vectorized top-k search (cosine, inner product or L2)
+    - Metadata filtering with the ChromaDB ``where`` syntax over a columnar table
+    - Incremental append/delete with tombstones and periodic compaction
+    - Crash-safe generation switch on compaction
+    """
+
+    INITIAL_CAPACITY = 1024
+    # Rows copied per step on compaction, bounding the extra memory it needs
+    COMPACTION_CHUNK_ROWS = 4096
+
+    def __init__(self, config: BotConfig, shared: Optional["NumpyVectorStore"] = None):
+        """
+        Initialize NumpyVectorStore.
+
+        Args:
+            config: Bot configuration (persist directory, collection name, metric)
+            shared: Store whose executor this one reuses
+        """
+        self.config = config
+        self.metric = config.chromadb_distance_metric
+        self._shared = shared
+        self.executor: ThreadPoolExecutor = (
+            shared.executor if shared else ThreadPoolExecutor(max_workers=2)
+        )
+        self._initialized = False
+        self._lock = threading.RLock()
+
+        self.persist_dir = (
+            Path(config.chromadb_persist_directory) / "numpy" / config.chromadb_collection_name
+        )
+        self.persist_dir.mkdir(parents=True, exist_ok=True)
+
+        self.compaction_ratio = getattr(config, "numpy_vector_store_compaction_ratio", 0.3)
+        self.compaction_min_rows = getattr(config, "numpy_vector_store_compaction_min_rows", 256)
+
+        self.embedding_dimension: Optional[int] = None
+        self._generation = 0
+        self._vectors: Optional[np.memmap] = None
+        self._log: Optional[TextIO] = None
+
+        # Columnar row table; a row is alive until tombstoned
+        self._size = 0
+        self._tombstones = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._documents: List[Optional[str]] = []
+        self._columns: Dict[str, List[Any]] = {}
+        self._column_cache: Dict[str, np.ndarray] = {}
+        self._row_of: Dict[str, int] = {}
+
+    async def initialize(self) -> None:
+        """Load the current generation from disk."""
+        if self._initialized:
+            return
+
+        try:
+            await asyncio.get_event_loop().run_in_executor(self.executor, self._load_sync)
+            self._initialized = True
+            logger.info(
+                f"NumPy vector store loaded: {self._size - self._tombstones} documents "
+                f"in {self.persist_dir}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize NumPy vector store: {e}")
+            raise NumpyVectorStoreError(f"Initialization failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _vectors_path(self, generation: int) -> Path:
+        return self.persist_dir / f"vectors.{generation}.npy"
+
+    def _log_path(self, generation: int) -> Path:
+        return self.persist_dir / f"rows.{generation}.jsonl"
+
+    def _write_manifest(self) -> None:
+        """Atomically point the manifest at the current generation."""
+        manifest = self.persist_dir / "manifest.json"
+        temp = manifest.with_suffix(".tmp")
+        temp.write_text(
+            json.dumps({"generation": self._generation, "dimension": self.embedding_dimension})
+        )
+        os.replace(temp, manifest)
+
+    def _load_sync(self) -> None:
+        """Read the manifest and replay the row log (runs in thread pool)."""
+        manifest = self.persist_dir / "manifest.json"
+        if manifest.exists():
+            data = json.loads(manifest.read_text())
+            self._generation = data["generation"]
+            self.embedding_dimension = data.get("dimension")
+
+        vectors_path = self._vectors_path(self._generation)
+        if self.embedding_dimension and vectors_path.exists():
+            self._vectors = cast(np.memmap, np.load(vectors_path, mmap_mode="r+"))
+
+        log_path = self._log_path(self._generation)
+        if log_path.exists():
+            with open(log_path, encoding="utf-8") as log:
+                for line in log:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry["op"] == "add":
+                        self._append_row(entry["id"], entry["document"], entry["metadata"])
+                    elif entry["op"] == "delete":
+                        self._tombstone_row(entry["row"])
+
+        # Rows past the log (written before a crash) are unused capacity
+        if self._vectors is not None and len(self._vectors) < self._size:
+            raise NumpyVectorStoreError("Vector file is shorter than the row log")
+
+        self._log = open(log_path, "a", encoding="utf-8")
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the memory-mapped matrix (doubling) to hold at least rows rows."""
+        assert self.embedding_dimension is not None
+        capacity = 0 if self._vectors is None else len(self._vectors)
+        if rows <= capacity:
+            return
+
+        new_capacity = max(self.INITIAL_CAPACITY, capacity)
+        while new_capacity < rows:
+            new_capacity *= 2
+
+        path = self._vectors_path(self._generation)
+        temp = path.with_name(path.name + ".grow")
+        grown = np.lib.format.open_memmap(
+            temp, mode="w+", dtype=np.float32, shape=(new_capacity, self.embedding_dimension)
+        )
+        if self._vectors is not None:
+            grown[: self._size] = self._vectors[: self._size]
+        grown.flush()
+        del grown
+        os.replace(temp, path)
+        self._vectors = cast(np.memmap, np.load(path, mmap_mode="r+"))
+
+    def _fit_embedding(self, embedding: List[float]) -> np.ndarray:
+        """Truncate/normalize an embedding for storage or querying."""
+        if self.embedding_dimension is None:
+            self.embedding_dimension = len(embedding)
+            self._write_manifest()
+
+        if len(embedding) < self.embedding_dimension:
+            raise NumpyVectorStoreError(
+                f"Embedding dimension {len(embedding)} is smaller than the store dimension "
+                f"{self.embedding_dimension}"
+            )
+
+        vector = np.asarray(
+            truncate_embedding(embedding, self.embedding_dimension), dtype=np.float32
+        )
+        if self.metric == "cosine":
+            norm = float(np.linalg.norm(vector))
+            if norm > 0:
+                vector = vector / norm
+        return vector
+
+    # ------------------------------------------------------------------
+    # Row table
+    # ------------------------------------------------------------------
+
+    def _append_row(self, document_id: str, content: str, metadata: Dict[str, Any]) -> int:
+        """Append a row to the in-memory table, tombstoning a previous version."""
+        previous = self._row_of.get(document_id)
+        if previous is not None:
+            self._tombstone_row(previous)
+
+        row = self._size
+        self._size += 1
+        if len(self._alive) < self._size:
+            self._alive = np.concatenate([self._alive, np.zeros(max(64, self._size), dtype=bool)])
+        self._alive[row] = True
+
+        self._ids.append(document_id)
+        self._documents.append(content)
+        for key in metadata.keys() - self._columns.keys():
+            self._columns[key] = [None] * row
+        for key, column in self._columns.items():
+            column.append(metadata.get(key))
+
+        self._row_of[document_id] = row
+        self._column_cache.clear()
+        return row
+
+    def _tombstone_row(self, row: int) -> None:
+        """Mark a row as deleted."""
+        if not self._alive[row]:
+            return
+
+        self._alive[row] = False
+        document_id = self._ids[row]
+        if document_id is not None and self._row_of.get(document_id) == row:
+            del self._row_of[document_id]
+        self._ids[row] = None
+        self._documents[row] = None
+        self._tombstones += 1
+        self._column_cache.clear()
+
+    def _row_metadata(self, row: int) -> Dict[str, Any]:
+        return {
+            key: column[row] for key, column in self._columns.items() if column[row] is not None
+        }
+
+    def _write_rows_sync(self, documents: DocumentBatch, overwrite: bool) -> int:
+        """Append documents (runs in thread pool)."""
+        with self._lock:
+            if not overwrite:
+                documents = [doc for doc in documents if doc[0] not in self._row_of]
+            if not documents:
+                return 0
+
+            vectors = [self._fit_embedding(doc[2]) for doc in documents]
+            self._ensure_capacity(self._size + len(documents))
+            assert self._vectors is not None and self._log is not None
+
+            log_lines = []
+            for (document_id, content, _, metadata), vector in zip(documents, vectors):
+                if document_id in self._row_of:
+                    log_lines.append(json.dumps({"op": "delete", "row": self._row_of[document_id]}))
+                prepared = self._prepare_metadata(metadata)
+                row = self._append_row(document_id, content, prepared)
+                self._vectors[row] = vector
+                log_lines.append(
+                    json.dumps(
+                        {"op": "add", "id": document_id, "document": content, "metadata": prepared}
+                    )
+                )
+
+            # Vectors first: a log entry never points at an unwritten row
+            self._vectors.flush()
+            self._log.write("\n".join(log_lines) + "\n")
+            self._log.flush()
+
+            self._maybe_compact()
+            return len(documents)
+
+    def _delete_rows_sync(self, document_ids: Sequence[str]) -> int:
+        """Tombstone documents (runs in thread pool)."""
+        with self._lock:
+            rows = [self._row_of[doc_id] for doc_id in document_ids if doc_id in self._row_of]
+            if not rows:
+                return 0
+
+            assert self._log is not None
+            for row in rows:
+                self._tombstone_row(row)
+            self._log.write("".join(json.dumps({"op": "delete", "row": r}) + "\n" for r in rows))
+            self._log.flush()
+
+            self._maybe_compact()
+            return len(rows)
+
+    def _maybe_compact(self) -> None:
+        """Compact once tombstones exceed the configured share of rows."""
+        if (
+            self._tombstones >= self.compaction_min_rows
+            and self._tombstones >= self._size * self.compaction_ratio
+        ):
+            self._compact_sync()
+
+    def _compact_sync(self) -> None:
+        """Rewrite live rows into a new generation (runs under the lock)."""
+        live_rows = np.flatnonzero(self._alive[: self._size])
+        old_generation = self._generation
+        new_generation = old_generation + 1
+
+        new_vectors: Optional[np.memmap] = None
+        if self.embedding_dimension:
+            new_vectors = np.lib.format.open_memmap(
+                self._vectors_path(new_generation),
+                mode="w+",
+                dtype=np.float32,
+                shape=(max(self.INITIAL_CAPACITY, len(live_rows)), self.embedding_dimension),
+            )
+            if self._vectors is not None:
+                for start in range(0, len(live_rows), self.COMPACTION_CHUNK_ROWS):
+                    chunk = live_rows[start : start + self.COMPACTION_CHUNK_ROWS]
+                    new_vectors[start : start + len(chunk)] = self._vectors[chunk]
+            new_vectors.flush()
+
+        with open(self._log_path(new_generation), "w", encoding="utf-8") as log:
+            for row in live_rows:
+                log.write(
+                    json.dumps(
+                        {
+                            "op": "add",
+                            "id": self._ids[row],
+                            "document": self._documents[row],
+                            "metadata": self._row_metadata(int(row)),
+                        }
+                    )
+                    + "\n"
+                )
+
+        # Switching the manifest commits the new generation
+        self._generation = new_generation
+        self._write_manifest()
+
+        ids = [self._ids[row] for row in live_rows]
+        documents = [self._documents[row] for row in live_rows]
+        metadatas = [self._row_metadata(int(row)) for row in live_rows]
+        self._reset_table()
+        for document_id, content, metadata in zip(ids, documents, metadatas):
+            assert document_id is not None and content is not None
+            self._append_row(document_id, content, metadata)
+
+        if self._log is not None:
+            self._log.close()
+        self._log = open(self._log_path(new_generation), "a", encoding="utf-8")
+        self._vectors = new_vectors
+
+        for path in (self._vectors_path(old_generation), self._log_path(old_generation)):
+            path.unlink(missing_ok=True)
+
+        logger.info(f"Compacted NumPy vector store to {len(live_rows)} rows")
+
+    def _reset_table(self) -> None:
+        self._size = 0
+        self._tombstones = 0
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids = []
+        self._documents = []
+        self._columns = {}
+        self._column_cache.clear()
+        self._row_of = {}
+
+    async def compact(self) -> None:
+        """Compact the store immediately."""
+        await self._ensure_initialized()
+
+        def run() -> None:
+            with self._lock:
+                self._compact_sync()
+
+        await asyncio.get_event_loop().run_in_executor(self.executor, run)
+
+    # ------------------------------------------------------------------
+    # Metadata filtering
+    # ------------------------------------------------------------------
+
+    def _column(self, key: str) -> np.ndarray:
+        """Object array of a metadata column over all rows (cached until the next write)."""
+        cached = self._column_cache.get(key)
+        if cached is None:
+            cached = np.empty(self._size, dtype=object)
+            if key in self._columns:
+                cached[:] = self._columns[key]
+            self._column_cache[key] = cached
+        return cached
+
+    def _where_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """Evaluate a ChromaDB-style where filter into a row mask."""
+        mask = np.ones(self._size, dtype=bool)
+
+        for key, condition in where.items():
+            if key == "$and":
+                for sub in condition:
+                    mask &= self._where_mask(sub)
+            elif key == "$or":
+                any_mask = np.zeros(self._size, dtype=bool)
+                for sub in condition:
+                    any_mask |= self._where_mask(sub)
+                mask &= any_mask
+            elif isinstance(condition, dict):
+                for operator, value in condition.items():
+                    mask &= self._compare(self._column(key), operator, value)
+            else:
+                mask &= self._compare(self._column(key), "$eq", condition)
+
+        return mask
+
+    def _compare(self, column: np.ndarray, operator: str, value: Any) -> np.ndarray:
+        """Apply one comparison operator to a column."""
+        if operator == "$eq":
+            return np.asarray(column == value, dtype=bool)
+        if operator == "$ne":
+            return np.asarray(column != value, dtype=bool)
+        if operator in ("$in", "$nin"):
+            values = set(value)
+            found = np.fromiter((item in values for item in column), dtype=bool, count=len(column))
+            return found if operator == "$in" else ~found
+
+        comparisons = {
+            "$gt": lambda a: a > value,
+            "$gte": lambda a: a >= value,
+            "$lt": lambda a: a < value,
+            "$lte": lambda a: a <= value,
+        }
+        if operator not in comparisons:
+            raise NumpyVectorStoreError(f"Unsupported where operator: {operator}")
+
+        compare = comparisons[operator]
+
+        def matches(item: Any) -> bool:
+            try:
+                return item is not None and bool(compare(item))
+            except TypeError:
+                return False
+
+        return np.fromiter((matches(item) for item in column), dtype=bool, count=len(column))
+
+    # ------------------------------------------------------------------
+    # VectorStore API
+    # ------------------------------------------------------------------
+
+    async def _run(self, description: str, func: Any, *args: Any) -> Any:
+        """Run a blocking operation in the executor, wrapping errors."""
+        await self._ensure_initialized()
+        try:
+            return await asyncio.get_event_loop().run_in_executor(self.executor, func, *args)
+        except NumpyVectorStoreError:
+            raise
+        except Exception as e:
+            logger.error(f"NumPy vector store {description} failed: {e}")
+            raise NumpyVectorStoreError(f"{description.capitalize()} failed: {e}")
+
+    async def add_document(
+        self,
+        document_id: str,
+        content: str,
+        embedding: List[float],
+        metadata: Optional[DocumentMetadata] = None,
+    ) -> bool:
+        """Add a single document (ignored if the ID already exists)."""
+        await self._run(
+            "document addition",
+            self._write_rows_sync,
+            [(document_id, content, embedding, metadata)],
+            False,
+        )
+        return True
+
+    async def add_documents_batch(self, documents: DocumentBatch) -> int:
+        """Add documents; existing IDs are left unchanged."""
+        if not documents:
+            return 0
+        await self._run("batch addition", self._write_rows_sync, documents, False)
+        return len(documents)
+
+    async def upsert_documents_batch(self, documents: DocumentBatch) -> int:
+        """Insert documents, tombstoning previous versions of existing IDs."""
+        if not documents:
+            return 0
+        return int(await self._run("batch upsert", self._write_rows_sync, documents, True))
+
+    async def search_documents(
+        self,
+        query_embedding: List[float],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
+        max_results: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """Search documents by embedding similarity, capped at max_results."""
+        cap = self.config.max_search_results if max_results is None else max_results
+        n_results = min(n_results, cap)
+        return list(
+            await self._run(
+                "search", self._search_sync, query_embedding, n_results, where, tuple(include)
+            )
+        )
+
+    def _search_sync(
+        self,
+        query_embedding: List[float],
+        n_results: int,
+        where: Optional[Dict[str, Any]],
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
+    ) -> List[SearchResult]:
+        """Brute-force top-k search (runs in thread pool)."""
+        with self._lock:
+            if self._vectors is None or self._size == self._tombstones or n_results <= 0:
+                return []
+
+            query = self._fit_embedding(query_embedding)
+            candidates = self._alive[: self._size]
+            if where:
+                candidates = candidates & self._where_mask(where)
+
+            count = int(np.count_nonzero(candidates))
+            if count == 0:
+                return []
+
+            # Score every row of the view, then mask, rather than gathering candidate rows
+            matrix = self._vectors[: self._size]
+            if self.metric == "l2":
+                distances = np.einsum("ij,ij->i", matrix, matrix) - 2 * (matrix @ query)
+                distances += float(query @ query)
+            else:
+                distances = 1.0 - matrix @ query
+            distances[~candidates] = np.inf
+
+            k = min(n_results, count)
+            top = np.argpartition(distances, k - 1)[:k]
+            top = top[np.argsort(distances[top], kind="stable")]
+
+            results: List[SearchResult] = []
+            for index in top:
+                row = int(index)
+                metadata = self._row_metadata(row) if "metadatas" in include else {}
+                results.append(
+                    SearchResult(
+                        document_id=self._ids[row] or "",
+                        content=(self._documents[row] or "") if "documents" in include else "",
+                        score=max(0.0, 1.0 - float(distances[row])),
+                        metadata=self._parse_metadata(metadata),
+                    )
+                )
+            return results
+
+    async def update_document(
+        self,
+        document_id: str,
+        content: Optional[str] = None,
+        embedding: Optional[List[float]] = None,
+        metadata: Optional[DocumentMetadata] = None,
+    ) -> bool:
+        """
+        Update fields of an existing document.
+
+        The document is rewritten as a new row and its previous row tombstoned.
+
+        Returns:
+            False if the document does not exist
+        """
+        return bool(
+            await self._run(
+                "document update", self._update_sync, document_id, content, embedding, metadata
+            )
+        )
+
+    def _update_sync(
+        self,
+        document_id: str,
+        content: Optional[str],
+        embedding: Optional[List[float]],
+        metadata: Optional[DocumentMetadata],
+    ) -> bool:
+        with self._lock:
+            row = self._row_of.get(document_id)
+            if row is None or self._vectors is None:
+                return False
+
+            current_metadata = self._parse_metadata(self._row_metadata(row))
+            self._write_rows_sync(
+                [
+                    (
+                        document_id,
+                        content if content is not None else self._documents[row] or "",
+                        embedding if embedding is not None else self._vectors[row].tolist(),
+                        metadata if metadata is not None else current_metadata,
+                    )
+                ],
+                True,
+            )
+            return True
+
+    async def delete_document(self, document_id: str) -> bool:
+        """Delete a single document."""
+        await self._run("document deletion", self._delete_rows_sync, [document_id])
+        return True
+
+    async def delete_documents_batch(self, document_ids: List[str]) -> int:
+        """Delete documents; unknown IDs are ignored."""
+        if not document_ids:
+            return 0
+        await self._run("batch deletion", self._delete_rows_sync, document_ids)
+        return len(document_ids)
+
+    async def count_where(self, where: Dict[str, Any]) -> int:
+        """Count documents matching a metadata filter."""
+
+        def count() -> int:
+            with self._lock:
+                return int(np.count_nonzero(self._alive[: self._size] & self._where_mask(where)))
+
+        return int(await self._run("count", count))
+
+    async def get_document_count(self) -> int:
+        """Get the total number of documents."""
+        await self._ensure_initialized()
+        return self._size - self._tombstones
+
+    async def get_documents(
+        self, ids: List[str], include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """Fetch documents by ID, skipping missing IDs."""
+
+        def get() -> List[StoredDocument]:
+            with self._lock:
+                rows = [self._row_of[doc_id] for doc_id in ids if doc_id in self._row_of]
+                return [self._stored_document(row, include) for row in rows]
+
+        return list(await self._run("document retrieval", get))
+
+    async def list_documents(
+        self, limit: int, offset: int = 0, include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """List one page of documents in insertion order."""
+
+        def page() -> List[StoredDocument]:
+            with self._lock:
+                rows = np.flatnonzero(self._alive[: self._size])[offset : offset + limit]
+                return [self._stored_document(int(row), include) for row in rows]
+
+        return list(await self._run("document listing", page))
+
+    def _stored_document(self, row: int, include: Sequence[str]) -> StoredDocument:
+        metadata = self._row_metadata(row) if "metadatas" in include else {}
+        embedding = None
+        if "embeddings" in include and self._vectors is not None:
+            embedding = self._vectors[row].tolist()
+        return StoredDocument(
+            document_id=self._ids[row] or "",
+            metadata=self._parse_metadata(metadata),
+            content=self._documents[row] if "documents" in include else None,
+            embedding=embedding,
+        )
+
+    async def reset_collection(self) -> bool:
+        """Delete all documents by switching to an empty generation."""
+
+        def reset() -> None:
+            with self._lock:
+                for row in np.flatnonzero(self._alive[: self._size]):
+                    self._tombstone_row(int(row))
+                self._compact_sync()
+
+        await self._run("collection reset", reset)
+        logger.info("NumPy vector store reset successfully")
+        return True
+
+    async def close(self) -> None:
+        """Flush and release the memory map and row log."""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            self._vectors = None
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            self._reset_table()
+        # A shared executor is shut down by the store owning it
+        if self._shared is None:
+            self.executor.shutdown(wait=True)
+        self._initialized = False
+        logger.info("NumPy vector store closed")
@@ -13,11 +13,11 @@ from typing import Any, Dict, List, NamedTuple, Optional
 
 from ..config import BotConfig
 from ..services.api_monitor import APIMonitor
-from ..services.chromadb_service import ChromaDBService
 from ..services.database import DatabaseService
 from ..services.knowledge_manager import KnowledgeManager
 from ..services.search_engine import SearchEngine
 from ..services.token_manager import TokenManager
+from ..services.vector_store import VectorStore
 from ..utils.memory import get_memory_monitor
 
 logger = logging.getLogger(__name__)
@@ -163,7 +163,7 @@ class Phase4Monitor:
         api_monitor: APIMonitor,
         search_engine: SearchEngine,
         knowledge_manager: KnowledgeManager,
-        chromadb_service: ChromaDBService,
+        chromadb_service: VectorStore,
         database_service: DatabaseService,
     ):
         """Phase4Monitorを初期化."""
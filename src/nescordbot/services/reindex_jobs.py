@@ -0,0 +1,466 @@
+"""
+Resumable bulk re-index jobs.
+
+A re-index job embeds notes into the vector store through
+SyncManager.sync_notes_batch, walking knowledge_notes in ID order. The ID of
+the last processed note is checkpointed in the ``reindex_jobs`` table after
+every batch, so a job that is paused, or interrupted by a restart, continues
+where it stopped instead of starting over.
+
+Jobs are paced to a target throughput and back off while the embedding
+rate limit shared with interactive requests is nearly used up.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from ..config import BotConfig
+from ..utils.progress import BatchProgressTracker
+from .database import DatabaseService
+from .embedding import EmbeddingService
+from .sync_manager import SyncManager
+
+logger = logging.getLogger(__name__)
+
+
+class ReindexJobError(Exception):
+    """Exception raised when a re-index job cannot be started or controlled."""
+
+    pass
+
+
+class ReindexJobStatus(Enum):
+    """Lifecycle status of a re-index job."""
+
+    RUNNING = "running"
+    PAUSED = "paused"
+    CANCELLED = "cancelled"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class ReindexJob:
+    """Persisted state of a re-index job."""
+
+    job_id: int
+    mode: str
+    status: ReindexJobStatus
+    cursor: Optional[str] = None
+    total_notes: int = 0
+    processed: int = 0
+    failed: int = 0
+    last_error: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+    @property
+    def is_active(self) -> bool:
+        """Whether the job still has work to do."""
+        return self.status in (ReindexJobStatus.RUNNING, ReindexJobStatus.PAUSED)
+
+    @property
+    def percent(self) -> float:
+        """Share of the notes processed so far."""
+        if self.total_notes == 0:
+            return 100.0 if self.status == ReindexJobStatus.COMPLETED else 0.0
+        return min(100.0, self.processed / self.total_notes * 100)
+
+
+class ReindexJobManager:
+    """
+    Runs checkpointed re-index jobs in the background.
+
+    Features:
+    - Modes: ``missing`` embeds notes that are not synced, ``full`` re-embeds all
+    - Keyset cursor checkpointed per batch; interrupted jobs resume on startup
+    - Pause, resume and cancel of the active job
+    - Progress through BatchProgressTracker
+    - Throughput target and throttling on embedding rate limit headroom
+    """
+
+    MISSING = "missing"
+    FULL = "full"
+
+    _SELECT_JOBS = """
+        SELECT id, mode, status, cursor, total_notes, processed, failed, last_error,
+               created_by, created_at, updated_at, completed_at
+        FROM reindex_jobs
+    """
+
+    def __init__(
+        self,
+        config: BotConfig,
+        database_service: DatabaseService,
+        sync_manager: SyncManager,
+        embedding_service: EmbeddingService,
+    ) -> None:
+        """
+        Initialize ReindexJobManager.
+
+        Args:
+            config: Bot configuration
+            database_service: Database service holding the reindex_jobs table
+            sync_manager: SyncManager performing the embedding and writes
+            embedding_service: Embedding service whose rate limit is shared
+        """
+        self.config = config
+        self.db = database_service
+        self.sync_manager = sync_manager
+        self.embedding = embedding_service
+
+        self.batch_size = getattr(config, "reindex_batch_size", 50)
+        # Notes per second; 0 disables pacing
+        self.target_rate = getattr(config, "reindex_target_rate", 5.0)
+        # Pause while less than this share of the embedding rate limit is left
+        self.min_headroom = getattr(config, "reindex_min_rate_limit_headroom", 0.25)
+        self.throttle_interval = getattr(config, "reindex_throttle_interval", 5.0)
+
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._stop_events: Dict[int, asyncio.Event] = {}
+        self._trackers: Dict[int, BatchProgressTracker] = {}
+
+    async def start_job(self, mode: str = MISSING, created_by: Optional[str] = None) -> ReindexJob:
+        """
+        Create a job and start running it in the background.
+
+        Args:
+            mode: MISSING or FULL
+            created_by: Who started the job (for display)
+
+        Returns:
+            The created job
+
+        Raises:
+            ReindexJobError: If the mode is unknown or another job is active
+        """
+        if mode not in (self.MISSING, self.FULL):
+            raise ReindexJobError(f"Unknown re-index mode: {mode}")
+
+        active = await self.get_active_job()
+        if active is not None:
+            raise ReindexJobError(f"Re-index job #{active.job_id} is already {active.status.value}")
+
+        await self.sync_manager.init_async()
+        total_notes = await self._count_notes(mode)
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "INSERT INTO reindex_jobs (mode, total_notes, created_by) VALUES (?, ?, ?)",
+                (mode, total_notes, created_by),
+            )
+            await conn.commit()
+            job_id = int(cursor.lastrowid)
+
+        job = await self._require_job(job_id)
+        self._spawn(job)
+        logger.info(f"Re-index job #{job_id} started ({mode}, {total_notes} notes)")
+        return job
+
+    async def pause_job(self, job_id: int) -> ReindexJob:
+        """
+        Pause a running job after its current batch.
+
+        Raises:
+            ReindexJobError: If the job is not running
+        """
+        job = await self._require_job(job_id)
+        if job.status != ReindexJobStatus.RUNNING:
+            raise ReindexJobError(f"Re-index job #{job_id} is not running")
+
+        await self._set_status(job_id, ReindexJobStatus.PAUSED)
+        await self._stop_task(job_id)
+        return await self._require_job(job_id)
+
+    async def resume_job(self, job_id: int) -> ReindexJob:
+        """
+        Resume a paused job from its checkpoint.
+
+        Raises:
+            ReindexJobError: If the job is not paused
+        """
+        job = await self._require_job(job_id)
+        if job.status != ReindexJobStatus.PAUSED:
+            raise ReindexJobError(f"Re-index job #{job_id} is not paused")
+
+        await self._set_status(job_id, ReindexJobStatus.RUNNING)
+        job = await self._require_job(job_id)
+        self._spawn(job)
+        return job
+
+    async def cancel_job(self, job_id: int) -> ReindexJob:
+        """
+        Cancel a running or paused job; notes already embedded stay embedded.
+
+        Raises:
+            ReindexJobError: If the job already finished
+        """
+        job = await self._require_job(job_id)
+        if not job.is_active:
+            raise ReindexJobError(f"Re-index job #{job_id} is already {job.status.value}")
+
+        await self._set_status(job_id, ReindexJobStatus.CANCELLED, finished=True)
+        await self._stop_task(job_id)
+        return await self._require_job(job_id)
+
+    async def resume_interrupted_jobs(self) -> List[int]:
+        """
+        Restart jobs left running by a previous process.
+
+        Returns:
+            IDs of the restarted jobs
+        """
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(f"{self._SELECT_JOBS} WHERE status = 'running' ORDER BY id")
+            jobs = [self._row_to_job(row) for row in await cursor.fetchall()]
+
+        restarted = []
+        for job in jobs:
+            if job.job_id not in self._tasks:
+                self._spawn(job)
+                restarted.append(job.job_id)
+                logger.info(f"Re-index job #{job.job_id} resumed after {job.processed} notes")
+        return restarted
+
+    async def shutdown(self) -> None:
+        """Stop running jobs after their current batch; they resume on next startup."""
+        for job_id in list(self._tasks):
+            await self._stop_task(job_id)
+
+    async def get_job(self, job_id: int) -> Optional[ReindexJob]:
+        """Get a job by ID."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(f"{self._SELECT_JOBS} WHERE id = ?", (job_id,))
+            row = await cursor.fetchone()
+        return self._row_to_job(row) if row else None
+
+    async def get_active_job(self) -> Optional[ReindexJob]:
+        """Get the running or paused job, if any."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"{self._SELECT_JOBS} WHERE status IN ('running', 'paused') ORDER BY id LIMIT 1"
+            )
+            row = await cursor.fetchone()
+        return self._row_to_job(row) if row else None
+
+    async def list_jobs(self, limit: int = 10) -> List[ReindexJob]:
+        """List the most recent jobs, newest first."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(f"{self._SELECT_JOBS} ORDER BY id DESC LIMIT ?", (limit,))
+            return [self._row_to_job(row) for row in await cursor.fetchall()]
+
+    def get_progress(self, job: ReindexJob) -> Dict[str, Any]:
+        """
+        Get progress of a job.
+
+        Rate and ETA come from the tracker of the current run and are zero
+        while the job is not running in this process.
+
+        Args:
+            job: Job to report on
+
+        Returns:
+            Counts, completion percentage, rate and ETA
+        """
+        tracker = self._trackers.get(job.job_id)
+        info = tracker.get_progress_info() if tracker else {}
+        return {
+            "job_id": job.job_id,
+            "mode": job.mode,
+            "status": job.status.value,
+            "total_notes": job.total_notes,
+            "processed": job.processed,
+            "failed": job.failed,
+            "percent": job.percent,
+            "rate_per_second": info.get("rate_per_second", 0.0),
+            "eta_seconds": info.get("eta_seconds", 0.0),
+            "running": self.is_running(job.job_id),
+        }
+
+    def is_running(self, job_id: int) -> bool:
+        """Check if a job is running in this process."""
+        task = self._tasks.get(job_id)
+        return task is not None and not task.done()
+
+    def _row_to_job(self, row: Any) -> ReindexJob:
+        """Convert a reindex_jobs row to a ReindexJob."""
+        return ReindexJob(
+            job_id=row[0],
+            mode=row[1],
+            status=ReindexJobStatus(row[2]),
+            cursor=row[3],
+            total_notes=row[4],
+            processed=row[5],
+            failed=row[6],
+            last_error=row[7],
+            created_by=row[8],
+            created_at=row[9],
+            updated_at=row[10],
+            completed_at=row[11],
+        )
+
+    async def _require_job(self, job_id: int) -> ReindexJob:
+        """Get a job or raise ReindexJobError."""
+        job = await self.get_job(job_id)
+        if job is None:
+            raise ReindexJobError(f"Re-index job #{job_id} not found")
+        return job
+
+    async def _set_status(
+        self,
+        job_id: int,
+        status: ReindexJobStatus,
+        error: Optional[str] = None,
+        finished: bool = False,
+    ) -> None:
+        """Record a status change of a job."""
+        now = datetime.now().isoformat()
+        async with self.db.get_connection() as conn:
+            await conn.execute(
+                """
+                UPDATE reindex_jobs
+                SET status = ?, last_error = COALESCE(?, last_error), updated_at = ?,
+                    completed_at = CASE WHEN ? THEN ? ELSE completed_at END
+                WHERE id = ?
+                """,
+                (status.value, error, now, finished, now, job_id),
+            )
+            await conn.commit()
+
+    def _note_query(self, mode: str) -> str:
+        """FROM/WHERE clause selecting the notes a job of the given mode covers."""
+        if mode == self.FULL:
+            return "FROM knowledge_notes kn WHERE 1 = 1"
+        return """
+            FROM knowledge_notes kn
+            LEFT JOIN sync_metadata sm ON sm.note_id = kn.id
+            WHERE (sm.note_id IS NULL OR sm.sync_status != 'synced')
+        """
+
+    async def _count_notes(self, mode: str) -> int:
+        """Count the notes a new job will process."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(f"SELECT COUNT(*) {self._note_query(mode)}")
+            row = await cursor.fetchone()
+        return int(row[0]) if row else 0
+
+    async def _next_batch(self, job: ReindexJob) -> List[str]:
+        """Fetch the next page of note IDs after the job's cursor."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT kn.id {self._note_query(job.mode)}
+                  AND kn.id > ?
+                ORDER BY kn.id
+                LIMIT ?
+                """,
+                (job.cursor or "", self.batch_size),
+            )
+            return [row[0] for row in await cursor.fetchall()]
+
+    async def _checkpoint(self, job: ReindexJob) -> None:
+        """Persist the cursor and counters of a job."""
+        async with self.db.get_connection() as conn:
+            await conn.execute(
+                """
+                UPDATE reindex_jobs
+                SET cursor = ?, processed = ?, failed = ?, updated_at = ?
+                WHERE id = ?
+                """,
+                (job.cursor, job.processed, job.failed, datetime.now().isoformat(), job.job_id),
+            )
+            await conn.commit()
+
+    def _spawn(self, job: ReindexJob) -> None:
+        """Start the background task of a job."""
+        stop_event = asyncio.Event()
+        self._stop_events[job.job_id] = stop_event
+        self._trackers[job.job_id] = BatchProgressTracker(
+            total_items=max(job.total_notes - job.processed, 0),
+            batch_size=self.batch_size,
+            description=f"Re-index job #{job.job_id} ({job.mode})",
+        )
+        self._tasks[job.job_id] = asyncio.create_task(self._run_job(job, stop_event))
+
+    async def _stop_task(self, job_id: int) -> None:
+        """Signal a job's task to stop after its current batch and wait for it."""
+        stop_event = self._stop_events.get(job_id)
+        task = self._tasks.get(job_id)
+        if stop_event is not None:
+            stop_event.set()
+        if task is not None and not task.done():
+            try:
+                await asyncio.wait_for(task, timeout=60.0)
+            except asyncio.TimeoutError:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    async def _run_job(self, job: ReindexJob, stop_event: asyncio.Event) -> None:
+        """Process batches until the job is done or asked to stop."""
+        tracker = self._trackers[job.job_id]
+        started = time.monotonic()
+        processed_this_run = 0
+
+        try:
+            await self.sync_manager.init_async()
+            while not stop_event.is_set():
+                note_ids = await self._next_batch(job)
+                if not note_ids:
+                    await self._set_status(job.job_id, ReindexJobStatus.COMPLETED, finished=True)
+                    logger.info(
+                        f"Re-index job #{job.job_id} completed: "
+                        f"{job.processed} notes, {job.failed} failed"
+                    )
+                    break
+
+                tracker.start_batch(tracker.current_batch)
+                results = await self.sync_manager.sync_notes_batch(
+                    note_ids, force=job.mode == self.FULL
+                )
+                succeeded = sum(1 for result in results.values() if result.success)
+
+                job.cursor = note_ids[-1]
+                job.processed += len(note_ids)
+                job.failed += len(note_ids) - succeeded
+                await self._checkpoint(job)
+                tracker.update_item(len(note_ids))
+                tracker.complete_batch()
+
+                processed_this_run += len(note_ids)
+                await self._throttle(started, processed_this_run, stop_event)
+
+        except Exception as e:
+            logger.error(f"Re-index job #{job.job_id} failed: {e}")
+            await self._set_status(job.job_id, ReindexJobStatus.FAILED, error=str(e), finished=True)
+
+        finally:
+            self._tasks.pop(job.job_id, None)
+            self._stop_events.pop(job.job_id, None)
+            self._trackers.pop(job.job_id, None)
+
+    async def _throttle(self, started: float, processed: int, stop_event: asyncio.Event) -> None:
+        """Pace to the target rate and wait while the embedding rate limit is tight."""
+        delay = 0.0
+        if self.target_rate > 0:
+            delay = processed / self.target_rate - (time.monotonic() - started)
+
+        if self.embedding.get_rate_limit_headroom() < self.min_headroom:
+            # Leave the remaining budget to interactive requests
+            delay = max(delay, self.throttle_interval)
+            logger.debug("Re-index throttled: embedding rate limit nearly exhausted")
+
+        if delay > 0:
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
@@ -307,19 +307,7 @@ class ReviewService:
                 total_content_length = (await cursor.fetchone())[0]
 
                 # Unique tags used
-                cursor = await conn.execute(
-                    """
-                    SELECT tags FROM knowledge_notes
-                    WHERE user_id = ? AND created_at BETWEEN ? AND ?
-                """,
-                    (user_id, start_time.isoformat(), end_time.isoformat()),
-                )
-
-                all_tags = set()
-                async for row in cursor:
-                    if row[0]:
-                        tags = json.loads(row[0])
-                        all_tags.update(tags)
+                all_tags = await self._count_tags(conn, user_id, start_time, end_time)
 
                 return {
                     "notes_created": notes_created,
@@ -417,20 +405,7 @@ class ReviewService:
         """Get tag usage analysis for the period."""
         try:
             async with self.db.get_connection() as conn:
-                cursor = await conn.execute(
-                    """
-                    SELECT tags FROM knowledge_notes
-                    WHERE user_id = ? AND created_at BETWEEN ? AND ?
-                """,
-                    (user_id, start_time.isoformat(), end_time.isoformat()),
-                )
-
-                tag_counts: Dict[str, int] = {}
-                async for row in cursor:
-                    if row[0]:
-                        tags = json.loads(row[0])
-                        for tag in tags:
-                            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+                tag_counts = await self._count_tags(conn, user_id, start_time, end_time)
 
                 # Sort by frequency
                 sorted_tags = sorted(tag_counts.items(), key=lambda x: x[1], reverse=True)
@@ -445,6 +420,26 @@ class ReviewService:
             logger.error(f"Failed to get tag analysis: {e}")
             raise ReviewServiceError(f"Tag analysis failed: {e}")
 
+    async def _count_tags(
+        self, conn: Any, user_id: str, start_time: datetime, end_time: datetime
+    ) -> Dict[str, int]:
+        """Count notes per tag for the period, folding case variants together."""
+        cursor = await conn.execute(
+            """
+            SELECT nt.tag, COUNT(*) FROM note_tags nt
+            JOIN knowledge_notes kn ON kn.id = nt.note_id
+            WHERE kn.user_id = ? AND kn.created_at BETWEEN ? AND ?
+            GROUP BY nt.tag
+        """,
+            (user_id, start_time.isoformat(), end_time.isoformat()),
+        )
+
+        tag_counts: Dict[str, int] = {}
+        async for tag, count in cursor:
+            name = self.km.tag_vocabulary.canonical(tag)
+            tag_counts[name] = tag_counts.get(name, 0) + count
+        return tag_counts
+
     async def _generate_growth_insights(
         self,
         stats: Dict[str, Any],
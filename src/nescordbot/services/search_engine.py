@@ -12,13 +12,14 @@ import uuid
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, List, Optional, Sequence, Tuple, cast
 
 from ..config import BotConfig
 from ..logger import get_logger
-from .chromadb_service import ChromaDBService
 from .database import DatabaseService
 from .embedding import EmbeddingService
+from .tag_vocabulary import TagVocabulary
+from .vector_store import SEARCH_INCLUDE_ALL, VectorStore
 
 
 class SearchMode(Enum):
@@ -52,6 +53,7 @@ class SearchFilters:
     min_score: Optional[float] = None
     content_type: Optional[str] = None  # "fleeting", "permanent", "link"
     user_id: Optional[str] = None
+    guild_id: Optional[str] = None
 
 
 @dataclass
@@ -95,10 +97,11 @@ class SearchEngine:
 
     def __init__(
         self,
-        chroma_service: ChromaDBService,
+        chroma_service: VectorStore,
         db_service: DatabaseService,
         embedding_service: EmbeddingService,
         config: BotConfig,
+        tag_vocabulary: Optional[TagVocabulary] = None,
     ):
         """Initialize SearchEngine with required services.
 
@@ -107,11 +110,13 @@ class SearchEngine:
             db_service: Database service for keyword search and history
             embedding_service: Embedding service for query embeddings
             config: Bot configuration
+            tag_vocabulary: Optional tag vocabulary for case-insensitive tag filters
         """
         self.chroma = chroma_service
         self.db = db_service
         self.embeddings = embedding_service
         self.config = config
+        self.tag_vocabulary = tag_vocabulary
         self.logger = get_logger(__name__)
 
         # RRF configuration - use values from config
@@ -122,6 +127,11 @@ class SearchEngine:
         # Performance settings
         self.max_search_time = 30.0  # seconds
         self.default_limit = getattr(config, "max_search_results", 10)
+        # Cap on the notes returned by vector search, applied after chunks are collapsed
+        self.max_results = self.default_limit
+        # Long notes are stored as several chunk documents; over-fetch so that
+        # collapsing chunk hits back to notes still fills the requested limit
+        self.chunk_overfetch = 3
 
         # Cache settings
         self.cache_enabled = getattr(config, "search_cache_enabled", True)
@@ -187,14 +197,19 @@ class SearchEngine:
         try:
             # Execute search based on mode
             if mode == SearchMode.VECTOR:
-                final_results = await self._vector_search(query, limit, filters)
+                final_results = await self._vector_search(
+                    query, min(limit, self.max_results), filters
+                )
             elif mode == SearchMode.KEYWORD:
                 final_results = await self._keyword_search(query, limit, filters)
             else:  # HYBRID mode
                 # Run vector and keyword search in parallel
                 search_limit = min(limit * 3, 100)  # Get more results for better fusion
 
-                vector_task = self._vector_search(query, search_limit, filters)
+                # Only metadata is needed for ranking; contents are loaded for the final page
+                vector_task = self._vector_search(
+                    query, search_limit, filters, include=("metadatas",)
+                )
                 keyword_task = self._keyword_search(query, search_limit, filters)
 
                 vector_results, keyword_results = await asyncio.gather(
@@ -229,6 +244,7 @@ class SearchEngine:
 
                 # Apply post-fusion filters and limit
                 final_results = self._post_process_results(fused_results, filters, limit)
+                await self._load_contents(final_results)
 
             # Cache the result
             if self.cache_enabled:
@@ -315,16 +331,16 @@ class SearchEngine:
         try:
             history_id = str(uuid.uuid4())
 
-            conn = await self.db.get_connection()
-            await conn.execute(
-                """
-                INSERT INTO search_history
-                (id, user_id, query, results_count, timestamp, execution_time_ms)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (history_id, user_id, query, results_count, datetime.now(), execution_time_ms),
-            )
-            await conn.commit()
+            async with self.db.get_connection() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO search_history
+                    (id, user_id, query, results_count, timestamp, execution_time_ms)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (history_id, user_id, query, results_count, datetime.now(), execution_time_ms),
+                )
+                await conn.commit()
 
         except Exception as e:
             self.logger.error(f"Failed to save search history: {e}")
@@ -341,18 +357,18 @@ class SearchEngine:
             List of SearchHistory entries, most recent first
         """
         try:
-            conn = await self.db.get_connection()
-            cursor = await conn.execute(
-                """
-                SELECT id, user_id, query, results_count, timestamp, execution_time_ms
-                FROM search_history
-                WHERE user_id = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-                """,
-                (user_id, limit),
-            )
-            rows = await cursor.fetchall()
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    """
+                    SELECT id, user_id, query, results_count, timestamp, execution_time_ms
+                    FROM search_history
+                    WHERE user_id = ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                    """,
+                    (user_id, limit),
+                )
+                rows = await cursor.fetchall()
 
             return [
                 SearchHistory(
@@ -371,37 +387,68 @@ class SearchEngine:
             return []
 
     async def _vector_search(
-        self, query: str, limit: int, filters: Optional[SearchFilters] = None
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[SearchFilters] = None,
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
     ) -> List[SearchResult]:
-        """Internal vector similarity search implementation."""
+        """Internal vector similarity search implementation.
+
+        Args:
+            query: Search query text
+            limit: Maximum results to return
+            filters: Optional search filters
+            include: Vector store fields to fetch besides IDs and scores; without
+                "documents" the results have empty content (see _load_contents)
+        """
         try:
             # Generate query embedding
             embedding_result = await self.embeddings.generate_embedding(text=query)
 
             # Prepare ChromaDB query filters
-            where_clause = {}
+            conditions: List[Dict[str, Any]] = []
             if filters:
+                if filters.guild_id:
+                    # Selects the guild's collection when tenant collections are enabled
+                    conditions.append({"guild_id": filters.guild_id})
                 if filters.user_id:
-                    where_clause["user_id"] = filters.user_id
+                    conditions.append({"user_id": filters.user_id})
                 if filters.content_type:
-                    where_clause["content_type"] = filters.content_type
+                    conditions.append({"content_type": filters.content_type})
                 if filters.tags:
                     # ChromaDB supports array contains
-                    where_clause["tags"] = filters.tags[0]
+                    conditions.append({"tags": filters.tags[0]})
+
+            # ChromaDB requires an explicit $and for more than one condition
+            where_clause: Optional[Dict[str, Any]] = None
+            if len(conditions) == 1:
+                where_clause = conditions[0]
+            elif conditions:
+                where_clause = {"$and": conditions}
 
             # Search in ChromaDB
+            # Over-fetch past the store's result cap; limit applies after collapsing chunks
             chroma_search_results = await self.chroma.search_documents(
                 query_embedding=embedding_result.embedding,
-                n_results=limit,
-                where=where_clause if where_clause else None,
+                n_results=limit * self.chunk_overfetch,
+                where=where_clause,
+                include=include,
+                max_results=limit * self.chunk_overfetch,
             )
 
-            # Convert ChromaDB SearchResult to our SearchResult
-            search_results = []
-            for chroma_result in chroma_search_results:
+            # Convert ChromaDB SearchResult to our SearchResult, keeping only the
+            # best-scoring chunk per note
+            search_results: List[SearchResult] = []
+            seen_notes = set()
+            for chroma_result in sorted(chroma_search_results, key=lambda r: r.score, reverse=True):
+                note_id = chroma_result.metadata.document_id or chroma_result.document_id
+                if note_id in seen_notes:
+                    continue
+                seen_notes.add(note_id)
                 search_results.append(
                     SearchResult(
-                        note_id=chroma_result.metadata.document_id or chroma_result.document_id,
+                        note_id=note_id,
                         title=chroma_result.metadata.title or "",
                         content=chroma_result.content,
                         score=chroma_result.score,
@@ -413,6 +460,8 @@ class SearchEngine:
                         relevance_reason=f"Vector similarity: {chroma_result.score:.3f}",
                     )
                 )
+                if len(search_results) >= limit:
+                    break
 
             return search_results
 
@@ -420,19 +469,43 @@ class SearchEngine:
             self.logger.error(f"Vector search failed: {e}")
             return []
 
+    async def _load_contents(self, results: List[SearchResult]) -> None:
+        """Fill in note contents of results fetched without documents from SQLite."""
+        missing = [result for result in results if not result.content]
+        if not missing:
+            return
+
+        try:
+            placeholders = ",".join("?" * len(missing))
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    f"SELECT id, title, content FROM knowledge_notes WHERE id IN ({placeholders})",
+                    [result.note_id for result in missing],
+                )
+                notes = {row[0]: (row[1], row[2]) for row in await cursor.fetchall()}
+        except Exception as e:
+            self.logger.warning(f"Failed to load note contents: {e}")
+            return
+
+        for result in missing:
+            if result.note_id in notes:
+                title, content = notes[result.note_id]
+                result.title = result.title or title
+                result.content = content
+
     async def _keyword_search(
         self, query: str, limit: int, filters: Optional[SearchFilters] = None
     ) -> List[SearchResult]:
         """Internal keyword search implementation using FTS5."""
         try:
-            # Build FTS5 query
-            fts_query = self._build_fts_query(query)
+            # Build FTS5 query; the terms only match note text, never the guild_id column
+            fts_query = f"{{title content}} : ({self._build_fts_query(query)})"
 
             # Build SQL query with filters (using FTS5 virtual table)
             sql_query = """
             SELECT
                 kn.id, kn.title, kn.content, kn.tags, kn.created_at, kn.updated_at,
-                kn.user_id, kn.content_type,
+                kn.user_id, kn.source_type,
                 bm25(knowledge_notes_fts) as score
             FROM knowledge_notes_fts
             JOIN knowledge_notes kn ON knowledge_notes_fts.rowid = kn.rowid
@@ -443,35 +516,48 @@ class SearchEngine:
 
             # Apply filters
             if filters:
+                if filters.guild_id:
+                    # Restrict the match to the guild's partition of the FTS5 index
+                    guild_term = filters.guild_id.replace('"', '""')
+                    params[0] = f'guild_id : "{guild_term}" AND ({fts_query})'
+                    sql_query += " AND kn.guild_id = ?"
+                    params.append(filters.guild_id)
                 if filters.user_id:
                     sql_query += " AND kn.user_id = ?"
                     params.append(filters.user_id)
                 if filters.content_type:
-                    sql_query += " AND kn.content_type = ?"
+                    # Notes record their type as source_type
+                    sql_query += " AND kn.source_type = ?"
                     params.append(filters.content_type)
                 if filters.tags:
-                    # Simple tag matching (can be improved)
-                    tag_conditions = []
-                    for tag in filters.tags:
-                        tag_conditions.append("kn.tags LIKE ?")
-                        params.append(f"%{tag}%")
-                    if tag_conditions:
-                        sql_query += f" AND ({' OR '.join(tag_conditions)})"
-
-            sql_query += " ORDER BY score DESC LIMIT ?"
+                    # Exact tag match in any spelling through the note_tags index
+                    tags = (
+                        self.tag_vocabulary.variants(filters.tags)
+                        if self.tag_vocabulary
+                        else list(filters.tags)
+                    )
+                    placeholders = ", ".join("?" for _ in tags)
+                    sql_query += (
+                        " AND kn.id IN (SELECT note_id FROM note_tags "
+                        f"WHERE tag IN ({placeholders}))"
+                    )
+                    params.extend(tags)
+
+            # bm25() is negative, lower meaning more relevant
+            sql_query += " ORDER BY score LIMIT ?"
             params.append(str(limit))
 
             # Execute search
-            conn = await self.db.get_connection()
-            cursor = await conn.execute(sql_query, params)
-            rows = await cursor.fetchall()
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(sql_query, params)
+                rows = await cursor.fetchall()
 
             # Convert to SearchResult
             search_results = []
             for row in rows:
                 # Normalize BM25 score to 0.0-1.0 range
                 # BM25 scores can vary widely, this is a simple normalization
-                normalized_score = min(1.0, max(0.0, row[8] / 10.0))  # score is index 8
+                normalized_score = min(1.0, max(0.0, -row[8] / 10.0))  # score is index 8
 
                 # Parse tags
                 tags = []
@@ -689,7 +775,7 @@ class SearchEngine:
         if filters:
             filter_str = (
                 f"{filters.user_id or ''}{filters.content_type or ''}"
-                f"{filters.tags or []}{filters.min_score or 0}"
+                f"{filters.tags or []}{filters.min_score or 0}{filters.guild_id or ''}"
             )
 
         cache_data = f"{query}{mode.value}{alpha}{limit}{filter_str}"
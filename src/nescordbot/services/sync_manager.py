@@ -3,20 +3,28 @@ SyncManager for SQLite-ChromaDB synchronization.
 
 This module provides SyncManager service for maintaining data consistency
 between knowledge_notes table (SQLite) and ChromaDB vector database.
+
+Retries of failed syncs have a single owner per note: while a note has a
+pending entry in the sync outbox, the outbox worker retries it on its own
+backoff schedule. The retry worker of this module only retries notes with
+no pending outbox entry, such as syncs started without an outbox or notes
+whose outbox entry was parked.
 """
 
 import asyncio
 import hashlib
 import logging
-from dataclasses import dataclass
+import random
+import time
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple, cast
+from typing import Any, Dict, List, Optional, Set, Tuple, cast
 
 from ..config import BotConfig
-from .chromadb_service import ChromaDBService, DocumentMetadata
 from .database import DatabaseService
 from .embedding import EmbeddingService
+from .vector_store import DocumentMetadata, VectorStore
 
 logger = logging.getLogger(__name__)
 
@@ -28,9 +36,79 @@ class SyncStatus(Enum):
     SYNCING = "syncing"
     SYNCED = "synced"
     FAILED = "failed"
+    PARKED = "parked"
     CONFLICT = "conflict"
 
 
+# Error classes that retrying cannot fix; such notes are parked immediately
+PERMANENT_SYNC_ERRORS = frozenset({"NoteNotFound", "EmptyContent"})
+
+# Counter updates applied by the sync_stats triggers; {row} is NEW or OLD
+_STATUS_COUNTER_SQL = """
+    INSERT INTO sync_stats (metric, key, value)
+    VALUES ('status', COALESCE({row}.sync_status, 'pending'), {delta})
+    ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value;
+"""
+_ERROR_CLASS_COUNTER_SQL = """
+    INSERT INTO sync_stats (metric, key, value)
+    SELECT 'error_class', {row}.last_error_class, {delta}
+    WHERE {row}.sync_status IN ('failed', 'parked') AND {row}.last_error_class IS NOT NULL
+    ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value;
+"""
+_NOTE_COUNTER_SQL = """
+    INSERT INTO sync_stats (metric, key, value) VALUES ('notes', 'total', {delta})
+    ON CONFLICT(metric, key) DO UPDATE SET value = value + excluded.value;
+"""
+
+# Triggers keeping sync_stats counters current in the same transaction as the write
+SYNC_STATS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sync_stats_metadata_insert
+    AFTER INSERT ON sync_metadata
+    BEGIN
+        {_STATUS_COUNTER_SQL.format(row="NEW", delta=1)}
+        {_ERROR_CLASS_COUNTER_SQL.format(row="NEW", delta=1)}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sync_stats_metadata_update
+    AFTER UPDATE OF sync_status, last_error_class ON sync_metadata
+    WHEN OLD.sync_status IS NOT NEW.sync_status
+      OR OLD.last_error_class IS NOT NEW.last_error_class
+    BEGIN
+        {_STATUS_COUNTER_SQL.format(row="OLD", delta=-1)}
+        {_ERROR_CLASS_COUNTER_SQL.format(row="OLD", delta=-1)}
+        {_STATUS_COUNTER_SQL.format(row="NEW", delta=1)}
+        {_ERROR_CLASS_COUNTER_SQL.format(row="NEW", delta=1)}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sync_stats_metadata_delete
+    AFTER DELETE ON sync_metadata
+    BEGIN
+        {_STATUS_COUNTER_SQL.format(row="OLD", delta=-1)}
+        {_ERROR_CLASS_COUNTER_SQL.format(row="OLD", delta=-1)}
+    END;
+    """,
+]
+NOTE_STATS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sync_stats_notes_insert
+    AFTER INSERT ON knowledge_notes
+    BEGIN
+        {_NOTE_COUNTER_SQL.format(delta=1)}
+    END;
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS sync_stats_notes_delete
+    AFTER DELETE ON knowledge_notes
+    BEGIN
+        {_NOTE_COUNTER_SQL.format(delta=-1)}
+    END;
+    """,
+]
+
+
 class SyncError(Exception):
     """Base exception for synchronization errors."""
 
@@ -81,6 +159,36 @@ class SyncReport:
         return self.successful_syncs / self.total_notes
 
 
+@dataclass
+class NoteChunk:
+    """A content-defined chunk of a note stored as its own ChromaDB document."""
+
+    doc_id: str
+    chunk_index: int
+    content: str
+    chunk_hash: str
+
+
+@dataclass
+class PendingNoteSync:
+    """Work item carried through the batch sync pipeline for one note."""
+
+    note_data: Dict[str, Any]
+    embedding_hash: str
+    chunks: List[NoteChunk]
+    changed_chunks: List[NoteChunk]
+    stale_doc_ids: List[str]
+    embeddings: List[List[float]] = field(default_factory=list)
+    retry_count: int = 0
+    error: Optional[str] = None
+    error_class: Optional[str] = None
+
+    @property
+    def note_id(self) -> str:
+        """ID of the note being synchronized."""
+        return cast(str, self.note_data["id"])
+
+
 @dataclass
 class ConsistencyCheck:
     """Result of consistency verification."""
@@ -104,6 +212,7 @@ class ConsistencyReport:
     missing_from_sqlite: int
     checks: List[ConsistencyCheck]
     checked_at: datetime
+    orphaned_doc_ids: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -138,13 +247,15 @@ class SyncManager:
     - Batch processing for efficiency
     - Data consistency verification
     - Error handling and recovery
+    - Persistent retry schedule with jittered exponential backoff
+    - Materialized sync statistics for dashboards and alerting
     """
 
     def __init__(
         self,
         config: BotConfig,
         database_service: DatabaseService,
-        chromadb_service: ChromaDBService,
+        chromadb_service: VectorStore,
         embedding_service: EmbeddingService,
     ):
         """
@@ -167,6 +278,25 @@ class SyncManager:
         self.max_retries = getattr(config, "sync_max_retries", 3)
         self.retry_delay = getattr(config, "sync_retry_delay", 5.0)
 
+        # Scheduled retries: jittered exponential backoff starting at retry_delay
+        self.retry_backoff_max = getattr(config, "sync_retry_backoff_max", 3600.0)
+        self.retry_poll_interval = getattr(config, "sync_retry_poll_interval", 30.0)
+        self._retry_task: Optional[asyncio.Task] = None
+        self._retry_shutdown = asyncio.Event()
+
+        # Scan-derived statistics (ages, recent activity) are snapshotted this often
+        self.stats_refresh_interval = getattr(config, "sync_stats_refresh_interval", 300.0)
+
+        # Number of batches that may be in flight between pipeline stages
+        self.pipeline_depth = getattr(config, "sync_pipeline_depth", 2)
+
+        # Notes read per SQLite page during consistency verification
+        self.verify_page_size = getattr(config, "sync_verify_page_size", 1000)
+
+        # Chunking configuration (notes longer than chunk_size are split)
+        self.chunk_size = getattr(config, "sync_chunk_size", 2000)
+        self.chunk_min_size = max(1, self.chunk_size // 4)
+
         logger.info("SyncManager initialized")
 
     async def init_async(self) -> None:
@@ -208,26 +338,222 @@ class SyncManager:
             last_error TEXT,
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+            next_retry_at DATETIME,
+            last_error_class TEXT,
             FOREIGN KEY (note_id) REFERENCES knowledge_notes(id)
         );
         """
 
+        # Columns added after the table was first released
+        retry_columns = [("next_retry_at", "DATETIME"), ("last_error_class", "TEXT")]
+
         # Create indexes for performance
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_sync_metadata_status ON sync_metadata(sync_status);",
             "CREATE INDEX IF NOT EXISTS idx_sync_metadata_synced_at "
             "ON sync_metadata(last_synced_at);",
             "CREATE INDEX IF NOT EXISTS idx_sync_metadata_retry ON sync_metadata(retry_count);",
+            "CREATE INDEX IF NOT EXISTS idx_sync_metadata_next_retry "
+            "ON sync_metadata(sync_status, next_retry_at);",
         ]
 
+        # Per-chunk hashes so that edits only re-embed the chunks that changed
+        create_chunks_sql = """
+        CREATE TABLE IF NOT EXISTS sync_chunks (
+            chromadb_doc_id TEXT PRIMARY KEY,
+            note_id TEXT NOT NULL,
+            chunk_index INTEGER NOT NULL,
+            chunk_hash TEXT NOT NULL,
+            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+        indexes.append("CREATE INDEX IF NOT EXISTS idx_sync_chunks_note ON sync_chunks(note_id);")
+
         async with self.db.get_connection() as conn:
             await conn.execute(create_table_sql)
+            await conn.execute(create_chunks_sql)
+
+            cursor = await conn.execute("PRAGMA table_info(sync_metadata)")
+            existing_columns = {row[1] for row in await cursor.fetchall()}
+            for column, column_type in retry_columns:
+                if column not in existing_columns:
+                    await conn.execute(
+                        f"ALTER TABLE sync_metadata ADD COLUMN {column} {column_type}"
+                    )
+
             for index_sql in indexes:
                 await conn.execute(index_sql)
+
+            await self._create_sync_stats_table(conn)
             await conn.commit()
 
         logger.debug("Sync metadata table created successfully")
 
+    async def _create_sync_stats_table(self, conn: Any) -> None:
+        """Create the materialized sync_stats table and the triggers maintaining it."""
+        cursor = await conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND name IN ('sync_stats', 'knowledge_notes')"
+        )
+        existing_tables = {row[0] for row in await cursor.fetchall()}
+
+        await conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sync_stats (
+                metric TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (metric, key)
+            );
+            """
+        )
+        for trigger_sql in SYNC_STATS_TRIGGERS:
+            await conn.execute(trigger_sql)
+        if "knowledge_notes" in existing_tables:
+            for trigger_sql in NOTE_STATS_TRIGGERS:
+                await conn.execute(trigger_sql)
+
+        if "sync_stats" not in existing_tables:
+            # Seed counters from the rows written before the triggers existed
+            await self._rebuild_sync_stats(conn)
+
+    async def _rebuild_sync_stats(self, conn: Any) -> None:
+        """Recompute all sync_stats counters with one pass over the source tables."""
+        await conn.execute("DELETE FROM sync_stats WHERE metric != 'snapshot'")
+        await conn.execute(
+            """
+            INSERT INTO sync_stats (metric, key, value)
+            SELECT 'status', COALESCE(sync_status, 'pending'), COUNT(*)
+            FROM sync_metadata
+            GROUP BY COALESCE(sync_status, 'pending')
+            """
+        )
+        await conn.execute(
+            """
+            INSERT INTO sync_stats (metric, key, value)
+            SELECT 'error_class', last_error_class, COUNT(*)
+            FROM sync_metadata
+            WHERE sync_status IN ('failed', 'parked') AND last_error_class IS NOT NULL
+            GROUP BY last_error_class
+            """
+        )
+        await conn.execute(
+            """
+            INSERT INTO sync_stats (metric, key, value)
+            SELECT 'notes', 'total', COUNT(*) FROM knowledge_notes
+            """
+        )
+
+    async def rebuild_sync_statistics(self) -> None:
+        """Recompute the materialized sync counters from scratch."""
+        await self._ensure_initialized()
+
+        async with self.db.get_connection() as conn:
+            await self._rebuild_sync_stats(conn)
+            await conn.commit()
+
+        await self.refresh_sync_snapshot()
+        logger.info("Rebuilt materialized sync statistics")
+
+    async def _read_sync_stats(self) -> Dict[str, Dict[str, int]]:
+        """Read all materialized counters grouped by metric."""
+        stats: Dict[str, Dict[str, int]] = {
+            "status": {},
+            "error_class": {},
+            "notes": {},
+            "snapshot": {},
+        }
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute("SELECT metric, key, value FROM sync_stats")
+            for metric, key, value in await cursor.fetchall():
+                if value or metric == "snapshot":
+                    stats.setdefault(metric, {})[key] = value
+        return stats
+
+    async def refresh_sync_snapshot(self) -> Dict[str, int]:
+        """
+        Recompute the statistics that need a scan and persist them to sync_stats.
+
+        Returns:
+            Snapshot values keyed by name (timestamps are Unix epoch seconds)
+        """
+        await self._ensure_initialized()
+
+        # Timestamps are written as naive local time by datetime.now(); SQLite's
+        # date functions would read them as UTC, so compare them in Python
+        now = datetime.now()
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT MIN(kn.updated_at)
+                FROM knowledge_notes kn
+                LEFT JOIN sync_metadata sm ON kn.id = sm.note_id
+                WHERE sm.note_id IS NULL
+                   OR sm.sync_status != 'synced'
+                   OR kn.updated_at > sm.last_synced_at
+                """
+            )
+            oldest_updated_at = (await cursor.fetchone())[0]
+            oldest_unsynced_at = (
+                int(datetime.fromisoformat(oldest_updated_at).timestamp())
+                if oldest_updated_at
+                else 0
+            )
+
+            cursor = await conn.execute(
+                """
+                SELECT
+                    COUNT(CASE WHEN last_synced_at > ? THEN 1 END),
+                    COUNT(*)
+                FROM sync_metadata
+                WHERE last_synced_at > ?
+                """,
+                (
+                    (now - timedelta(hours=24)).isoformat(),
+                    (now - timedelta(days=7)).isoformat(),
+                ),
+            )
+            synced_last_24h, synced_last_week = await cursor.fetchone()
+
+            cursor = await conn.execute(
+                """
+                SELECT
+                    COALESCE(SUM(retry_count), 0),
+                    COALESCE(MAX(retry_count), 0),
+                    COUNT(CASE WHEN retry_count >= ? THEN 1 END)
+                FROM sync_metadata
+                WHERE sync_status IN ('failed', 'parked')
+                """,
+                (self.max_retries,),
+            )
+            retry_total, max_retry_count, max_retries_exceeded = await cursor.fetchone()
+
+            snapshot = {
+                "oldest_unsynced_at": oldest_unsynced_at,
+                "synced_last_24h": synced_last_24h,
+                "synced_last_week": synced_last_week,
+                "retry_total": retry_total,
+                "max_retry_count": max_retry_count,
+                "max_retries_exceeded": max_retries_exceeded,
+                "refreshed_at": int(now.timestamp()),
+            }
+            for key, value in snapshot.items():
+                await conn.execute(
+                    """
+                    INSERT INTO sync_stats (metric, key, value) VALUES ('snapshot', ?, ?)
+                    ON CONFLICT(metric, key) DO UPDATE SET value = excluded.value
+                    """,
+                    (key, value),
+                )
+            await conn.commit()
+
+        return snapshot
+
+    def _snapshot_is_stale(self, snapshot: Dict[str, int]) -> bool:
+        """Check whether a persisted snapshot is older than the refresh interval."""
+        refreshed_at = snapshot.get("refreshed_at")
+        return refreshed_at is None or time.time() - refreshed_at >= self.stats_refresh_interval
+
     def _generate_embedding_hash(self, content: str) -> str:
         """Generate hash for embedding content to detect changes."""
         # Include model name in hash to handle model changes
@@ -238,6 +564,159 @@ class SyncManager:
         """Generate ChromaDB document ID from note ID."""
         return f"note_{note_id}"
 
+    def _generate_chunk_doc_id(self, note_id: str, chunk_hash: str) -> str:
+        """Generate content-addressed ChromaDB document ID for a note chunk."""
+        return f"{self._generate_doc_id(note_id)}#{chunk_hash[:16]}"
+
+    def _split_into_chunks(self, content: str) -> List[str]:
+        """
+        Split content into content-defined chunks.
+
+        Chunk boundaries are placed on paragraph breaks whose own hash selects
+        them as a cut point, so an edit only shifts the boundaries of the chunk
+        it touches instead of every chunk after it.
+
+        Args:
+            content: Note body to split
+
+        Returns:
+            List of chunk texts (a single element for short content)
+        """
+        if len(content) <= self.chunk_size:
+            return [content]
+
+        paragraphs: List[str] = []
+        for paragraph in content.split("\n\n"):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            # Oversized paragraphs are hard-split so no chunk exceeds chunk_size
+            while len(paragraph) > self.chunk_size:
+                paragraphs.append(paragraph[: self.chunk_size])
+                paragraph = paragraph[self.chunk_size :]
+            if paragraph:
+                paragraphs.append(paragraph)
+
+        chunks: List[str] = []
+        current: List[str] = []
+        current_size = 0
+        for paragraph in paragraphs:
+            if current and current_size + len(paragraph) > self.chunk_size:
+                chunks.append("\n\n".join(current))
+                current, current_size = [], 0
+
+            current.append(paragraph)
+            current_size += len(paragraph) + 2
+
+            digest = hashlib.sha256(paragraph.encode()).digest()
+            if current_size >= self.chunk_min_size and digest[0] % 4 == 0:
+                chunks.append("\n\n".join(current))
+                current, current_size = [], 0
+
+        if current:
+            chunks.append("\n\n".join(current))
+
+        return chunks or [content]
+
+    def _build_note_chunks(self, note_data: Dict[str, Any]) -> List[NoteChunk]:
+        """Build the chunk documents that represent a note in ChromaDB."""
+        note_id = note_data["id"]
+        bodies = self._split_into_chunks(note_data.get("content") or "")
+
+        if len(bodies) == 1:
+            # Short notes keep a single document under the plain note doc ID
+            content = self._prepare_content_for_embedding(note_data)
+            return [
+                NoteChunk(
+                    doc_id=self._generate_doc_id(note_id),
+                    chunk_index=0,
+                    content=content,
+                    chunk_hash=self._generate_embedding_hash(content),
+                )
+            ]
+
+        chunks: List[NoteChunk] = []
+        seen: set = set()
+        for body in bodies:
+            content = self._prepare_content_for_embedding({**note_data, "content": body})
+            chunk_hash = self._generate_embedding_hash(content)
+            doc_id = self._generate_chunk_doc_id(note_id, chunk_hash)
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            chunks.append(
+                NoteChunk(
+                    doc_id=doc_id,
+                    chunk_index=len(chunks),
+                    content=content,
+                    chunk_hash=chunk_hash,
+                )
+            )
+        return chunks
+
+    def _legacy_doc_ids(
+        self,
+        note_id: str,
+        sync_metadata: Optional[Dict[str, Any]],
+        stored_chunks: Dict[str, str],
+        current_doc_ids: Set[str],
+    ) -> List[str]:
+        """
+        Plain note document left behind when a note is first synced as chunks.
+
+        Notes synced before chunking have a ``note_<id>`` document but no
+        sync_chunks records, so the stale-chunk diff never sees it.
+        """
+        doc_id = self._generate_doc_id(note_id)
+        if sync_metadata and not stored_chunks and doc_id not in current_doc_ids:
+            return [doc_id]
+        return []
+
+    async def _get_note_chunks(self, note_id: str) -> Dict[str, str]:
+        """Get stored chunk hashes for a note keyed by ChromaDB document ID."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT chromadb_doc_id, chunk_hash FROM sync_chunks WHERE note_id = ?",
+                (note_id,),
+            )
+            return {row[0]: row[1] for row in await cursor.fetchall()}
+
+    async def _get_note_chunks_bulk(self, note_ids: List[str]) -> Dict[str, Dict[str, str]]:
+        """Get stored chunk hashes for multiple notes, keyed by note ID then doc ID."""
+        if not note_ids:
+            return {}
+
+        placeholders = ",".join("?" for _ in note_ids)
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT note_id, chromadb_doc_id, chunk_hash
+                FROM sync_chunks
+                WHERE note_id IN ({placeholders})
+                """,
+                note_ids,
+            )
+            rows = await cursor.fetchall()
+
+        chunks: Dict[str, Dict[str, str]] = {}
+        for note_id, doc_id, chunk_hash in rows:
+            chunks.setdefault(note_id, {})[doc_id] = chunk_hash
+        return chunks
+
+    async def _replace_note_chunks(self, note_id: str, chunks: List[NoteChunk]) -> None:
+        """Replace stored chunk hashes for a note after a successful sync."""
+        async with self.db.get_connection() as conn:
+            await conn.execute("DELETE FROM sync_chunks WHERE note_id = ?", (note_id,))
+            for chunk in chunks:
+                await conn.execute(
+                    """
+                    INSERT INTO sync_chunks (chromadb_doc_id, note_id, chunk_index, chunk_hash)
+                    VALUES (?, ?, ?, ?)
+                    """,
+                    (chunk.doc_id, note_id, chunk.chunk_index, chunk.chunk_hash),
+                )
+            await conn.commit()
+
     async def _ensure_initialized(self) -> None:
         """Ensure SyncManager is initialized before operations."""
         if not self._initialized:
@@ -261,7 +740,10 @@ class SyncManager:
                 async with self.db.get_connection() as conn:
                     cursor = await conn.execute(
                         """
-                        SELECT sm.*, kn.title, kn.updated_at as note_updated_at
+                        SELECT sm.note_id, sm.last_synced_at, sm.sync_status,
+                               sm.chromadb_doc_id, sm.embedding_hash, sm.retry_count,
+                               sm.last_error, sm.next_retry_at, kn.title,
+                               kn.updated_at as note_updated_at
                         FROM sync_metadata sm
                         JOIN knowledge_notes kn ON kn.id = sm.note_id
                         WHERE sm.note_id = ?
@@ -279,40 +761,28 @@ class SyncManager:
                         "embedding_hash": row[4],
                         "retry_count": row[5],
                         "last_error": row[6],
-                        "title": row[9],
-                        "note_updated_at": row[10],
+                        "next_retry_at": row[7],
+                        "title": row[8],
+                        "note_updated_at": row[9],
                     }
                 else:
                     return {"error": f"Note {note_id} not found or not synced"}
 
             else:
-                # Get overall sync statistics
-                async with self.db.get_connection() as conn:
-                    cursor = await conn.execute(
-                        """
-                        SELECT
-                            sync_status,
-                            COUNT(*) as count
-                        FROM sync_metadata
-                        GROUP BY sync_status
-                        """
-                    )
-                    status_counts = {row[0]: row[1] for row in await cursor.fetchall()}
-
-                    # Get total notes count
-                    cursor = await conn.execute("SELECT COUNT(*) FROM knowledge_notes")
-                    total_notes = (await cursor.fetchone())[0]
-
-                    # Get synced notes count
-                    synced_notes = sum(status_counts.values())
-
-                    return {
-                        "total_notes": total_notes,
-                        "synced_notes": synced_notes,
-                        "unsynced_notes": total_notes - synced_notes,
-                        "status_breakdown": status_counts,
-                        "last_checked": datetime.now().isoformat(),
-                    }
+                # Overall status is served from the materialized counters
+                counters = await self._read_sync_stats()
+                status_counts = counters["status"]
+                total_notes = counters["notes"].get("total", 0)
+                synced_notes = sum(status_counts.values())
+
+                return {
+                    "total_notes": total_notes,
+                    "synced_notes": synced_notes,
+                    "unsynced_notes": total_notes - synced_notes,
+                    "pending_backlog": total_notes - status_counts.get("synced", 0),
+                    "status_breakdown": status_counts,
+                    "last_checked": datetime.now().isoformat(),
+                }
 
         except Exception as e:
             logger.error(f"Failed to get sync status: {e}")
@@ -411,34 +881,66 @@ class SyncManager:
                     retry_count=sync_metadata.get("retry_count", 0),
                 )
 
-            # Generate embedding
-            embedding_result = await self.embedding.generate_embedding(content)
-            if not embedding_result:
-                return SyncResult(
-                    note_id=note_id,
-                    success=False,
-                    status=SyncStatus.FAILED,
-                    error="Failed to generate embedding",
-                )
+            # Work out which chunks actually changed since the last sync
+            chunks = self._build_note_chunks(note_data)
+            stored_chunks = await self._get_note_chunks(note_id)
+            changed_chunks = [
+                chunk for chunk in chunks if stored_chunks.get(chunk.doc_id) != chunk.chunk_hash
+            ]
+            current_doc_ids = {chunk.doc_id for chunk in chunks}
+            changed_doc_ids = {chunk.doc_id for chunk in changed_chunks}
+            stale_doc_ids = [
+                doc_id
+                for doc_id in stored_chunks
+                if doc_id not in current_doc_ids or doc_id in changed_doc_ids
+            ]
+            stale_doc_ids.extend(
+                self._legacy_doc_ids(note_id, sync_metadata, stored_chunks, current_doc_ids)
+            )
+
+            # Generate embeddings for changed chunks only
+            embeddings: List[List[float]] = []
+            for chunk in changed_chunks:
+                embedding_result = await self.embedding.generate_embedding(chunk.content)
+                if not embedding_result:
+                    return SyncResult(
+                        note_id=note_id,
+                        success=False,
+                        status=SyncStatus.FAILED,
+                        error="Failed to generate embedding",
+                    )
+                embeddings.append(embedding_result.embedding)
 
             # Prepare ChromaDB document
             doc_id = self._generate_doc_id(note_id)
-            metadata = self._create_document_metadata(note_data)
 
             # Update sync status to syncing
             await self._update_sync_metadata(
                 note_id=note_id, status=SyncStatus.SYNCING, chromadb_doc_id=doc_id
             )
 
-            # Add/update document in ChromaDB
-            success = await self.chromadb.add_document(
-                document_id=doc_id,
-                content=content,
-                embedding=embedding_result.embedding,
-                metadata=metadata,
-            )
+            # Drop removed chunks and the previous version of re-embedded ones
+            for stale_doc_id in stale_doc_ids:
+                await self.chromadb.delete_document(stale_doc_id)
+
+            # Add changed chunks to ChromaDB
+            success = True
+            for chunk, embedding in zip(changed_chunks, embeddings):
+                metadata = self._create_document_metadata(note_data)
+                metadata.chunk_index = chunk.chunk_index
+                metadata.content_hash = chunk.chunk_hash
+                success = await self.chromadb.add_document(
+                    document_id=chunk.doc_id,
+                    content=chunk.content,
+                    embedding=embedding,
+                    metadata=metadata,
+                )
+                if not success:
+                    break
 
             if success:
+                await self._replace_note_chunks(note_id, chunks)
+
                 # Update sync metadata
                 await self._update_sync_metadata(
                     note_id=note_id,
@@ -448,12 +950,19 @@ class SyncManager:
                     last_synced_at=start_time,
                 )
 
+                logger.debug(
+                    f"Note {note_id} synced: {len(changed_chunks)}/{len(chunks)} chunks re-embedded"
+                )
+
                 return SyncResult(
                     note_id=note_id, success=True, status=SyncStatus.SYNCED, synced_at=start_time
                 )
             else:
                 await self._update_sync_metadata(
-                    note_id=note_id, status=SyncStatus.FAILED, error="ChromaDB add_document failed"
+                    note_id=note_id,
+                    status=SyncStatus.FAILED,
+                    error="ChromaDB add_document failed",
+                    error_class="VectorStoreError",
                 )
 
                 return SyncResult(
@@ -469,45 +978,348 @@ class SyncManager:
 
             # Update sync metadata with error
             await self._update_sync_metadata(
-                note_id=note_id, status=SyncStatus.FAILED, error=error_msg
+                note_id=note_id,
+                status=SyncStatus.FAILED,
+                error=error_msg,
+                error_class=type(e).__name__,
             )
 
             return SyncResult(
                 note_id=note_id, success=False, status=SyncStatus.FAILED, error=error_msg
             )
 
-    async def sync_notes_batch(self, note_ids: List[str]) -> Dict[str, SyncResult]:
+    async def sync_notes_batch(
+        self, note_ids: List[str], force: bool = False
+    ) -> Dict[str, SyncResult]:
         """
         Synchronize multiple notes in batch.
 
+        Notes are processed in batches of ``batch_size`` through a pipeline:
+
+        1. Bulk-load notes, sync metadata and chunk hashes; skip unchanged notes
+        2. Embed all changed chunks of the batch in one batched request
+        3. Write all chunk documents to ChromaDB in one batch call
+        4. Record sync metadata and chunk hashes in one SQLite transaction
+
+        Stages run concurrently on consecutive batches (up to
+        ``pipeline_depth`` batches queued between stages), so loading and
+        writing overlap with the embedding requests that dominate sync time.
+
         Args:
             note_ids: List of note IDs to synchronize
+            force: Re-embed every chunk, even of notes that are already synced
 
         Returns:
             Dictionary mapping note_id to SyncResult
         """
         await self._ensure_initialized()
 
-        results = {}
+        results: Dict[str, SyncResult] = {}
+        unique_ids = list(dict.fromkeys(note_ids))
+        if not unique_ids:
+            return results
+
+        if not self.embedding.is_available():
+            for note_id in unique_ids:
+                results[note_id] = SyncResult(
+                    note_id=note_id,
+                    success=False,
+                    status=SyncStatus.FAILED,
+                    error="EmbeddingService not available",
+                )
+            return results
 
-        # Process in chunks to respect batch size limits
-        for i in range(0, len(note_ids), self.batch_size):
-            batch = note_ids[i : i + self.batch_size]
+        batches = [
+            unique_ids[i : i + self.batch_size] for i in range(0, len(unique_ids), self.batch_size)
+        ]
+        embed_queue: "asyncio.Queue[Optional[List[PendingNoteSync]]]" = asyncio.Queue(
+            maxsize=self.pipeline_depth
+        )
+        write_queue: "asyncio.Queue[Optional[List[PendingNoteSync]]]" = asyncio.Queue(
+            maxsize=self.pipeline_depth
+        )
+        started_at = datetime.now()
 
-            # Process batch concurrently
-            tasks = [self.sync_note_to_chromadb(note_id) for note_id in batch]
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def load_stage() -> None:
+            try:
+                for batch in batches:
+                    await embed_queue.put(await self._load_sync_batch(batch, results, force))
+            finally:
+                await embed_queue.put(None)
 
-            # Process results
-            for note_id, result in zip(batch, batch_results):
-                if isinstance(result, Exception):
-                    results[note_id] = SyncResult(
-                        note_id=note_id, success=False, status=SyncStatus.FAILED, error=str(result)
+        async def embed_stage() -> None:
+            try:
+                while (pending := await embed_queue.get()) is not None:
+                    await self._embed_sync_batch(pending)
+                    await write_queue.put(pending)
+            finally:
+                await write_queue.put(None)
+
+        async def write_stage() -> None:
+            while (pending := await write_queue.get()) is not None:
+                await self._write_sync_batch(pending, results, started_at)
+
+        await asyncio.gather(load_stage(), embed_stage(), write_stage())
+
+        # Preserve the caller's ordering
+        return {note_id: results[note_id] for note_id in unique_ids if note_id in results}
+
+    async def _load_sync_batch(
+        self, note_ids: List[str], results: Dict[str, SyncResult], force: bool = False
+    ) -> List[PendingNoteSync]:
+        """
+        Pipeline stage 1: bulk-load notes and drop the ones that are unchanged.
+
+        Args:
+            note_ids: Note IDs of the batch
+            results: Result map; missing and unchanged notes are resolved here
+            force: Keep unchanged notes and treat all of their chunks as changed
+
+        Returns:
+            Work items for notes that need to be (re-)embedded
+        """
+        try:
+            notes = await self._get_notes_data(note_ids)
+            sync_metadata = await self._get_sync_metadata_bulk(note_ids)
+            stored_chunks = await self._get_note_chunks_bulk(note_ids)
+        except Exception as e:
+            logger.error(f"Failed to load sync batch: {e}")
+            for note_id in note_ids:
+                results[note_id] = SyncResult(
+                    note_id=note_id,
+                    success=False,
+                    status=SyncStatus.FAILED,
+                    error=f"Sync failed: {e}",
+                )
+            return []
+
+        pending: List[PendingNoteSync] = []
+        for note_id in note_ids:
+            note_data = notes.get(note_id)
+            if not note_data:
+                results[note_id] = SyncResult(
+                    note_id=note_id,
+                    success=False,
+                    status=SyncStatus.FAILED,
+                    error="Note not found in SQLite",
+                )
+                continue
+
+            embedding_hash = self._generate_embedding_hash(
+                self._prepare_content_for_embedding(note_data)
+            )
+            metadata = sync_metadata.get(note_id)
+            if (
+                not force
+                and metadata
+                and metadata.get("embedding_hash") == embedding_hash
+                and metadata.get("sync_status") == "synced"
+            ):
+                results[note_id] = SyncResult(
+                    note_id=note_id,
+                    success=True,
+                    status=SyncStatus.SYNCED,
+                    synced_at=datetime.now(),
+                    retry_count=metadata.get("retry_count", 0),
+                )
+                continue
+
+            chunks = self._build_note_chunks(note_data)
+            stored = stored_chunks.get(note_id, {})
+            changed_chunks = [
+                chunk for chunk in chunks if force or stored.get(chunk.doc_id) != chunk.chunk_hash
+            ]
+            current_doc_ids = {chunk.doc_id for chunk in chunks}
+            pending.append(
+                PendingNoteSync(
+                    note_data=note_data,
+                    embedding_hash=embedding_hash,
+                    chunks=chunks,
+                    changed_chunks=changed_chunks,
+                    # Re-embedded documents are overwritten by the upsert
+                    stale_doc_ids=[doc_id for doc_id in stored if doc_id not in current_doc_ids]
+                    + self._legacy_doc_ids(note_id, metadata, stored, current_doc_ids),
+                    retry_count=metadata.get("retry_count", 0) if metadata else 0,
+                )
+            )
+
+        return pending
+
+    async def _embed_sync_batch(self, pending: List[PendingNoteSync]) -> None:
+        """
+        Pipeline stage 2: embed the changed chunks of a batch in one request.
+
+        Failures are recorded on the work items instead of being raised.
+
+        Args:
+            pending: Work items of the batch
+        """
+        texts: List[str] = []
+        owners: List[PendingNoteSync] = []
+        for item in pending:
+            if any(not chunk.content.strip() for chunk in item.changed_chunks):
+                item.error = "Failed to generate embedding: empty note content"
+                item.error_class = "EmptyContent"
+                continue
+            for chunk in item.changed_chunks:
+                texts.append(chunk.content)
+                owners.append(item)
+
+        if not texts:
+            return
+
+        try:
+            embedding_results = await self.embedding.generate_embeddings_batch(texts)
+        except Exception as e:
+            logger.error(f"Batch embedding of {len(texts)} chunks failed: {e}")
+            for item in pending:
+                if item.error is None:
+                    item.error = f"Failed to generate embedding: {e}"
+                    item.error_class = type(e).__name__
+            return
+
+        for item, embedding_result in zip(owners, embedding_results):
+            item.embeddings.append(embedding_result.embedding)
+
+    async def _write_sync_batch(
+        self,
+        pending: List[PendingNoteSync],
+        results: Dict[str, SyncResult],
+        synced_at: datetime,
+    ) -> None:
+        """
+        Pipeline stages 3 and 4: write chunk documents, then record metadata.
+
+        Args:
+            pending: Embedded work items of the batch
+            results: Result map to fill in
+            synced_at: Timestamp recorded as last sync time
+        """
+        ready = [item for item in pending if item.error is None]
+
+        if ready:
+            try:
+                # Drop chunks that no longer exist, then overwrite the rest in one call
+                stale_doc_ids = [doc_id for item in ready for doc_id in item.stale_doc_ids]
+                if stale_doc_ids:
+                    await self.chromadb.delete_documents_batch(stale_doc_ids)
+
+                documents: List[Tuple[str, str, List[float], Optional[DocumentMetadata]]] = []
+                for item in ready:
+                    for chunk, embedding in zip(item.changed_chunks, item.embeddings):
+                        metadata = self._create_document_metadata(item.note_data)
+                        metadata.chunk_index = chunk.chunk_index
+                        metadata.content_hash = chunk.chunk_hash
+                        documents.append((chunk.doc_id, chunk.content, embedding, metadata))
+
+                if documents:
+                    await self.chromadb.upsert_documents_batch(documents)
+            except Exception as e:
+                logger.error(f"ChromaDB batch write failed: {e}")
+                for item in ready:
+                    item.error = f"ChromaDB upsert_documents_batch failed: {e}"
+                    item.error_class = type(e).__name__
+
+        try:
+            await self._record_sync_batch(pending, synced_at)
+        except Exception as e:
+            logger.error(f"Failed to record sync metadata for batch: {e}")
+            for item in pending:
+                item.error = item.error or f"Failed to record sync metadata: {e}"
+
+        for item in pending:
+            if item.error is None:
+                results[item.note_id] = SyncResult(
+                    note_id=item.note_id,
+                    success=True,
+                    status=SyncStatus.SYNCED,
+                    synced_at=synced_at,
+                )
+            else:
+                results[item.note_id] = SyncResult(
+                    note_id=item.note_id,
+                    success=False,
+                    status=SyncStatus.FAILED,
+                    error=item.error,
+                )
+
+        logger.debug(
+            f"Synced batch: {len(ready)}/{len(pending)} notes, "
+            f"{sum(len(item.changed_chunks) for item in ready)} chunks re-embedded"
+        )
+
+    async def _record_sync_batch(self, pending: List[PendingNoteSync], synced_at: datetime) -> None:
+        """Write sync metadata and chunk hashes for a batch in one transaction."""
+        now = datetime.now().isoformat()
+
+        async with self.db.get_connection() as conn:
+            for item in pending:
+                if item.error is None:
+                    await conn.execute(
+                        """
+                        INSERT INTO sync_metadata
+                        (note_id, sync_status, chromadb_doc_id, embedding_hash,
+                         last_synced_at, last_error, retry_count, created_at, updated_at)
+                        VALUES (?, 'synced', ?, ?, ?, NULL, 0, ?, ?)
+                        ON CONFLICT(note_id) DO UPDATE SET
+                            sync_status = 'synced',
+                            chromadb_doc_id = excluded.chromadb_doc_id,
+                            embedding_hash = excluded.embedding_hash,
+                            last_synced_at = excluded.last_synced_at,
+                            last_error = NULL,
+                            last_error_class = NULL,
+                            retry_count = 0,
+                            next_retry_at = NULL,
+                            updated_at = excluded.updated_at
+                        """,
+                        (
+                            item.note_id,
+                            self._generate_doc_id(item.note_id),
+                            item.embedding_hash,
+                            synced_at.isoformat(),
+                            now,
+                            now,
+                        ),
                     )
+                    await conn.execute("DELETE FROM sync_chunks WHERE note_id = ?", (item.note_id,))
+                    for chunk in item.chunks:
+                        await conn.execute(
+                            """
+                            INSERT INTO sync_chunks
+                            (chromadb_doc_id, note_id, chunk_index, chunk_hash)
+                            VALUES (?, ?, ?, ?)
+                            """,
+                            (chunk.doc_id, item.note_id, chunk.chunk_index, chunk.chunk_hash),
+                        )
                 else:
-                    results[note_id] = cast(SyncResult, result)
-
-        return results
+                    retry_count = item.retry_count + 1
+                    status, next_retry_at = self._schedule_retry(retry_count, item.error_class)
+                    await conn.execute(
+                        """
+                        INSERT INTO sync_metadata
+                        (note_id, sync_status, last_error, last_error_class, retry_count,
+                         next_retry_at, created_at, updated_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT(note_id) DO UPDATE SET
+                            sync_status = excluded.sync_status,
+                            last_error = excluded.last_error,
+                            last_error_class = excluded.last_error_class,
+                            retry_count = excluded.retry_count,
+                            next_retry_at = excluded.next_retry_at,
+                            updated_at = excluded.updated_at
+                        """,
+                        (
+                            item.note_id,
+                            status,
+                            item.error,
+                            item.error_class,
+                            retry_count,
+                            next_retry_at,
+                            now,
+                            now,
+                        ),
+                    )
+            await conn.commit()
 
     async def sync_all_notes(self) -> SyncReport:
         """
@@ -573,7 +1385,7 @@ class SyncManager:
             cursor = await conn.execute(
                 """
                 SELECT id, title, content, tags, source_type,
-                       created_at, updated_at, user_id
+                       created_at, updated_at, user_id, guild_id
                 FROM knowledge_notes
                 WHERE id = ?
                 """,
@@ -591,9 +1403,43 @@ class SyncManager:
                 "created_at": row[5],
                 "updated_at": row[6],
                 "user_id": row[7],
+                "guild_id": row[8],
             }
         return None
 
+    async def _get_notes_data(self, note_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get note data for multiple notes from SQLite in one query."""
+        if not note_ids:
+            return {}
+
+        placeholders = ",".join("?" for _ in note_ids)
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT id, title, content, tags, source_type,
+                       created_at, updated_at, user_id, guild_id
+                FROM knowledge_notes
+                WHERE id IN ({placeholders})
+                """,
+                note_ids,
+            )
+            rows = await cursor.fetchall()
+
+        return {
+            row[0]: {
+                "id": row[0],
+                "title": row[1],
+                "content": row[2],
+                "tags": row[3],
+                "source_type": row[4],
+                "created_at": row[5],
+                "updated_at": row[6],
+                "user_id": row[7],
+                "guild_id": row[8],
+            }
+            for row in rows
+        }
+
     def _prepare_content_for_embedding(self, note_data: Dict[str, Any]) -> str:
         """Prepare note content for embedding generation."""
         parts = []
@@ -623,6 +1469,7 @@ class SyncManager:
             tags=note_data.get("tags", "").split(",") if note_data.get("tags") else None,
             user_id=note_data.get("user_id"),
             content_type="note",
+            guild_id=note_data.get("guild_id"),
         )
 
     async def _get_sync_metadata(self, note_id: str) -> Optional[Dict[str, Any]]:
@@ -642,9 +1489,33 @@ class SyncManager:
                 "last_error": row[6],
                 "created_at": row[7],
                 "updated_at": row[8],
+                "next_retry_at": row[9],
+                "last_error_class": row[10],
             }
         return None
 
+    async def _get_sync_metadata_bulk(self, note_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get sync status, hash and retry count for multiple notes in one query."""
+        if not note_ids:
+            return {}
+
+        placeholders = ",".join("?" for _ in note_ids)
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"""
+                SELECT note_id, sync_status, embedding_hash, retry_count
+                FROM sync_metadata
+                WHERE note_id IN ({placeholders})
+                """,
+                note_ids,
+            )
+            rows = await cursor.fetchall()
+
+        return {
+            row[0]: {"sync_status": row[1], "embedding_hash": row[2], "retry_count": row[3]}
+            for row in rows
+        }
+
     async def _update_sync_metadata(
         self,
         note_id: str,
@@ -653,13 +1524,23 @@ class SyncManager:
         embedding_hash: Optional[str] = None,
         last_synced_at: Optional[datetime] = None,
         error: Optional[str] = None,
+        error_class: Optional[str] = None,
     ) -> None:
-        """Update sync metadata for a note."""
+        """Update sync metadata for a note, scheduling a retry for failures."""
         current_time = datetime.now()
 
         # First check if record exists
         existing = await self._get_sync_metadata(note_id)
 
+        retry_count = (existing["retry_count"] or 0) if existing else 0
+        next_retry_at: Optional[str] = None
+        status_value = status.value
+        if status == SyncStatus.FAILED:
+            retry_count += 1
+            status_value, next_retry_at = self._schedule_retry(retry_count, error_class)
+        elif status == SyncStatus.SYNCED:
+            retry_count = 0
+
         if existing:
             # Update existing record
             update_sql = """
@@ -670,11 +1551,9 @@ class SyncManager:
                 embedding_hash = COALESCE(?, embedding_hash),
                 last_synced_at = COALESCE(?, last_synced_at),
                 last_error = ?,
-                retry_count = CASE
-                    WHEN ? = 'failed' THEN retry_count + 1
-                    WHEN ? = 'synced' THEN 0
-                    ELSE retry_count
-                END
+                last_error_class = ?,
+                retry_count = ?,
+                next_retry_at = ?
             WHERE note_id = ?
             """
 
@@ -682,14 +1561,15 @@ class SyncManager:
                 await conn.execute(
                     update_sql,
                     (
-                        status.value,
+                        status_value,
                         current_time.isoformat(),
                         chromadb_doc_id,
                         embedding_hash,
                         last_synced_at.isoformat() if last_synced_at else None,
                         error,
-                        status.value,
-                        status.value,
+                        error_class,
+                        retry_count,
+                        next_retry_at,
                         note_id,
                     ),
                 )
@@ -698,57 +1578,133 @@ class SyncManager:
             # Insert new record
             insert_sql = """
             INSERT INTO sync_metadata
-            (note_id, sync_status, chromadb_doc_id, embedding_hash,
-             last_synced_at, last_error, retry_count, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            (note_id, sync_status, chromadb_doc_id, embedding_hash, last_synced_at,
+             last_error, last_error_class, retry_count, next_retry_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
 
-            retry_count = 1 if status == SyncStatus.FAILED else 0
-
             async with self.db.get_connection() as conn:
                 await conn.execute(
                     insert_sql,
                     (
                         note_id,
-                        status.value,
+                        status_value,
                         chromadb_doc_id,
                         embedding_hash,
                         last_synced_at.isoformat() if last_synced_at else None,
                         error,
+                        error_class,
                         retry_count,
+                        next_retry_at,
                         current_time.isoformat(),
                         current_time.isoformat(),
                     ),
                 )
                 await conn.commit()
 
+    def _schedule_retry(
+        self, retry_count: int, error_class: Optional[str]
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Decide how a failed sync is retried.
+
+        Notes that ran out of retries or hit a permanent error are parked and
+        only retried through requeue_parked_syncs().
+
+        Args:
+            retry_count: Number of failed attempts including this one
+            error_class: Class of the error that caused the failure
+
+        Returns:
+            Status to record and the next retry time (None when parked)
+        """
+        if retry_count >= self.max_retries or error_class in PERMANENT_SYNC_ERRORS:
+            return SyncStatus.PARKED.value, None
+
+        delay = self._get_retry_delay(retry_count)
+        return SyncStatus.FAILED.value, (datetime.now() + timedelta(seconds=delay)).isoformat()
+
+    def _get_retry_delay(self, retry_count: int) -> float:
+        """Exponential backoff, jittered over the upper half of the delay."""
+        delay = min(self.retry_backoff_max, self.retry_delay * (2 ** (retry_count - 1)))
+        return float(delay / 2 + random.uniform(0, delay / 2))
+
     async def verify_consistency(self) -> ConsistencyReport:
         """
         Verify data consistency between SQLite and ChromaDB.
 
+        Performs a set diff instead of per-note vector queries: ChromaDB is
+        streamed page by page (IDs and metadata only) into a map of note ID to
+        chunk documents, then SQLite notes are streamed in ID order and matched
+        against it. Documents left over belong to notes that no longer exist
+        in SQLite and are reported as orphans.
+
         Returns:
             Comprehensive consistency report
         """
         await self._ensure_initialized()
 
         checked_at = datetime.now()
-        checks = []
+        checks: List[ConsistencyCheck] = []
 
         try:
-            # Get all notes from SQLite
+            # ChromaDB side: note_id -> {doc_id: metadata}
+            chromadb_docs: Dict[str, Dict[str, DocumentMetadata]] = {}
+            async for page in self.chromadb.iter_documents(include=["metadatas"]):
+                for doc in page:
+                    note_id = doc.metadata.document_id or self._note_id_from_doc_id(doc.document_id)
+                    chromadb_docs.setdefault(note_id, {})[doc.document_id] = doc.metadata
+
+            # Recorded hashes are only needed for documents written before
+            # content hashes were stored in ChromaDB metadata
             async with self.db.get_connection() as conn:
-                cursor = await conn.execute(
-                    "SELECT id, title, content, tags, updated_at FROM knowledge_notes"
-                )
-                sqlite_notes = {row[0]: row for row in await cursor.fetchall()}
+                cursor = await conn.execute("SELECT note_id, embedding_hash FROM sync_metadata")
+                recorded_hashes = {row[0]: row[1] for row in await cursor.fetchall()}
 
-            # Get ChromaDB document count
-            await self.chromadb.get_document_count()
+            # SQLite side, streamed with keyset pagination
+            last_id = ""
+            while True:
+                async with self.db.get_connection() as conn:
+                    cursor = await conn.execute(
+                        """
+                        SELECT id, title, content, tags, updated_at
+                        FROM knowledge_notes
+                        WHERE id > ?
+                        ORDER BY id
+                        LIMIT ?
+                        """,
+                        (last_id, self.verify_page_size),
+                    )
+                    rows = await cursor.fetchall()
 
-            # Check each SQLite note against ChromaDB
-            for note_id, note_data in sqlite_notes.items():
-                check = await self._verify_single_note_consistency(note_id, note_data)
-                checks.append(check)
+                if not rows:
+                    break
+
+                for row in rows:
+                    note_data = {"id": row[0], "title": row[1], "content": row[2], "tags": row[3]}
+                    checks.append(
+                        self._compare_note_documents(
+                            note_data,
+                            chromadb_docs.pop(row[0], {}),
+                            recorded_hashes.get(row[0]),
+                            last_modified=row[4],
+                        )
+                    )
+                last_id = rows[-1][0]
+
+            # Whatever is left in ChromaDB has no SQLite note
+            orphaned_doc_ids: List[str] = []
+            for note_id, docs in chromadb_docs.items():
+                orphaned_doc_ids.extend(docs)
+                checks.append(
+                    ConsistencyCheck(
+                        note_id=note_id,
+                        sqlite_exists=False,
+                        chromadb_exists=True,
+                        embedding_matches=False,
+                        metadata_matches=False,
+                    )
+                )
 
             # Compile statistics
             consistent_notes = sum(
@@ -776,6 +1732,7 @@ class SyncManager:
                 missing_from_sqlite=missing_from_sqlite,
                 checks=checks,
                 checked_at=checked_at,
+                orphaned_doc_ids=orphaned_doc_ids,
             )
 
         except Exception as e:
@@ -790,68 +1747,61 @@ class SyncManager:
                 checked_at=checked_at,
             )
 
-    async def _verify_single_note_consistency(
-        self, note_id: str, note_data: Tuple[str, ...]
+    def _note_id_from_doc_id(self, doc_id: str) -> str:
+        """Recover the note ID from a (chunk) document ID without metadata."""
+        base = doc_id.split("#", 1)[0]
+        return base[len("note_") :] if base.startswith("note_") else base
+
+    def _compare_note_documents(
+        self,
+        note_data: Dict[str, Any],
+        docs: Dict[str, DocumentMetadata],
+        recorded_hash: Optional[str],
+        last_modified: Optional[str] = None,
     ) -> ConsistencyCheck:
-        """Verify consistency for a single note."""
-        doc_id = self._generate_doc_id(note_id)
+        """
+        Compare a SQLite note with the ChromaDB documents stored for it.
 
-        # Check SQLite existence
-        sqlite_exists = note_data is not None
+        Args:
+            note_data: Note fields (id, title, content, tags)
+            docs: ChromaDB documents of the note keyed by document ID
+            recorded_hash: Embedding hash recorded in sync_metadata
+            last_modified: Note updated_at
 
-        # Check ChromaDB existence
-        chromadb_exists = False
+        Returns:
+            Consistency check for the note
+        """
         embedding_matches = False
         metadata_matches = False
 
-        try:
-            # Try to search for the document in ChromaDB
-            # Since we don't have a direct "get by ID" method, we'll use search
-            test_embedding = [0.1] * self.embedding.embedding_dimension
-            results = await self.chromadb.search_documents(
-                query_embedding=test_embedding,
-                n_results=1000,  # Get many results to find our document
-                where={"document_id": note_id},
-            )
-
-            # Look for our document in the results
-            chromadb_doc = None
-            for result in results:
-                if result.document_id == doc_id:
-                    chromadb_doc = result
-                    chromadb_exists = True
-                    break
-
-            if chromadb_exists and chromadb_doc:
-                # Check embedding consistency
-                note_content = self._prepare_content_for_embedding(
-                    {"title": note_data[1], "content": note_data[2], "tags": note_data[3]}
-                )
-                expected_hash = self._generate_embedding_hash(note_content)
-
-                # Get sync metadata to compare hash
-                sync_metadata = await self._get_sync_metadata(note_id)
-                if sync_metadata:
-                    embedding_matches = sync_metadata.get("embedding_hash") == expected_hash
+        if docs:
+            expected = {
+                chunk.doc_id: chunk.chunk_hash for chunk in self._build_note_chunks(note_data)
+            }
+            stored = {doc_id: metadata.content_hash for doc_id, metadata in docs.items()}
 
-                # Check metadata consistency (basic check)
-                metadata_matches = (
-                    chromadb_doc.metadata.document_id == note_id
-                    and chromadb_doc.metadata.title == note_data[1]
+            if all(stored.values()):
+                embedding_matches = stored == expected
+            else:
+                # Legacy documents without a content hash
+                expected_hash = self._generate_embedding_hash(
+                    self._prepare_content_for_embedding(note_data)
                 )
+                embedding_matches = set(stored) == set(expected) and recorded_hash == expected_hash
 
-        except Exception as e:
-            logger.debug(f"Error checking ChromaDB consistency for note {note_id}: {e}")
-            # ChromaDB check failed, assume not exists
-            chromadb_exists = False
+            title = note_data.get("title") or ""
+            metadata_matches = all(
+                metadata.document_id in ("", note_data["id"]) and (metadata.title or "") == title
+                for metadata in docs.values()
+            )
 
         return ConsistencyCheck(
-            note_id=note_id,
-            sqlite_exists=sqlite_exists,
-            chromadb_exists=chromadb_exists,
+            note_id=note_data["id"],
+            sqlite_exists=True,
+            chromadb_exists=bool(docs),
             embedding_matches=embedding_matches,
             metadata_matches=metadata_matches,
-            last_modified=note_data[4] if sqlite_exists and len(note_data) > 4 else None,
+            last_modified=last_modified,
         )
 
     async def repair_inconsistencies(self, consistency_report: ConsistencyReport) -> RepairReport:
@@ -917,6 +1867,30 @@ class SyncManager:
                         )
                     )
 
+        # Documents whose note no longer exists are removed in one batch
+        if consistency_report.orphaned_doc_ids:
+            orphaned_note_ids = sorted(
+                {
+                    self._note_id_from_doc_id(doc_id)
+                    for doc_id in consistency_report.orphaned_doc_ids
+                }
+            )
+            try:
+                await self.chromadb.delete_documents_batch(consistency_report.orphaned_doc_ids)
+                await self._delete_sync_records(orphaned_note_ids)
+                repair_results.extend(
+                    RepairResult(note_id=note_id, repair_type="delete_orphan", success=True)
+                    for note_id in orphaned_note_ids
+                )
+            except Exception as e:
+                logger.error(f"Failed to delete orphaned documents: {e}")
+                repair_results.extend(
+                    RepairResult(
+                        note_id=note_id, repair_type="delete_orphan", success=False, error=str(e)
+                    )
+                    for note_id in orphaned_note_ids
+                )
+
         # Handle notes missing from SQLite (if any found in ChromaDB but not SQLite)
         # This would be a more complex repair - for now just log
         missing_from_sqlite = [
@@ -956,8 +1930,10 @@ class SyncManager:
         await self._ensure_initialized()
 
         try:
-            doc_id = self._generate_doc_id(note_id)
-            success = await self.chromadb.delete_document(doc_id)
+            doc_ids = list(await self._get_note_chunks(note_id)) or [self._generate_doc_id(note_id)]
+            success = True
+            for doc_id in doc_ids:
+                success = await self.chromadb.delete_document(doc_id) and success
 
             if success:
                 # Update sync metadata to mark as deleted/unsynced
@@ -968,6 +1944,7 @@ class SyncManager:
                 # Or alternatively, delete the sync metadata entirely
                 async with self.db.get_connection() as conn:
                     await conn.execute("DELETE FROM sync_metadata WHERE note_id = ?", (note_id,))
+                    await conn.execute("DELETE FROM sync_chunks WHERE note_id = ?", (note_id,))
                     await conn.commit()
 
                 logger.debug(f"Note {note_id} deleted from ChromaDB successfully")
@@ -978,6 +1955,53 @@ class SyncManager:
             logger.error(f"Failed to delete note {note_id} from ChromaDB: {e}")
             return False
 
+    async def delete_notes_from_chromadb(self, note_ids: List[str]) -> bool:
+        """
+        Delete several notes from ChromaDB with a single batch call.
+
+        Args:
+            note_ids: IDs of the notes to delete
+
+        Returns:
+            True if deletion was successful
+        """
+        await self._ensure_initialized()
+
+        note_ids = list(dict.fromkeys(note_ids))
+        if not note_ids:
+            return True
+
+        try:
+            stored_chunks = await self._get_note_chunks_bulk(note_ids)
+            doc_ids: List[str] = []
+            for note_id in note_ids:
+                doc_ids.extend(stored_chunks.get(note_id) or [self._generate_doc_id(note_id)])
+
+            await self.chromadb.delete_documents_batch(doc_ids)
+            await self._delete_sync_records(note_ids)
+
+            logger.debug(f"Deleted {len(note_ids)} notes ({len(doc_ids)} documents) from ChromaDB")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to delete {len(note_ids)} notes from ChromaDB: {e}")
+            return False
+
+    async def _delete_sync_records(self, note_ids: List[str]) -> None:
+        """Remove sync metadata and chunk hashes of deleted notes in one transaction."""
+        if not note_ids:
+            return
+
+        placeholders = ",".join("?" for _ in note_ids)
+        async with self.db.get_connection() as conn:
+            await conn.execute(
+                f"DELETE FROM sync_metadata WHERE note_id IN ({placeholders})", note_ids
+            )
+            await conn.execute(
+                f"DELETE FROM sync_chunks WHERE note_id IN ({placeholders})", note_ids
+            )
+            await conn.commit()
+
     async def get_unsynced_notes(self, limit: int = 100) -> List[str]:
         """
         Get list of note IDs that need synchronization.
@@ -1015,7 +2039,10 @@ class SyncManager:
 
     async def retry_failed_syncs(self, max_retries: Optional[int] = None) -> SyncReport:
         """
-        Retry synchronization for notes that previously failed.
+        Retry synchronization for notes that previously failed, immediately.
+
+        This ignores the retry schedule; the background retry worker started
+        with start_retry_worker() only picks up notes whose backoff elapsed.
 
         Args:
             max_retries: Override default max retries setting
@@ -1042,52 +2069,7 @@ class SyncManager:
                 )
                 failed_note_ids = [row[0] for row in await cursor.fetchall()]
 
-            if not failed_note_ids:
-                return SyncReport(
-                    total_notes=0,
-                    successful_syncs=0,
-                    failed_syncs=0,
-                    skipped_syncs=0,
-                    results=[],
-                    started_at=start_time,
-                    completed_at=datetime.now(),
-                )
-
-            # Retry synchronization with exponential backoff
-            retry_results = {}
-            for note_id in failed_note_ids:
-                # Get current retry count
-                sync_metadata = await self._get_sync_metadata(note_id)
-                current_retries = sync_metadata.get("retry_count", 0) if sync_metadata else 0
-
-                # Calculate delay based on retry count
-                delay = self.retry_delay * (2**current_retries)
-                if current_retries > 0:
-                    await asyncio.sleep(min(delay, 60.0))  # Cap at 60 seconds
-
-                # Attempt retry
-                result = await self.sync_note_to_chromadb(note_id)
-                retry_results[note_id] = result
-
-                logger.info(
-                    f"Retry {current_retries + 1} for note {note_id}: "
-                    f"{'Success' if result.success else 'Failed'}"
-                )
-
-            # Compile report
-            results_list = list(retry_results.values())
-            successful_syncs = sum(1 for r in results_list if r.success)
-            failed_syncs = len(results_list) - successful_syncs
-
-            return SyncReport(
-                total_notes=len(failed_note_ids),
-                successful_syncs=successful_syncs,
-                failed_syncs=failed_syncs,
-                skipped_syncs=0,
-                results=results_list,
-                started_at=start_time,
-                completed_at=datetime.now(),
-            )
+            return await self._retry_notes(failed_note_ids, start_time)
 
         except Exception as e:
             logger.error(f"Failed to retry failed syncs: {e}")
@@ -1101,6 +2083,178 @@ class SyncManager:
                 completed_at=datetime.now(),
             )
 
+    async def retry_due_syncs(self, limit: Optional[int] = None) -> SyncReport:
+        """
+        Retry failed syncs whose backoff has elapsed.
+
+        Due notes are re-synced through the batch pipeline, which schedules
+        the next attempt or parks notes that ran out of retries. Notes with a
+        pending sync outbox entry are left to the outbox worker. Nothing is
+        attempted while the embedding service is unavailable, so an outage
+        does not use up retries.
+
+        Args:
+            limit: Maximum number of notes to retry (defaults to batch_size)
+
+        Returns:
+            Synchronization report for the retried notes
+        """
+        await self._ensure_initialized()
+
+        start_time = datetime.now()
+        note_ids: List[str] = []
+        if self.embedding.is_available():
+            note_ids = await self._claim_due_retries(limit or self.batch_size)
+
+        return await self._retry_notes(note_ids, start_time)
+
+    async def _claim_due_retries(self, limit: int) -> List[str]:
+        """
+        Park failed rows of deleted notes and fetch the notes due for a retry.
+
+        Notes with a pending sync outbox entry are skipped; the outbox worker
+        retries those.
+
+        Args:
+            limit: Maximum number of note IDs to return
+
+        Returns:
+            Note IDs, earliest scheduled retry first
+        """
+        now = datetime.now().isoformat()
+
+        async with self.db.get_connection() as conn:
+            # A note that no longer exists can never sync
+            await conn.execute(
+                """
+                UPDATE sync_metadata
+                SET sync_status = 'parked',
+                    next_retry_at = NULL,
+                    last_error = 'Note not found in SQLite',
+                    last_error_class = 'NoteNotFound',
+                    updated_at = ?
+                WHERE sync_status = 'failed'
+                  AND note_id NOT IN (SELECT id FROM knowledge_notes)
+                """,
+                (now,),
+            )
+            cursor = await conn.execute(
+                """
+                SELECT note_id FROM sync_metadata
+                WHERE sync_status = 'failed'
+                  AND (next_retry_at IS NULL OR next_retry_at <= ?)
+                  AND note_id NOT IN (
+                      SELECT note_id FROM sync_outbox WHERE status = 'pending'
+                  )
+                ORDER BY next_retry_at
+                LIMIT ?
+                """,
+                (now, limit),
+            )
+            note_ids = [row[0] for row in await cursor.fetchall()]
+            await conn.commit()
+
+        return note_ids
+
+    async def _retry_notes(self, note_ids: List[str], started_at: datetime) -> SyncReport:
+        """Re-sync notes in batch and summarize the outcome."""
+        results = await self.sync_notes_batch(note_ids) if note_ids else {}
+
+        results_list = list(results.values())
+        successful_syncs = sum(1 for r in results_list if r.success)
+        if results_list:
+            logger.info(f"Retried {len(results_list)} failed syncs: {successful_syncs} succeeded")
+
+        return SyncReport(
+            total_notes=len(results_list),
+            successful_syncs=successful_syncs,
+            failed_syncs=len(results_list) - successful_syncs,
+            skipped_syncs=0,
+            results=results_list,
+            started_at=started_at,
+            completed_at=datetime.now(),
+        )
+
+    async def requeue_parked_syncs(self) -> int:
+        """
+        Requeue parked notes for an immediate retry with a fresh retry budget.
+
+        Returns:
+            Number of notes requeued
+        """
+        await self._ensure_initialized()
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                UPDATE sync_metadata
+                SET sync_status = 'failed', retry_count = 0, next_retry_at = NULL
+                WHERE sync_status = 'parked'
+                """
+            )
+            await conn.commit()
+            return int(cursor.rowcount)
+
+    async def start_retry_worker(self) -> None:
+        """Start retrying failed syncs in the background on their backoff schedule."""
+        if self._retry_task and not self._retry_task.done():
+            logger.warning("Sync retry worker already running")
+            return
+
+        self._retry_shutdown.clear()
+        self._retry_task = asyncio.create_task(self._retry_worker_loop())
+        logger.info("Sync retry worker started")
+
+    async def stop_retry_worker(self) -> None:
+        """Stop the background retry worker; schedules are kept in sync_metadata."""
+        self._retry_shutdown.set()
+
+        if self._retry_task and not self._retry_task.done():
+            try:
+                await asyncio.wait_for(self._retry_task, timeout=10.0)
+            except asyncio.TimeoutError:
+                self._retry_task.cancel()
+                try:
+                    await self._retry_task
+                except asyncio.CancelledError:
+                    pass
+
+        self._retry_task = None
+        logger.info("Sync retry worker stopped")
+
+    @property
+    def is_retry_worker_running(self) -> bool:
+        """Check if the background retry worker is running."""
+        return self._retry_task is not None and not self._retry_task.done()
+
+    async def _retry_worker_loop(self) -> None:
+        """Retry due notes in batches and keep the statistics snapshot fresh."""
+        while not self._retry_shutdown.is_set():
+            try:
+                report = await self.retry_due_syncs()
+                processed = report.total_notes
+            except Exception as e:
+                logger.error(f"Sync retry worker error: {e}")
+                processed = 0
+
+            try:
+                counters = await self._read_sync_stats()
+                if self._snapshot_is_stale(counters["snapshot"]):
+                    await self.refresh_sync_snapshot()
+            except Exception as e:
+                logger.error(f"Sync statistics snapshot error: {e}")
+
+            if processed >= self.batch_size:
+                # More retries are likely due
+                continue
+
+            try:
+                await asyncio.wait_for(
+                    self._retry_shutdown.wait(), timeout=self.retry_poll_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+
     async def clear_old_sync_metadata(self, days_old: int = 30) -> int:
         """
         Clean up old sync metadata entries.
@@ -1117,15 +2271,14 @@ class SyncManager:
             cutoff_date = datetime.now() - timedelta(days=days_old)
 
             async with self.db.get_connection() as conn:
-                # Remove old failed sync entries that are no longer relevant
+                # Remove old parked sync entries that are no longer relevant
                 cursor = await conn.execute(
                     """
                     DELETE FROM sync_metadata
-                    WHERE sync_status = 'failed'
+                    WHERE sync_status = 'parked'
                       AND updated_at < ?
-                      AND retry_count >= ?
                     """,
-                    (cutoff_date.isoformat(), self.max_retries),
+                    (cutoff_date.isoformat(),),
                 )
 
                 # Get count of deleted rows
@@ -1143,100 +2296,84 @@ class SyncManager:
         """
         Get comprehensive synchronization statistics.
 
+        Counters come from the materialized sync_stats table; figures that need
+        a scan are read from a snapshot refreshed every stats_refresh_interval.
+
         Returns:
             Dictionary containing various sync statistics
         """
         await self._ensure_initialized()
 
         try:
-            stats = {}
-
-            async with self.db.get_connection() as conn:
-                # Basic counts
-                cursor = await conn.execute("SELECT COUNT(*) FROM knowledge_notes")
-                stats["total_notes"] = (await cursor.fetchone())[0]
-
-                cursor = await conn.execute("SELECT COUNT(*) FROM sync_metadata")
-                stats["sync_records"] = (await cursor.fetchone())[0]
-
-                # Status breakdown
-                cursor = await conn.execute(
-                    """
-                    SELECT sync_status, COUNT(*)
-                    FROM sync_metadata
-                    GROUP BY sync_status
-                    """
-                )
-                status_counts = dict(await cursor.fetchall())
-                stats["status_breakdown"] = status_counts
+            stats: Dict[str, Any] = {}
+
+            counters = await self._read_sync_stats()
+            snapshot = counters["snapshot"]
+            if self._snapshot_is_stale(snapshot):
+                snapshot = await self.refresh_sync_snapshot()
+
+            # Basic counts
+            status_counts = counters["status"]
+            stats["total_notes"] = counters["notes"].get("total", 0)
+            stats["sync_records"] = sum(status_counts.values())
+            stats["status_breakdown"] = status_counts
+
+            # Backlog
+            stats["pending_backlog"] = stats["total_notes"] - status_counts.get("synced", 0)
+            oldest_unsynced_at = snapshot.get("oldest_unsynced_at") or None
+            stats["oldest_unsynced_at"] = (
+                datetime.fromtimestamp(oldest_unsynced_at).isoformat()
+                if oldest_unsynced_at
+                else None
+            )
+            stats["oldest_unsynced_age_seconds"] = (
+                max(0, int(time.time()) - oldest_unsynced_at) if oldest_unsynced_at else 0
+            )
 
-                # Recent activity
-                cursor = await conn.execute(
-                    """
-                    SELECT COUNT(*) FROM sync_metadata
-                    WHERE last_synced_at > datetime('now', '-24 hours')
-                    """
-                )
-                stats["synced_last_24h"] = (await cursor.fetchone())[0]
+            # Recent activity
+            stats["synced_last_24h"] = snapshot.get("synced_last_24h", 0)
+            stats["synced_last_week"] = snapshot.get("synced_last_week", 0)
 
-                cursor = await conn.execute(
-                    """
-                    SELECT COUNT(*) FROM sync_metadata
-                    WHERE last_synced_at > datetime('now', '-7 days')
-                    """
-                )
-                stats["synced_last_week"] = (await cursor.fetchone())[0]
+            # Error analysis
+            error_classes = dict(
+                sorted(counters["error_class"].items(), key=lambda item: item[1], reverse=True)
+            )
+            stats["error_classes"] = error_classes
+            stats["top_errors"] = dict(list(error_classes.items())[:5])
 
-                # Error analysis
+            # Retry analysis
+            retrying = status_counts.get("failed", 0) + status_counts.get("parked", 0)
+            async with self.db.get_connection() as conn:
                 cursor = await conn.execute(
-                    """
-                    SELECT last_error, COUNT(*)
-                    FROM sync_metadata
-                    WHERE sync_status = 'failed'
-                      AND last_error IS NOT NULL
-                    GROUP BY last_error
-                    ORDER BY COUNT(*) DESC
-                    LIMIT 5
-                    """
+                    "SELECT MIN(next_retry_at) FROM sync_metadata WHERE sync_status = 'failed'"
                 )
-                error_stats = dict(await cursor.fetchall())
-                stats["top_errors"] = error_stats
+                next_retry_at = (await cursor.fetchone())[0]
+            stats["retry_analysis"] = {
+                "avg_retries": snapshot.get("retry_total", 0) / retrying if retrying else 0,
+                "max_retries": snapshot.get("max_retry_count", 0),
+                "max_retries_exceeded": snapshot.get("max_retries_exceeded", 0),
+                "parked": status_counts.get("parked", 0),
+                "next_retry_at": next_retry_at,
+                "worker_running": self.is_retry_worker_running,
+            }
 
-                # Retry analysis
-                cursor = await conn.execute(
-                    """
-                    SELECT
-                        AVG(retry_count) as avg_retries,
-                        MAX(retry_count) as max_retries,
-                        COUNT(CASE WHEN retry_count >= ? THEN 1 END) as max_retries_exceeded
-                    FROM sync_metadata
-                    WHERE sync_status = 'failed'
-                    """,
-                    (self.max_retries,),
-                )
-                retry_row = await cursor.fetchone()
-                if retry_row:
-                    stats["retry_analysis"] = {
-                        "avg_retries": retry_row[0] or 0,
-                        "max_retries": retry_row[1] or 0,
-                        "max_retries_exceeded": retry_row[2] or 0,
-                    }
+            # ChromaDB statistics
+            try:
+                chromadb_count = await self.chromadb.get_document_count()
+                stats["chromadb_documents"] = chromadb_count
+            except Exception as e:
+                stats["chromadb_documents"] = f"Error: {e}"
 
-                # ChromaDB statistics
-                try:
-                    chromadb_count = await self.chromadb.get_document_count()
-                    stats["chromadb_documents"] = chromadb_count
-                except Exception as e:
-                    stats["chromadb_documents"] = f"Error: {e}"
-
-                # Success rate calculation
-                total_attempts = sum(status_counts.values())
-                successful = status_counts.get("synced", 0)
-                stats["success_rate"] = (
-                    successful / total_attempts * 100 if total_attempts > 0 else 0
-                )
+            # Success rate calculation
+            total_attempts = sum(status_counts.values())
+            successful = status_counts.get("synced", 0)
+            stats["success_rate"] = successful / total_attempts * 100 if total_attempts > 0 else 0
 
-                stats["generated_at"] = datetime.now().isoformat()
+            refreshed_at = snapshot.get("refreshed_at")
+            stats["snapshot_at"] = (
+                datetime.fromtimestamp(refreshed_at).isoformat() if refreshed_at else None
+            )
+            stats["generated_at"] = datetime.now().isoformat()
 
             return stats
 
@@ -1305,5 +2442,7 @@ class SyncManager:
 
     async def close(self) -> None:
         """Clean up resources."""
+        if self.is_retry_worker_running:
+            await self.stop_retry_worker()
         self._initialized = False
         logger.info("SyncManager closed")
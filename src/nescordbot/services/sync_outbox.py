@@ -0,0 +1,443 @@
+"""
+Transactional outbox for note synchronization.
+
+Note mutations write a row to the ``sync_outbox`` table in the same SQLite
+transaction as the note itself. A background worker drains the outbox in
+batches and propagates the change to ChromaDB/Obsidian, retrying failures
+with exponential backoff, so commands only pay for a local write and no
+change is lost if the bot stops before the sync completes. While a note has
+a pending entry here, this worker owns its retries; SyncManager's retry
+worker skips it.
+
+Upserts are debounced per note: each new upsert pushes the note's pending
+rows to the end of the debounce window, so a burst of edits is embedded
+and written to Obsidian once, from the latest version. The window never
+extends past the oldest pending row's creation plus the maximum wait, so a
+note that keeps being edited is still synced.
+"""
+
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..config import BotConfig
+from .database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class SyncOutboxError(Exception):
+    """Exception raised when outbox operations fail."""
+
+    pass
+
+
+@dataclass
+class OutboxEntry:
+    """Pending sync work for a single note, coalesced from its outbox rows."""
+
+    note_id: str
+    operation: str
+    max_id: int
+    attempts: int = 0
+
+
+OutboxHandler = Callable[[OutboxEntry], Awaitable[None]]
+OutboxBatchHandler = Callable[[List[OutboxEntry]], Awaitable[None]]
+
+
+class SyncOutbox:
+    """
+    Durable queue of note sync operations backed by the sync_outbox table.
+
+    Features:
+    - Enqueue on the caller's connection so the row commits with the note
+    - Coalescing of repeated mutations of the same note into one operation
+    - Per-note debounce window for upserts during bursts of edits
+    - Optional batch handler applying all due deletes in one call
+    - Exponential backoff with jitter, parking entries after max attempts
+    - Background worker woken immediately on new work, polling otherwise
+    """
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+    def __init__(self, config: BotConfig, database_service: DatabaseService) -> None:
+        """
+        Initialize SyncOutbox.
+
+        Args:
+            config: Bot configuration
+            database_service: Database service holding the sync_outbox table
+        """
+        self.config = config
+        self.db = database_service
+
+        self.batch_size = getattr(config, "sync_outbox_batch_size", 50)
+        self.poll_interval = getattr(config, "sync_outbox_poll_interval", 5.0)
+        self.max_attempts = getattr(config, "sync_outbox_max_attempts", 8)
+        self.backoff_base = getattr(config, "sync_outbox_backoff_base", 2.0)
+        self.backoff_max = getattr(config, "sync_outbox_backoff_max", 600.0)
+        self.debounce_seconds = getattr(config, "sync_outbox_debounce_seconds", 2.0)
+        self.debounce_max_seconds = getattr(config, "sync_outbox_debounce_max_seconds", 30.0)
+
+        self._worker_task: Optional[asyncio.Task] = None
+        self._wake_event = asyncio.Event()
+        self._shutdown_event = asyncio.Event()
+
+        self._stats: Dict[str, Any] = {
+            "synced": 0,
+            "errors": 0,
+            "parked": 0,
+            "last_error": None,
+        }
+
+    async def enqueue(self, conn: Any, note_id: str, operation: str) -> None:
+        """
+        Add a sync operation using the caller's connection.
+
+        The row is not committed here; it becomes visible together with the
+        note change when the caller commits. Call notify() after committing
+        to wake the worker.
+
+        Args:
+            conn: Connection of the transaction that modifies the note
+            note_id: ID of the modified note
+            operation: UPSERT or DELETE
+        """
+        if operation not in (self.UPSERT, self.DELETE):
+            raise SyncOutboxError(f"Unknown outbox operation: {operation}")
+
+        if operation == self.DELETE or self.debounce_seconds <= 0:
+            await conn.execute(
+                "INSERT INTO sync_outbox (note_id, operation) VALUES (?, ?)",
+                (note_id, operation),
+            )
+            return
+
+        # Restart the note's debounce window, but no later than the maximum wait after
+        # its oldest pending row; rows in retry backoff keep their schedule.
+        # Earlier rows take the new row's due time so the burst is claimed as a whole.
+        window = f"+{self.debounce_seconds:.3f} seconds"
+        max_wait = f"+{self.debounce_max_seconds:.3f} seconds"
+        cursor = await conn.execute(
+            """
+            INSERT INTO sync_outbox (note_id, operation, next_attempt_at)
+            VALUES (?, ?, min(
+                strftime('%Y-%m-%d %H:%M:%f', 'now', ?),
+                COALESCE(
+                    (
+                        SELECT strftime('%Y-%m-%d %H:%M:%f', MIN(created_at), ?)
+                        FROM sync_outbox
+                        WHERE note_id = ? AND status = 'pending' AND attempts = 0
+                    ),
+                    strftime('%Y-%m-%d %H:%M:%f', 'now', ?)
+                )
+            ))
+            """,
+            (note_id, operation, window, max_wait, note_id, max_wait),
+        )
+        await conn.execute(
+            """
+            UPDATE sync_outbox
+            SET next_attempt_at = (SELECT next_attempt_at FROM sync_outbox WHERE id = ?)
+            WHERE note_id = ? AND status = 'pending' AND attempts = 0 AND id < ?
+            """,
+            (cursor.lastrowid, note_id, cursor.lastrowid),
+        )
+
+    def notify(self) -> None:
+        """Wake the worker to process newly committed entries."""
+        self._wake_event.set()
+
+    async def claim_due(self, limit: Optional[int] = None) -> List[OutboxEntry]:
+        """
+        Fetch due entries, coalesced per note.
+
+        The latest operation for a note wins, so a note created, edited and
+        deleted before the worker runs results in a single delete.
+
+        Args:
+            limit: Maximum number of outbox rows to read
+
+        Returns:
+            Entries in order of their first pending row
+        """
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT id, note_id, operation, attempts
+                FROM sync_outbox
+                WHERE status = 'pending'
+                  AND next_attempt_at <= strftime('%Y-%m-%d %H:%M:%f', 'now')
+                ORDER BY id
+                LIMIT ?
+                """,
+                (limit or self.batch_size,),
+            )
+            rows = await cursor.fetchall()
+
+        entries: Dict[str, OutboxEntry] = {}
+        for row_id, note_id, operation, attempts in rows:
+            entry = entries.get(note_id)
+            if entry is None:
+                entries[note_id] = OutboxEntry(note_id, operation, row_id, attempts)
+            else:
+                entry.operation = operation
+                entry.max_id = row_id
+                entry.attempts = max(entry.attempts, attempts)
+
+        return list(entries.values())
+
+    async def complete(self, entry: OutboxEntry) -> None:
+        """Remove all rows covered by a successfully processed entry."""
+        async with self.db.get_connection() as conn:
+            await conn.execute(
+                "DELETE FROM sync_outbox WHERE note_id = ? AND id <= ?",
+                (entry.note_id, entry.max_id),
+            )
+            await conn.commit()
+
+    async def fail(self, entry: OutboxEntry, error: Exception) -> None:
+        """
+        Record a failed attempt and schedule a retry.
+
+        Entries that reach max_attempts are parked with status 'failed' and
+        are only retried through retry_failed().
+
+        Args:
+            entry: Entry that failed
+            error: Exception raised by the handler
+        """
+        attempts = entry.attempts + 1
+        last_error = f"{type(error).__name__}: {error}"
+
+        async with self.db.get_connection() as conn:
+            if attempts >= self.max_attempts:
+                await conn.execute(
+                    """
+                    UPDATE sync_outbox
+                    SET status = 'failed', attempts = ?, last_error = ?
+                    WHERE note_id = ? AND id <= ? AND status = 'pending'
+                    """,
+                    (attempts, last_error, entry.note_id, entry.max_id),
+                )
+                self._stats["parked"] += 1
+                logger.error(
+                    f"Sync outbox entry for note {entry.note_id} parked after "
+                    f"{attempts} attempts: {last_error}"
+                )
+            else:
+                delay = self._get_backoff_delay(attempts)
+                await conn.execute(
+                    """
+                    UPDATE sync_outbox
+                    SET attempts = ?, last_error = ?,
+                        next_attempt_at = strftime('%Y-%m-%d %H:%M:%f', 'now', ?)
+                    WHERE note_id = ? AND id <= ? AND status = 'pending'
+                    """,
+                    (attempts, last_error, f"+{delay:.3f} seconds", entry.note_id, entry.max_id),
+                )
+                logger.warning(
+                    f"Sync of note {entry.note_id} failed (attempt {attempts}), "
+                    f"retrying in {delay:.1f}s: {last_error}"
+                )
+            await conn.commit()
+
+    def _get_backoff_delay(self, attempts: int) -> float:
+        """Exponential backoff, jittered over the upper half of the delay."""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+        return float(delay / 2 + random.uniform(0, delay / 2))
+
+    async def process_batch(
+        self, handler: OutboxHandler, delete_handler: Optional[OutboxBatchHandler] = None
+    ) -> int:
+        """
+        Process one batch of due entries.
+
+        Args:
+            handler: Coroutine applying an entry; raising marks it failed
+            delete_handler: Coroutine applying all due deletes at once; raising
+                marks every one of them failed
+
+        Returns:
+            Number of entries processed (successful or failed)
+        """
+        entries = await self.claim_due()
+
+        if delete_handler is not None:
+            deletes = [entry for entry in entries if entry.operation == self.DELETE]
+            entries = [entry for entry in entries if entry.operation != self.DELETE]
+            if deletes:
+                await self._process_deletes(delete_handler, deletes)
+        else:
+            deletes = []
+
+        for entry in entries:
+            try:
+                await handler(entry)
+            except Exception as e:
+                self._stats["errors"] += 1
+                self._stats["last_error"] = str(e)
+                await self.fail(entry, e)
+            else:
+                self._stats["synced"] += 1
+                await self.complete(entry)
+
+        return len(deletes) + len(entries)
+
+    async def _process_deletes(
+        self, delete_handler: OutboxBatchHandler, entries: List[OutboxEntry]
+    ) -> None:
+        """Apply delete entries with a single handler call."""
+        try:
+            await delete_handler(entries)
+        except Exception as e:
+            self._stats["errors"] += len(entries)
+            self._stats["last_error"] = str(e)
+            for entry in entries:
+                await self.fail(entry, e)
+            return
+
+        self._stats["synced"] += len(entries)
+        async with self.db.get_connection() as conn:
+            await conn.executemany(
+                "DELETE FROM sync_outbox WHERE note_id = ? AND id <= ?",
+                [(entry.note_id, entry.max_id) for entry in entries],
+            )
+            await conn.commit()
+
+    async def drain(
+        self, handler: OutboxHandler, delete_handler: Optional[OutboxBatchHandler] = None
+    ) -> int:
+        """
+        Process due entries until none are left.
+
+        Args:
+            handler: Coroutine applying an entry
+            delete_handler: Optional coroutine applying due deletes in one call
+
+        Returns:
+            Total number of entries processed
+        """
+        total = 0
+        while True:
+            processed = await self.process_batch(handler, delete_handler)
+            total += processed
+            if processed == 0:
+                return total
+
+    async def start_worker(
+        self, handler: OutboxHandler, delete_handler: Optional[OutboxBatchHandler] = None
+    ) -> None:
+        """Start the background worker."""
+        if self._worker_task and not self._worker_task.done():
+            logger.warning("Sync outbox worker already running")
+            return
+
+        self._shutdown_event.clear()
+        self._worker_task = asyncio.create_task(self._worker_loop(handler, delete_handler))
+        logger.info("Sync outbox worker started")
+
+    async def stop_worker(self) -> None:
+        """Stop the background worker; pending entries stay in the outbox."""
+        self._shutdown_event.set()
+        self._wake_event.set()
+
+        if self._worker_task and not self._worker_task.done():
+            try:
+                await asyncio.wait_for(self._worker_task, timeout=10.0)
+            except asyncio.TimeoutError:
+                self._worker_task.cancel()
+                try:
+                    await self._worker_task
+                except asyncio.CancelledError:
+                    pass
+
+        self._worker_task = None
+        logger.info("Sync outbox worker stopped")
+
+    @property
+    def is_running(self) -> bool:
+        """Check if the background worker is running."""
+        return self._worker_task is not None and not self._worker_task.done()
+
+    async def _worker_loop(
+        self, handler: OutboxHandler, delete_handler: Optional[OutboxBatchHandler]
+    ) -> None:
+        """Drain the outbox, sleeping until notified or the next entry is due."""
+        while not self._shutdown_event.is_set():
+            self._wake_event.clear()
+            try:
+                processed = await self.process_batch(handler, delete_handler)
+                timeout = await self._seconds_until_due()
+            except Exception as e:
+                logger.error(f"Sync outbox worker error: {e}")
+                processed = 0
+                timeout = self.poll_interval
+
+            if processed >= self.batch_size:
+                # More work is likely waiting
+                continue
+
+            try:
+                await asyncio.wait_for(self._wake_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _seconds_until_due(self) -> float:
+        """Time until the earliest pending entry is due, capped at the poll interval."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT (julianday(MIN(next_attempt_at)) - julianday('now')) * 86400
+                FROM sync_outbox
+                WHERE status = 'pending'
+                """
+            )
+            row = await cursor.fetchone()
+
+        if row is None or row[0] is None:
+            return float(self.poll_interval)
+        return float(min(self.poll_interval, max(0.05, row[0])))
+
+    async def retry_failed(self) -> int:
+        """
+        Requeue parked entries for immediate retry.
+
+        Returns:
+            Number of rows requeued
+        """
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                UPDATE sync_outbox
+                SET status = 'pending', attempts = 0, next_attempt_at = CURRENT_TIMESTAMP
+                WHERE status = 'failed'
+                """
+            )
+            await conn.commit()
+            count = int(cursor.rowcount)
+
+        self.notify()
+        return count
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Get outbox statistics.
+
+        Returns:
+            Queue depth by status and worker counters
+        """
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute("SELECT status, COUNT(*) FROM sync_outbox GROUP BY status")
+            counts = {status: count for status, count in await cursor.fetchall()}
+
+        return {
+            **self._stats,
+            "pending": counts.get("pending", 0),
+            "failed": counts.get("failed", 0),
+            "worker_running": self.is_running,
+        }
@@ -0,0 +1,180 @@
+"""
+In-memory tag vocabulary.
+
+TagVocabulary keeps every tag in use with its usage count and the time it was
+last used, keyed by its case-folded form. It is loaded once from the
+note_tags table and then kept current by KnowledgeManager on every note
+write, so tag suggestion, autocomplete, search filters and reviews can look
+tags up without scanning or parsing knowledge_notes.tags.
+"""
+
+import bisect
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Set
+
+from .database import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class TagUsage:
+    """Usage of a tag across all notes."""
+
+    name: str
+    count: int = 0
+    last_used: Optional[str] = None
+    variants: Set[str] = field(default_factory=set)
+
+
+class TagVocabulary:
+    """
+    Case-insensitive dictionary of the tags in use.
+
+    Features:
+    - Case-folded index; the first spelling seen is the display name
+    - Usage counts and last-used timestamps per tag
+    - Prefix and substring completion for autocomplete
+    - Incremental updates from note writes
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty TagVocabulary."""
+        self._tags: Dict[str, TagUsage] = {}
+        # Sorted keys for prefix completion, rebuilt lazily after changes
+        self._sorted_keys: Optional[List[str]] = None
+        self.loaded = False
+
+    @staticmethod
+    def normalize(tag: str) -> str:
+        """Case-folded lookup key of a tag."""
+        return tag.strip().lstrip("#").casefold()
+
+    async def load(self, db: DatabaseService) -> None:
+        """Rebuild the vocabulary from the note_tags table."""
+        async with db.get_connection() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT nt.tag, COUNT(*), MAX(kn.updated_at)
+                FROM note_tags nt
+                JOIN knowledge_notes kn ON kn.id = nt.note_id
+                GROUP BY nt.tag
+                ORDER BY MIN(kn.rowid)
+                """
+            )
+            rows = await cursor.fetchall()
+
+        self._tags = {}
+        for tag, count, last_used in rows:
+            self._add(tag, count, last_used)
+        self._sorted_keys = None
+        self.loaded = True
+        logger.info(f"Tag vocabulary loaded: {len(self._tags)} tags")
+
+    def add(self, tags: Iterable[str], used_at: Optional[str] = None) -> None:
+        """Record one more use of each tag."""
+        for tag in tags:
+            self._add(tag, 1, used_at)
+
+    def remove(self, tags: Iterable[str]) -> None:
+        """Record that each tag is used by one note fewer."""
+        for tag in tags:
+            key = self.normalize(tag)
+            usage = self._tags.get(key)
+            if usage is None:
+                continue
+            usage.count -= 1
+            if usage.count <= 0:
+                del self._tags[key]
+                self._sorted_keys = None
+
+    def replace(
+        self, before: Iterable[str], after: Iterable[str], used_at: Optional[str] = None
+    ) -> None:
+        """Move one note's usage from its old tags to its new tags."""
+        self.remove(before)
+        self.add(after, used_at)
+
+    def _add(self, tag: str, count: int, used_at: Optional[str]) -> None:
+        """Add usage of a spelling of a tag."""
+        key = self.normalize(tag)
+        if not key:
+            return
+
+        usage = self._tags.get(key)
+        if usage is None:
+            usage = self._tags[key] = TagUsage(name=tag.strip().lstrip("#"))
+            self._sorted_keys = None
+        usage.count += count
+        usage.variants.add(tag)
+        if used_at and (usage.last_used is None or used_at > usage.last_used):
+            usage.last_used = used_at
+
+    def __contains__(self, tag: object) -> bool:
+        return isinstance(tag, str) and self.normalize(tag) in self._tags
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def get(self, tag: str) -> Optional[TagUsage]:
+        """Usage of a tag in any spelling."""
+        return self._tags.get(self.normalize(tag))
+
+    def canonical(self, tag: str) -> str:
+        """Display name of a known tag, or the tag itself."""
+        usage = self.get(tag)
+        return usage.name if usage else tag.strip().lstrip("#")
+
+    def variants(self, tags: Iterable[str]) -> List[str]:
+        """Every stored spelling of the given tags, for exact-match filters."""
+        spellings: Set[str] = set()
+        for tag in tags:
+            usage = self.get(tag)
+            spellings.update(usage.variants if usage else {tag.strip().lstrip("#")})
+        return sorted(spellings)
+
+    def most_used(self, limit: Optional[int] = None) -> List[TagUsage]:
+        """Tags ordered by usage count, most used first."""
+        ranked = sorted(self._tags.values(), key=lambda usage: (-usage.count, usage.name))
+        return ranked if limit is None else ranked[:limit]
+
+    def names(self, limit: Optional[int] = None) -> List[str]:
+        """Display names ordered by usage count."""
+        return [usage.name for usage in self.most_used(limit)]
+
+    def complete(self, text: str, limit: int = 25) -> List[TagUsage]:
+        """
+        Tags for autocomplete: prefix matches first, then substring matches.
+
+        Args:
+            text: Partial tag typed by the user
+            limit: Maximum number of tags to return
+
+        Returns:
+            Matching tags, most used first within each group
+        """
+        query = self.normalize(text)
+        if not query:
+            return self.most_used(limit)
+
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._tags)
+        keys = self._sorted_keys
+
+        prefixed = []
+        for i in range(bisect.bisect_left(keys, query), len(keys)):
+            if not keys[i].startswith(query):
+                break
+            prefixed.append(self._tags[keys[i]])
+
+        matches = sorted(prefixed, key=lambda usage: (-usage.count, usage.name))
+        if len(matches) < limit:
+            contained = [
+                usage
+                for key, usage in self._tags.items()
+                if query in key and not key.startswith(query)
+            ]
+            matches.extend(sorted(contained, key=lambda usage: (-usage.count, usage.name)))
+
+        return matches[:limit]
@@ -0,0 +1,486 @@
+"""
+Per-guild (tenant) vector store routing.
+
+Wraps a vector backend so that every guild gets its own collection. All
+collections live in the persist directory of the wrapped backend, and the
+guild stores share the client and executor of the default tenant's store,
+so opening or closing a guild's collection does not create or tear down a
+client. Guild stores are opened lazily on first use and the least recently
+used idle ones are closed once more than ``vector_tenant_max_open`` are
+open. The tenant of each document is recorded in the
+``vector_tenant_routes`` table, so deletes and lookups by ID go straight to
+the owning collection.
+
+Documents without a guild (DMs, imports) live in the default tenant, which
+keeps the unsuffixed collection name of the wrapped backend and stays open.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..config import BotConfig
+from .database import DatabaseService
+from .vector_store import (
+    SEARCH_INCLUDE_ALL,
+    DocumentBatch,
+    DocumentMetadata,
+    SearchResult,
+    StoredDocument,
+    VectorStore,
+    VectorStoreError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TenantVectorStoreError(VectorStoreError):
+    """Raised when tenant routing fails."""
+
+    pass
+
+
+class TenantVectorStore(VectorStore):
+    """
+    Vector store that routes each guild to its own collection.
+
+    Features:
+    - Lazily opened per-tenant stores with LRU closing of idle ones
+    - Tenant stores sharing one backend client and executor
+    - Writes grouped per tenant from ``DocumentMetadata.guild_id``
+    - Searches and counts scoped by a ``guild_id`` filter hit one collection;
+      unscoped ones fan out over all tenants and are merged by score, without
+      evicting open stores
+    """
+
+    DEFAULT_TENANT = "default"
+    ROUTE_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        config: BotConfig,
+        store_factory: Callable[[BotConfig, Optional[VectorStore]], VectorStore],
+        database_service: DatabaseService,
+    ):
+        """
+        Initialize TenantVectorStore.
+
+        Args:
+            config: Bot configuration of the wrapped backend
+            store_factory: Creates a backend store from a tenant configuration and
+                the default tenant's store, whose client it shares (None for that store)
+            database_service: SQLite database service holding the route table
+        """
+        self.config = config
+        self.store_factory = store_factory
+        self.db = database_service
+        self._initialized = False
+
+        self.max_open = max(1, getattr(config, "vector_tenant_max_open", 16))
+
+        self._default_store: Optional[VectorStore] = None
+        self._stores: "OrderedDict[str, VectorStore]" = OrderedDict()
+        self._in_use: Dict[str, int] = {}
+
+    async def initialize(self) -> None:
+        """Create the route table."""
+        if self._initialized:
+            return
+
+        try:
+            if not self.db.is_initialized:
+                await self.db.initialize()
+
+            async with self.db.get_connection() as conn:
+                await conn.executescript(
+                    """
+                    CREATE TABLE IF NOT EXISTS vector_tenant_routes (
+                        document_id TEXT PRIMARY KEY,
+                        tenant TEXT NOT NULL
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_vector_tenant_routes_tenant
+                    ON vector_tenant_routes(tenant);
+                    """
+                )
+                await conn.commit()
+
+            self._initialized = True
+            logger.info(f"Tenant vector store initialized (max open: {self.max_open})")
+        except Exception as e:
+            logger.error(f"Failed to initialize tenant vector store: {e}")
+            raise TenantVectorStoreError(f"Initialization failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Tenant stores
+    # ------------------------------------------------------------------
+
+    def _tenant_name(self, guild_id: Optional[Any]) -> str:
+        """Map a guild ID to a tenant name safe for paths and collection names."""
+        if guild_id is None or guild_id == "":
+            return self.DEFAULT_TENANT
+        return re.sub(r"[^A-Za-z0-9_-]", "_", str(guild_id))
+
+    def _tenant_config(self, tenant: str) -> BotConfig:
+        """Build the backend configuration of a tenant."""
+        if tenant == self.DEFAULT_TENANT:
+            return self.config
+        return self.config.model_copy(
+            update={
+                "chromadb_collection_name": f"{self.config.chromadb_collection_name}_{tenant}",
+            }
+        )
+
+    async def _get_default_store(self) -> VectorStore:
+        """Open the default tenant's store, which owns the shared client."""
+        if self._default_store is None:
+            self._default_store = self.store_factory(self.config, None)
+        await self._default_store.initialize()
+        return self._default_store
+
+    @asynccontextmanager
+    async def _tenant(self, tenant: str, evict: bool = True) -> AsyncIterator[VectorStore]:
+        """
+        Open (or reuse) a tenant store and keep it from being evicted while in use.
+
+        Args:
+            tenant: Tenant name
+            evict: Whether the access may close idle stores; fan-out over all
+                tenants passes False, touches no LRU position and opens a
+                store that does not fit only for the duration of the access
+        """
+        await self._ensure_initialized()
+
+        if tenant == self.DEFAULT_TENANT:
+            yield await self._get_default_store()
+            return
+
+        store = self._stores.get(tenant)
+        transient = False
+        if store is None:
+            store = self.store_factory(self._tenant_config(tenant), await self._get_default_store())
+            if evict or len(self._stores) < self.max_open:
+                self._stores[tenant] = store
+                self._in_use[tenant] = 0
+            else:
+                transient = True
+        if not transient:
+            if evict:
+                self._stores.move_to_end(tenant)
+            self._in_use[tenant] += 1
+
+        try:
+            await store.initialize()
+            if evict:
+                await self._evict_idle()
+            yield store
+        finally:
+            if transient:
+                await store.close()
+            else:
+                self._in_use[tenant] -= 1
+
+    async def _evict_idle(self) -> None:
+        """Close least recently used idle stores beyond max_open."""
+        for tenant in list(self._stores):
+            if len(self._stores) <= self.max_open:
+                return
+            if self._in_use.get(tenant, 0) > 0:
+                continue
+            store = self._stores.pop(tenant)
+            self._in_use.pop(tenant, None)
+            try:
+                await store.close()
+                logger.debug(f"Closed idle vector tenant {tenant}")
+            except Exception as e:
+                logger.warning(f"Failed to close vector tenant {tenant}: {e}")
+
+    async def _known_tenants(self) -> List[str]:
+        """List all tenants that hold documents or are open."""
+        await self._ensure_initialized()
+        tenants: Set[str] = {self.DEFAULT_TENANT, *self._stores}
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute("SELECT DISTINCT tenant FROM vector_tenant_routes")
+            tenants.update(row[0] for row in await cursor.fetchall())
+        return sorted(tenants)
+
+    def _scoped_tenant(self, where: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Extract the tenant of a ``guild_id`` equality filter, if any."""
+        if not where:
+            return None
+
+        clauses = where["$and"] if "$and" in where else [where]
+        for clause in clauses:
+            if not isinstance(clause, dict) or "guild_id" not in clause:
+                continue
+            value = clause["guild_id"]
+            if isinstance(value, dict):
+                if set(value) != {"$eq"}:
+                    continue
+                value = value["$eq"]
+            return self._tenant_name(value)
+        return None
+
+    # ------------------------------------------------------------------
+    # Routes
+    # ------------------------------------------------------------------
+
+    async def _get_routes(self, document_ids: Sequence[str]) -> Dict[str, str]:
+        """Look up the tenant of each document; unknown IDs are omitted."""
+        await self._ensure_initialized()
+        routes: Dict[str, str] = {}
+        async with self.db.get_connection() as conn:
+            for start in range(0, len(document_ids), self.ROUTE_BATCH_SIZE):
+                chunk = list(document_ids[start : start + self.ROUTE_BATCH_SIZE])
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await conn.execute(
+                    "SELECT document_id, tenant FROM vector_tenant_routes "
+                    f"WHERE document_id IN ({placeholders})",
+                    chunk,
+                )
+                routes.update((row[0], row[1]) for row in await cursor.fetchall())
+        return routes
+
+    async def _set_routes(self, routes: Dict[str, str]) -> None:
+        """Record the tenant of each document."""
+        items = list(routes.items())
+        async with self.db.get_connection() as conn:
+            for start in range(0, len(items), self.ROUTE_BATCH_SIZE):
+                chunk = items[start : start + self.ROUTE_BATCH_SIZE]
+                await conn.execute(
+                    "INSERT OR REPLACE INTO vector_tenant_routes (document_id, tenant) "
+                    f"VALUES {','.join(['(?, ?)'] * len(chunk))}",
+                    [value for pair in chunk for value in pair],
+                )
+            await conn.commit()
+
+    async def _delete_routes(self, document_ids: Sequence[str]) -> None:
+        """Forget the tenant of each document."""
+        async with self.db.get_connection() as conn:
+            for start in range(0, len(document_ids), self.ROUTE_BATCH_SIZE):
+                chunk = list(document_ids[start : start + self.ROUTE_BATCH_SIZE])
+                placeholders = ",".join("?" * len(chunk))
+                await conn.execute(
+                    f"DELETE FROM vector_tenant_routes WHERE document_id IN ({placeholders})",
+                    chunk,
+                )
+            await conn.commit()
+
+    async def _group_by_route(self, document_ids: Sequence[str]) -> Dict[str, List[str]]:
+        """Group document IDs by their recorded tenant (default when unknown)."""
+        routes = await self._get_routes(document_ids)
+        groups: Dict[str, List[str]] = {}
+        for document_id in document_ids:
+            tenant = routes.get(document_id, self.DEFAULT_TENANT)
+            groups.setdefault(tenant, []).append(document_id)
+        return groups
+
+    # ------------------------------------------------------------------
+    # VectorStore API
+    # ------------------------------------------------------------------
+
+    async def add_document(
+        self,
+        document_id: str,
+        content: str,
+        embedding: List[float],
+        metadata: Optional[DocumentMetadata] = None,
+    ) -> bool:
+        """Add a single document to its guild's collection."""
+        tenant = self._tenant_name(metadata.guild_id if metadata else None)
+        async with self._tenant(tenant) as store:
+            added = await store.add_document(document_id, content, embedding, metadata)
+        await self._set_routes({document_id: tenant})
+        return added
+
+    async def _write_batch(self, documents: DocumentBatch, overwrite: bool) -> int:
+        """Write documents grouped by tenant and record their routes."""
+        groups: Dict[str, DocumentBatch] = {}
+        for document in documents:
+            metadata = document[3]
+            tenant = self._tenant_name(metadata.guild_id if metadata else None)
+            groups.setdefault(tenant, []).append(document)
+
+        if overwrite:
+            # Drop copies left in another tenant when a document changed guild
+            previous = await self._get_routes([document[0] for document in documents])
+            moved: Dict[str, List[str]] = {}
+            for tenant, batch in groups.items():
+                for document in batch:
+                    old_tenant = previous.get(document[0])
+                    if old_tenant is not None and old_tenant != tenant:
+                        moved.setdefault(old_tenant, []).append(document[0])
+            for old_tenant, ids in moved.items():
+                async with self._tenant(old_tenant) as store:
+                    await store.delete_documents_batch(ids)
+
+        written = 0
+        for tenant, batch in groups.items():
+            async with self._tenant(tenant) as store:
+                if overwrite:
+                    written += await store.upsert_documents_batch(batch)
+                else:
+                    written += await store.add_documents_batch(batch)
+            await self._set_routes({document[0]: tenant for document in batch})
+        return written
+
+    async def add_documents_batch(self, documents: DocumentBatch) -> int:
+        """Add documents to their guilds' collections."""
+        return await self._write_batch(documents, overwrite=False)
+
+    async def upsert_documents_batch(self, documents: DocumentBatch) -> int:
+        """Upsert documents into their guilds' collections."""
+        return await self._write_batch(documents, overwrite=True)
+
+    async def search_documents(
+        self,
+        query_embedding: List[float],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
+        max_results: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """
+        Search one guild's collection, or all of them without a guild filter.
+
+        Args:
+            query_embedding: Query embedding vector
+            n_results: Number of results to return
+            where: Metadata filter; a ``guild_id`` equality selects the tenant
+            include: Fields to fetch besides IDs and scores
+            max_results: Cap on n_results; defaults to max_search_results
+
+        Returns:
+            Search results ordered by score
+        """
+        tenant = self._scoped_tenant(where)
+        if tenant is not None:
+            async with self._tenant(tenant) as store:
+                return await store.search_documents(
+                    query_embedding, n_results, where, include, max_results
+                )
+
+        results: List[SearchResult] = []
+        for tenant in await self._known_tenants():
+            async with self._tenant(tenant, evict=False) as store:
+                results.extend(
+                    await store.search_documents(
+                        query_embedding, n_results, where, include, max_results
+                    )
+                )
+        results.sort(key=lambda result: result.score, reverse=True)
+        cap = self.config.max_search_results if max_results is None else max_results
+        return results[: min(n_results, cap)]
+
+    async def update_document(
+        self,
+        document_id: str,
+        content: Optional[str] = None,
+        embedding: Optional[List[float]] = None,
+        metadata: Optional[DocumentMetadata] = None,
+    ) -> bool:
+        """Update a document in the collection it was routed to."""
+        routes = await self._get_routes([document_id])
+        tenant = routes.get(document_id, self.DEFAULT_TENANT)
+        async with self._tenant(tenant) as store:
+            return await store.update_document(document_id, content, embedding, metadata)
+
+    async def delete_document(self, document_id: str) -> bool:
+        """Delete a single document from its collection."""
+        return await self.delete_documents_batch([document_id]) > 0
+
+    async def delete_documents_batch(self, document_ids: List[str]) -> int:
+        """Delete documents, one batch per owning collection."""
+        if not document_ids:
+            return 0
+
+        deleted = 0
+        for tenant, ids in (await self._group_by_route(document_ids)).items():
+            async with self._tenant(tenant) as store:
+                deleted += await store.delete_documents_batch(ids)
+        await self._delete_routes(document_ids)
+        return deleted
+
+    async def count_where(self, where: Dict[str, Any]) -> int:
+        """Count matching documents in one guild's collection or across all."""
+        tenant = self._scoped_tenant(where)
+        tenants = [tenant] if tenant is not None else await self._known_tenants()
+
+        count = 0
+        for name in tenants:
+            async with self._tenant(name, evict=tenant is not None) as store:
+                count += await store.count_where(where)
+        return count
+
+    async def get_document_count(self) -> int:
+        """Get the total number of documents across all tenants."""
+        count = 0
+        for tenant in await self._known_tenants():
+            async with self._tenant(tenant, evict=False) as store:
+                count += await store.get_document_count()
+        return count
+
+    async def get_documents(
+        self, ids: List[str], include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """Fetch documents by ID from their collections, keeping the input order."""
+        found: Dict[str, StoredDocument] = {}
+        for tenant, tenant_ids in (await self._group_by_route(ids)).items():
+            async with self._tenant(tenant) as store:
+                for document in await store.get_documents(tenant_ids, include):
+                    found[document.document_id] = document
+        return [found[document_id] for document_id in ids if document_id in found]
+
+    async def list_documents(
+        self, limit: int, offset: int = 0, include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """List one page of documents, walking the tenants in name order."""
+        page: List[StoredDocument] = []
+        for tenant in await self._known_tenants():
+            if len(page) >= limit:
+                break
+            async with self._tenant(tenant, evict=False) as store:
+                count = await store.get_document_count()
+                if offset >= count:
+                    offset -= count
+                    continue
+                page.extend(await store.list_documents(limit - len(page), offset, include))
+                offset = 0
+        return page
+
+    async def reset_collection(self) -> bool:
+        """Delete all documents of every tenant."""
+        success = True
+        for tenant in await self._known_tenants():
+            async with self._tenant(tenant, evict=False) as store:
+                success = await store.reset_collection() and success
+
+        async with self.db.get_connection() as conn:
+            await conn.execute("DELETE FROM vector_tenant_routes")
+            await conn.commit()
+        return success
+
+    async def close(self) -> None:
+        """Close every open tenant store, then the default store owning the client."""
+        while self._stores:
+            tenant, store = self._stores.popitem(last=False)
+            self._in_use.pop(tenant, None)
+            try:
+                await store.close()
+            except Exception as e:
+                logger.warning(f"Failed to close vector tenant {tenant}: {e}")
+        if self._default_store is not None:
+            try:
+                await self._default_store.close()
+            except Exception as e:
+                logger.warning(f"Failed to close default vector tenant: {e}")
+            self._default_store = None
+        self._initialized = False
+        logger.info("Tenant vector store closed")
+
+    @property
+    def open_tenants(self) -> Tuple[str, ...]:
+        """Tenants whose stores are currently open, the default first, then LRU order."""
+        default = (self.DEFAULT_TENANT,) if self._default_store is not None else ()
+        return default + tuple(self._stores)
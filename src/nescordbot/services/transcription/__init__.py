@@ -5,7 +5,9 @@
 
 import logging
 import os
+from typing import Optional
 
+from ..llm_cache import LLMCache
 from .base import TranscriptionService
 from .gemini import GeminiTranscriptionService
 from .whisper import WhisperTranscriptionService
@@ -13,7 +15,7 @@ from .whisper import WhisperTranscriptionService
 logger = logging.getLogger(__name__)
 
 
-def get_transcription_service() -> TranscriptionService:
+def get_transcription_service(llm_cache: Optional[LLMCache] = None) -> TranscriptionService:
     """
     環境変数に応じて適切な文字起こしサービスを返すファクトリ関数。
 
@@ -21,6 +23,9 @@ def get_transcription_service() -> TranscriptionService:
     - "whisper": OpenAI Whisper API (デフォルト)
     - "gemini": Google Gemini API
 
+    Args:
+        llm_cache: 文字起こし結果を保存する永続キャッシュ（任意）
+
     Returns:
         設定されたTranscriptionServiceインスタンス
     """
@@ -29,13 +34,13 @@ def get_transcription_service() -> TranscriptionService:
     logger.info(f"文字起こしプロバイダーとして '{provider}' を選択しました。")
 
     if provider == "gemini":
-        gemini_service = GeminiTranscriptionService()
+        gemini_service = GeminiTranscriptionService(llm_cache)
         if gemini_service.is_available():
             logger.info("Gemini文字起こしサービスを使用します")
             return gemini_service
         else:
             logger.warning("Geminiサービスが利用不可。Whisperにフォールバックします")
-            fallback_service = WhisperTranscriptionService()
+            fallback_service = WhisperTranscriptionService(llm_cache)
             if fallback_service.is_available():
                 return fallback_service
             else:
@@ -43,13 +48,13 @@ def get_transcription_service() -> TranscriptionService:
                 return fallback_service  # エラーハンドリングは呼び出し側で
 
     elif provider == "whisper":
-        service = WhisperTranscriptionService()
+        service = WhisperTranscriptionService(llm_cache)
         logger.info(f"Whisper文字起こしサービスを使用します (利用可能: {service.is_available()})")
         return service
 
     else:
         logger.warning(f"無効なプロバイダー '{provider}' が指定されました。デフォルトのWhisperを使用します。")
-        return WhisperTranscriptionService()
+        return WhisperTranscriptionService(llm_cache)
 
 
 # パッケージの公開API
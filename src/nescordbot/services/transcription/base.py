@@ -1,7 +1,10 @@
 """音声文字起こしサービスの抽象基底クラス。"""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple
+
+from ..llm_cache import LLMCache, file_digest
 
 
 class TranscriptionService(ABC):
@@ -10,6 +13,9 @@ class TranscriptionService(ABC):
     異なる音声認識APIを統一的に扱うためのインターフェースを提供する。
     """
 
+    # 設定された場合、同じ音声ファイルの文字起こし結果を再利用する
+    llm_cache: Optional[LLMCache] = None
+
     @abstractmethod
     async def transcribe(self, audio_path: str) -> Optional[str]:
         """
@@ -36,3 +42,35 @@ class TranscriptionService(ABC):
     def provider_name(self) -> str:
         """プロバイダー名を返す。"""
         return self.__class__.__name__.replace("TranscriptionService", "").lower()
+
+    async def _get_cached_transcription(
+        self, audio_path: str, model: str, prompt_version: str, prompt: str = ""
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        音声ファイルの内容に対応するキャッシュ済みの文字起こし結果を取得する。
+
+        Args:
+            audio_path: 音声ファイルのパス
+            model: 使用するモデル名
+            prompt_version: プロンプト・設定のバージョン
+            prompt: 文字起こしに使うプロンプト
+
+        Returns:
+            (キャッシュキー, キャッシュ済みテキスト)。キャッシュ未設定時はキーもNone。
+        """
+        if self.llm_cache is None:
+            return None, None
+
+        audio_hash = await asyncio.to_thread(file_digest, audio_path)
+        key = self.llm_cache.make_key(
+            self.provider_name, model, prompt_version, [prompt, audio_hash]
+        )
+        cached = await self.llm_cache.get(key)
+        return key, str(cached) if cached else None
+
+    async def _cache_transcription(
+        self, key: Optional[str], text: str, model: str, prompt_version: str
+    ) -> None:
+        """文字起こし結果をキャッシュに保存する。"""
+        if self.llm_cache is not None and key is not None:
+            await self.llm_cache.set(key, text, self.provider_name, model, prompt_version)
@@ -12,6 +12,7 @@ try:
 except ImportError:
     GEMINI_AVAILABLE = False
 
+from ..llm_cache import LLMCache
 from .base import TranscriptionService
 
 logger = logging.getLogger(__name__)
@@ -20,7 +21,15 @@ logger = logging.getLogger(__name__)
 class GeminiTranscriptionService(TranscriptionService):
     """Google Gemini APIを使用した文字起こしサービス。"""
 
-    def __init__(self):
+    MODEL = "gemini-1.5-pro-latest"
+    # プロンプトを変えた場合は更新し、古いキャッシュを再利用しない
+    PROMPT_VERSION = "1"
+    PROMPT = """以下の音声ファイルを日本語で正確に文字起こししてください。
+
+音声の内容をそのまま文字に起こしてください。話し言葉や方言、間投詞も含めて忠実に転写してください。"""
+
+    def __init__(self, llm_cache: Optional[LLMCache] = None):
+        self.llm_cache = llm_cache
         self.api_key = os.getenv("GEMINI_API_KEY")
 
         if not GEMINI_AVAILABLE:
@@ -31,7 +40,7 @@ class GeminiTranscriptionService(TranscriptionService):
         if self.api_key:
             try:
                 genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel("gemini-1.5-pro-latest")
+                self.model = genai.GenerativeModel(self.MODEL)
                 logger.info("Gemini Audio API が初期化されました")
             except Exception as e:
                 logger.error(f"Gemini API初期化エラー: {e}")
@@ -60,23 +69,30 @@ class GeminiTranscriptionService(TranscriptionService):
 
         audio_file = None
         try:
+            # 同じ音声ファイルはアップロードせずキャッシュから返す
+            cache_key, cached = await self._get_cached_transcription(
+                audio_path, self.MODEL, self.PROMPT_VERSION, self.PROMPT
+            )
+            if cached:
+                logger.info("キャッシュ済みの文字起こし結果を使用します")
+                return cached
+
             logger.info(f"Geminiにアップロードする音声ファイル: {audio_path}")
 
             # 音声ファイルをアップロード
             audio_file = await genai.upload_file_async(path=audio_path)
 
-            # 文字起こしプロンプト
-            prompt = """以下の音声ファイルを日本語で正確に文字起こししてください。
-
-音声の内容をそのまま文字に起こしてください。話し言葉や方言、間投詞も含めて忠実に転写してください。"""
-
             # 文字起こし実行
             if self.model is not None:
-                response = await self.model.generate_content_async([prompt, audio_file])
+                response = await self.model.generate_content_async([self.PROMPT, audio_file])
 
                 if response.text:
                     logger.info(f"Gemini文字起こし完了: {len(response.text)}文字")
-                    return str(response.text)
+                    text = str(response.text)
+                    await self._cache_transcription(
+                        cache_key, text, self.MODEL, self.PROMPT_VERSION
+                    )
+                    return text
                 else:
                     logger.warning("Geminiから空のレスポンスが返されました")
                     return None
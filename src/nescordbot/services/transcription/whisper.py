@@ -7,6 +7,7 @@ from typing import Optional
 
 from openai import OpenAI
 
+from ..llm_cache import LLMCache
 from .base import TranscriptionService
 
 logger = logging.getLogger(__name__)
@@ -15,7 +16,12 @@ logger = logging.getLogger(__name__)
 class WhisperTranscriptionService(TranscriptionService):
     """OpenAI Whisper APIを使用した文字起こしサービス。"""
 
-    def __init__(self):
+    MODEL = "whisper-1"
+    # 言語などのリクエスト設定を変えた場合は更新し、古いキャッシュを再利用しない
+    PROMPT_VERSION = "ja-1"
+
+    def __init__(self, llm_cache: Optional[LLMCache] = None):
+        self.llm_cache = llm_cache
         self.api_key = os.getenv("OPENAI_API_KEY")
         self.client: Optional[OpenAI]
         if self.api_key:
@@ -43,11 +49,18 @@ class WhisperTranscriptionService(TranscriptionService):
             return None
 
         try:
+            cache_key, cached = await self._get_cached_transcription(
+                audio_path, self.MODEL, self.PROMPT_VERSION
+            )
+            if cached:
+                logger.info("キャッシュ済みの文字起こし結果を使用します")
+                return cached
+
             if self.client is not None:
                 with open(audio_path, "rb") as audio_file:
                     transcript = await asyncio.to_thread(
                         self.client.audio.transcriptions.create,
-                        model="whisper-1",
+                        model=self.MODEL,
                         file=audio_file,
                         language="ja",
                         timeout=30.0,
@@ -55,7 +68,10 @@ class WhisperTranscriptionService(TranscriptionService):
             else:
                 return None
 
-            return transcript.text if transcript else None
+            text = transcript.text if transcript else None
+            if text:
+                await self._cache_transcription(cache_key, text, self.MODEL, self.PROMPT_VERSION)
+            return text
 
         except TimeoutError:
             logger.error("音声認識タイムアウト: 処理時間が30秒を超えました")
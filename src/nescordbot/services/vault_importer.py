@@ -0,0 +1,695 @@
+"""
+Streaming Obsidian vault import.
+
+VaultImporter walks a vault directory or zip archive lazily and inserts the
+markdown files into knowledge_notes in large transactions, so vaults with tens
+of thousands of notes are imported with bounded memory. Note IDs are derived
+from the vault name and file path, which makes imports restartable: files that
+are already present are skipped when the same vault is imported again.
+
+[[links]] are resolved in a second pass once every note exists, and embedding
+is left to a ``missing`` re-index job instead of one sync per note.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import json
+import logging
+import os
+import re
+import uuid
+import zipfile
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from ..config import BotConfig
+from .knowledge_manager import KnowledgeManager
+from .reindex_jobs import ReindexJobError, ReindexJobManager
+
+logger = logging.getLogger(__name__)
+
+
+class VaultImportError(Exception):
+    """Exception raised when a vault import cannot be started."""
+
+    pass
+
+
+class VaultImportStatus(Enum):
+    """Lifecycle status of a vault import."""
+
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+@dataclass
+class VaultImport:
+    """Persisted state of a vault import."""
+
+    import_id: int
+    source: str
+    status: VaultImportStatus
+    files_seen: int = 0
+    imported: int = 0
+    skipped: int = 0
+    failed: int = 0
+    links_resolved: int = 0
+    links_unresolved: int = 0
+    last_error: Optional[str] = None
+    created_by: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    completed_at: Optional[str] = None
+
+
+@dataclass
+class VaultFile:
+    """A markdown file found in a vault; its content is read on demand."""
+
+    path: str
+    size: int
+    modified_at: datetime
+    read: Callable[[], bytes]
+
+
+def _unquote(value: str) -> str:
+    """Strip whitespace and matching quotes from a frontmatter scalar."""
+    value = value.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ("'", '"'):
+        return value[1:-1]
+    return value
+
+
+def parse_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Split YAML frontmatter from a markdown document.
+
+    Only the subset Obsidian writes is understood: ``key: value`` pairs,
+    inline lists (``[a, b]``) and block lists (``- item``).
+
+    Args:
+        text: Markdown document
+
+    Returns:
+        Tuple of (frontmatter values, body without the frontmatter)
+    """
+    lines = text.splitlines(keepends=True)
+    if not lines or lines[0].strip() != "---":
+        return {}, text
+
+    end = next((i for i in range(1, len(lines)) if lines[i].strip() in ("---", "...")), None)
+    if end is None:
+        return {}, text
+
+    metadata: Dict[str, Any] = {}
+    key: Optional[str] = None
+    for line in lines[1:end]:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+
+        if stripped.startswith("-") and key is not None:
+            items = metadata.get(key)
+            if not isinstance(items, list):
+                items = metadata[key] = []
+            item = _unquote(stripped[1:])
+            if item:
+                items.append(item)
+            continue
+
+        if ":" not in stripped:
+            continue
+        name, _, value = stripped.partition(":")
+        key = name.strip()
+        value = value.strip()
+        if value.startswith("[") and value.endswith("]"):
+            metadata[key] = [_unquote(item) for item in value[1:-1].split(",") if item.strip()]
+        else:
+            metadata[key] = _unquote(value)
+
+    return metadata, "".join(lines[end + 1 :]).lstrip("\n")
+
+
+class VaultImporter:
+    """
+    Imports Obsidian vaults into knowledge_notes.
+
+    Features:
+    - Streams vault directories and zip archives file by file
+    - Frontmatter title, tags and dates; inline #tags
+    - One transaction per batch of notes
+    - Second pass resolving [[links]], recording unresolved targets
+    - Restartable: deterministic note IDs skip files imported before
+    - Embedding handed to a ReindexJobManager ``missing`` job
+    """
+
+    SOURCE_TYPE = "obsidian"
+
+    # Owner recorded on imported notes when no user is given (user_id is NOT NULL)
+    DEFAULT_USER_ID = "vault_import"
+
+    # Titles per IN (...) lookup during link resolution
+    TITLE_LOOKUP_CHUNK = 500
+
+    _SELECT_IMPORTS = """
+        SELECT id, source, status, files_seen, imported, skipped, failed, links_resolved,
+               links_unresolved, last_error, created_by, created_at, updated_at, completed_at
+        FROM vault_imports
+    """
+
+    def __init__(
+        self,
+        config: BotConfig,
+        knowledge_manager: KnowledgeManager,
+        reindex_jobs: Optional[ReindexJobManager] = None,
+    ) -> None:
+        """
+        Initialize VaultImporter.
+
+        Args:
+            config: Bot configuration
+            knowledge_manager: KnowledgeManager whose tables receive the notes
+            reindex_jobs: Optional job manager used to embed imported notes
+        """
+        self.config = config
+        self.knowledge_manager = knowledge_manager
+        self.db = knowledge_manager.db
+        self.reindex_jobs = reindex_jobs
+
+        self.batch_size = getattr(config, "vault_import_batch_size", 500)
+        # Larger files are skipped; Obsidian notes are rarely over a few KB
+        self.max_file_bytes = getattr(config, "vault_import_max_file_bytes", 1_000_000)
+
+        self._task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
+    @staticmethod
+    def note_id_for(vault_name: str, path: str) -> str:
+        """Deterministic note ID of a vault file."""
+        return str(uuid.uuid5(uuid.NAMESPACE_URL, f"obsidian-vault:{vault_name}/{path}"))
+
+    async def import_vault(
+        self,
+        source: str,
+        user_id: Optional[str] = None,
+        guild_id: Optional[str] = None,
+        created_by: Optional[str] = None,
+        progress_callback: Optional[Callable[[VaultImport], None]] = None,
+    ) -> VaultImport:
+        """
+        Import a vault and wait for it to finish.
+
+        Args:
+            source: Path of a vault directory or zip archive
+            user_id: Owner recorded on the imported notes
+            guild_id: Guild the notes belong to
+            created_by: Who started the import (for display)
+            progress_callback: Called with the import state after every batch
+
+        Returns:
+            Final state of the import
+
+        Raises:
+            VaultImportError: If the source is invalid or an import is running
+        """
+        path, record = await self._prepare(source, created_by)
+        await self._run(record, path, user_id, guild_id, progress_callback)
+        return await self._require_import(record.import_id)
+
+    async def start_import(
+        self,
+        source: str,
+        user_id: Optional[str] = None,
+        guild_id: Optional[str] = None,
+        created_by: Optional[str] = None,
+        cleanup: Optional[Callable[[], None]] = None,
+    ) -> VaultImport:
+        """
+        Start importing a vault in the background.
+
+        Args:
+            cleanup: Called once the import has ended, e.g. to delete an uploaded archive
+
+        Raises:
+            VaultImportError: If the source is invalid or an import is running
+        """
+        path, record = await self._prepare(source, created_by)
+        self._task = asyncio.create_task(self._run(record, path, user_id, guild_id, None))
+        if cleanup is not None:
+            self._task.add_done_callback(lambda _: cleanup())
+        return record
+
+    async def shutdown(self) -> None:
+        """Stop a running import after its current batch; re-importing resumes it."""
+        self._stop_event.set()
+        if self._task is not None and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, timeout=60.0)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+
+    @property
+    def is_running(self) -> bool:
+        """Check if an import is running in this process."""
+        return self._task is not None and not self._task.done()
+
+    async def get_import(self, import_id: int) -> Optional[VaultImport]:
+        """Get an import by ID."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(f"{self._SELECT_IMPORTS} WHERE id = ?", (import_id,))
+            row = await cursor.fetchone()
+        return self._row_to_import(row) if row else None
+
+    async def list_imports(self, limit: int = 10) -> List[VaultImport]:
+        """List the most recent imports, newest first."""
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"{self._SELECT_IMPORTS} ORDER BY id DESC LIMIT ?", (limit,)
+            )
+            return [self._row_to_import(row) for row in await cursor.fetchall()]
+
+    async def _prepare(self, source: str, created_by: Optional[str]) -> Tuple[Path, VaultImport]:
+        """Validate the source and create or resume its import record."""
+        if self.is_running:
+            raise VaultImportError("A vault import is already running")
+
+        path = Path(source).expanduser().resolve()
+        if not path.is_dir() and not (path.is_file() and zipfile.is_zipfile(path)):
+            raise VaultImportError(f"Vault must be a directory or zip archive: {source}")
+
+        await self.knowledge_manager.initialize()
+        self._stop_event.clear()
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"{self._SELECT_IMPORTS} WHERE source = ? AND status != 'completed' "
+                "ORDER BY id DESC LIMIT 1",
+                (str(path),),
+            )
+            row = await cursor.fetchone()
+            if row:
+                # Resume: counters of the scan restart, imported notes are kept
+                import_id = row[0]
+                await conn.execute(
+                    """
+                    UPDATE vault_imports
+                    SET status = 'running', files_seen = 0, skipped = 0, failed = 0,
+                        last_error = NULL, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (datetime.now().isoformat(), import_id),
+                )
+            else:
+                cursor = await conn.execute(
+                    "INSERT INTO vault_imports (source, created_by) VALUES (?, ?)",
+                    (str(path), created_by),
+                )
+                import_id = int(cursor.lastrowid)
+            await conn.commit()
+
+        return path, await self._require_import(import_id)
+
+    async def _run(
+        self,
+        record: VaultImport,
+        path: Path,
+        user_id: Optional[str],
+        guild_id: Optional[str],
+        progress_callback: Optional[Callable[[VaultImport], None]],
+    ) -> None:
+        """Import all files, then resolve links and queue embedding."""
+        vault_name = path.stem if path.is_file() else path.name
+        logger.info(f"Vault import #{record.import_id} started: {path}")
+
+        try:
+            with self._open_vault(path) as files:
+                while not self._stop_event.is_set():
+                    batch = await asyncio.to_thread(
+                        lambda: list(itertools.islice(files, self.batch_size))
+                    )
+                    if not batch:
+                        break
+                    await self._import_batch(record, vault_name, batch, user_id, guild_id)
+                    if progress_callback:
+                        progress_callback(record)
+
+            # Notes were inserted directly, so rebuild the tag vocabulary from note_tags
+            if record.imported:
+                await self.knowledge_manager.tag_vocabulary.load(self.db)
+
+            if self._stop_event.is_set():
+                logger.info(f"Vault import #{record.import_id} stopped; re-import to resume")
+                return
+
+            await self._resolve_links(record, vault_name)
+            await self._finish(record, VaultImportStatus.COMPLETED)
+            logger.info(
+                f"Vault import #{record.import_id} completed: {record.imported} imported, "
+                f"{record.skipped} skipped, {record.failed} failed"
+            )
+
+        except Exception as e:
+            logger.error(f"Vault import #{record.import_id} failed: {e}")
+            await self._finish(record, VaultImportStatus.FAILED, error=str(e))
+            return
+
+        await self._queue_embeddings(record)
+
+    @contextlib.contextmanager
+    def _open_vault(self, path: Path) -> Iterator[Iterator[VaultFile]]:
+        """Open a vault and yield a lazy iterator over its markdown files."""
+        if path.is_dir():
+            yield self._iter_directory(path)
+            return
+
+        with zipfile.ZipFile(path) as archive:
+            yield self._iter_archive(archive)
+
+    def _iter_directory(self, root: Path) -> Iterator[VaultFile]:
+        """Walk a vault directory in a stable order, skipping hidden folders."""
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+            for filename in sorted(filenames):
+                if not filename.lower().endswith(".md"):
+                    continue
+                full_path = Path(dirpath) / filename
+                stat = full_path.stat()
+                yield VaultFile(
+                    path=full_path.relative_to(root).as_posix(),
+                    size=stat.st_size,
+                    modified_at=datetime.fromtimestamp(stat.st_mtime),
+                    read=full_path.read_bytes,
+                )
+
+    def _iter_archive(self, archive: zipfile.ZipFile) -> Iterator[VaultFile]:
+        """Iterate the markdown members of a zipped vault."""
+        for info in archive.infolist():
+            parts = PurePosixPath(info.filename).parts
+            if info.is_dir() or not info.filename.lower().endswith(".md"):
+                continue
+            if any(part.startswith(".") or part == "__MACOSX" for part in parts):
+                continue
+            yield VaultFile(
+                path=info.filename,
+                size=info.file_size,
+                modified_at=datetime(*info.date_time),
+                read=partial(archive.read, info),
+            )
+
+    async def _import_batch(
+        self,
+        record: VaultImport,
+        vault_name: str,
+        files: List[VaultFile],
+        user_id: Optional[str],
+        guild_id: Optional[str],
+    ) -> None:
+        """Insert one batch of files in a single transaction."""
+        by_id = {self.note_id_for(vault_name, file.path): file for file in files}
+        placeholders = ",".join("?" * len(by_id))
+
+        async with self.db.get_connection() as conn:
+            cursor = await conn.execute(
+                f"SELECT id FROM knowledge_notes WHERE id IN ({placeholders})", list(by_id)
+            )
+            existing = {row[0] for row in await cursor.fetchall()}
+
+        pending = [(note_id, file) for note_id, file in by_id.items() if note_id not in existing]
+        rows, skipped, failed = await asyncio.to_thread(
+            self._parse_files, vault_name, pending, user_id, guild_id
+        )
+
+        async with self.db.get_connection() as conn:
+            if rows:
+                await conn.executemany(
+                    """
+                    INSERT INTO knowledge_notes (
+                        id, title, content, tags, source_type, source_id,
+                        user_id, guild_id, created_at, updated_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                await self._backfill_links(conn, [row[0] for row in rows])
+
+            record.files_seen += len(files)
+            record.imported += len(rows)
+            record.skipped += len(existing) + skipped
+            record.failed += failed
+            await self._checkpoint(conn, record)
+            await conn.commit()
+
+    def _parse_files(
+        self,
+        vault_name: str,
+        pending: List[Tuple[str, VaultFile]],
+        user_id: Optional[str],
+        guild_id: Optional[str],
+    ) -> Tuple[List[Tuple[Any, ...]], int, int]:
+        """Read and parse files; runs in a worker thread."""
+        rows: List[Tuple[Any, ...]] = []
+        skipped = failed = 0
+
+        for note_id, file in pending:
+            if file.size > self.max_file_bytes:
+                logger.warning(f"Skipping {file.path}: {file.size} bytes exceeds the limit")
+                skipped += 1
+                continue
+
+            try:
+                text = file.read().decode("utf-8-sig")
+            except (OSError, UnicodeDecodeError, zipfile.BadZipFile) as e:
+                logger.warning(f"Failed to read {file.path}: {e}")
+                failed += 1
+                continue
+
+            metadata, body = parse_frontmatter(text)
+            modified_at = file.modified_at.isoformat()
+            rows.append(
+                (
+                    note_id,
+                    str(metadata.get("title") or PurePosixPath(file.path).stem),
+                    body,
+                    json.dumps(self._collect_tags(metadata, body), ensure_ascii=False),
+                    self.SOURCE_TYPE,
+                    f"{vault_name}/{file.path}",
+                    user_id or self.DEFAULT_USER_ID,
+                    guild_id,
+                    str(metadata.get("created") or metadata.get("date") or modified_at),
+                    str(metadata.get("updated") or metadata.get("modified") or modified_at),
+                )
+            )
+
+        return rows, skipped, failed
+
+    def _collect_tags(self, metadata: Dict[str, Any], body: str) -> List[str]:
+        """Combine frontmatter tags with inline #tags."""
+        raw = metadata.get("tags") or metadata.get("tag") or []
+        if isinstance(raw, str):
+            raw = re.split(r"[,\s]+", raw)
+
+        tags = [str(tag).strip().lstrip("#").lower() for tag in raw]
+        tags.extend(self.knowledge_manager.extract_tags(body))
+        return [tag for tag in dict.fromkeys(tags) if tag]
+
+    async def _backfill_links(self, conn: Any, note_ids: List[str]) -> None:
+        """Create links from existing notes that were waiting for the new titles."""
+        placeholders = ",".join("?" * len(note_ids))
+        await conn.execute(
+            f"""
+            INSERT OR IGNORE INTO note_links (from_note_id, to_note_id, link_type, created_at)
+            SELECT ul.from_note_id, kn.id, 'reference', ?
+            FROM unresolved_links ul
+            JOIN knowledge_notes kn ON kn.title = ul.target_title
+            WHERE kn.id IN ({placeholders})
+            """,
+            [datetime.now().isoformat(), *note_ids],
+        )
+        await conn.execute(
+            f"""
+            DELETE FROM unresolved_links WHERE target_title IN (
+                SELECT title FROM knowledge_notes WHERE id IN ({placeholders})
+            )
+            """,
+            note_ids,
+        )
+
+    async def _resolve_links(self, record: VaultImport, vault_name: str) -> None:
+        """Rebuild the outgoing links of the vault's notes, one page at a time."""
+        prefix = f"{vault_name}/"
+        last_source_id = prefix
+        record.links_resolved = record.links_unresolved = 0
+
+        while not self._stop_event.is_set():
+            async with self.db.get_connection() as conn:
+                cursor = await conn.execute(
+                    """
+                    SELECT id, source_id, content FROM knowledge_notes
+                    WHERE source_type = ? AND source_id > ? AND substr(source_id, 1, ?) = ?
+                    ORDER BY source_id
+                    LIMIT ?
+                    """,
+                    (self.SOURCE_TYPE, last_source_id, len(prefix), prefix, self.batch_size),
+                )
+                notes = await cursor.fetchall()
+            if not notes:
+                break
+
+            links = {
+                note_id: list(dict.fromkeys(self.knowledge_manager.extract_links(content or "")))
+                for note_id, _, content in notes
+            }
+            targets = await self._lookup_titles(
+                {name for names in links.values() for name in names}
+            )
+
+            now = datetime.now().isoformat()
+            resolved = [
+                (note_id, targets[name], "reference", now)
+                for note_id, names in links.items()
+                for name in names
+                if name in targets
+            ]
+            unresolved = [
+                (note_id, name, now)
+                for note_id, names in links.items()
+                for name in names
+                if name not in targets
+            ]
+
+            note_ids = list(links)
+            placeholders = ",".join("?" * len(note_ids))
+            async with self.db.get_connection() as conn:
+                await conn.execute(
+                    f"DELETE FROM note_links WHERE from_note_id IN ({placeholders})", note_ids
+                )
+                await conn.execute(
+                    f"DELETE FROM unresolved_links WHERE from_note_id IN ({placeholders})",
+                    note_ids,
+                )
+                if resolved:
+                    await conn.executemany(
+                        "INSERT OR IGNORE INTO note_links "
+                        "(from_note_id, to_note_id, link_type, created_at) VALUES (?, ?, ?, ?)",
+                        resolved,
+                    )
+                if unresolved:
+                    await conn.executemany(
+                        "INSERT OR IGNORE INTO unresolved_links "
+                        "(from_note_id, target_title, created_at) VALUES (?, ?, ?)",
+                        unresolved,
+                    )
+
+                record.links_resolved += len(resolved)
+                record.links_unresolved += len(unresolved)
+                await self._checkpoint(conn, record)
+                await conn.commit()
+
+            last_source_id = notes[-1][1]
+
+    async def _lookup_titles(self, titles: Set[str]) -> Dict[str, str]:
+        """Map titles to note IDs; the first note created with a title wins."""
+        targets: Dict[str, str] = {}
+        ordered = sorted(titles)
+
+        async with self.db.get_connection() as conn:
+            for start in range(0, len(ordered), self.TITLE_LOOKUP_CHUNK):
+                chunk = ordered[start : start + self.TITLE_LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                cursor = await conn.execute(
+                    f"SELECT id, title FROM knowledge_notes WHERE title IN ({placeholders}) "
+                    "ORDER BY rowid",
+                    chunk,
+                )
+                for note_id, title in await cursor.fetchall():
+                    targets.setdefault(title, note_id)
+
+        return targets
+
+    async def _queue_embeddings(self, record: VaultImport) -> None:
+        """Start a ``missing`` re-index job so the imported notes get embedded."""
+        if self.reindex_jobs is None or record.imported == 0:
+            return
+
+        try:
+            await self.reindex_jobs.start_job(
+                ReindexJobManager.MISSING, created_by=f"vault import #{record.import_id}"
+            )
+        except ReindexJobError as e:
+            logger.warning(f"Embedding for vault import #{record.import_id} not queued: {e}")
+
+    async def _checkpoint(self, conn: Any, record: VaultImport) -> None:
+        """Persist the counters of an import in the caller's transaction."""
+        await conn.execute(
+            """
+            UPDATE vault_imports
+            SET files_seen = ?, imported = ?, skipped = ?, failed = ?,
+                links_resolved = ?, links_unresolved = ?, updated_at = ?
+            WHERE id = ?
+            """,
+            (
+                record.files_seen,
+                record.imported,
+                record.skipped,
+                record.failed,
+                record.links_resolved,
+                record.links_unresolved,
+                datetime.now().isoformat(),
+                record.import_id,
+            ),
+        )
+
+    async def _finish(
+        self, record: VaultImport, status: VaultImportStatus, error: Optional[str] = None
+    ) -> None:
+        """Record the final status of an import."""
+        now = datetime.now().isoformat()
+        record.status = status
+        record.last_error = error
+        async with self.db.get_connection() as conn:
+            await conn.execute(
+                """
+                UPDATE vault_imports
+                SET status = ?, last_error = ?, updated_at = ?, completed_at = ?
+                WHERE id = ?
+                """,
+                (status.value, error, now, now, record.import_id),
+            )
+            await conn.commit()
+
+    def _row_to_import(self, row: Any) -> VaultImport:
+        """Convert a vault_imports row to a VaultImport."""
+        return VaultImport(
+            import_id=row[0],
+            source=row[1],
+            status=VaultImportStatus(row[2]),
+            files_seen=row[3],
+            imported=row[4],
+            skipped=row[5],
+            failed=row[6],
+            links_resolved=row[7],
+            links_unresolved=row[8],
+            last_error=row[9],
+            created_by=row[10],
+            created_at=row[11],
+            updated_at=row[12],
+            completed_at=row[13],
+        )
+
+    async def _require_import(self, import_id: int) -> VaultImport:
+        """Get an import or raise VaultImportError."""
+        record = await self.get_import(import_id)
+        if record is None:
+            raise VaultImportError(f"Vault import #{import_id} not found")
+        return record
@@ -0,0 +1,265 @@
+"""
+Vector store interface.
+
+Defines the VectorStore interface shared by the ChromaDB service and the
+built-in NumPy backend, together with the document types they exchange.
+SyncManager, KnowledgeManager and SearchEngine only depend on this surface,
+so the backend can be chosen with VECTOR_STORE_BACKEND.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from ..config import BotConfig
+
+
+@dataclass
+class DocumentMetadata:
+    """Metadata for a document stored in a vector store."""
+
+    document_id: str
+    title: Optional[str] = None
+    source: Optional[str] = None
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    tags: Optional[List[str]] = None
+    user_id: Optional[str] = None
+    content_type: Optional[str] = None
+    chunk_index: Optional[int] = None
+    content_hash: Optional[str] = None
+    guild_id: Optional[str] = None
+
+
+@dataclass
+class StoredDocument:
+    """Document fetched from a vector store by ID."""
+
+    document_id: str
+    metadata: DocumentMetadata
+    content: Optional[str] = None
+    embedding: Optional[List[float]] = None
+
+
+@dataclass
+class SearchResult:
+    """Result from a vector similarity search."""
+
+    document_id: str
+    content: str
+    score: float
+    metadata: DocumentMetadata
+
+
+DocumentBatch = List[Tuple[str, str, List[float], Optional[DocumentMetadata]]]
+
+# Default projection of search results; IDs and scores are always returned
+SEARCH_INCLUDE_ALL: Tuple[str, ...] = ("documents", "metadatas")
+
+
+class VectorStoreError(Exception):
+    """Base exception for vector store errors."""
+
+    pass
+
+
+class VectorStore(ABC):
+    """
+    Interface for vector backends.
+
+    Metadata is stored flattened to scalar values (see _prepare_metadata) and
+    ``where`` filters use the ChromaDB filter syntax, so both backends accept
+    the same filters.
+    """
+
+    config: BotConfig
+    _initialized: bool = False
+
+    @abstractmethod
+    async def initialize(self) -> None:
+        """Open the store."""
+
+    @abstractmethod
+    async def add_document(
+        self,
+        document_id: str,
+        content: str,
+        embedding: List[float],
+        metadata: Optional[DocumentMetadata] = None,
+    ) -> bool:
+        """Add a single document."""
+
+    @abstractmethod
+    async def add_documents_batch(self, documents: DocumentBatch) -> int:
+        """Add documents; existing IDs are left unchanged."""
+
+    @abstractmethod
+    async def upsert_documents_batch(self, documents: DocumentBatch) -> int:
+        """Insert documents, replacing existing IDs."""
+
+    @abstractmethod
+    async def search_documents(
+        self,
+        query_embedding: List[float],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        include: Sequence[str] = SEARCH_INCLUDE_ALL,
+        max_results: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """
+        Search documents by embedding similarity.
+
+        ``include`` selects the fields to fetch besides IDs and scores
+        ("documents", "metadatas"). Fields left out come back empty.
+        ``n_results`` is capped at ``max_results``, which defaults to the
+        configured max_search_results; callers that over-fetch chunks and
+        collapse them to notes pass their own cap.
+        """
+
+    @abstractmethod
+    async def update_document(
+        self,
+        document_id: str,
+        content: Optional[str] = None,
+        embedding: Optional[List[float]] = None,
+        metadata: Optional[DocumentMetadata] = None,
+    ) -> bool:
+        """Update fields of an existing document."""
+
+    @abstractmethod
+    async def delete_document(self, document_id: str) -> bool:
+        """Delete a single document."""
+
+    @abstractmethod
+    async def delete_documents_batch(self, document_ids: List[str]) -> int:
+        """Delete documents; unknown IDs are ignored."""
+
+    @abstractmethod
+    async def count_where(self, where: Dict[str, Any]) -> int:
+        """Count documents matching a metadata filter."""
+
+    @abstractmethod
+    async def get_document_count(self) -> int:
+        """Get the total number of documents."""
+
+    @abstractmethod
+    async def get_documents(
+        self, ids: List[str], include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """Fetch documents by ID, skipping missing IDs."""
+
+    @abstractmethod
+    async def list_documents(
+        self, limit: int, offset: int = 0, include: Sequence[str] = ("metadatas",)
+    ) -> List[StoredDocument]:
+        """List one page of documents."""
+
+    @abstractmethod
+    async def reset_collection(self) -> bool:
+        """Delete all documents."""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release resources."""
+
+    async def list_document_ids(self, limit: int, offset: int = 0) -> List[str]:
+        """
+        List one page of document IDs.
+
+        Args:
+            limit: Page size
+            offset: Number of documents to skip
+
+        Returns:
+            Document IDs of the page
+        """
+        return [doc.document_id for doc in await self.list_documents(limit, offset, include=())]
+
+    async def iter_documents(
+        self, page_size: Optional[int] = None, include: Sequence[str] = ("metadatas",)
+    ) -> AsyncIterator[List[StoredDocument]]:
+        """
+        Stream the whole store page by page.
+
+        Args:
+            page_size: Documents per page (defaults to chromadb_max_batch_size)
+            include: Fields to fetch ("metadatas", "documents", "embeddings")
+
+        Yields:
+            Pages of documents
+        """
+        page_size = page_size or self.config.chromadb_max_batch_size
+        offset = 0
+        while True:
+            page = await self.list_documents(page_size, offset, include)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            offset += len(page)
+
+    def _prepare_metadata(self, metadata: Optional[DocumentMetadata]) -> Dict[str, Any]:
+        """Convert DocumentMetadata to ChromaDB metadata format."""
+        chroma_metadata: Dict[str, Any] = {}
+
+        if metadata:
+            # ChromaDB metadata values must be strings, numbers, or booleans
+            if metadata.document_id:
+                chroma_metadata["document_id"] = metadata.document_id
+            if metadata.chunk_index is not None:
+                chroma_metadata["chunk_index"] = metadata.chunk_index
+            if metadata.content_hash:
+                chroma_metadata["content_hash"] = metadata.content_hash
+            if metadata.title:
+                chroma_metadata["title"] = metadata.title
+            if metadata.source:
+                chroma_metadata["source"] = metadata.source
+            if metadata.created_at:
+                chroma_metadata["created_at"] = metadata.created_at
+            if metadata.updated_at:
+                chroma_metadata["updated_at"] = metadata.updated_at
+            if metadata.user_id:
+                chroma_metadata["user_id"] = metadata.user_id
+            if metadata.content_type:
+                chroma_metadata["content_type"] = metadata.content_type
+            if metadata.guild_id:
+                chroma_metadata["guild_id"] = metadata.guild_id
+            if metadata.tags:
+                # Convert list to JSON string for storage
+                chroma_metadata["tags"] = json.dumps(metadata.tags)
+
+        # ChromaDB requires non-empty metadata, add default if empty
+        if not chroma_metadata:
+            chroma_metadata["_default"] = "true"
+
+        return chroma_metadata
+
+    def _parse_metadata(self, metadata_dict: Dict[str, Any]) -> DocumentMetadata:
+        """Convert ChromaDB metadata to DocumentMetadata object."""
+        tags = None
+        if "tags" in metadata_dict:
+            try:
+                tags = json.loads(metadata_dict["tags"])
+            except (json.JSONDecodeError, TypeError):
+                tags = None
+
+        return DocumentMetadata(
+            document_id=metadata_dict.get("document_id", ""),
+            title=metadata_dict.get("title"),
+            source=metadata_dict.get("source"),
+            created_at=metadata_dict.get("created_at"),
+            updated_at=metadata_dict.get("updated_at"),
+            user_id=metadata_dict.get("user_id"),
+            content_type=metadata_dict.get("content_type"),
+            tags=tags,
+            chunk_index=metadata_dict.get("chunk_index"),
+            content_hash=metadata_dict.get("content_hash"),
+            guild_id=metadata_dict.get("guild_id"),
+        )
+
+    async def _ensure_initialized(self) -> None:
+        """Ensure the store is initialized before operations."""
+        if not self._initialized:
+            await self.initialize()
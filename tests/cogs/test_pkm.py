@@ -12,6 +12,7 @@ from discord.ext import commands
 from src.nescordbot.cogs.pkm import PKMCog
 from src.nescordbot.services import KnowledgeManager, SearchEngine, SearchFilters
 from src.nescordbot.services.search_engine import SearchMode, SearchResult
+from src.nescordbot.services.tag_vocabulary import TagVocabulary
 from src.nescordbot.ui.pkm_embeds import PKMEmbed
 
 
@@ -130,6 +131,7 @@ class TestPKMCog:
         """Create mock Discord interaction."""
         interaction = AsyncMock(spec=discord.Interaction)
         interaction.user.id = 123456789
+        interaction.guild_id = 987654321
         interaction.response.defer = AsyncMock()
         interaction.response.send_message = AsyncMock()
         interaction.followup.send = AsyncMock()
@@ -158,6 +160,7 @@ class TestPKMCog:
             tags=["test", "mock"],
             source_type="manual",
             user_id="123456789",
+            guild_id="987654321",
         )
 
         # Verify response was sent
@@ -371,6 +374,21 @@ class TestPKMCog:
         # Verify tag search was used
         manager_mock.assert_called_once_with("specific_tag", limit=20)  # limit * 2
 
+    @pytest.mark.asyncio
+    async def test_tag_autocomplete(self, pkm_cog: PKMCog, mock_interaction: AsyncMock) -> None:
+        """Test tag autocomplete from the tag vocabulary."""
+        vocabulary = TagVocabulary()
+        vocabulary.add(["Python", "python", "pytest", "numpy"])
+        pkm_cog.knowledge_manager.tag_vocabulary = vocabulary  # type: ignore[union-attr]
+
+        choices = await pkm_cog.list_tag_autocomplete(mock_interaction, "py")
+        assert [choice.value for choice in choices] == ["Python", "pytest", "numpy"]
+        assert choices[0].name == "Python (2)"
+
+        # Only the last comma-separated tag is completed
+        choices = await pkm_cog.note_tags_autocomplete(mock_interaction, "ai, pyte")
+        assert [choice.value for choice in choices] == ["ai, pytest"]
+
     @pytest.mark.asyncio
     async def test_help_command(self, pkm_cog: PKMCog, mock_interaction: AsyncMock) -> None:
         """Test help command."""
@@ -35,6 +35,7 @@ def mock_knowledge_manager():
     km.get_note = AsyncMock()
     km.merge_notes = AsyncMock()
     km.initialize = AsyncMock()
+    km.get_related_notes = AsyncMock(return_value=[])
     return km
 
 
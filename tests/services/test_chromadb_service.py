@@ -221,6 +221,55 @@ class TestChromaDBService:
         # Cleanup
         await service.close()
 
+    @pytest.mark.asyncio
+    async def test_upsert_documents_batch_overwrites(self, test_config, sample_embedding):
+        """Test that batch upsert replaces existing documents in chunks."""
+        test_config.chromadb_max_batch_size = 2
+
+        service = ChromaDBService(test_config)
+        await service.initialize()
+
+        await service.add_documents_batch([("doc-1", "Old content", sample_embedding, None)])
+        documents = [(f"doc-{i}", f"New content {i}", sample_embedding, None) for i in range(1, 6)]
+
+        result = await service.upsert_documents_batch(documents)
+
+        assert result == 5
+        assert await service.get_document_count() == 5
+        stored = await service.get_documents(["doc-1"], include=("documents",))
+        assert stored[0].content == "New content 1"
+
+        # Cleanup
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_documents_batch_and_count_where(self, test_config, sample_embedding):
+        """Test batch deletion and filtered counting."""
+        test_config.chromadb_max_batch_size = 2
+
+        service = ChromaDBService(test_config)
+        await service.initialize()
+
+        documents = [
+            (
+                f"doc-{i}",
+                f"Content {i}",
+                sample_embedding,
+                DocumentMetadata(document_id=f"doc-{i}", source="voice" if i < 3 else "text"),
+            )
+            for i in range(6)
+        ]
+        await service.add_documents_batch(documents)
+
+        assert await service.count_where({"source": "voice"}) == 3
+        assert await service.delete_documents_batch(["doc-0", "doc-1", "doc-4", "missing"]) == 4
+        assert await service.get_document_count() == 3
+        assert await service.count_where({"source": "voice"}) == 1
+        assert await service.delete_documents_batch([]) == 0
+
+        # Cleanup
+        await service.close()
+
     @pytest.mark.asyncio
     async def test_search_documents(self, test_config, sample_embedding):
         """Test document search functionality."""
@@ -276,6 +325,96 @@ class TestChromaDBService:
         # Cleanup
         await service.close()
 
+    @pytest.mark.asyncio
+    async def test_search_documents_projection(self, test_config, sample_embedding):
+        """Test that include limits the fields fetched with the results."""
+        service = ChromaDBService(test_config)
+        await service.initialize()
+
+        metadata = DocumentMetadata(document_id="note-1", title="Projected")
+        await service.add_documents_batch([("doc-1", "Full content", sample_embedding, metadata)])
+
+        with patch.object(service.collection, "query", wraps=service.collection.query) as query:
+            ids_only = await service.search_documents(sample_embedding, n_results=1, include=())
+            metadata_only = await service.search_documents(
+                sample_embedding, n_results=1, include=("metadatas",)
+            )
+
+        assert [call.kwargs["include"] for call in query.call_args_list] == [
+            ["distances"],
+            ["metadatas", "distances"],
+        ]
+        assert ids_only[0].document_id == "doc-1"
+        assert ids_only[0].score > 0.9
+        assert ids_only[0].content == ""
+        assert ids_only[0].metadata.document_id == ""
+        assert metadata_only[0].metadata.title == "Projected"
+        assert metadata_only[0].content == ""
+
+        # Cleanup
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_searches_are_micro_batched(self, test_config, sample_embedding):
+        """Test that concurrent searches of the same shape share one collection query."""
+        service = ChromaDBService(test_config)
+        await service.initialize()
+        service.query_batch_window = 0.05
+
+        metadata = [
+            DocumentMetadata(document_id=f"doc-{i}", source="voice" if i % 2 else "text")
+            for i in range(4)
+        ]
+        await service.add_documents_batch(
+            [
+                (f"doc-{i}", f"Content {i}", [float(i + 1)] + sample_embedding[1:], metadata[i])
+                for i in range(4)
+            ]
+        )
+        queries = [[float(i + 1)] + sample_embedding[1:] for i in range(4)]
+
+        with patch.object(service.collection, "query", wraps=service.collection.query) as query:
+            results = await asyncio.gather(
+                *(service.search_documents(query_embedding=q, n_results=1) for q in queries),
+                service.search_documents(
+                    query_embedding=queries[0], n_results=4, where={"source": "voice"}
+                ),
+            )
+
+        # The first search runs at once; while it runs, the other three unfiltered
+        # searches share one query and the filtered one gets its own
+        assert query.call_count == 3
+        assert [r[0].document_id for r in results[:4]] == ["doc-0", "doc-1", "doc-2", "doc-3"]
+        assert {r.document_id for r in results[4]} == {"doc-1", "doc-3"}
+
+        # A search with nothing else in flight does not wait for the window
+        service.query_batch_window = 60.0
+        lone = await asyncio.wait_for(
+            service.search_documents(query_embedding=queries[2], n_results=1), timeout=5.0
+        )
+        assert lone[0].document_id == "doc-2"
+
+        # Cleanup
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_micro_batch_failure_reaches_every_caller(self, test_config, sample_embedding):
+        """Test that a failed batched query fails all of its callers."""
+        service = ChromaDBService(test_config)
+        await service.initialize()
+
+        with patch.object(service.collection, "query", side_effect=RuntimeError("boom")):
+            results = await asyncio.gather(
+                service.search_documents(query_embedding=sample_embedding),
+                service.search_documents(query_embedding=sample_embedding),
+                return_exceptions=True,
+            )
+
+        assert all(isinstance(r, ChromaDBOperationError) for r in results)
+
+        # Cleanup
+        await service.close()
+
     @pytest.mark.asyncio
     async def test_search_documents_respects_max_results(self, test_config, sample_embedding):
         """Test that search respects max_search_results configuration."""
@@ -434,6 +573,63 @@ class TestChromaDBService:
         # Cleanup
         await service.close()
 
+    @pytest.mark.asyncio
+    async def test_get_documents_by_id(self, test_config, sample_embedding):
+        """Test fetching documents by ID across several batches."""
+        service = ChromaDBService(test_config)
+        await service.initialize()
+
+        documents = [
+            (
+                f"doc-{i}",
+                f"Content {i}",
+                sample_embedding,
+                DocumentMetadata(document_id=f"note-{i}", title=f"Title {i}", content_hash=f"h{i}"),
+            )
+            for i in range(7)
+        ]
+        await service.add_documents_batch(documents)
+
+        # 8 IDs with max batch size 5 -> two lookups; the unknown ID is skipped
+        ids = [f"doc-{i}" for i in range(7)] + ["missing"]
+        fetched = await service.get_documents(ids, include=["metadatas", "documents"])
+
+        by_id = {doc.document_id: doc for doc in fetched}
+        assert set(by_id) == {f"doc-{i}" for i in range(7)}
+        assert by_id["doc-3"].content == "Content 3"
+        assert by_id["doc-3"].metadata.document_id == "note-3"
+        assert by_id["doc-3"].metadata.content_hash == "h3"
+        assert by_id["doc-3"].embedding is None
+
+        assert await service.get_documents([]) == []
+
+        # Cleanup
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_iter_documents_pages(self, test_config, sample_embedding):
+        """Test paged ID listing and streaming of the whole collection."""
+        service = ChromaDBService(test_config)
+        await service.initialize()
+
+        documents = [(f"doc-{i}", f"Content {i}", sample_embedding, None) for i in range(12)]
+        await service.add_documents_batch(documents)
+
+        first_page = await service.list_document_ids(limit=10)
+        second_page = await service.list_document_ids(limit=10, offset=10)
+        assert len(first_page) == 10
+        assert len(second_page) == 2
+        assert set(first_page) | set(second_page) == {f"doc-{i}" for i in range(12)}
+
+        pages = [page async for page in service.iter_documents()]
+        assert [len(page) for page in pages] == [5, 5, 2]
+        assert {doc.document_id for page in pages for doc in page} == {
+            f"doc-{i}" for i in range(12)
+        }
+
+        # Cleanup
+        await service.close()
+
     @pytest.mark.asyncio
     async def test_reset_collection(self, test_config, sample_embedding):
         """Test resetting collection (deleting all documents)."""
@@ -462,6 +658,85 @@ class TestChromaDBService:
         # Cleanup
         await service.close()
 
+    @pytest.mark.asyncio
+    async def test_migrate_dimension(self, test_config, sample_embedding, sample_metadata):
+        """Test migrating the collection to a truncated embedding dimension."""
+        service = ChromaDBService(test_config)
+        await service.initialize()
+
+        documents = [
+            (f"doc-{i}", f"Content {i}", sample_embedding, sample_metadata) for i in range(12)
+        ]
+        await service.add_documents_batch(documents)
+
+        summary = await service.migrate_dimension(256)
+
+        assert summary["migrated"] == 12
+        assert summary["target"] == "test_collection_d256"
+        assert service.embedding_dimension == 256
+        assert service.get_migration_status()["state"] == "completed"
+        assert await service.get_document_count() == 12
+
+        # Full-size query vectors are truncated to the collection dimension
+        results = await service.search_documents(query_embedding=sample_embedding, n_results=3)
+        assert len(results) == 3
+        assert results[0].score == pytest.approx(1.0, abs=1e-3)
+
+        # New writes with full-size vectors are accepted
+        await service.add_document("doc-new", "New content", sample_embedding, sample_metadata)
+        assert await service.get_document_count() == 13
+
+        await service.close()
+
+        # A restarted service picks up the migrated collection
+        restarted = ChromaDBService(test_config)
+        await restarted.initialize()
+        assert restarted.collection.name == "test_collection_d256"
+        assert restarted.embedding_dimension == 256
+        assert await restarted.get_document_count() == 13
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_migration_mirrors_concurrent_writes(self, test_config, sample_embedding):
+        """Test writes made during a migration reach the new collection."""
+        service = ChromaDBService(test_config)
+        await service.initialize()
+        await service.add_documents_batch(
+            [(f"doc-{i}", f"Content {i}", sample_embedding, None) for i in range(20)]
+        )
+
+        migration = service.start_dimension_migration(256)
+        with pytest.raises(ChromaDBOperationError):
+            service.start_dimension_migration(128)
+        await service.add_document("doc-during", "Written mid-migration", sample_embedding)
+        await service.delete_document("doc-0")
+        await migration
+
+        assert await service.get_document_count() == 20
+        ids = service.collection.get(include=[])["ids"]
+        assert "doc-during" in ids
+        assert "doc-0" not in ids
+
+        await service.close()
+
+    @pytest.mark.asyncio
+    async def test_shared_client(self, test_config, sample_embedding):
+        """Test a service opening its collection in another service's client."""
+        owner = ChromaDBService(test_config)
+        tenant_config = test_config.model_copy(update={"chromadb_collection_name": "tenant_a"})
+        tenant = ChromaDBService(tenant_config, shared=owner)
+        await tenant.initialize()
+
+        assert tenant.client is owner.client
+        await tenant.add_document("doc-1", "Tenant content", sample_embedding)
+        assert await tenant.get_document_count() == 1
+        assert await owner.get_document_count() == 0
+
+        # Closing the tenant leaves the shared executor running
+        await tenant.close()
+        assert await owner.get_document_count() == 0
+        await owner.close()
+
     @pytest.mark.asyncio
     async def test_metadata_conversion(self, test_config):
         """Test metadata conversion between DocumentMetadata and ChromaDB format."""
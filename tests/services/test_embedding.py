@@ -17,6 +17,7 @@ from src.nescordbot.services.embedding import (
     EmbeddingResult,
     EmbeddingService,
     EmbeddingServiceError,
+    truncate_embedding,
 )
 
 
@@ -188,19 +189,34 @@ class TestEmbeddingService:
         texts = ["Text 1", "Text 2", "Text 3"]
         expected_embeddings = [[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]]
 
-        mock_responses = [MagicMock() for _ in texts]
-        for i, response in enumerate(mock_responses):
-            response.__getitem__.return_value = expected_embeddings[i]
-            response.get.return_value = expected_embeddings[i]
-
-        with patch("google.generativeai.embed_content", side_effect=mock_responses):
+        with patch(
+            "google.generativeai.embed_content", return_value={"embedding": expected_embeddings}
+        ) as mock_embed:
             results = await service_with_api.generate_embeddings_batch(texts)
 
+            # All texts are sent in a single batch request
+            mock_embed.assert_called_once()
+            assert mock_embed.call_args.kwargs["content"] == texts
             assert len(results) == len(texts)
             for i, result in enumerate(results):
                 assert result.text == texts[i]
                 assert result.embedding == expected_embeddings[i]
 
+    @pytest.mark.asyncio
+    async def test_generate_embeddings_batch_uses_cache(self, service_with_api):
+        """Test that cached texts are not sent in the batch request."""
+        with patch("google.generativeai.embed_content", return_value={"embedding": [[0.1, 0.2]]}):
+            await service_with_api.generate_embeddings_batch(["Text 1"])
+
+        with patch(
+            "google.generativeai.embed_content", return_value={"embedding": [[0.3, 0.4]]}
+        ) as mock_embed:
+            results = await service_with_api.generate_embeddings_batch(["Text 1", "Text 2"])
+
+            assert mock_embed.call_args.kwargs["content"] == ["Text 2"]
+            assert results[0].cached is True
+            assert results[1].embedding == [0.3, 0.4]
+
     @pytest.mark.asyncio
     async def test_generate_embeddings_batch_empty(self, service_with_api):
         """Test batch embedding with empty list."""
@@ -298,6 +314,82 @@ class TestEmbeddingService:
         assert health["status"] == "unavailable"
         assert health["api_available"] is False
 
+    @pytest.mark.asyncio
+    async def test_local_provider(self):
+        """Test embedding generation with the local provider (no API key)."""
+        config = BotConfig(
+            discord_token=self.TEST_DISCORD_TOKEN,
+            openai_api_key=self.TEST_OPENAI_API_KEY,
+            embedding_provider="local",
+            embedding_dimension=256,
+        )
+        service = EmbeddingService(config)
+
+        assert service.is_available()
+        assert service.model_name.startswith("local-")
+
+        result = await service.generate_embedding("ローカル埋め込みのテスト")
+        assert len(result.embedding) == 256
+        assert result.model == service.model_name
+
+        batch = await service.generate_embeddings_batch(["first", "second"])
+        assert [len(r.embedding) for r in batch] == [256, 256]
+        assert service.get_usage_stats()["provider"] == "local"
+
+    @pytest.mark.asyncio
+    async def test_fallback_switches_to_local_provider(self, service_with_api):
+        """Test that FallbackManager pressure switches to the local provider."""
+        fallback_manager = MagicMock()
+        fallback_manager.should_use_local_embeddings = MagicMock(return_value=True)
+        service_with_api.fallback_manager = fallback_manager
+
+        with patch("google.generativeai.embed_content") as mock_embed:
+            result = await service_with_api.generate_embedding("under pressure")
+
+            mock_embed.assert_not_called()
+            assert result.model.startswith("local-")
+            assert len(result.embedding) == service_with_api.embedding_dimension
+
+        # Back to normal: Gemini model is used again
+        fallback_manager.should_use_local_embeddings.return_value = False
+        assert service_with_api.model_name == EmbeddingService.GEMINI_MODEL_NAME
+
+    def test_truncate_embedding(self):
+        """Test Matryoshka truncation keeps leading components at unit length."""
+        embedding = [3.0, 4.0, 12.0, 84.0]
+
+        truncated = truncate_embedding(embedding, 2)
+        assert truncated == pytest.approx([0.6, 0.8])
+
+        # Already short enough: unchanged
+        assert truncate_embedding(embedding, 4) == embedding
+
+    @pytest.mark.asyncio
+    async def test_generate_embedding_reduced_dimension(self):
+        """Test Gemini vectors are truncated in reduced-dimension mode."""
+        config = BotConfig(
+            discord_token=self.TEST_DISCORD_TOKEN,
+            openai_api_key=self.TEST_OPENAI_API_KEY,
+            gemini_api_key=self.TEST_GEMINI_API_KEY,
+            embedding_dimension=256,
+        )
+        with patch("google.generativeai.configure"):
+            service = EmbeddingService(config)
+            service._gemini_available = True
+
+        with patch("google.generativeai.embed_content", return_value={"embedding": [0.5] * 768}):
+            result = await service.generate_embedding("reduced dimension")
+
+        assert len(result.embedding) == 256
+        assert sum(v * v for v in result.embedding) == pytest.approx(1.0)
+
+    def test_register_provider_dimension_mismatch(self, service_with_api):
+        """Test that providers with a different dimension are rejected."""
+        from src.nescordbot.services.embedding_providers import LocalEmbeddingProvider
+
+        with pytest.raises(EmbeddingServiceError):
+            service_with_api.register_provider(LocalEmbeddingProvider(dimension=384))
+
     def teardown_method(self):
         """Clean up test environment."""
         # Clear any environment variables that might affect tests
@@ -0,0 +1,62 @@
+"""
+Tests for embedding providers.
+"""
+
+import numpy as np
+import pytest
+
+from src.nescordbot.services.embedding_providers import LocalEmbeddingProvider
+
+
+class TestLocalEmbeddingProvider:
+    """Test cases for LocalEmbeddingProvider."""
+
+    @pytest.fixture
+    def provider(self):
+        """Create local provider with a small dimension."""
+        return LocalEmbeddingProvider(dimension=256)
+
+    @pytest.mark.asyncio
+    async def test_dimension_and_normalization(self, provider):
+        """Test vectors have the configured dimension and unit length."""
+        embedding = await provider.embed("Weekly team meeting discussion points")
+
+        assert len(embedding) == 256
+        assert np.linalg.norm(embedding) == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_deterministic(self):
+        """Test the same text always yields the same vector across instances."""
+        first = await LocalEmbeddingProvider(dimension=256).embed("deterministic text")
+        second = await LocalEmbeddingProvider(dimension=256).embed("deterministic text")
+
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_similar_texts_are_closer(self, provider):
+        """Test lexical overlap translates into cosine similarity."""
+        base = np.array(await provider.embed("machine learning research topics"))
+        similar = np.array(await provider.embed("research topics in machine learning"))
+        unrelated = np.array(await provider.embed("会議の議事録と次回の予定"))
+
+        assert base @ similar > base @ unrelated
+
+    @pytest.mark.asyncio
+    async def test_embed_batch(self, provider):
+        """Test batch embedding matches single embedding."""
+        texts = ["first text", "second text"]
+        batch = await provider.embed_batch(texts)
+
+        assert batch == [await provider.embed(text) for text in texts]
+
+    @pytest.mark.asyncio
+    async def test_non_word_text(self, provider):
+        """Test text without features still produces a valid unit vector."""
+        embedding = await provider.embed("!")
+
+        assert np.linalg.norm(embedding) == pytest.approx(1.0)
+
+    def test_invalid_dimension(self):
+        """Test invalid dimension is rejected."""
+        with pytest.raises(ValueError):
+            LocalEmbeddingProvider(dimension=0)
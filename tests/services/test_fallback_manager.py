@@ -174,6 +174,20 @@ class TestFallbackManager:
         await fallback_manager.set_manual_override(False)
         assert fallback_manager._manual_override is False
 
+    @pytest.mark.asyncio
+    async def test_should_use_local_embeddings(self, fallback_manager):
+        """Test local embedding provider switch decision."""
+        fallback_manager.config.embedding_local_fallback = True
+        assert not fallback_manager.should_use_local_embeddings()
+
+        await fallback_manager.check_and_update_fallback_level({"monthly_usage_percentage": 96})
+        assert fallback_manager.should_use_local_embeddings()
+
+        # Never switch when disabled in config
+        fallback_manager.config.embedding_local_fallback = False
+        assert not fallback_manager.should_use_local_embeddings()
+
+    @pytest.mark.asyncio
     async def test_service_availability_check(self, fallback_manager):
         """Test service availability checking."""
         # Initially all services should be available (NORMAL level)
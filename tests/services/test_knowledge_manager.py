@@ -298,6 +298,92 @@ class TestKnowledgeManager:
         assert len(target_links["incoming"]) == 1
         assert target_links["incoming"][0]["title"] == "Source Note"
 
+    @pytest.mark.asyncio
+    async def test_unresolved_links_backfilled_when_target_created(self, knowledge_manager):
+        """Test that links to missing notes are recorded and resolved later."""
+        source_id = await knowledge_manager.create_note(
+            title="Source",
+            content="See [[Later]], [[Later]] again and [[Elsewhere]]",
+            user_id="test_user",
+        )
+        assert (await knowledge_manager.get_linked_notes(source_id))["outgoing"] == []
+
+        async with knowledge_manager.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT target_title FROM unresolved_links WHERE from_note_id = ? "
+                "ORDER BY target_title",
+                (source_id,),
+            )
+            assert [row[0] for row in await cursor.fetchall()] == ["Elsewhere", "Later"]
+
+        later_id = await knowledge_manager.create_note(
+            title="Later", content="Target", user_id="test_user"
+        )
+        links = await knowledge_manager.get_linked_notes(source_id)
+        assert [link["id"] for link in links["outgoing"]] == [later_id]
+
+        # Renaming a note onto a pending title resolves the remaining link
+        other_id = await knowledge_manager.create_note(
+            title="Other", content="Target", user_id="test_user"
+        )
+        await knowledge_manager.update_note(other_id, title="Elsewhere")
+        links = await knowledge_manager.get_linked_notes(source_id)
+        assert {link["id"] for link in links["outgoing"]} == {later_id, other_id}
+
+        health = await knowledge_manager.health_check()
+        assert health["unresolved_link_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_title_index_tracks_rename_and_delete(self, knowledge_manager):
+        """Test that the title index follows renames and deletions."""
+        note_id = await knowledge_manager.create_note(
+            title="First", content="Body", user_id="test_user"
+        )
+        assert knowledge_manager._title_index["First"] == note_id
+
+        await knowledge_manager.update_note(note_id, title="Second")
+        assert "First" not in knowledge_manager._title_index
+        assert knowledge_manager._title_index["Second"] == note_id
+
+        source_id = await knowledge_manager.create_note(
+            title="Source", content="[[Second]]", user_id="test_user"
+        )
+        await knowledge_manager.delete_note(note_id)
+        assert "Second" not in knowledge_manager._title_index
+
+        # The incoming link waits for a new note with the same title
+        assert (await knowledge_manager.get_linked_notes(source_id))["outgoing"] == []
+        new_id = await knowledge_manager.create_note(
+            title="Second", content="Recreated", user_id="test_user"
+        )
+        links = await knowledge_manager.get_linked_notes(source_id)
+        assert [link["id"] for link in links["outgoing"]] == [new_id]
+
+    @pytest.mark.asyncio
+    async def test_update_links_resolves_in_one_query(self, knowledge_manager):
+        """Test that link targets are looked up with a single IN query."""
+        for i in range(5):
+            await knowledge_manager.create_note(
+                title=f"Target {i}", content="Body", user_id="test_user"
+            )
+        knowledge_manager._title_index.clear()
+
+        source_id = await knowledge_manager.create_note(
+            title="Hub", content="Body", user_id="test_user"
+        )
+        content = " ".join(f"[[Target {i}]]" for i in range(5))
+
+        with patch.object(
+            knowledge_manager.db.connection,
+            "execute",
+            wraps=knowledge_manager.db.connection.execute,
+        ) as execute:
+            await knowledge_manager.update_links(source_id, content)
+
+        lookups = [c for c in execute.call_args_list if "FROM knowledge_notes" in c.args[0]]
+        assert len(lookups) == 1
+        assert len((await knowledge_manager.get_linked_notes(source_id))["outgoing"]) == 5
+
     @pytest.mark.asyncio
     async def test_merge_notes(self, knowledge_manager):
         """Test note merging functionality."""
@@ -330,6 +416,63 @@ class TestKnowledgeManager:
         assert note1 is None
         assert note2 is None
 
+    @pytest.mark.asyncio
+    async def test_merge_notes_repoints_links_in_one_transaction(self, knowledge_manager):
+        """Test that merging repoints incoming links and batches the ChromaDB deletes."""
+        first_id = await knowledge_manager.create_note(
+            title="First", content="links to [[Second]] and [[Target]]", user_id="user1"
+        )
+        second_id = await knowledge_manager.create_note(
+            title="Second", content="second part", user_id="user1"
+        )
+        target_id = await knowledge_manager.create_note(
+            title="Target", content="target", user_id="user1"
+        )
+        referrer_id = await knowledge_manager.create_note(
+            title="Referrer", content="see [[First]] and [[Second]]", user_id="user1"
+        )
+        knowledge_manager.sync_manager.delete_note_from_chromadb.reset_mock()
+
+        merged_id = await knowledge_manager.merge_notes([first_id, second_id], "Combined")
+
+        referrer_links = await knowledge_manager.get_linked_notes(referrer_id)
+        assert [note["id"] for note in referrer_links["outgoing"]] == [merged_id]
+        merged_links = await knowledge_manager.get_linked_notes(merged_id)
+        assert [note["id"] for note in merged_links["outgoing"]] == [target_id]
+
+        async with knowledge_manager.db.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT COUNT(*) FROM note_links WHERE from_note_id IN (?, ?) "
+                "OR to_note_id IN (?, ?)",
+                (first_id, second_id, first_id, second_id),
+            )
+            assert (await cursor.fetchone())[0] == 0
+
+        knowledge_manager.sync_manager.delete_notes_from_chromadb.assert_awaited_once_with(
+            [first_id, second_id]
+        )
+        knowledge_manager.sync_manager.delete_note_from_chromadb.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_merge_notes_rolls_back_on_failure(self, knowledge_manager):
+        """Test that a failing merge leaves the source notes untouched."""
+        first_id = await knowledge_manager.create_note(
+            title="First", content="first", user_id="user1"
+        )
+        second_id = await knowledge_manager.create_note(
+            title="Second", content="second", user_id="user1"
+        )
+
+        with patch.object(
+            knowledge_manager, "_backfill_links", side_effect=RuntimeError("disk full")
+        ):
+            with pytest.raises(KnowledgeManagerError, match="disk full"):
+                await knowledge_manager.merge_notes([first_id, second_id], "Combined")
+
+        assert await knowledge_manager.get_note(first_id) is not None
+        assert await knowledge_manager.get_note(second_id) is not None
+        assert (await knowledge_manager.list_notes(limit=10))[0]["title"] != "Combined"
+
     @pytest.mark.asyncio
     async def test_merge_notes_insufficient_notes(self, knowledge_manager):
         """Test merge with insufficient notes."""
@@ -340,6 +483,85 @@ class TestKnowledgeManager:
         with pytest.raises(KnowledgeManagerError, match="At least 2 notes required"):
             await knowledge_manager.merge_notes([note_id])
 
+    @staticmethod
+    def _batch_tag_model(fail_on_title=None):
+        """Create a Gemini model mock answering batch tag prompts as JSON."""
+
+        async def generate(prompt, generation_config=None):
+            if fail_on_title and fail_on_title in prompt:
+                return MagicMock(text="not json")
+            count = prompt.count("### id:")
+            notes = [
+                {"id": str(i), "tags": [{"tag": "auto", "confidence": 0.9, "reason": "r"}]}
+                for i in range(1, count + 1)
+            ]
+            return MagicMock(text=json.dumps({"notes": notes}))
+
+        model = MagicMock()
+        model.generate_content_async = AsyncMock(side_effect=generate)
+        return model
+
+    @pytest.mark.asyncio
+    async def test_auto_categorize_packs_notes_into_prompts(self, knowledge_manager):
+        """Test that auto-categorization batches prompts and tag updates."""
+        note_ids = [
+            await knowledge_manager.create_note(
+                title=f"Note {i}", content=f"content {i}", tags=["manual"], user_id="user1"
+            )
+            for i in range(5)
+        ]
+        model = self._batch_tag_model()
+        knowledge_manager._tag_model = model
+        knowledge_manager.sync_manager.sync_notes_batch.reset_mock()
+        progress = []
+
+        results = await knowledge_manager.auto_categorize_notes(
+            batch_size=2, progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        assert results["processed"] == 5
+        assert results["categorized"] == 5
+        assert results["errors"] == []
+        # 5 notes in prompts of 2, all within one page of 4 concurrent prompts
+        assert model.generate_content_async.await_count == 3
+        assert progress == [(5, 5)]
+        knowledge_manager.sync_manager.sync_notes_batch.assert_awaited_once()
+        for note_id in note_ids:
+            note = await knowledge_manager.get_note(note_id)
+            assert note["tags"] == ["manual", "auto"]
+
+    @pytest.mark.asyncio
+    async def test_auto_categorize_reports_failed_prompts(self, knowledge_manager):
+        """Test that an unparsable response only fails the notes of its prompt."""
+        first_id = await knowledge_manager.create_note(
+            title="Good", content="good", user_id="user1"
+        )
+        second_id = await knowledge_manager.create_note(
+            title="Broken", content="broken", user_id="user1"
+        )
+        knowledge_manager._tag_model = self._batch_tag_model(fail_on_title="Broken")
+
+        results = await knowledge_manager.auto_categorize_notes(
+            note_ids=[first_id, second_id], batch_size=1
+        )
+
+        assert results["processed"] == 1
+        assert results["categorized"] == 1
+        assert len(results["errors"]) == 1
+        assert second_id in results["errors"][0]
+        assert (await knowledge_manager.get_note(first_id))["tags"] == ["auto"]
+        assert (await knowledge_manager.get_note(second_id))["tags"] == []
+
+    @pytest.mark.asyncio
+    async def test_tag_model_is_created_once(self, knowledge_manager):
+        """Test that the Gemini client is configured once and reused."""
+        knowledge_manager.config.gemini_api_key = "test_key"
+        with patch("google.generativeai") as mock_genai:
+            assert knowledge_manager._get_tag_model() is knowledge_manager._get_tag_model()
+
+        mock_genai.configure.assert_called_once()
+        mock_genai.GenerativeModel.assert_called_once_with("gemini-1.5-flash")
+
     @pytest.mark.asyncio
     async def test_search_notes(self, knowledge_manager):
         """Test note searching."""
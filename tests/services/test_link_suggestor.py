@@ -1,12 +1,20 @@
 """Tests for LinkSuggestor class."""
 
 import asyncio
+import json
+import tempfile
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from nescordbot.services.database import DatabaseService
 from nescordbot.services.link_suggestor import LinkSuggestionError, LinkSuggestor
+from nescordbot.services.vector_store import (
+    DocumentMetadata,
+    SearchResult,
+    StoredDocument,
+    VectorStore,
+)
 
 
 @pytest.fixture
@@ -101,9 +109,13 @@ class TestLinkSuggestor:
             ("candidate-3", "Unrelated Note", "This is about cooking", '["cooking", "recipes"]'),
         ]
 
-        # Setup mock returns
+        # Setup mock returns: no queued notes, term frequencies, then the shortlist
         mock_cursor.fetchone.return_value = source_note_row
-        mock_cursor.fetchall.return_value = candidate_rows
+        mock_cursor.fetchall.side_effect = [
+            [],
+            [("python", 2), ("programming", 2), ("#python", 1)],
+            candidate_rows,
+        ]
 
         # Run suggestions
         suggestions = await suggestor.suggest_links_for_note(
@@ -342,7 +354,7 @@ class TestLinkSuggestor:
         ]
 
         mock_cursor.fetchone.return_value = source_note_row
-        mock_cursor.fetchall.return_value = candidate_rows
+        mock_cursor.fetchall.side_effect = [[], [("python", 2)], candidate_rows]
 
         # Test with high min_similarity (should filter out cooking note)
         suggestions = await suggestor.suggest_links_for_note("source-id", min_similarity=0.5)
@@ -350,3 +362,236 @@ class TestLinkSuggestor:
         # Should only return highly similar notes
         for suggestion in suggestions:
             assert suggestion["similarity_score"] >= 0.5
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database with migrations applied."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/links.db")
+        await service.initialize()
+        yield service
+        await service.close()
+
+
+async def insert_note(db, note_id, title, content, tags, guild_id=None):
+    """Insert a note directly, as any write path would."""
+    async with db.get_connection() as conn:
+        await conn.execute(
+            """
+            INSERT INTO knowledge_notes (id, title, content, tags, user_id, guild_id)
+            VALUES (?, ?, ?, ?, 'user_1', ?)
+            """,
+            (note_id, title, content, json.dumps(tags), guild_id),
+        )
+        await conn.commit()
+
+
+async def indexed_terms(db, note_id):
+    """Return the indexed terms of a note."""
+    async with db.get_connection() as conn:
+        cursor = await conn.execute("SELECT term FROM note_terms WHERE note_id = ?", (note_id,))
+        return {row[0] for row in await cursor.fetchall()}
+
+
+class TestNoteTermsIndex:
+    """Test candidate generation from the note_terms inverted index."""
+
+    @pytest.mark.asyncio
+    async def test_index_follows_note_writes(self, database_service):
+        suggestor = LinkSuggestor(database_service)
+        await insert_note(database_service, "n1", "Python Guide", "asyncio basics", ["Dev"])
+
+        assert await suggestor.refresh_index() == 1
+        assert await indexed_terms(database_service, "n1") == {
+            "python",
+            "guide",
+            "asyncio",
+            "basics",
+            "#dev",
+        }
+        assert await suggestor.refresh_index() == 0
+
+        async with database_service.get_connection() as conn:
+            await conn.execute("UPDATE knowledge_notes SET content = 'numpy' WHERE id = 'n1'")
+            await conn.commit()
+        await suggestor.refresh_index()
+        assert await indexed_terms(database_service, "n1") == {"python", "guide", "numpy", "#dev"}
+
+        async with database_service.get_connection() as conn:
+            await conn.execute("DELETE FROM knowledge_notes WHERE id = 'n1'")
+            await conn.commit()
+        assert await indexed_terms(database_service, "n1") == set()
+
+    @pytest.mark.asyncio
+    async def test_requests_index_a_bounded_part_of_the_queue(self, database_service):
+        suggestor = LinkSuggestor(
+            database_service, index_batch_size=2, request_index_limit=3, index_interval=0.05
+        )
+        for i in range(5):
+            await insert_note(database_service, f"n{i}", f"Note {i}", "python asyncio", [])
+
+        await suggestor.suggest_links_for_note("n0")
+
+        async with database_service.get_connection() as conn:
+            cursor = await conn.execute("SELECT COUNT(*) FROM note_terms_pending")
+            assert (await cursor.fetchone())[0] == 2
+
+        await suggestor.start_index_worker()
+        try:
+            for _ in range(50):
+                if await indexed_terms(database_service, "n4"):
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            await suggestor.stop_index_worker()
+
+        assert await suggestor.refresh_index() == 0
+
+    @pytest.mark.asyncio
+    async def test_suggestions_score_only_the_shortlist(self, database_service):
+        suggestor = LinkSuggestor(database_service, shortlist_size=2, index_batch_size=2)
+        await insert_note(
+            database_service, "src", "Python asyncio", "event loop coroutines", ["python"]
+        )
+        await insert_note(
+            database_service, "near", "Python asyncio tips", "event loop coroutines", ["python"]
+        )
+        await insert_note(database_service, "linked", "Python asyncio", "event loop", ["python"])
+        await insert_note(database_service, "partial", "Python", "cooking recipes", [])
+        for i in range(5):
+            await insert_note(database_service, f"other{i}", "Gardening", "tomato soil", [])
+
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO note_links (from_note_id, to_note_id) VALUES ('linked', 'src')"
+            )
+            await conn.commit()
+
+        original_score = suggestor._score
+        suggestor._score = MagicMock(side_effect=original_score)
+
+        suggestions = await suggestor.suggest_links_for_note("src", min_similarity=0.0)
+
+        # The linked note is excluded and unrelated notes never reach scoring
+        assert [s["note_id"] for s in suggestions] == ["near", "partial"]
+        assert suggestor._score.call_count == 2
+        assert suggestions[0]["similarity_score"] > 0.8
+        assert any("Common tags" in reason for reason in suggestions[0]["similarity_reasons"])
+
+
+def vector_hit(doc_id, note_id, score):
+    """Vector search result for a chunk of a note."""
+    return SearchResult(
+        document_id=doc_id, content="", score=score, metadata=DocumentMetadata(document_id=note_id)
+    )
+
+
+class TestVectorSuggestions:
+    """Test suggestions from nearest neighbours of stored embeddings."""
+
+    @pytest.fixture
+    async def notes(self, database_service):
+        for note_id, title in [
+            ("src", "Python asyncio"),
+            ("linked", "Event loops"),
+            ("near", "Coroutines"),
+            ("far", "Python gardening"),
+        ]:
+            await insert_note(database_service, note_id, title, title.lower(), [], "guild_1")
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO note_links (from_note_id, to_note_id) VALUES ('src', 'linked')"
+            )
+            await conn.commit()
+
+    @pytest.fixture
+    def vector_store(self):
+        store = MagicMock(spec=VectorStore)
+        store.get_documents = AsyncMock(
+            return_value=[
+                StoredDocument(
+                    document_id="note_src",
+                    metadata=DocumentMetadata(document_id="src"),
+                    embedding=[1.0, 0.0],
+                )
+            ]
+        )
+        store.search_documents = AsyncMock(
+            return_value=[
+                vector_hit("note_src", "src", 1.0),
+                vector_hit("note_linked", "linked", 0.9),
+                vector_hit("note_near#a", "near", 0.8),
+                vector_hit("note_near#b", "near", 0.7),
+                vector_hit("note_far", "far", 0.5),
+            ]
+        )
+        return store
+
+    @pytest.mark.asyncio
+    async def test_neighbours_exclude_self_and_linked_notes(
+        self, database_service, notes, vector_store
+    ):
+        suggestor = LinkSuggestor(database_service, vector_store=vector_store)
+
+        suggestions = await suggestor.suggest_by_vector(
+            "src", max_suggestions=3, min_similarity=0.1
+        )
+
+        assert [(s["note_id"], s["similarity_score"]) for s in suggestions] == [
+            ("near", 0.8),
+            ("far", 0.5),
+        ]
+        (embedding,) = vector_store.search_documents.call_args.args
+        assert embedding == [1.0, 0.0]
+        assert vector_store.search_documents.call_args.kwargs["where"] == {"guild_id": "guild_1"}
+
+    @pytest.mark.asyncio
+    async def test_lexical_score_is_blended(self, database_service, notes, vector_store):
+        suggestor = LinkSuggestor(database_service, vector_store=vector_store)
+
+        suggestions = await suggestor.suggest_by_vector(
+            "src", min_similarity=0.0, lexical_weight=0.5
+        )
+
+        scores = {s["note_id"]: s for s in suggestions}
+        source = {"title": "Python asyncio", "content": "python asyncio", "tags": []}
+        far = {"title": "Python gardening", "content": "python gardening", "tags": []}
+        expected = 0.5 * 0.5 + 0.5 * suggestor._calculate_similarity(source, far)
+        assert scores["far"]["similarity_score"] == pytest.approx(expected)
+        assert scores["far"]["vector_score"] == 0.5
+        assert "Common keywords: python" in scores["far"]["similarity_reasons"]
+
+    @pytest.mark.asyncio
+    async def test_searches_further_when_linked_chunks_fill_the_page(
+        self, database_service, notes, vector_store
+    ):
+        hits = [vector_hit(f"note_linked#{i}", "linked", 0.9) for i in range(20)]
+        hits += [vector_hit("note_near", "near", 0.8), vector_hit("note_far", "far", 0.5)]
+
+        async def search_documents(embedding, n_results, where, include, max_results):
+            return hits[:n_results]
+
+        vector_store.search_documents = AsyncMock(side_effect=search_documents)
+        suggestor = LinkSuggestor(database_service, vector_store=vector_store)
+
+        suggestions = await suggestor.suggest_by_vector(
+            "src", max_suggestions=2, min_similarity=0.1
+        )
+
+        assert [s["note_id"] for s in suggestions] == ["near", "far"]
+        calls = vector_store.search_documents.call_args_list
+        assert [call.kwargs["n_results"] for call in calls] == [9, 36]
+        assert all(call.kwargs["max_results"] == call.kwargs["n_results"] for call in calls)
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_lexical_without_embedding(
+        self, database_service, notes, vector_store
+    ):
+        vector_store.get_documents.return_value = []
+        suggestor = LinkSuggestor(database_service, vector_store=vector_store)
+
+        suggestions = await suggestor.suggest_by_vector("src", min_similarity=0.0)
+
+        vector_store.search_documents.assert_not_called()
+        assert [s["note_id"] for s in suggestions] == ["far"]
@@ -0,0 +1,203 @@
+"""
+Tests for LLMCache and its use by the LLM call sites.
+"""
+
+import hashlib
+import tempfile
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.llm_cache import LLMCache, content_digest
+from src.nescordbot.services.note_processing import NoteProcessingService
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database with migrations applied."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/llm_cache.db")
+        await service.initialize()
+        yield service
+        await service.close()
+
+
+@pytest.fixture
+def config():
+    """Create config with small cache limits."""
+    config = MagicMock(spec=BotConfig)
+    config.llm_cache_enabled = True
+    config.llm_cache_ttl_seconds = 3600
+    config.llm_cache_max_entries = 3
+    config.llm_cache_max_bytes = 1024
+    return config
+
+
+@pytest.fixture
+def cache(config, database_service):
+    """Create LLMCache instance."""
+    return LLMCache(config, database_service)
+
+
+async def cached_keys(database_service):
+    """Return the stored cache keys."""
+    async with database_service.get_connection() as conn:
+        cursor = await conn.execute("SELECT cache_key FROM llm_cache")
+        return {row[0] for row in await cursor.fetchall()}
+
+
+class TestCacheKey:
+    """Test content-addressed keys."""
+
+    def test_key_is_stable_sha256(self):
+        expected = hashlib.sha256()
+        for part in (b"openai", b"gpt", b"1", b"hello"):
+            expected.update(f"{len(part)}:".encode())
+            expected.update(part)
+
+        assert LLMCache.make_key("openai", "gpt", "1", "hello") == expected.hexdigest()
+
+    def test_key_depends_on_every_part(self):
+        key = LLMCache.make_key("openai", "gpt", "1", {"messages": ["a"]})
+
+        assert key == LLMCache.make_key("openai", "gpt", "1", {"messages": ["a"]})
+        assert key != LLMCache.make_key("gemini", "gpt", "1", {"messages": ["a"]})
+        assert key != LLMCache.make_key("openai", "gpt", "2", {"messages": ["a"]})
+        assert key != LLMCache.make_key("openai", "gpt", "1", {"messages": ["b"]})
+        assert content_digest("ab", "c") != content_digest("a", "bc")
+
+
+class TestLLMCache:
+    """Test LLMCache storage behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_persists_responses(self, config, cache, database_service):
+        compute = AsyncMock(return_value={"text": "応答"})
+
+        first = await cache.get_or_compute("openai", "gpt", "1", "prompt", compute)
+        second = await cache.get_or_compute("openai", "gpt", "1", "prompt", compute)
+
+        assert first == second == {"text": "応答"}
+        compute.assert_awaited_once()
+
+        # A new instance, as after a restart, reads the stored response
+        restarted = LLMCache(config, database_service)
+        assert await restarted.get_or_compute("openai", "gpt", "1", "prompt", compute) == first
+        compute.assert_awaited_once()
+
+        stats = await cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["stores"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
+        assert stats["providers"] == {"openai": 1}
+
+    @pytest.mark.asyncio
+    async def test_none_and_errors_are_not_cached(self, cache, database_service):
+        assert await cache.get_or_compute("openai", "gpt", "1", "x", AsyncMock()) is not None
+
+        assert (
+            await cache.get_or_compute("openai", "gpt", "1", "y", AsyncMock(return_value=None))
+            is None
+        )
+        with pytest.raises(RuntimeError):
+            await cache.get_or_compute(
+                "openai", "gpt", "1", "z", AsyncMock(side_effect=RuntimeError("api down"))
+            )
+
+        assert len(await cached_keys(database_service)) == 0
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_misses(self, cache, database_service):
+        key = cache.make_key("openai", "gpt", "1", "prompt")
+        await cache.set(key, "old", "openai", "gpt", "1")
+        await cache.set("forever", "kept", "openai", "gpt", "1", ttl_seconds=0)
+
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "UPDATE llm_cache SET expires_at = '2000-01-01T00:00:00' WHERE cache_key = ?",
+                (key,),
+            )
+            await conn.commit()
+
+        assert await cache.get(key) is None
+        assert await cache.get("forever") == "kept"
+        assert await cached_keys(database_service) == {"forever"}
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, cache, database_service):
+        for key in ("a", "b", "c"):
+            await cache.set(key, key, "openai", "gpt", "1")
+        await cache.get("a")
+
+        await cache.set("d", "d", "openai", "gpt", "1")
+
+        assert await cached_keys(database_service) == {"a", "c", "d"}
+
+        # The byte cap applies as well as the entry cap
+        await cache.set("big", "x" * 1020, "openai", "gpt", "1")
+        assert await cached_keys(database_service) == {"big"}
+        assert (await cache.get_stats())["evictions"] == 4
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_always_computes(self, config, database_service):
+        config.llm_cache_enabled = False
+        cache = LLMCache(config, database_service)
+        compute = AsyncMock(return_value="fresh")
+
+        await cache.get_or_compute("openai", "gpt", "1", "prompt", compute)
+        await cache.get_or_compute("openai", "gpt", "1", "prompt", compute)
+
+        assert compute.await_count == 2
+        assert await cached_keys(database_service) == set()
+
+    @pytest.mark.asyncio
+    async def test_clear_by_provider(self, cache, database_service):
+        await cache.set("a", "a", "openai", "gpt", "1")
+        await cache.set("b", "b", "gemini", "flash", "1")
+
+        assert await cache.clear("openai") == 1
+        assert await cached_keys(database_service) == {"b"}
+
+    @pytest.mark.asyncio
+    async def test_hits_and_totals_avoid_table_writes(self, cache, database_service):
+        cache._recount = AsyncMock(wraps=cache._recount)
+        for key in ("a", "b"):
+            await cache.set(key, key, "openai", "gpt", "1")
+        await cache.set("a", "aaaa", "openai", "gpt", "1")
+
+        # Counted once, then tracked from the stores themselves
+        cache._recount.assert_awaited_once()
+        assert (cache._entries, cache._total_bytes) == (2, len('"aaaa"') + len('"b"'))
+
+        assert await cache.get("b") == "b"
+        assert await cache.get("b") == "b"
+
+        async def hit_count():
+            async with database_service.get_connection() as conn:
+                cursor = await conn.execute("SELECT hit_count FROM llm_cache WHERE cache_key = 'b'")
+                return (await cursor.fetchone())[0]
+
+        assert await hit_count() == 0
+        await cache.flush_access()
+        assert await hit_count() == 2
+
+
+class TestNoteProcessingCache:
+    """Test that note processing reuses cached completions."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_processing_calls_openai_once(self, cache):
+        service = NoteProcessingService(api_key="test-key", llm_cache=cache)
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = "整形済み"
+        service._call_openai_with_retry = AsyncMock(return_value=response)
+
+        first = await service.process_text("同じテキスト")
+        second = await service.process_text("同じテキスト")
+
+        assert first == second == {"processed": "整形済み", "summary": "整形済み"}
+        # One format and one summary request; the repeat is served from the cache
+        assert service._call_openai_with_retry.await_count == 2
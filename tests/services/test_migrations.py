@@ -17,12 +17,15 @@ import pytest
 from nescordbot.services.migrations import (
     CreateFTS5IndexMigration,
     CreateKnowledgeNotesMigration,
+    CreateMissingFTS5IndexMigration,
     CreateNoteLinksMigration,
     CreateTokenUsageMigration,
     DatabaseMigrationManager,
     ExtendTranscriptionsMigration,
     Migration,
     MigrationInfo,
+    PartitionKnowledgeNotesByGuildMigration,
+    fts5_available,
 )
 
 
@@ -415,9 +418,7 @@ class TestIndividualMigrations:
         migration = CreateFTS5IndexMigration()
 
         # Check if FTS5 is available (skip if not)
-        try:
-            await connection.execute("SELECT fts5_version()")
-        except aiosqlite.OperationalError:
+        if not await fts5_available(connection):
             pytest.skip("FTS5 not available in this SQLite build")
 
         await migration.up(connection)
@@ -456,6 +457,92 @@ class TestIndividualMigrations:
         assert result is not None
         assert result[0] == "Test Title"
 
+    @pytest.mark.asyncio
+    async def test_partition_notes_by_guild_migration(self, connection):
+        """Test guild index creation and FTS5 re-index with a guild_id column."""
+        knowledge_migration = CreateKnowledgeNotesMigration()
+        await knowledge_migration.up(connection)
+
+        # Existing FTS5 index as created by migration 005
+        try:
+            await connection.execute(
+                """
+                CREATE VIRTUAL TABLE knowledge_notes_fts USING fts5(
+                    title, content, tags, content=knowledge_notes, content_rowid=rowid
+                )
+            """
+            )
+        except aiosqlite.OperationalError:
+            pytest.skip("FTS5 not available in this SQLite build")
+
+        await connection.execute(
+            """
+            INSERT INTO knowledge_notes (id, title, content, user_id, guild_id)
+            VALUES ('n1', 'Guild One', 'shared search words', 'user1', 'g1'),
+                   ('n2', 'Guild Two', 'shared search words', 'user1', 'g2')
+        """
+        )
+
+        migration = PartitionKnowledgeNotesByGuildMigration()
+        await migration.up(connection)
+        await connection.commit()
+
+        cursor = await connection.execute(
+            """
+            SELECT name FROM sqlite_master
+            WHERE type='index' AND name='idx_knowledge_notes_guild_id'
+        """
+        )
+        assert await cursor.fetchone() is not None
+
+        # Existing rows were re-indexed and new rows are indexed by the triggers
+        await connection.execute(
+            """
+            INSERT INTO knowledge_notes (id, title, content, user_id, guild_id)
+            VALUES ('n3', 'Guild One Later', 'shared search words', 'user1', 'g1')
+        """
+        )
+        cursor = await connection.execute(
+            """
+            SELECT title FROM knowledge_notes_fts
+            WHERE knowledge_notes_fts MATCH 'guild_id:"g1" AND "search"'
+            ORDER BY rowid
+        """
+        )
+        rows = await cursor.fetchall()
+        assert [row[0] for row in rows] == ["Guild One", "Guild One Later"]
+
+        await migration.down(connection)
+        cursor = await connection.execute("PRAGMA table_info(knowledge_notes_fts)")
+        assert [col[1] for col in await cursor.fetchall()] == ["title", "content", "tags"]
+
+    @pytest.mark.asyncio
+    async def test_create_missing_fts5_migration(self, connection):
+        """Test that the FTS5 index is created and filled when migration 005 skipped it."""
+        if not await fts5_available(connection):
+            pytest.skip("FTS5 not available in this SQLite build")
+
+        await CreateKnowledgeNotesMigration().up(connection)
+        await connection.execute(
+            """
+            INSERT INTO knowledge_notes (id, title, content, user_id, guild_id)
+            VALUES ('n1', 'Existing', 'indexed search words', 'user1', 'g1')
+        """
+        )
+
+        migration = CreateMissingFTS5IndexMigration()
+        await migration.up(connection)
+        # An existing index is left alone
+        await migration.up(connection)
+
+        cursor = await connection.execute(
+            """
+            SELECT title FROM knowledge_notes_fts
+            WHERE knowledge_notes_fts MATCH 'guild_id:"g1" AND "search"'
+        """
+        )
+        assert [row[0] for row in await cursor.fetchall()] == ["Existing"]
+
 
 class TestDatabaseServiceIntegration:
     """Integration tests for DatabaseService with migrations."""
@@ -480,7 +567,7 @@ class TestDatabaseServiceIntegration:
         await cursor.close()
 
         # Should have applied 7 migrations (including Migration 007: note_history)
-        assert result[0] == 8
+        assert result[0] == 19
 
         # Check new tables exist
         cursor = await service.connection.execute(
@@ -511,9 +598,7 @@ class TestDatabaseServiceIntegration:
         await service.initialize()
 
         # Skip if FTS5 not available
-        try:
-            await service.connection.execute("SELECT fts5_version()")
-        except aiosqlite.OperationalError:
+        if not await fts5_available(service.connection):
             pytest.skip("FTS5 not available in this SQLite build")
 
         # Insert test data
@@ -652,8 +737,8 @@ class TestMigrationEdgeCases:
         """Test migration on completely empty database."""
         result = await migration_manager.migrate_to_latest()
 
-        assert result["applied"] == 8  # All 8 migrations applied (updated from 7 to 8)
-        assert result["current_version"] == 8  # Updated from 7 to 8
+        assert result["applied"] == 19  # All 19 migrations applied (updated from 18 to 19)
+        assert result["current_version"] == 19  # Updated from 18 to 19
 
     @pytest.mark.asyncio
     async def test_already_migrated_database(self, migration_manager):
@@ -665,7 +750,7 @@ class TestMigrationEdgeCases:
         result = await migration_manager.migrate_to_latest()
 
         assert result["applied"] == 0  # No new migrations
-        assert result["current_version"] == 8  # Updated from 7 to 8 (Migration 008 added)
+        assert result["current_version"] == 19  # Updated from 18 to 19 (Migration 019 added)
 
     @pytest.mark.asyncio
     async def test_partial_migration_rollback(self, migration_manager):
@@ -676,9 +761,7 @@ class TestMigrationEdgeCases:
         # Rollback to version 3
         result = await migration_manager.rollback_to_version(3)
 
-        assert (
-            result["rolled_back"] == 5
-        )  # Versions 4, 5, 6, 7, and 8 rolled back (updated from 4 to 5)
+        assert result["rolled_back"] == 16  # Versions 4 through 19 rolled back (was 15)
         assert result["current_version"] == 3
 
     @pytest.mark.asyncio
@@ -695,12 +778,12 @@ class TestMigrationEdgeCases:
         status = await migration_manager.get_migration_status()
 
         assert status["current_version"] == 3
-        assert status["latest_version"] == 8  # Updated from 7 to 8 (Migration 008 added)
+        assert status["latest_version"] == 19  # Updated from 18 to 19 (Migration 019 added)
         assert status["applied_migrations"] == 3
-        assert status["pending_migrations"] == 5  # Updated from 4 to 5 (one more pending migration)
+        assert status["pending_migrations"] == 16  # Updated from 15 to 16 (one more pending)
         assert status["integrity_valid"] is True
         assert len(status["migrations"]["applied"]) == 3
-        assert len(status["migrations"]["pending"]) == 5  # Updated from 4 to 5
+        assert len(status["migrations"]["pending"]) == 16  # Updated from 15 to 16
 
 
 @pytest.mark.asyncio
@@ -711,15 +794,11 @@ async def test_fts5_availability():
 
     try:
         async with aiosqlite.connect(db_path) as connection:
-            try:
-                await connection.execute("SELECT fts5_version()")
-                fts5_available = True
-            except aiosqlite.OperationalError:
-                fts5_available = False
+            available = await fts5_available(connection)
 
         # This test documents FTS5 availability but doesn't fail
         # if FTS5 is not available in the test environment
-        print(f"FTS5 available: {fts5_available}")
+        print(f"FTS5 available: {available}")
 
     finally:
         Path(db_path).unlink(missing_ok=True)
@@ -0,0 +1,218 @@
+"""
+Tests for the delta-compressed note history.
+"""
+
+import asyncio
+import json
+import tempfile
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.knowledge_manager import KnowledgeManager
+from src.nescordbot.services.migrations import CompactNoteHistoryMigration
+from src.nescordbot.services.note_history import apply_delta, make_delta, pack, unpack
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database with migrations applied."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/history.db")
+        await service.initialize()
+        yield service
+        await service.close()
+
+
+@pytest.fixture
+def knowledge_manager(database_service):
+    """Create a KnowledgeManager with a short snapshot interval."""
+    config = MagicMock(spec=BotConfig)
+    config.github_obsidian_enabled = False
+    config.note_history_snapshot_interval = 3
+    return KnowledgeManager(config, database_service, AsyncMock(), AsyncMock(), AsyncMock(), None)
+
+
+def long_content(version):
+    """Long note content where each version changes one line."""
+    return "".join(f"line {i}: {'edited ' * (i == version)}text\n" for i in range(200))
+
+
+async def history_rows(database_service):
+    """Return (version, is_snapshot, content_after) of all history rows."""
+    async with database_service.get_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT version, is_snapshot, content_after FROM note_history ORDER BY version"
+        )
+        return await cursor.fetchall()
+
+
+class TestDelta:
+    """Test delta encoding of note states."""
+
+    def test_roundtrip(self):
+        source = {"title": "Old", "content": "a\nb\nc\nd", "tags": ["x"]}
+        target = {"title": "Old", "content": "a\nB\nc\nd\ne\n", "tags": ["x", "y"]}
+
+        delta = make_delta(source, target)
+
+        assert "title" not in delta
+        assert delta["tags"] == ["x", "y"]
+        assert apply_delta(source, delta) == target
+        assert apply_delta(target, make_delta(target, source)) == source
+        assert make_delta(source, source) == {}
+
+    def test_delta_stores_only_changed_lines(self):
+        source = {"title": "T", "content": long_content(-1), "tags": []}
+        target = {"title": "T", "content": long_content(100), "tags": []}
+
+        packed = pack(make_delta(source, target))
+
+        assert len(packed) < 100
+        assert apply_delta(source, unpack(packed)) == target
+
+
+class TestKnowledgeManagerHistory:
+    """Test history written and read through KnowledgeManager."""
+
+    @pytest.mark.asyncio
+    async def test_versions_rebuild_across_snapshots(self, knowledge_manager, database_service):
+        await knowledge_manager.initialize()
+        note_id = await knowledge_manager.create_note(
+            "Title 0", long_content(0), tags=["a"], user_id="user_1"
+        )
+        for version in range(1, 8):
+            await knowledge_manager.update_note(
+                note_id, title=f"Title {version}", content=long_content(version), user_id="user_1"
+            )
+
+        # Head and every third version keep full snapshots; the rest are deltas
+        rows = await history_rows(database_service)
+        assert [(v, s) for v, s, _ in rows] == [
+            (1, 0),
+            (2, 0),
+            (3, 1),
+            (4, 0),
+            (5, 0),
+            (6, 1),
+            (7, 1),
+        ]
+        assert all(content is None for _, _, content in rows)
+
+        for version in range(8):
+            state = await knowledge_manager.get_note_version(note_id, version)
+            assert state["version"] == version
+            assert state["title"] == f"Title {version}"
+            assert state["content"] == long_content(version)
+            assert state["tags"] == ["a"]
+
+        assert await knowledge_manager.get_note_version(note_id, 8) is None
+        assert await knowledge_manager.get_note_version(note_id, -1) is None
+
+        history = await knowledge_manager.get_note_history(note_id, limit=7)
+        assert [item["version"] for item in history] == [7, 6, 5, 4, 3, 2, 1]
+        for item in history:
+            assert item["content_before"] == long_content(item["version"] - 1)
+            assert item["content_after"] == long_content(item["version"])
+            assert item["changes"]["title"]["after"] == f"Title {item['version']}"
+
+    @pytest.mark.asyncio
+    async def test_untracked_edits_between_versions(self, knowledge_manager):
+        await knowledge_manager.initialize()
+        note_id = await knowledge_manager.create_note("Draft", "one\n", user_id="user_1")
+
+        assert (await knowledge_manager.get_note_version(note_id, 0))["title"] == "Draft"
+
+        await knowledge_manager.update_note(note_id, content="two\n", user_id="user_1")
+        await knowledge_manager.update_note(note_id, content="three\n")
+        await knowledge_manager.update_note(note_id, content="four\n", user_id="user_1")
+
+        assert [
+            (await knowledge_manager.get_note_version(note_id, version))["content"]
+            for version in range(3)
+        ] == ["one\n", "two\n", "four\n"]
+
+        history = await knowledge_manager.get_note_history(note_id)
+        assert history[0]["content_before"] == "three\n"
+        assert history[1]["content_after"] == "two\n"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_edits_get_consecutive_versions(self, knowledge_manager):
+        await knowledge_manager.initialize()
+        note_id = await knowledge_manager.create_note("Title", "zero\n", user_id="user_1")
+
+        await asyncio.gather(
+            *(
+                knowledge_manager.update_note(note_id, title=f"Title {i}", user_id="user_1")
+                for i in range(1, 6)
+            )
+        )
+
+        history = await knowledge_manager.get_note_history(note_id)
+        assert [item["version"] for item in history] == [5, 4, 3, 2, 1]
+        for version in range(6):
+            assert await knowledge_manager.get_note_version(note_id, version) is not None
+
+
+class TestCompactNoteHistoryMigration:
+    """Test conversion of full-copy history rows."""
+
+    @pytest.mark.asyncio
+    async def test_compacts_legacy_rows(self, knowledge_manager, database_service):
+        await knowledge_manager.initialize()
+        note_id = await knowledge_manager.create_note("v0", "body 0\n", user_id="user_1")
+
+        async with database_service.get_connection() as conn:
+            for version in range(1, 4):
+                await conn.execute(
+                    """
+                    INSERT INTO note_history (
+                        note_id, title_before, content_before, tags_before,
+                        title_after, content_after, tags_after, user_id, timestamp
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, 'user_1', ?)
+                    """,
+                    (
+                        note_id,
+                        f"v{version - 1}",
+                        f"body {version - 1}\n",
+                        json.dumps(["old"]),
+                        f"v{version}",
+                        f"body {version}\n",
+                        json.dumps(["new"]),
+                        f"2024-01-0{version}",
+                    ),
+                )
+
+            migration = CompactNoteHistoryMigration()
+            await migration.up(conn)
+            await conn.commit()
+
+        rows = await history_rows(database_service)
+        assert [(v, s, c) for v, s, c in rows] == [(1, 0, None), (2, 0, None), (3, 1, None)]
+
+        history = await knowledge_manager.get_note_history(note_id)
+        assert [(h["title_before"], h["title_after"]) for h in history] == [
+            ("v2", "v3"),
+            ("v1", "v2"),
+            ("v0", "v1"),
+        ]
+        assert history[2]["tags_before"] == ["old"]
+        assert (await knowledge_manager.get_note_version(note_id, 0))["content"] == "body 0\n"
+
+        # Rolling back restores the full copies and a re-run compacts them again
+        async with database_service.get_connection() as conn:
+            await migration.down(conn)
+            await conn.commit()
+        rows = await history_rows(database_service)
+        assert [(v, c) for v, _, c in rows] == [
+            (None, "body 1\n"),
+            (None, "body 2\n"),
+            (None, "body 3\n"),
+        ]
+
+        async with database_service.get_connection() as conn:
+            await migration.up(conn)
+            await conn.commit()
+        assert (await knowledge_manager.get_note_version(note_id, 2))["title"] == "v2"
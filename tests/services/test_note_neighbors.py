@@ -0,0 +1,265 @@
+"""
+Tests for the precomputed note_neighbors table.
+"""
+
+import math
+import tempfile
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.link_suggestor import LinkSuggestor
+from src.nescordbot.services.note_neighbors import NoteNeighborIndex
+from src.nescordbot.services.vector_store import (
+    DocumentMetadata,
+    SearchResult,
+    StoredDocument,
+    VectorStore,
+)
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database with migrations applied."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/neighbors.db")
+        await service.initialize()
+        async with service.get_connection() as conn:
+            await conn.execute(
+                """
+                CREATE TABLE sync_metadata (
+                    note_id TEXT PRIMARY KEY,
+                    sync_status TEXT DEFAULT 'pending',
+                    embedding_hash TEXT
+                )
+                """
+            )
+            await conn.commit()
+        yield service
+        await service.close()
+
+
+@pytest.fixture
+def angles():
+    """Embedding of each note as an angle in degrees; similarity is the cosine."""
+    return {"a": 0.0, "b": 10.0, "c": 30.0, "d": 80.0}
+
+
+@pytest.fixture
+def vector_store(angles):
+    """Vector store searching the embeddings described by angles."""
+
+    def embedding(note_id):
+        radians = math.radians(angles[note_id])
+        return [math.cos(radians), math.sin(radians)]
+
+    async def get_documents(doc_ids, include=None):
+        note_id = doc_ids[0][len("note_") :]
+        return [
+            StoredDocument(
+                document_id=doc_ids[0],
+                metadata=DocumentMetadata(document_id=note_id),
+                embedding=embedding(note_id),
+            )
+        ]
+
+    async def search_documents(query, n_results=10, where=None, include=None, max_results=None):
+        hits = [
+            SearchResult(
+                document_id=f"note_{note_id}",
+                content="",
+                score=sum(x * y for x, y in zip(query, embedding(note_id))),
+                metadata=DocumentMetadata(document_id=note_id),
+            )
+            for note_id in angles
+        ]
+        hits.sort(key=lambda hit: hit.score, reverse=True)
+        return hits[:n_results]
+
+    store = MagicMock(spec=VectorStore)
+    store.get_documents = AsyncMock(side_effect=get_documents)
+    store.search_documents = AsyncMock(side_effect=search_documents)
+    return store
+
+
+@pytest.fixture
+async def notes(database_service, angles):
+    """Synced notes a to d."""
+    async with database_service.get_connection() as conn:
+        for note_id, angle in angles.items():
+            await conn.execute(
+                """
+                INSERT INTO knowledge_notes (id, title, content, tags, user_id, guild_id)
+                VALUES (?, ?, ?, '["tag"]', 'user_1', 'guild_1')
+                """,
+                (note_id, f"Note {note_id}", f"content {note_id}"),
+            )
+            await conn.execute(
+                "INSERT INTO sync_metadata VALUES (?, 'synced', ?)", (note_id, f"hash_{angle}")
+            )
+        await conn.commit()
+
+
+@pytest.fixture
+def neighbor_index(database_service, vector_store):
+    """Create a NoteNeighborIndex keeping two neighbours per note."""
+    config = MagicMock(spec=BotConfig)
+    config.note_neighbors_k = 2
+    return NoteNeighborIndex(config, database_service, vector_store)
+
+
+async def neighbor_ids(index, note_id):
+    """IDs of a note's stored neighbours, most related first."""
+    return [note["id"] for note in await index.get_neighbors(note_id, limit=10)]
+
+
+async def change_embedding(database_service, angles, note_id, angle):
+    """Move a note's embedding and record the new hash as the sync would."""
+    angles[note_id] = angle
+    async with database_service.get_connection() as conn:
+        await conn.execute(
+            "UPDATE sync_metadata SET embedding_hash = ? WHERE note_id = ?",
+            (f"hash_{angle}", note_id),
+        )
+        await conn.commit()
+
+
+class TestNoteNeighborIndex:
+    """Test building and reading the neighbour table."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_builds_top_k(self, neighbor_index, vector_store, notes):
+        assert await neighbor_index.refresh() == 4
+
+        assert await neighbor_ids(neighbor_index, "a") == ["b", "c"]
+        assert await neighbor_ids(neighbor_index, "d") == ["c", "b"]
+
+        related = await neighbor_index.get_neighbors("a", limit=1)
+        assert related[0]["title"] == "Note b"
+        assert related[0]["tags"] == ["tag"]
+        assert related[0]["score"] == pytest.approx(math.cos(math.radians(10)))
+        assert vector_store.search_documents.call_args.kwargs["where"] == {"guild_id": "guild_1"}
+
+        # Nothing changed, so nothing is queried again
+        vector_store.search_documents.reset_mock()
+        assert await neighbor_index.refresh() == 0
+        vector_store.search_documents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_changed_note_refreshes_affected_neighbourhoods(
+        self, neighbor_index, vector_store, database_service, angles, notes
+    ):
+        await neighbor_index.refresh()
+        await change_embedding(database_service, angles, "d", 3.0)
+        vector_store.search_documents.reset_mock()
+
+        assert await neighbor_index.refresh() == 1
+
+        # d is listed by no note, so only d itself is queried
+        assert vector_store.search_documents.await_count == 1
+        assert await neighbor_ids(neighbor_index, "d") == ["a", "b"]
+        assert await neighbor_ids(neighbor_index, "a") == ["d", "b"]
+        assert await neighbor_ids(neighbor_index, "b") == ["d", "a"]
+        assert await neighbor_ids(neighbor_index, "c") == ["b", "d"]
+
+        # Moving b away re-queries b and every note that listed it
+        await change_embedding(database_service, angles, "b", 90.0)
+        vector_store.search_documents.reset_mock()
+
+        assert await neighbor_index.refresh() == 1
+
+        assert vector_store.search_documents.await_count == 4
+        assert await neighbor_ids(neighbor_index, "a") == ["d", "c"]
+        assert await neighbor_ids(neighbor_index, "b") == ["c", "d"]
+
+    @pytest.mark.asyncio
+    async def test_affected_notes_beyond_the_batch_are_deferred(
+        self, neighbor_index, vector_store, database_service, angles, notes
+    ):
+        await neighbor_index.refresh()
+        neighbor_index.batch_size = 1
+        await change_embedding(database_service, angles, "b", 90.0)
+        vector_store.search_documents.reset_mock()
+
+        # b is listed by a, c and d; only b and one of them are queried now
+        assert await neighbor_index.refresh() == 1
+        assert vector_store.search_documents.await_count == 2
+        assert vector_store.search_documents.call_args.kwargs["max_results"] == 9
+
+        while await neighbor_index.refresh():
+            pass
+
+        assert await neighbor_ids(neighbor_index, "a") == ["c", "d"]
+        assert await neighbor_ids(neighbor_index, "b") == ["d", "c"]
+        assert await neighbor_ids(neighbor_index, "c") == ["a", "d"]
+        assert await neighbor_ids(neighbor_index, "d") == ["b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_note_without_embedding_is_retried(
+        self, neighbor_index, vector_store, database_service, angles, notes
+    ):
+        await neighbor_index.refresh()
+        get_documents = vector_store.get_documents.side_effect
+
+        async def without_d(doc_ids, include=None):
+            return [] if doc_ids == ["note_d"] else await get_documents(doc_ids, include)
+
+        vector_store.get_documents.side_effect = without_d
+        await change_embedding(database_service, angles, "d", 3.0)
+
+        assert await neighbor_index.refresh() == 0
+        assert await neighbor_ids(neighbor_index, "d") == []
+
+        vector_store.get_documents.side_effect = get_documents
+        assert await neighbor_index.refresh() == 1
+        assert await neighbor_ids(neighbor_index, "d") == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_deleted_and_linked_notes_are_excluded(
+        self, neighbor_index, database_service, notes
+    ):
+        await neighbor_index.refresh()
+
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO note_links (from_note_id, to_note_id) VALUES ('c', 'a')"
+            )
+            await conn.execute("DELETE FROM knowledge_notes WHERE id = 'b'")
+            await conn.commit()
+
+            cursor = await conn.execute(
+                "SELECT COUNT(*) FROM note_neighbors WHERE note_id = 'b' OR neighbor_id = 'b'"
+            )
+            assert (await cursor.fetchone())[0] == 0
+
+        assert await neighbor_ids(neighbor_index, "a") == ["c"]
+        assert await neighbor_index.get_neighbors("a", exclude_linked=True) == []
+
+    @pytest.mark.asyncio
+    async def test_link_suggestions_read_precomputed_neighbours(
+        self, neighbor_index, vector_store, database_service, notes
+    ):
+        await neighbor_index.refresh()
+        vector_store.search_documents.reset_mock()
+        suggestor = LinkSuggestor(
+            database_service, vector_store=vector_store, neighbor_index=neighbor_index
+        )
+
+        suggestions = await suggestor.suggest_by_vector("d", max_suggestions=2, min_similarity=0.0)
+
+        vector_store.search_documents.assert_not_called()
+        assert [s["note_id"] for s in suggestions] == ["c", "b"]
+
+        # A linked neighbour leaves the full list short, so the store is searched
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO note_links (from_note_id, to_note_id) VALUES ('d', 'c')"
+            )
+            await conn.commit()
+
+        suggestions = await suggestor.suggest_by_vector("d", max_suggestions=2, min_similarity=0.0)
+
+        vector_store.search_documents.assert_awaited_once()
+        assert [s["note_id"] for s in suggestions] == ["b", "a"]
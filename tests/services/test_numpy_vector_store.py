@@ -0,0 +1,200 @@
+"""
+Tests for NumpyVectorStore.
+"""
+
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.numpy_vector_store import NumpyVectorStore, NumpyVectorStoreError
+from src.nescordbot.services.vector_store import DocumentMetadata, VectorStore
+
+
+@pytest.fixture
+def test_config():
+    """Create test configuration with a temporary persist directory."""
+    temp_dir = tempfile.mkdtemp()
+    yield BotConfig(
+        discord_token="Bot TEST_TOKEN_FOR_TESTING",
+        openai_api_key="sk-test-key",
+        chromadb_persist_directory=temp_dir,
+        chromadb_collection_name="test_collection",
+        vector_store_backend="numpy",
+        max_search_results=10,
+    )
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _vector(index: int, dimension: int = 16) -> list:
+    """Deterministic unit-ish vector peaked at one component."""
+    vector = np.full(dimension, 0.01, dtype=np.float32)
+    vector[index % dimension] = 1.0
+    return vector.tolist()
+
+
+def _documents(count: int):
+    return [
+        (
+            f"doc-{i}",
+            f"Content {i}",
+            _vector(i),
+            DocumentMetadata(
+                document_id=f"note-{i}", source="voice" if i % 2 else "text", chunk_index=i
+            ),
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+async def store(test_config):
+    """Create an initialized NumpyVectorStore."""
+    store = NumpyVectorStore(test_config)
+    await store.initialize()
+    yield store
+    if store._initialized:
+        await store.close()
+
+
+class TestNumpyVectorStore:
+    """Test NumpyVectorStore operations."""
+
+    def test_implements_vector_store(self, test_config):
+        """Test that the backend is a VectorStore."""
+        assert isinstance(NumpyVectorStore(test_config), VectorStore)
+
+    @pytest.mark.asyncio
+    async def test_add_and_search(self, store):
+        """Test exact top-k search over added documents."""
+        assert await store.add_documents_batch(_documents(8)) == 8
+
+        results = await store.search_documents(query_embedding=_vector(3), n_results=3)
+
+        assert results[0].document_id == "doc-3"
+        assert results[0].content == "Content 3"
+        assert results[0].metadata.document_id == "note-3"
+        assert results[0].score > results[1].score
+        assert len(results) == 3
+
+        ids_only = await store.search_documents(_vector(3), n_results=1, include=())
+        assert ids_only[0].document_id == "doc-3"
+        assert ids_only[0].content == ""
+        assert ids_only[0].metadata.document_id == ""
+
+    @pytest.mark.asyncio
+    async def test_max_results_overrides_configured_cap(self, store):
+        """Test that over-fetching callers can exceed max_search_results."""
+        await store.add_documents_batch(_documents(16))
+
+        assert len(await store.search_documents(_vector(0), n_results=15)) == 10
+        assert len(await store.search_documents(_vector(0), n_results=15, max_results=15)) == 15
+
+    @pytest.mark.asyncio
+    async def test_metadata_filtering(self, store):
+        """Test where filters over the columnar metadata table."""
+        await store.add_documents_batch(_documents(8))
+
+        results = await store.search_documents(
+            query_embedding=_vector(2), n_results=8, where={"source": "voice"}
+        )
+        assert {r.document_id for r in results} == {"doc-1", "doc-3", "doc-5", "doc-7"}
+
+        assert await store.count_where({"source": "text"}) == 4
+        assert await store.count_where({"chunk_index": {"$gte": 6}}) == 2
+        assert (
+            await store.count_where(
+                {"$or": [{"source": "voice"}, {"document_id": {"$in": ["note-0", "note-2"]}}]}
+            )
+            == 6
+        )
+        with pytest.raises(NumpyVectorStoreError):
+            await store.count_where({"chunk_index": {"$like": 1}})
+
+    @pytest.mark.asyncio
+    async def test_add_ignores_existing_and_upsert_replaces(self, store):
+        """Test add vs upsert semantics for existing IDs."""
+        await store.add_documents_batch(_documents(2))
+        await store.add_document("doc-0", "Ignored", _vector(5))
+        await store.upsert_documents_batch([("doc-1", "Replaced", _vector(5), None)])
+
+        stored = {
+            doc.document_id: doc
+            for doc in await store.get_documents(["doc-0", "doc-1", "missing"], ("documents",))
+        }
+        assert stored["doc-0"].content == "Content 0"
+        assert stored["doc-1"].content == "Replaced"
+        assert await store.get_document_count() == 2
+
+        results = await store.search_documents(query_embedding=_vector(5), n_results=1)
+        assert results[0].document_id == "doc-1"
+
+    @pytest.mark.asyncio
+    async def test_update_and_delete(self, store):
+        """Test updates and tombstone deletes."""
+        await store.add_documents_batch(_documents(4))
+
+        assert await store.update_document("doc-0", content="Updated")
+        assert not await store.update_document("missing", content="Updated")
+        assert await store.delete_documents_batch(["doc-1", "doc-2", "missing"]) == 3
+
+        page = await store.list_documents(limit=10, include=("documents",))
+        assert [doc.document_id for doc in page] == ["doc-3", "doc-0"]
+        assert page[1].content == "Updated"
+        assert await store.list_document_ids(limit=1, offset=1) == ["doc-0"]
+
+        results = await store.search_documents(query_embedding=_vector(1), n_results=4)
+        assert {r.document_id for r in results} == {"doc-0", "doc-3"}
+
+    @pytest.mark.asyncio
+    async def test_compaction_and_reload(self, test_config, store):
+        """Test that compaction keeps live rows and the store reloads from disk."""
+        store.compaction_min_rows = 3
+        store.COMPACTION_CHUNK_ROWS = 2
+        await store.add_documents_batch(_documents(6))
+        await store.delete_documents_batch(["doc-0", "doc-1", "doc-2"])
+
+        # Compaction switched to a new generation without tombstones
+        assert store._generation == 1
+        assert store._tombstones == 0
+        assert await store.get_document_count() == 3
+        # Live vectors were copied in chunks, each to its own row
+        for i in range(3, 6):
+            results = await store.search_documents(query_embedding=_vector(i), n_results=1)
+            assert results[0].document_id == f"doc-{i}"
+
+        await store.upsert_documents_batch([("doc-9", "Late", _vector(9), None)])
+        await store.close()
+
+        reloaded = NumpyVectorStore(test_config)
+        await reloaded.initialize()
+        assert await reloaded.get_document_count() == 4
+        results = await reloaded.search_documents(query_embedding=_vector(4), n_results=1)
+        assert results[0].document_id == "doc-4"
+        stored = await reloaded.get_documents(["doc-9"], include=("embeddings",))
+        assert stored[0].embedding is not None and len(stored[0].embedding) == 16
+        assert not list(reloaded.persist_dir.glob("*.0.*"))
+        await reloaded.close()
+
+    @pytest.mark.asyncio
+    async def test_capacity_growth(self, store):
+        """Test that the memory-mapped matrix grows past its initial capacity."""
+        store.INITIAL_CAPACITY = 4
+        await store.add_documents_batch(_documents(10))
+
+        assert len(store._vectors) >= 10
+        results = await store.search_documents(query_embedding=_vector(9), n_results=1)
+        assert results[0].document_id == "doc-9"
+
+    @pytest.mark.asyncio
+    async def test_reset_and_dimension_check(self, store):
+        """Test reset and rejection of too-short vectors."""
+        await store.add_documents_batch(_documents(3))
+        assert await store.reset_collection()
+        assert await store.get_document_count() == 0
+        assert await store.search_documents(query_embedding=_vector(0)) == []
+
+        with pytest.raises(NumpyVectorStoreError):
+            await store.add_document("short", "Too short", [0.1, 0.2])
@@ -0,0 +1,205 @@
+"""
+Tests for ReindexJobManager.
+"""
+
+import asyncio
+import tempfile
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.reindex_jobs import (
+    ReindexJobError,
+    ReindexJobManager,
+    ReindexJobStatus,
+)
+from src.nescordbot.services.sync_manager import SyncManager
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database with migrations applied."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/reindex.db")
+        await service.initialize()
+        async with service.get_connection() as conn:
+            for i in range(7):
+                await conn.execute(
+                    "INSERT INTO knowledge_notes (id, title, content, user_id) VALUES (?, ?, ?, ?)",
+                    (f"note_{i:02d}", f"Note {i}", f"Content {i}", "user_1"),
+                )
+            await conn.commit()
+        yield service
+        await service.close()
+
+
+@pytest.fixture
+def config():
+    """Create config with small batches and no pacing."""
+    config = MagicMock(spec=BotConfig)
+    config.sync_batch_size = 10
+    config.reindex_batch_size = 3
+    config.reindex_target_rate = 0
+    config.reindex_min_rate_limit_headroom = 0.25
+    config.reindex_throttle_interval = 0.05
+    return config
+
+
+@pytest.fixture
+def embedding_service():
+    """Create an embedding service mock with spare rate limit headroom."""
+    embedding_service = MagicMock()
+    embedding_service.is_available = MagicMock(return_value=True)
+    embedding_service.get_rate_limit_headroom = MagicMock(return_value=1.0)
+    embedding_service.generate_embeddings_batch = AsyncMock(
+        side_effect=lambda texts: [MagicMock(embedding=[0.1] * 8) for _ in texts]
+    )
+    return embedding_service
+
+
+@pytest.fixture
+async def sync_manager(config, database_service, embedding_service):
+    """Create a SyncManager writing to a mocked vector store."""
+    chromadb_service = AsyncMock()
+    chromadb_service._initialized = True
+    chromadb_service.upsert_documents_batch = AsyncMock(side_effect=lambda docs: len(docs))
+    manager = SyncManager(config, database_service, chromadb_service, embedding_service)
+    await manager.init_async()
+    yield manager
+    await manager.close()
+
+
+@pytest.fixture
+async def reindex_jobs(config, database_service, sync_manager, embedding_service):
+    """Create ReindexJobManager instance."""
+    manager = ReindexJobManager(config, database_service, sync_manager, embedding_service)
+    yield manager
+    await manager.shutdown()
+
+
+async def _wait(manager, job_id):
+    task = manager._tasks.get(job_id)
+    if task is not None:
+        await task
+    return await manager.get_job(job_id)
+
+
+def _batches(sync_manager):
+    return [call.args[0] for call in sync_manager.sync_notes_batch.call_args_list]
+
+
+class TestReindexJobManager:
+    """Test ReindexJobManager job lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_missing_mode_embeds_unsynced_notes(self, reindex_jobs, sync_manager):
+        """Test that a missing-mode job only processes notes that are not synced."""
+        await sync_manager.sync_notes_batch(["note_00", "note_01"])
+        sync_manager.sync_notes_batch = AsyncMock(wraps=sync_manager.sync_notes_batch)
+
+        job = await reindex_jobs.start_job(ReindexJobManager.MISSING, created_by="admin")
+        assert job.total_notes == 5
+
+        job = await _wait(reindex_jobs, job.job_id)
+        assert job.status == ReindexJobStatus.COMPLETED
+        assert job.processed == 5 and job.failed == 0
+        assert job.cursor == "note_06"
+        assert job.completed_at is not None
+        assert _batches(sync_manager) == [["note_02", "note_03", "note_04"], ["note_05", "note_06"]]
+
+    @pytest.mark.asyncio
+    async def test_full_mode_forces_reembedding(self, reindex_jobs, sync_manager):
+        """Test that a full job re-embeds notes that are already synced."""
+        await sync_manager.sync_notes_batch([f"note_{i:02d}" for i in range(7)])
+        sync_manager.embedding.generate_embeddings_batch.reset_mock()
+
+        job = await reindex_jobs.start_job(ReindexJobManager.FULL)
+        job = await _wait(reindex_jobs, job.job_id)
+
+        assert job.processed == 7
+        texts = sum(
+            len(call.args[0])
+            for call in sync_manager.embedding.generate_embeddings_batch.call_args_list
+        )
+        assert texts == 7
+
+    @pytest.mark.asyncio
+    async def test_pause_and_resume_from_checkpoint(self, reindex_jobs, sync_manager):
+        """Test that a paused job continues after its last checkpoint."""
+        sync_manager.sync_notes_batch = AsyncMock(wraps=sync_manager.sync_notes_batch)
+        reindex_jobs.target_rate = 1.0  # Wait ~3s after the first batch
+
+        job = await reindex_jobs.start_job()
+        while sync_manager.sync_notes_batch.await_count == 0:
+            await asyncio.sleep(0.01)
+
+        job = await reindex_jobs.pause_job(job.job_id)
+        assert job.status == ReindexJobStatus.PAUSED
+        assert job.processed == 3 and job.cursor == "note_02"
+        assert not reindex_jobs.is_running(job.job_id)
+
+        with pytest.raises(ReindexJobError):
+            await reindex_jobs.start_job()
+
+        reindex_jobs.target_rate = 0
+        job = await reindex_jobs.resume_job(job.job_id)
+        job = await _wait(reindex_jobs, job.job_id)
+
+        assert job.status == ReindexJobStatus.COMPLETED
+        assert job.processed == 7
+        assert [note for batch in _batches(sync_manager) for note in batch] == [
+            f"note_{i:02d}" for i in range(7)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_interrupted_job_resumes_on_startup(
+        self, reindex_jobs, sync_manager, database_service
+    ):
+        """Test that a job left running by a previous process is restarted."""
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                """
+                INSERT INTO reindex_jobs (mode, status, cursor, total_notes, processed)
+                VALUES ('full', 'running', 'note_03', 7, 4)
+                """
+            )
+            await conn.commit()
+        sync_manager.sync_notes_batch = AsyncMock(wraps=sync_manager.sync_notes_batch)
+
+        assert await reindex_jobs.resume_interrupted_jobs() == [1]
+        job = await _wait(reindex_jobs, 1)
+
+        assert job.status == ReindexJobStatus.COMPLETED
+        assert job.processed == 7
+        assert _batches(sync_manager) == [["note_04", "note_05", "note_06"]]
+
+    @pytest.mark.asyncio
+    async def test_cancel_job(self, reindex_jobs):
+        """Test cancelling an active job."""
+        reindex_jobs.target_rate = 0.1
+
+        job = await reindex_jobs.start_job()
+        job = await reindex_jobs.cancel_job(job.job_id)
+
+        assert job.status == ReindexJobStatus.CANCELLED
+        assert job.processed < 7
+        with pytest.raises(ReindexJobError):
+            await reindex_jobs.resume_job(job.job_id)
+        with pytest.raises(ReindexJobError):
+            await reindex_jobs.cancel_job(job.job_id)
+
+    @pytest.mark.asyncio
+    async def test_throttles_when_rate_limit_is_tight(self, reindex_jobs, embedding_service):
+        """Test that the job waits while embedding headroom is low."""
+        embedding_service.get_rate_limit_headroom.return_value = 0.1
+
+        job = await reindex_jobs.start_job()
+        progress = reindex_jobs.get_progress(job)
+        assert progress["running"] is True
+        assert progress["total_notes"] == 7
+
+        job = await _wait(reindex_jobs, job.job_id)
+        assert job.status == ReindexJobStatus.COMPLETED
+        assert embedding_service.get_rate_limit_headroom.call_count == 3
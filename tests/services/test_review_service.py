@@ -10,6 +10,7 @@ from src.nescordbot.config import BotConfig
 from src.nescordbot.services.database import DatabaseService
 from src.nescordbot.services.knowledge_manager import KnowledgeManager
 from src.nescordbot.services.review_service import ReviewService, ReviewServiceError
+from src.nescordbot.services.tag_vocabulary import TagVocabulary
 
 
 class TestReviewService:
@@ -47,6 +48,7 @@ class TestReviewService:
         km = AsyncMock(spec=KnowledgeManager)
         km._initialized = True
         km.initialize.return_value = None
+        km.tag_vocabulary = TagVocabulary()
         return km
 
     @pytest.fixture
@@ -239,11 +241,13 @@ class TestReviewService:
             (750,),  # total content length
         ]
 
-        # Mock tags query
+        # Mock tag counts query
         mock_cursor.__aiter__.return_value = iter(
             [
-                ('["python", "ai"]',),
-                ('["development", "testing"]',),
+                ("python", 1),
+                ("ai", 1),
+                ("development", 1),
+                ("testing", 1),
             ]
         )
 
@@ -269,12 +273,15 @@ class TestReviewService:
         mock_connection = mock_db.get_connection.return_value.__aenter__.return_value
         mock_cursor = AsyncMock()
 
-        # Mock tags query response
+        # Mock tag counts response; "Python" is a case variant of "python"
+        review_service.km.tag_vocabulary.add(["python", "ai"])
         mock_cursor.__aiter__.return_value = iter(
             [
-                ('["python", "ai"]',),
-                ('["python", "development"]',),
-                ('["ai", "machine-learning"]',),
+                ("Python", 1),
+                ("ai", 2),
+                ("development", 1),
+                ("machine-learning", 1),
+                ("python", 2),
             ]
         )
 
@@ -284,8 +291,8 @@ class TestReviewService:
 
         assert analysis["total_tags"] == 4
         assert len(analysis["top_tags"]) <= 10
-        # python appears twice, so it should be first
-        assert analysis["top_tags"][0] == ("python", 2)
+        # python appears three times across spellings, so it should be first
+        assert analysis["top_tags"][0] == ("python", 3)
 
     @pytest.mark.asyncio
     async def test_growth_insights(self, review_service):
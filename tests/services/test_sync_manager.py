@@ -7,6 +7,7 @@ consistency verification, and error handling functionality.
 
 import asyncio
 import tempfile
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List
 from unittest.mock import AsyncMock, MagicMock, patch
@@ -14,6 +15,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
 from src.nescordbot.config import BotConfig
+from src.nescordbot.services.chromadb_service import StoredDocument
 from src.nescordbot.services.database import DatabaseService
 from src.nescordbot.services.sync_manager import (
     ConsistencyReport,
@@ -67,6 +69,12 @@ class TestSyncManager:
         mock_embedding_result = MagicMock()
         mock_embedding_result.embedding = [0.1] * 384
         embedding_service.generate_embedding = AsyncMock(return_value=mock_embedding_result)
+        embedding_service.generate_embeddings_batch = AsyncMock(
+            side_effect=lambda texts: [mock_embedding_result for _ in texts]
+        )
+        chromadb_service.add_documents_batch = AsyncMock(side_effect=lambda docs: len(docs))
+        chromadb_service.upsert_documents_batch = AsyncMock(side_effect=lambda docs: len(docs))
+        chromadb_service.delete_documents_batch = AsyncMock(side_effect=lambda ids: len(ids))
 
         yield {
             "database": database_service,
@@ -246,8 +254,418 @@ class TestSyncManager:
             assert result.success is True
             assert result.status == SyncStatus.SYNCED
 
-        # Verify ChromaDB was called for each note
-        assert sync_manager.chromadb.add_document.call_count == 3
+        # Verify one batched embedding request and one ChromaDB batch write
+        sync_manager.embedding.generate_embeddings_batch.assert_called_once()
+        sync_manager.chromadb.upsert_documents_batch.assert_called_once()
+        documents = sync_manager.chromadb.upsert_documents_batch.call_args[0][0]
+        assert [doc[0] for doc in documents] == ["note_note_1", "note_note_2", "note_note_3"]
+        sync_manager.chromadb.add_document.assert_not_called()
+        sync_manager.chromadb.delete_documents_batch.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_sync_skips_unchanged_notes(self, sync_manager, sample_notes):
+        """Test that a repeated batch sync does not re-embed unchanged notes."""
+        await sync_manager.sync_notes_batch(["note_1", "note_2", "note_3"])
+        sync_manager.embedding.generate_embeddings_batch.reset_mock()
+        sync_manager.chromadb.upsert_documents_batch.reset_mock()
+
+        async with sync_manager.db.get_connection() as conn:
+            await conn.execute(
+                "UPDATE knowledge_notes SET content = ? WHERE id = ?", ("Edited", "note_2")
+            )
+            await conn.commit()
+
+        results = await sync_manager.sync_notes_batch(["note_1", "note_2", "note_3"])
+
+        assert all(result.success for result in results.values())
+        texts = sync_manager.embedding.generate_embeddings_batch.call_args[0][0]
+        assert len(texts) == 1 and "Edited" in texts[0]
+        documents = sync_manager.chromadb.upsert_documents_batch.call_args[0][0]
+        assert [doc[0] for doc in documents] == ["note_note_2"]
+        sync_manager.chromadb.delete_document.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_batch_sync_pipelines_multiple_batches(self, sync_manager, sample_notes):
+        """Test that large syncs are split into batches with one request per stage."""
+        async with sync_manager.db.get_connection() as conn:
+            for i in range(4, 26):
+                await conn.execute(
+                    "INSERT INTO knowledge_notes (id, title, content, user_id) VALUES (?, ?, ?, ?)",
+                    (f"note_{i}", f"Note {i}", f"Content {i}", "user_123"),
+                )
+            await conn.commit()
+
+        note_ids = [f"note_{i}" for i in range(1, 26)] + ["missing_note"]
+        results = await sync_manager.sync_notes_batch(note_ids)
+
+        assert list(results) == note_ids
+        assert sum(result.success for result in results.values()) == 25
+        assert "Note not found" in (results["missing_note"].error or "")
+        # batch_size is 10: 26 IDs -> 3 batches
+        assert sync_manager.embedding.generate_embeddings_batch.call_count == 3
+        assert sync_manager.chromadb.upsert_documents_batch.call_count == 3
+
+        status = await sync_manager.get_sync_status("note_25")
+        assert status["sync_status"] == "synced"
+
+    @pytest.mark.asyncio
+    async def test_batch_sync_embedding_failure(self, sync_manager, sample_notes):
+        """Test that a failed batch embedding marks the batch as failed."""
+        sync_manager.embedding.generate_embeddings_batch.side_effect = Exception("quota")
+
+        results = await sync_manager.sync_notes_batch(["note_1", "note_2"])
+
+        assert all(not result.success for result in results.values())
+        assert "quota" in (results["note_1"].error or "")
+        sync_manager.chromadb.upsert_documents_batch.assert_not_called()
+        metadata = await sync_manager._get_sync_metadata("note_1")
+        assert metadata["sync_status"] == "failed"
+        assert metadata["retry_count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_schedules_retry_with_backoff(self, sync_manager, sample_notes):
+        """Test that failures are retried only once their backoff elapsed."""
+        sync_manager.retry_delay = 60.0
+        sync_manager.embedding.generate_embeddings_batch.side_effect = TimeoutError("gemini")
+
+        await sync_manager.sync_notes_batch(["note_1"])
+
+        metadata = await sync_manager._get_sync_metadata("note_1")
+        assert metadata["last_error_class"] == "TimeoutError"
+        delay = datetime.fromisoformat(metadata["next_retry_at"]) - datetime.now()
+        assert timedelta(seconds=25) < delay <= timedelta(seconds=60)
+
+        # Not due yet
+        report = await sync_manager.retry_due_syncs()
+        assert report.total_notes == 0
+
+        async with sync_manager.db.get_connection() as conn:
+            await conn.execute("UPDATE sync_metadata SET next_retry_at = '2000-01-01T00:00:00'")
+            await conn.commit()
+
+        sync_manager.embedding.generate_embeddings_batch.side_effect = lambda texts: [
+            MagicMock(embedding=[0.1] * 384) for _ in texts
+        ]
+        report = await sync_manager.retry_due_syncs()
+        assert report.successful_syncs == 1
+
+        metadata = await sync_manager._get_sync_metadata("note_1")
+        assert metadata["sync_status"] == "synced"
+        assert metadata["next_retry_at"] is None
+        assert metadata["retry_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_retry_skips_notes_owned_by_outbox(self, sync_manager, sample_notes):
+        """Test that notes with a pending outbox entry are left to the outbox worker."""
+        async with sync_manager.db.get_connection() as conn:
+            await conn.executemany(
+                "INSERT INTO sync_metadata (note_id, sync_status, retry_count) "
+                "VALUES (?, 'failed', 1)",
+                [("note_1",), ("note_2",)],
+            )
+            await conn.execute(
+                "INSERT INTO sync_outbox (note_id, operation) VALUES ('note_1', 'upsert')"
+            )
+            await conn.commit()
+
+        report = await sync_manager.retry_due_syncs()
+
+        assert [result.note_id for result in report.results] == ["note_2"]
+
+    @pytest.mark.asyncio
+    async def test_retries_are_parked_when_exhausted(self, sync_manager, sample_notes):
+        """Test that a note is parked after max_retries and can be requeued."""
+        sync_manager.embedding.generate_embeddings_batch.side_effect = Exception("quota")
+
+        await sync_manager.sync_notes_batch(["note_1"])
+        for _ in range(sync_manager.max_retries - 1):
+            async with sync_manager.db.get_connection() as conn:
+                await conn.execute("UPDATE sync_metadata SET next_retry_at = NULL")
+                await conn.commit()
+            report = await sync_manager.retry_due_syncs()
+            assert report.total_notes == 1
+
+        metadata = await sync_manager._get_sync_metadata("note_1")
+        assert metadata["sync_status"] == "parked"
+        assert metadata["retry_count"] == sync_manager.max_retries
+        assert metadata["next_retry_at"] is None
+        assert (await sync_manager.retry_due_syncs()).total_notes == 0
+
+        assert await sync_manager.requeue_parked_syncs() == 1
+        metadata = await sync_manager._get_sync_metadata("note_1")
+        assert metadata["sync_status"] == "failed"
+        assert metadata["retry_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_permanent_failures_are_parked(self, sync_manager, sample_notes):
+        """Test that retrying deleted or empty notes is not attempted again."""
+        async with sync_manager.db.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO sync_metadata (note_id, sync_status, retry_count) "
+                "VALUES ('deleted_note', 'failed', 1)"
+            )
+            await conn.execute("UPDATE knowledge_notes SET title = '', content = '  ', tags = NULL")
+            await conn.commit()
+
+        await sync_manager.sync_notes_batch(["note_1"])
+        report = await sync_manager.retry_due_syncs()
+        assert report.total_notes == 0
+
+        deleted = await sync_manager._get_sync_metadata("deleted_note")
+        assert deleted["sync_status"] == "parked"
+        assert deleted["last_error_class"] == "NoteNotFound"
+        empty = await sync_manager._get_sync_metadata("note_1")
+        assert empty["sync_status"] == "parked"
+        assert empty["last_error_class"] == "EmptyContent"
+
+    @pytest.mark.asyncio
+    async def test_retry_worker_runs_due_retries(self, sync_manager, sample_notes):
+        """Test the background retry worker lifecycle."""
+        sync_manager.retry_poll_interval = 0.05
+        async with sync_manager.db.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO sync_metadata (note_id, sync_status, retry_count) "
+                "VALUES ('note_2', 'failed', 1)"
+            )
+            await conn.commit()
+
+        await sync_manager.start_retry_worker()
+        assert sync_manager.is_retry_worker_running
+        for _ in range(50):
+            metadata = await sync_manager._get_sync_metadata("note_2")
+            if metadata["sync_status"] == "synced":
+                break
+            await asyncio.sleep(0.02)
+
+        await sync_manager.stop_retry_worker()
+        assert not sync_manager.is_retry_worker_running
+        assert metadata["sync_status"] == "synced"
+
+    @pytest.mark.asyncio
+    async def test_retry_columns_added_to_existing_table(self, temp_config, mock_services):
+        """Test that a sync_metadata table from an older release is upgraded."""
+        async with mock_services["database"].get_connection() as conn:
+            await conn.execute(
+                """
+                CREATE TABLE sync_metadata (
+                    note_id TEXT PRIMARY KEY,
+                    last_synced_at DATETIME,
+                    sync_status TEXT DEFAULT 'pending',
+                    chromadb_doc_id TEXT,
+                    embedding_hash TEXT,
+                    retry_count INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            await conn.commit()
+
+        manager = SyncManager(
+            temp_config,
+            mock_services["database"],
+            mock_services["chromadb"],
+            mock_services["embedding"],
+        )
+        await manager.init_async()
+
+        async with mock_services["database"].get_connection() as conn:
+            cursor = await conn.execute("PRAGMA table_info(sync_metadata)")
+            columns = [row[1] for row in await cursor.fetchall()]
+        assert columns[-2:] == ["next_retry_at", "last_error_class"]
+
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_materialized_counters_follow_metadata_changes(self, sync_manager, sample_notes):
+        """Test that sync_stats counters track status and error class transitions."""
+        await sync_manager.sync_notes_batch(["note_1", "note_2"])
+        sync_manager.embedding.generate_embeddings_batch.side_effect = RuntimeError("quota")
+        async with sync_manager.db.get_connection() as conn:
+            await conn.execute("UPDATE knowledge_notes SET content = 'changed' WHERE id = 'note_2'")
+            await conn.commit()
+        await sync_manager.sync_notes_batch(["note_2", "note_3"])
+
+        status = await sync_manager.get_sync_status()
+        assert status["total_notes"] == 3
+        assert status["status_breakdown"] == {"synced": 1, "failed": 2}
+        assert status["pending_backlog"] == 2
+
+        stats = await sync_manager.get_sync_statistics()
+        assert stats["error_classes"] == {"RuntimeError": 2}
+        assert stats["retry_analysis"]["avg_retries"] == 1
+        assert stats["oldest_unsynced_at"] is not None
+
+        await sync_manager._delete_sync_records(["note_3"])
+        assert await sync_manager.requeue_parked_syncs() == 0
+        stats = await sync_manager.get_sync_statistics()
+        assert stats["status_breakdown"] == {"synced": 1, "failed": 1}
+        assert stats["error_classes"] == {"RuntimeError": 1}
+
+        # The triggers agree with a full recount
+        before = await sync_manager._read_sync_stats()
+        await sync_manager.rebuild_sync_statistics()
+        after = await sync_manager._read_sync_stats()
+        assert {k: after[k] for k in ("status", "error_class", "notes")} == {
+            k: before[k] for k in ("status", "error_class", "notes")
+        }
+
+    @pytest.mark.asyncio
+    async def test_counters_seeded_for_existing_metadata(self, temp_config, mock_services):
+        """Test that counters are seeded from rows written before sync_stats existed."""
+        async with mock_services["database"].get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO knowledge_notes (id, title, content, user_id) "
+                "VALUES ('old_1', 'Old', 'Body', 'user_1')"
+            )
+            await conn.execute(
+                """
+                CREATE TABLE sync_metadata (
+                    note_id TEXT PRIMARY KEY,
+                    last_synced_at DATETIME,
+                    sync_status TEXT DEFAULT 'pending',
+                    chromadb_doc_id TEXT,
+                    embedding_hash TEXT,
+                    retry_count INTEGER DEFAULT 0,
+                    last_error TEXT,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+                """
+            )
+            await conn.execute(
+                "INSERT INTO sync_metadata (note_id, sync_status) VALUES ('old_1', 'synced')"
+            )
+            await conn.commit()
+
+        manager = SyncManager(
+            temp_config,
+            mock_services["database"],
+            mock_services["chromadb"],
+            mock_services["embedding"],
+        )
+        await manager.init_async()
+
+        status = await manager.get_sync_status()
+        assert status["total_notes"] == 1
+        assert status["status_breakdown"] == {"synced": 1}
+
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_statistics_snapshot_refreshed_when_stale(self, sync_manager, sample_notes):
+        """Test that scan-derived statistics are reused until the snapshot goes stale."""
+        stats = await sync_manager.get_sync_statistics()
+        assert stats["synced_last_24h"] == 0
+        assert stats["oldest_unsynced_age_seconds"] >= 0
+
+        await sync_manager.sync_notes_batch(["note_1"])
+        stats = await sync_manager.get_sync_statistics()
+        assert stats["status_breakdown"] == {"synced": 1}
+        assert stats["synced_last_24h"] == 0  # Snapshot not yet stale
+
+        sync_manager.stats_refresh_interval = 0
+        stats = await sync_manager.get_sync_statistics()
+        assert stats["synced_last_24h"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unsynced_age_uses_the_writer_clock(
+        self, sync_manager, sample_notes, monkeypatch
+    ):
+        """Test that the backlog age reads local timestamps as local time."""
+        # A host east of UTC, where reading local time as UTC gives a future time
+        monkeypatch.setenv("TZ", "Asia/Tokyo")
+        time.tzset()
+        try:
+            updated_at = (datetime.now() - timedelta(hours=1)).isoformat()
+            async with sync_manager.db.get_connection() as conn:
+                await conn.execute("UPDATE knowledge_notes SET updated_at = ?", (updated_at,))
+                await conn.commit()
+
+            sync_manager.stats_refresh_interval = 0
+            stats = await sync_manager.get_sync_statistics()
+        finally:
+            monkeypatch.undo()
+            time.tzset()
+
+        assert 3500 <= stats["oldest_unsynced_age_seconds"] <= 3700
+
+    @pytest.mark.asyncio
+    async def test_verify_consistency_set_diff(self, sync_manager, sample_notes):
+        """Test ID/hash based verification including ChromaDB orphans."""
+        await sync_manager.sync_notes_batch(["note_1", "note_2", "note_3"])
+        written = sync_manager.chromadb.upsert_documents_batch.call_args[0][0]
+        stored = [
+            StoredDocument(document_id=doc_id, metadata=metadata)
+            for doc_id, _, _, metadata in written
+            if metadata.document_id != "note_3"
+        ]
+        stored.append(
+            StoredDocument(
+                document_id="note_deleted",
+                metadata=sync_manager._create_document_metadata({"id": "deleted"}),
+            )
+        )
+
+        async def iter_documents(**kwargs):
+            yield stored[:2]
+            yield stored[2:]
+
+        sync_manager.chromadb.iter_documents = iter_documents
+
+        async with sync_manager.db.get_connection() as conn:
+            await conn.execute(
+                "UPDATE knowledge_notes SET content = ? WHERE id = ?", ("Edited", "note_2")
+            )
+            await conn.commit()
+
+        report = await sync_manager.verify_consistency()
+
+        checks = {check.note_id: check for check in report.checks}
+        assert report.total_checked == 4
+        assert report.consistent_notes == 1
+        assert checks["note_1"].embedding_matches and checks["note_1"].metadata_matches
+        assert checks["note_2"].chromadb_exists and not checks["note_2"].embedding_matches
+        assert report.missing_from_chromadb == 1 and not checks["note_3"].chromadb_exists
+        assert report.missing_from_sqlite == 1
+        assert report.orphaned_doc_ids == ["note_deleted"]
+        sync_manager.chromadb.search_documents.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_repair_deletes_orphans_in_one_batch(self, sync_manager, sample_notes):
+        """Test that orphaned documents are removed with a single batch delete."""
+        report = ConsistencyReport(
+            total_checked=2,
+            consistent_notes=0,
+            inconsistent_notes=2,
+            missing_from_chromadb=0,
+            missing_from_sqlite=2,
+            checks=[],
+            checked_at=datetime.now(),
+            orphaned_doc_ids=["note_gone_1", "note_gone_2"],
+        )
+
+        repair = await sync_manager.repair_inconsistencies(report)
+
+        sync_manager.chromadb.delete_documents_batch.assert_called_once_with(
+            ["note_gone_1", "note_gone_2"]
+        )
+        assert repair.successful_repairs == 2
+        assert {r.repair_type for r in repair.results} == {"delete_orphan"}
+
+    @pytest.mark.asyncio
+    async def test_delete_notes_from_chromadb(self, sync_manager, sample_notes):
+        """Test bulk deletion of several notes' documents and sync records."""
+        await sync_manager.sync_notes_batch(["note_1", "note_2", "note_3"])
+
+        assert await sync_manager.delete_notes_from_chromadb(["note_1", "note_2"])
+
+        sync_manager.chromadb.delete_documents_batch.assert_called_once_with(
+            ["note_note_1", "note_note_2"]
+        )
+        assert await sync_manager._get_sync_metadata("note_1") is None
+        assert await sync_manager._get_sync_metadata("note_3") is not None
 
     @pytest.mark.asyncio
     async def test_sync_all_notes(self, sync_manager, sample_notes):
@@ -420,6 +838,95 @@ class TestSyncManager:
         await sync_manager.close()
         assert sync_manager._initialized is False
 
+    @pytest.mark.asyncio
+    async def test_split_into_chunks(self, sync_manager):
+        """Test content-defined chunking of long content."""
+        sync_manager.chunk_size = 200
+        sync_manager.chunk_min_size = 50
+
+        # Short content stays a single chunk
+        assert sync_manager._split_into_chunks("short note") == ["short note"]
+
+        paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(20)]
+        chunks = sync_manager._split_into_chunks("\n\n".join(paragraphs))
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 200 for chunk in chunks)
+        # Chunking is deterministic
+        assert chunks == sync_manager._split_into_chunks("\n\n".join(paragraphs))
+
+    @pytest.mark.asyncio
+    async def test_long_note_reembeds_only_changed_chunks(self, sync_manager, mock_services):
+        """Test that editing a long note only re-embeds the changed chunks."""
+        sync_manager.chunk_size = 200
+        sync_manager.chunk_min_size = 50
+
+        paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(20)]
+        async with mock_services["database"].get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO knowledge_notes (id, title, content, user_id) VALUES (?, ?, ?, ?)",
+                ("long_note", "Long", "\n\n".join(paragraphs), "test_user"),
+            )
+            await conn.commit()
+
+        result = await sync_manager.sync_note_to_chromadb("long_note")
+        assert result.success is True
+
+        stored_chunks = await sync_manager._get_note_chunks("long_note")
+        assert len(stored_chunks) > 1
+        assert sync_manager.chromadb.add_document.call_count == len(stored_chunks)
+        for call in sync_manager.chromadb.add_document.call_args_list:
+            assert call.kwargs["metadata"].document_id == "long_note"
+
+        # Edit the last paragraph only
+        paragraphs[-1] = "Edited paragraph " + "change " * 10
+        async with mock_services["database"].get_connection() as conn:
+            await conn.execute(
+                "UPDATE knowledge_notes SET content = ? WHERE id = ?",
+                ("\n\n".join(paragraphs), "long_note"),
+            )
+            await conn.commit()
+
+        sync_manager.chromadb.add_document.reset_mock()
+        sync_manager.embedding.generate_embedding.reset_mock()
+
+        result = await sync_manager.sync_note_to_chromadb("long_note")
+        assert result.success is True
+
+        reembedded = sync_manager.embedding.generate_embedding.call_count
+        assert 1 <= reembedded < len(stored_chunks)
+        assert sync_manager.chromadb.add_document.call_count == reembedded
+
+        # Deleting the note removes every chunk document
+        current_chunks = await sync_manager._get_note_chunks("long_note")
+        sync_manager.chromadb.delete_document.reset_mock()
+        assert await sync_manager.delete_note_from_chromadb("long_note") is True
+        assert sync_manager.chromadb.delete_document.call_count == len(current_chunks)
+        assert await sync_manager._get_note_chunks("long_note") == {}
+
+    @pytest.mark.asyncio
+    async def test_first_chunked_sync_deletes_legacy_document(self, sync_manager, sample_notes):
+        """Test that a note synced before chunking loses its plain document."""
+        sync_manager.chunk_size = 200
+        sync_manager.chunk_min_size = 50
+        await sync_manager._update_sync_metadata(
+            note_id="note_1", status=SyncStatus.SYNCED, chromadb_doc_id="note_note_1"
+        )
+
+        paragraphs = [f"Paragraph {i} " + "word " * 20 for i in range(20)]
+        async with sync_manager.db.get_connection() as conn:
+            await conn.execute(
+                "UPDATE knowledge_notes SET content = ? WHERE id = ?",
+                ("\n\n".join(paragraphs), "note_1"),
+            )
+            await conn.commit()
+
+        results = await sync_manager.sync_notes_batch(["note_1"])
+
+        assert results["note_1"].success is True
+        sync_manager.chromadb.delete_documents_batch.assert_called_once_with(["note_note_1"])
+        assert "note_note_1" not in await sync_manager._get_note_chunks("note_1")
+
 
 class TestSyncManagerIntegration:
     """Integration tests for SyncManager with more realistic scenarios."""
@@ -453,6 +960,12 @@ class TestSyncManagerIntegration:
             mock_result = MagicMock()
             mock_result.embedding = [0.2] * 384
             embedding_service.generate_embedding = AsyncMock(return_value=mock_result)
+            embedding_service.generate_embeddings_batch = AsyncMock(
+                side_effect=lambda texts: [mock_result for _ in texts]
+            )
+            chromadb_service.add_documents_batch = AsyncMock(side_effect=lambda docs: len(docs))
+            chromadb_service.upsert_documents_batch = AsyncMock(side_effect=lambda docs: len(docs))
+            chromadb_service.delete_documents_batch = AsyncMock(side_effect=lambda ids: len(ids))
 
             # Create manager
             manager = SyncManager(config, database_service, chromadb_service, embedding_service)
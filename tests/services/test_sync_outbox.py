@@ -0,0 +1,371 @@
+"""
+Tests for SyncOutbox and the outbox-based KnowledgeManager sync path.
+"""
+
+import asyncio
+import tempfile
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.chromadb_service import ChromaDBService
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.embedding import EmbeddingService
+from src.nescordbot.services.knowledge_manager import KnowledgeManager
+from src.nescordbot.services.obsidian_github import ObsidianGitHubService
+from src.nescordbot.services.sync_manager import SyncManager, SyncResult, SyncStatus
+from src.nescordbot.services.sync_outbox import OutboxEntry, SyncOutbox, SyncOutboxError
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database with migrations applied."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/outbox.db")
+        await service.initialize()
+        yield service
+        await service.close()
+
+
+@pytest.fixture
+def config():
+    """Create config with fast retry settings."""
+    config = MagicMock(spec=BotConfig)
+    config.github_obsidian_enabled = True
+    config.sync_outbox_batch_size = 10
+    config.sync_outbox_poll_interval = 0.05
+    config.sync_outbox_max_attempts = 3
+    config.sync_outbox_backoff_base = 0.0
+    config.sync_outbox_backoff_max = 0.0
+    config.sync_outbox_debounce_seconds = 0.0
+    return config
+
+
+@pytest.fixture
+def outbox(config, database_service):
+    """Create SyncOutbox instance."""
+    return SyncOutbox(config, database_service)
+
+
+async def _enqueue(outbox, database_service, note_id, operation):
+    async with database_service.get_connection() as conn:
+        await outbox.enqueue(conn, note_id, operation)
+        await conn.commit()
+
+
+class TestSyncOutbox:
+    """Test SyncOutbox queue operations."""
+
+    @pytest.mark.asyncio
+    async def test_enqueue_and_claim(self, outbox, database_service):
+        """Test that committed entries are claimed in order."""
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        await _enqueue(outbox, database_service, "note_2", SyncOutbox.DELETE)
+
+        entries = await outbox.claim_due()
+
+        assert [(e.note_id, e.operation) for e in entries] == [
+            ("note_1", "upsert"),
+            ("note_2", "delete"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_enqueue_invalid_operation(self, outbox, database_service):
+        """Test that unknown operations are rejected."""
+        async with database_service.get_connection() as conn:
+            with pytest.raises(SyncOutboxError):
+                await outbox.enqueue(conn, "note_1", "rename")
+
+    @pytest.mark.asyncio
+    async def test_claim_coalesces_per_note(self, outbox, database_service):
+        """Test that the latest operation for a note wins."""
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.DELETE)
+
+        entries = await outbox.claim_due()
+
+        assert len(entries) == 1
+        assert entries[0].operation == SyncOutbox.DELETE
+
+        await outbox.complete(entries[0])
+        stats = await outbox.get_stats()
+        assert stats["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_complete_keeps_newer_rows(self, outbox, database_service):
+        """Test that rows written after the claim survive completion."""
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        entries = await outbox.claim_due()
+
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        await outbox.complete(entries[0])
+
+        remaining = await outbox.claim_due()
+        assert len(remaining) == 1
+        assert remaining[0].max_id > entries[0].max_id
+
+    @pytest.mark.asyncio
+    async def test_fail_schedules_backoff(self, config, database_service):
+        """Test that failed entries are not due until the backoff elapses."""
+        config.sync_outbox_backoff_base = 60.0
+        config.sync_outbox_backoff_max = 60.0
+        outbox = SyncOutbox(config, database_service)
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+
+        entry = (await outbox.claim_due())[0]
+        await outbox.fail(entry, RuntimeError("boom"))
+
+        assert await outbox.claim_due() == []
+        async with database_service.get_connection() as conn:
+            cursor = await conn.execute("SELECT attempts, last_error FROM sync_outbox")
+            attempts, last_error = await cursor.fetchone()
+        assert attempts == 1
+        assert last_error == "RuntimeError: boom"
+
+    def test_backoff_delay_bounds(self, config, database_service):
+        """Test exponential backoff growth and cap."""
+        config.sync_outbox_backoff_base = 2.0
+        config.sync_outbox_backoff_max = 10.0
+        outbox = SyncOutbox(config, database_service)
+
+        assert 1.0 <= outbox._get_backoff_delay(1) <= 2.0
+        assert 4.0 <= outbox._get_backoff_delay(3) <= 8.0
+        assert 5.0 <= outbox._get_backoff_delay(10) <= 10.0
+
+    @pytest.mark.asyncio
+    async def test_process_batch_parks_after_max_attempts(self, outbox, database_service):
+        """Test that permanently failing entries are parked and can be retried."""
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        handler = AsyncMock(side_effect=RuntimeError("ChromaDB down"))
+
+        for _ in range(outbox.max_attempts):
+            assert await outbox.process_batch(handler) == 1
+
+        stats = await outbox.get_stats()
+        assert stats["pending"] == 0
+        assert stats["failed"] == 1
+        assert stats["parked"] == 1
+        assert await outbox.process_batch(handler) == 0
+
+        assert await outbox.retry_failed() == 1
+        handler.side_effect = None
+        assert await outbox.drain(handler) == 1
+        assert (await outbox.get_stats())["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_delete_handler_batches_deletes(self, outbox, database_service):
+        """Test that due deletes are applied with one batch handler call."""
+        for note_id in ("note_1", "note_2", "note_3"):
+            await _enqueue(outbox, database_service, note_id, SyncOutbox.DELETE)
+        await _enqueue(outbox, database_service, "note_4", SyncOutbox.UPSERT)
+        handler = AsyncMock()
+        delete_handler = AsyncMock(side_effect=RuntimeError("ChromaDB down"))
+
+        assert await outbox.process_batch(handler, delete_handler) == 4
+        assert (await outbox.get_stats())["pending"] == 3
+
+        delete_handler.side_effect = None
+        assert await outbox.drain(handler, delete_handler) == 3
+
+        handler.assert_awaited_once()
+        deleted = [entry.note_id for entry in delete_handler.await_args.args[0]]
+        assert deleted == ["note_1", "note_2", "note_3"]
+        assert (await outbox.get_stats())["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_upserts_are_debounced_per_note(self, config, database_service):
+        """Test that a new upsert pushes the note's pending rows past the window."""
+        config.sync_outbox_debounce_seconds = 60.0
+        outbox = SyncOutbox(config, database_service)
+
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "INSERT INTO sync_outbox (note_id, operation) VALUES ('note_1', 'upsert')"
+            )
+            await conn.commit()
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        await _enqueue(outbox, database_service, "note_2", SyncOutbox.DELETE)
+
+        # Only the delete is due; both upserts of note_1 wait for the window
+        entries = await outbox.claim_due()
+        assert [(e.note_id, e.operation) for e in entries] == [("note_2", "delete")]
+
+        async with database_service.get_connection() as conn:
+            cursor = await conn.execute(
+                "SELECT COUNT(*) FROM sync_outbox "
+                "WHERE note_id = 'note_1' AND next_attempt_at > CURRENT_TIMESTAMP"
+            )
+            assert (await cursor.fetchone())[0] == 2
+
+    @pytest.mark.asyncio
+    async def test_continuous_edits_are_synced_after_max_wait(self, config, database_service):
+        """Test that the debounce window stops sliding at the maximum wait."""
+        config.sync_outbox_debounce_seconds = 60.0
+        config.sync_outbox_debounce_max_seconds = 30.0
+        outbox = SyncOutbox(config, database_service)
+
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        assert await outbox.claim_due() == []
+
+        # The first edit was queued a while ago and edits keep arriving
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "UPDATE sync_outbox SET created_at = datetime('now', '-31 seconds') "
+                "WHERE id = (SELECT MIN(id) FROM sync_outbox)"
+            )
+            await conn.commit()
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+
+        entries = await outbox.claim_due()
+        assert [(e.note_id, e.operation) for e in entries] == [("note_1", "upsert")]
+        assert entries[0].max_id == 3
+
+    @pytest.mark.asyncio
+    async def test_debounced_burst_syncs_once(self, config, database_service):
+        """Test that a burst of edits is processed once when the window elapses."""
+        config.sync_outbox_debounce_seconds = 1.0
+        outbox = SyncOutbox(config, database_service)
+        handled = []
+
+        async def handler(entry: OutboxEntry) -> None:
+            handled.append(entry.note_id)
+
+        await outbox.start_worker(handler)
+        for _ in range(3):
+            await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+            outbox.notify()
+        await asyncio.sleep(0.2)
+        assert handled == []
+
+        for _ in range(40):
+            if handled:
+                break
+            await asyncio.sleep(0.1)
+        await outbox.stop_worker()
+
+        assert handled == ["note_1"]
+        assert (await outbox.get_stats())["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_worker_drains_on_notify(self, outbox, database_service):
+        """Test that the background worker processes notified entries."""
+        processed = asyncio.Event()
+
+        async def handler(entry: OutboxEntry) -> None:
+            processed.set()
+
+        await outbox.start_worker(handler)
+        assert outbox.is_running
+
+        await _enqueue(outbox, database_service, "note_1", SyncOutbox.UPSERT)
+        outbox.notify()
+        await asyncio.wait_for(processed.wait(), timeout=2.0)
+
+        await outbox.stop_worker()
+        assert not outbox.is_running
+        assert (await outbox.get_stats())["synced"] == 1
+
+
+class TestKnowledgeManagerOutbox:
+    """Test KnowledgeManager with the sync outbox enabled."""
+
+    @pytest.fixture
+    async def manager(self, config, database_service, outbox):
+        """Create KnowledgeManager wired to the outbox."""
+        sync_manager = AsyncMock(spec=SyncManager)
+        sync_manager.sync_note_to_chromadb.side_effect = lambda note_id: SyncResult(
+            note_id=note_id, success=True, status=SyncStatus.SYNCED
+        )
+        sync_manager.delete_note_from_chromadb.return_value = True
+
+        manager = KnowledgeManager(
+            config=config,
+            database_service=database_service,
+            chromadb_service=AsyncMock(spec=ChromaDBService),
+            embedding_service=AsyncMock(spec=EmbeddingService),
+            sync_manager=sync_manager,
+            obsidian_github_service=AsyncMock(spec=ObsidianGitHubService),
+            sync_outbox=outbox,
+        )
+        await manager.initialize()
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_create_note_enqueues_instead_of_syncing(self, manager, outbox):
+        """Test that note creation only writes the outbox row."""
+        note_id = await manager.create_note(
+            title="Outbox", content="queued sync", user_id="test_user"
+        )
+
+        manager.sync_manager.sync_note_to_chromadb.assert_not_called()
+        entries = await outbox.claim_due()
+        assert [(e.note_id, e.operation) for e in entries] == [(note_id, "upsert")]
+
+    @pytest.mark.asyncio
+    async def test_drain_syncs_chromadb_and_obsidian(self, manager, outbox):
+        """Test that draining applies upserts to both services."""
+        note_id = await manager.create_note(
+            title="Outbox", content="queued sync", user_id="test_user"
+        )
+        await manager.update_note(note_id, content="edited")
+
+        assert await outbox.drain(manager._process_outbox_entry) == 1
+
+        manager.sync_manager.sync_note_to_chromadb.assert_called_once_with(note_id)
+        manager.obsidian_github.save_to_obsidian.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_delete_note_enqueues_delete(self, manager, outbox):
+        """Test that a created then deleted note results in a single delete."""
+        note_id = await manager.create_note(
+            title="Outbox", content="short lived", user_id="test_user"
+        )
+        await manager.delete_note(note_id)
+
+        assert await outbox.drain(manager._process_outbox_entry) == 1
+
+        manager.sync_manager.delete_note_from_chromadb.assert_called_once_with(note_id)
+        manager.sync_manager.sync_note_to_chromadb.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_is_retried(self, manager, outbox):
+        """Test that an unsuccessful SyncResult keeps the entry queued."""
+        manager.sync_manager.sync_note_to_chromadb.side_effect = lambda note_id: SyncResult(
+            note_id=note_id,
+            success=False,
+            status=SyncStatus.FAILED,
+            error="EmbeddingService not available",
+        )
+        await manager.create_note(title="Outbox", content="retry me", user_id="test_user")
+
+        await outbox.process_batch(manager._process_outbox_entry)
+
+        stats = await outbox.get_stats()
+        assert stats["pending"] == 1
+        assert "EmbeddingService not available" in stats["last_error"]
+
+    @pytest.mark.asyncio
+    async def test_merge_notes_enqueues_one_sync_step(self, manager, outbox):
+        """Test that a merge is drained as one upsert and one batched delete."""
+        manager.sync_manager.delete_notes_from_chromadb.return_value = True
+        note_ids = [
+            await manager.create_note(title=f"Part {i}", content=f"part {i}", user_id="u")
+            for i in range(3)
+        ]
+        await outbox.drain(manager._process_outbox_entry)
+        manager.sync_manager.sync_note_to_chromadb.reset_mock()
+
+        merged_id = await manager.merge_notes(note_ids, new_title="Whole")
+
+        manager.sync_manager.sync_note_to_chromadb.assert_not_called()
+        processed = await outbox.drain(
+            manager._process_outbox_entry, manager._process_outbox_deletes
+        )
+
+        assert processed == 4
+        manager.sync_manager.delete_notes_from_chromadb.assert_awaited_once_with(note_ids)
+        manager.sync_manager.delete_note_from_chromadb.assert_not_called()
+        manager.sync_manager.sync_note_to_chromadb.assert_called_once_with(merged_id)
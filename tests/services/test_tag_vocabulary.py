@@ -0,0 +1,171 @@
+"""
+Tests for TagVocabulary and the note_tags index it is loaded from.
+"""
+
+import json
+import tempfile
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.knowledge_manager import KnowledgeManager
+from src.nescordbot.services.tag_vocabulary import TagVocabulary
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database with migrations applied."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/tags.db")
+        await service.initialize()
+        yield service
+        await service.close()
+
+
+@pytest.fixture
+def knowledge_manager(database_service):
+    """Create a KnowledgeManager backed only by the database."""
+    config = MagicMock(spec=BotConfig)
+    config.github_obsidian_enabled = False
+    return KnowledgeManager(config, database_service, AsyncMock(), AsyncMock(), AsyncMock(), None)
+
+
+async def insert_note(database_service, note_id, tags):
+    """Insert a note directly, bypassing KnowledgeManager."""
+    async with database_service.get_connection() as conn:
+        await conn.execute(
+            """
+            INSERT INTO knowledge_notes (id, title, content, tags, user_id, created_at, updated_at)
+            VALUES (?, ?, '', ?, 'user_1', ?, ?)
+            """,
+            (note_id, note_id, tags, f"2024-01-0{note_id[-1]}", f"2024-01-0{note_id[-1]}"),
+        )
+        await conn.commit()
+
+
+async def note_tags(database_service):
+    """Return the note_tags index as a set of rows."""
+    async with database_service.get_connection() as conn:
+        cursor = await conn.execute("SELECT note_id, tag FROM note_tags")
+        return set(await cursor.fetchall())
+
+
+class TestTagVocabulary:
+    """Test in-memory vocabulary operations."""
+
+    def test_counts_fold_case_variants(self):
+        vocabulary = TagVocabulary()
+        vocabulary.add(["Python", "#python", "ai"], "2024-01-01")
+        vocabulary.add(["PYTHON"], "2024-01-03")
+
+        usage = vocabulary.get("python")
+        assert usage is not None
+        assert (usage.name, usage.count, usage.last_used) == ("Python", 3, "2024-01-03")
+        assert "pYtHoN" in vocabulary
+        assert vocabulary.canonical("PYTHON") == "Python"
+        assert vocabulary.canonical("unknown") == "unknown"
+        assert vocabulary.variants(["python"]) == ["#python", "PYTHON", "Python"]
+        assert vocabulary.names() == ["Python", "ai"]
+
+    def test_remove_and_replace(self):
+        vocabulary = TagVocabulary()
+        vocabulary.add(["python", "ai"])
+        vocabulary.add(["python"])
+
+        vocabulary.replace(["python", "ai"], ["ml"], "2024-02-01")
+
+        assert "ai" not in vocabulary
+        assert vocabulary.get("python").count == 1
+        assert vocabulary.get("ml").last_used == "2024-02-01"
+        vocabulary.remove(["missing"])
+        assert len(vocabulary) == 2
+
+    def test_complete_prefers_prefix_matches(self):
+        vocabulary = TagVocabulary()
+        vocabulary.add(["numpy", "pytest", "python", "python", "typing"])
+
+        assert [u.name for u in vocabulary.complete("Py")] == ["python", "pytest", "numpy"]
+        assert [u.name for u in vocabulary.complete("py", limit=1)] == ["python"]
+        assert [u.name for u in vocabulary.complete("")] == [
+            "python",
+            "numpy",
+            "pytest",
+            "typing",
+        ]
+
+        # The sorted key list is rebuilt after new tags are added
+        vocabulary.add(["pydantic"])
+        assert "pydantic" in [u.name for u in vocabulary.complete("pyd")]
+
+
+class TestNoteTagsIndex:
+    """Test the trigger-maintained note_tags table and loading from it."""
+
+    @pytest.mark.asyncio
+    async def test_triggers_keep_index_in_sync(self, database_service):
+        await insert_note(database_service, "note_1", json.dumps(["python", "ai", ""]))
+        await insert_note(database_service, "note_2", "not json")
+        assert await note_tags(database_service) == {("note_1", "python"), ("note_1", "ai")}
+
+        async with database_service.get_connection() as conn:
+            await conn.execute(
+                "UPDATE knowledge_notes SET tags = ? WHERE id = 'note_1'", ('["ml"]',)
+            )
+            await conn.execute("DELETE FROM knowledge_notes WHERE id = 'note_2'")
+            await conn.commit()
+        assert await note_tags(database_service) == {("note_1", "ml")}
+
+        async with database_service.get_connection() as conn:
+            await conn.execute("DELETE FROM knowledge_notes WHERE id = 'note_1'")
+            await conn.commit()
+        assert await note_tags(database_service) == set()
+
+    @pytest.mark.asyncio
+    async def test_load_from_database(self, database_service):
+        await insert_note(database_service, "note_1", json.dumps(["Python", "ai"]))
+        await insert_note(database_service, "note_2", json.dumps(["python"]))
+
+        vocabulary = TagVocabulary()
+        await vocabulary.load(database_service)
+
+        assert vocabulary.loaded
+        usage = vocabulary.get("PYTHON")
+        assert (usage.name, usage.count, usage.last_used) == ("Python", 2, "2024-01-02")
+        assert vocabulary.names() == ["Python", "ai"]
+
+
+class TestKnowledgeManagerVocabulary:
+    """Test that note writes keep the KnowledgeManager vocabulary current."""
+
+    @pytest.mark.asyncio
+    async def test_note_writes_update_vocabulary(self, knowledge_manager):
+        await knowledge_manager.initialize()
+        vocabulary = knowledge_manager.tag_vocabulary
+
+        note_id = await knowledge_manager.create_note(
+            "First", "Body", tags=["Python", "ai"], user_id="user_1"
+        )
+        await knowledge_manager.create_note("Second", "Body", tags=["python"], user_id="user_1")
+        assert vocabulary.get("python").count == 2
+
+        await knowledge_manager.update_note(note_id, tags=["ml"])
+        assert vocabulary.get("python").count == 1
+        assert "ai" not in vocabulary
+        assert "ml" in vocabulary
+
+        await knowledge_manager.delete_note(note_id)
+        assert "ml" not in vocabulary
+        assert await knowledge_manager._get_all_existing_tags() == ["Python"]
+
+    @pytest.mark.asyncio
+    async def test_get_notes_by_tag_is_case_insensitive(self, knowledge_manager):
+        await knowledge_manager.initialize()
+        await knowledge_manager.create_note("First", "Body", tags=["Python"], user_id="user_1")
+        await knowledge_manager.create_note("Second", "Body", tags=["python"], user_id="user_1")
+        await knowledge_manager.create_note("Third", "Body", tags=["pythonic"], user_id="user_1")
+
+        notes = await knowledge_manager.get_notes_by_tag("PYTHON")
+
+        assert {note["title"] for note in notes} == {"First", "Second"}
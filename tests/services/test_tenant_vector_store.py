@@ -0,0 +1,160 @@
+"""
+Tests for TenantVectorStore.
+"""
+
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.numpy_vector_store import NumpyVectorStore
+from src.nescordbot.services.tenant_vector_store import TenantVectorStore
+from src.nescordbot.services.vector_store import DocumentMetadata
+
+
+@pytest.fixture
+def test_config():
+    """Create test configuration with a temporary persist directory."""
+    temp_dir = tempfile.mkdtemp()
+    yield BotConfig(
+        discord_token="Bot TEST_TOKEN_FOR_TESTING",
+        openai_api_key="sk-test-key",
+        chromadb_persist_directory=temp_dir,
+        chromadb_collection_name="test_collection",
+        vector_store_backend="numpy",
+        vector_tenant_collections=True,
+    )
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+async def database_service():
+    """Create an initialized database."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service = DatabaseService(f"sqlite:///{temp_dir}/tenants.db")
+        await service.initialize()
+        yield service
+        await service.close()
+
+
+@pytest.fixture
+async def store(test_config, database_service):
+    """Create a TenantVectorStore over NumPy backends."""
+    store = TenantVectorStore(test_config, NumpyVectorStore, database_service)
+    await store.initialize()
+    yield store
+    await store.close()
+
+
+def _vector(index: int, dimension: int = 16) -> list:
+    """Deterministic unit-ish vector peaked at one component."""
+    vector = np.full(dimension, 0.01, dtype=np.float32)
+    vector[index % dimension] = 1.0
+    return vector.tolist()
+
+
+def _document(index: int, guild_id=None):
+    return (
+        f"doc-{index}",
+        f"Content {index}",
+        _vector(index),
+        DocumentMetadata(document_id=f"note-{index}", guild_id=guild_id),
+    )
+
+
+class TestTenantVectorStore:
+    """Test TenantVectorStore routing."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_routed_per_guild(self, store):
+        """Test that each guild gets its own collection."""
+        await store.add_documents_batch(
+            [_document(0, "111"), _document(1, "222"), _document(2, "111"), _document(3)]
+        )
+
+        assert set(store.open_tenants) == {"111", "222", "default"}
+        assert await store.get_document_count() == 4
+        assert await store.count_where({"guild_id": "111"}) == 2
+
+        tenant_store = store._stores["111"]
+        assert tenant_store.config.chromadb_collection_name == "test_collection_111"
+        assert await tenant_store.get_document_count() == 2
+
+    @pytest.mark.asyncio
+    async def test_search_scoped_and_fan_out(self, store):
+        """Test guild-scoped search and unscoped fan-out merged by score."""
+        await store.add_documents_batch([_document(0, "111"), _document(1, "222")])
+
+        scoped = await store.search_documents(_vector(1), n_results=5, where={"guild_id": "111"})
+        assert [r.document_id for r in scoped] == ["doc-0"]
+
+        scoped = await store.search_documents(
+            _vector(1),
+            n_results=5,
+            where={"$and": [{"guild_id": "222"}, {"document_id": "note-1"}]},
+        )
+        assert [r.document_id for r in scoped] == ["doc-1"]
+
+        merged = await store.search_documents(_vector(1), n_results=5)
+        assert [r.document_id for r in merged] == ["doc-1", "doc-0"]
+
+    @pytest.mark.asyncio
+    async def test_lookups_and_deletes_follow_routes(self, store):
+        """Test that ID-based operations go to the owning collection."""
+        await store.add_documents_batch([_document(0, "111"), _document(1, "222")])
+
+        found = await store.get_documents(["doc-1", "missing", "doc-0"], ("documents",))
+        assert [doc.content for doc in found] == ["Content 1", "Content 0"]
+        assert await store.update_document("doc-1", content="Updated")
+
+        assert await store.delete_documents_batch(["doc-0"]) == 1
+        assert await store._get_routes(["doc-0", "doc-1"]) == {"doc-1": "222"}
+        assert await store.get_document_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_upsert_moves_document_between_guilds(self, store):
+        """Test that a document changing guild leaves no copy behind."""
+        await store.add_documents_batch([_document(0, "111")])
+        await store.upsert_documents_batch([_document(0, "222")])
+
+        assert await store.count_where({"guild_id": "111"}) == 0
+        assert await store.count_where({"guild_id": "222"}) == 1
+        assert await store.get_document_count() == 1
+
+    @pytest.mark.asyncio
+    async def test_idle_stores_are_closed_lru(self, store):
+        """Test that the least recently used idle tenants are closed."""
+        store.max_open = 2
+        await store.add_documents_batch([_document(0, "111")])
+        await store.add_documents_batch([_document(1, "222")])
+        await store.add_documents_batch([_document(2, "333")])
+
+        # The default tenant owns the shared executor and stays open
+        assert store.open_tenants == ("default", "222", "333")
+        assert store._stores["222"].executor is store._default_store.executor
+
+        # A closed tenant is reopened from disk on demand
+        results = await store.search_documents(_vector(0), n_results=1, where={"guild_id": "111"})
+        assert [r.document_id for r in results] == ["doc-0"]
+        assert store.open_tenants == ("default", "333", "111")
+
+        page = await store.list_documents(limit=2, offset=1)
+        assert [doc.document_id for doc in page] == ["doc-1", "doc-2"]
+
+    @pytest.mark.asyncio
+    async def test_fan_out_does_not_evict(self, store):
+        """Test that unscoped reads leave the open tenants and their order alone."""
+        store.max_open = 2
+        for index, guild_id in enumerate(["111", "222", "333"]):
+            await store.add_documents_batch([_document(index, guild_id)])
+        open_tenants = store.open_tenants
+
+        merged = await store.search_documents(_vector(0), n_results=5)
+        assert [r.document_id for r in merged][0] == "doc-0"
+        assert await store.get_document_count() == 3
+        assert await store.count_where({"source": "voice"}) == 0
+
+        assert store.open_tenants == open_tenants
@@ -0,0 +1,254 @@
+"""
+Tests for VaultImporter.
+"""
+
+import json
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.knowledge_manager import KnowledgeManager
+from src.nescordbot.services.reindex_jobs import ReindexJobManager
+from src.nescordbot.services.vault_importer import (
+    VaultImporter,
+    VaultImportError,
+    VaultImportStatus,
+    parse_frontmatter,
+)
+
+ALPHA = """---
+title: Alpha
+tags: [one, "two"]
+created: 2024-01-02T03:04:05
+---
+Alpha links to [[Beta]] and has an #inline tag.
+"""
+
+BETA = """---
+tags:
+  - three
+---
+Back to [[Alpha|the first note]], [[Alpha#Heading]] and [[Gamma]].
+"""
+
+
+def write_vault(root: Path) -> Path:
+    """Create a small vault with a hidden settings folder."""
+    vault = root / "MyVault"
+    (vault / "sub").mkdir(parents=True)
+    (vault / ".obsidian").mkdir()
+    (vault / "a.md").write_text(ALPHA, encoding="utf-8")
+    (vault / "sub" / "Beta.md").write_text(BETA, encoding="utf-8")
+    (vault / "sub" / "image.png").write_bytes(b"\x89PNG")
+    (vault / ".obsidian" / "workspace.md").write_text("ignored", encoding="utf-8")
+    return vault
+
+
+@pytest.fixture
+def temp_dir():
+    """Temporary directory for the database and vaults."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir)
+
+
+@pytest.fixture
+def config():
+    """Create config with small batches."""
+    config = MagicMock(spec=BotConfig)
+    config.vault_import_batch_size = 1
+    config.vault_import_max_file_bytes = 1_000_000
+    return config
+
+
+@pytest.fixture
+async def database_service(temp_dir):
+    """Create an initialized database with migrations applied."""
+    service = DatabaseService(f"sqlite:///{temp_dir}/vault.db")
+    await service.initialize()
+    yield service
+    await service.close()
+
+
+@pytest.fixture
+def knowledge_manager(config, database_service):
+    """Create a KnowledgeManager backed only by the database."""
+    return KnowledgeManager(config, database_service, AsyncMock(), AsyncMock(), AsyncMock(), None)
+
+
+@pytest.fixture
+def importer(config, knowledge_manager):
+    """Create a VaultImporter without embedding."""
+    return VaultImporter(config, knowledge_manager)
+
+
+async def fetch_notes(database_service):
+    """Return imported notes keyed by title."""
+    async with database_service.get_connection() as conn:
+        cursor = await conn.execute(
+            "SELECT id, title, content, tags, source_type, user_id, created_at "
+            "FROM knowledge_notes"
+        )
+        return {row[1]: row for row in await cursor.fetchall()}
+
+
+class TestParseFrontmatter:
+    """Test frontmatter parsing."""
+
+    def test_inline_and_block_lists(self):
+        metadata, body = parse_frontmatter(ALPHA)
+        assert metadata["title"] == "Alpha"
+        assert metadata["tags"] == ["one", "two"]
+        assert body.startswith("Alpha links to")
+
+        metadata, _ = parse_frontmatter(BETA)
+        assert metadata["tags"] == ["three"]
+
+    def test_without_frontmatter(self):
+        assert parse_frontmatter("# Title\n---\n") == ({}, "# Title\n---\n")
+        assert parse_frontmatter("---\nunterminated: yes\n") == (
+            {},
+            "---\nunterminated: yes\n",
+        )
+
+
+class TestVaultImporter:
+    """Test VaultImporter functionality."""
+
+    @pytest.mark.asyncio
+    async def test_import_directory(self, importer, knowledge_manager, database_service, temp_dir):
+        vault = write_vault(temp_dir)
+        progress = []
+
+        record = await importer.import_vault(
+            str(vault), user_id="user_1", progress_callback=progress.append
+        )
+
+        assert record.status == VaultImportStatus.COMPLETED
+        assert (record.files_seen, record.imported, record.skipped) == (2, 2, 0)
+        assert len(progress) == 2
+
+        notes = await fetch_notes(database_service)
+        assert set(notes) == {"Alpha", "Beta"}
+        alpha = notes["Alpha"]
+        assert alpha[2].startswith("Alpha links to")
+        assert json.loads(alpha[3]) == ["one", "two", "inline"]
+        assert alpha[4] == VaultImporter.SOURCE_TYPE
+        assert alpha[5] == "user_1"
+        assert alpha[6] == "2024-01-02T03:04:05"
+        assert json.loads(notes["Beta"][3]) == ["three"]
+        assert knowledge_manager.tag_vocabulary.names() == ["inline", "one", "three", "two"]
+
+    @pytest.mark.asyncio
+    async def test_resolves_links_in_second_pass(self, importer, database_service, temp_dir):
+        record = await importer.import_vault(str(write_vault(temp_dir)))
+
+        # Alpha -> Beta is resolved although Beta is inserted in a later batch
+        assert (record.links_resolved, record.links_unresolved) == (2, 1)
+        notes = await fetch_notes(database_service)
+        alpha_id, beta_id = notes["Alpha"][0], notes["Beta"][0]
+        assert notes["Alpha"][5] == VaultImporter.DEFAULT_USER_ID
+
+        async with database_service.get_connection() as conn:
+            cursor = await conn.execute("SELECT from_note_id, to_note_id FROM note_links")
+            links = set(await cursor.fetchall())
+            cursor = await conn.execute("SELECT from_note_id, target_title FROM unresolved_links")
+            unresolved = await cursor.fetchall()
+
+        assert links == {(alpha_id, beta_id), (beta_id, alpha_id)}
+        assert unresolved == [(beta_id, "Gamma")]
+
+    @pytest.mark.asyncio
+    async def test_import_zip_archive(self, importer, database_service, temp_dir):
+        archive = temp_dir / "Zipped.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("Zipped/a.md", ALPHA)
+            zf.writestr("Zipped/sub/Beta.md", BETA)
+            zf.writestr("__MACOSX/Zipped/._a.md", "resource fork")
+
+        record = await importer.import_vault(str(archive))
+
+        assert record.status == VaultImportStatus.COMPLETED
+        assert record.imported == 2
+        assert set(await fetch_notes(database_service)) == {"Alpha", "Beta"}
+
+    @pytest.mark.asyncio
+    async def test_reimport_skips_existing_files(self, importer, database_service, temp_dir):
+        vault = write_vault(temp_dir)
+        await importer.import_vault(str(vault))
+        (vault / "Gamma.md").write_text("Gamma links to [[Alpha]]", encoding="utf-8")
+
+        record = await importer.import_vault(str(vault))
+
+        assert (record.imported, record.skipped) == (1, 2)
+        assert len(await fetch_notes(database_service)) == 3
+        # The late Gamma note resolves the link Beta was waiting for
+        assert (record.links_resolved, record.links_unresolved) == (4, 0)
+        assert len(await importer.list_imports()) == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_import_resumes_same_record(self, importer, temp_dir):
+        vault = write_vault(temp_dir)
+        importer._resolve_links = AsyncMock(side_effect=RuntimeError("boom"))
+
+        failed = await importer.import_vault(str(vault))
+        assert failed.status == VaultImportStatus.FAILED
+        assert failed.last_error == "boom"
+
+        del importer._resolve_links
+        resumed = await importer.import_vault(str(vault))
+
+        assert resumed.import_id == failed.import_id
+        assert resumed.status == VaultImportStatus.COMPLETED
+        assert (resumed.imported, resumed.skipped) == (2, 2)
+
+    @pytest.mark.asyncio
+    async def test_cleanup_runs_when_background_import_ends(self, importer, temp_dir):
+        upload = temp_dir / "upload"
+        upload.mkdir()
+        archive = upload / "Zipped.zip"
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("Zipped/a.md", ALPHA)
+
+        await importer.start_import(
+            str(archive), cleanup=lambda: shutil.rmtree(upload, ignore_errors=True)
+        )
+        assert importer._task is not None
+        await importer._task
+
+        assert not upload.exists()
+
+    @pytest.mark.asyncio
+    async def test_oversized_files_are_skipped(self, importer, database_service, temp_dir):
+        importer.max_file_bytes = 10
+
+        record = await importer.import_vault(str(write_vault(temp_dir)))
+
+        assert (record.imported, record.skipped) == (0, 2)
+        assert await fetch_notes(database_service) == {}
+
+    @pytest.mark.asyncio
+    async def test_queues_missing_reindex_job(self, config, knowledge_manager, temp_dir):
+        reindex_jobs = AsyncMock(spec=ReindexJobManager)
+        importer = VaultImporter(config, knowledge_manager, reindex_jobs)
+
+        record = await importer.import_vault(str(write_vault(temp_dir)))
+
+        reindex_jobs.start_job.assert_awaited_once_with(
+            ReindexJobManager.MISSING, created_by=f"vault import #{record.import_id}"
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalid_source(self, importer, temp_dir):
+        not_a_zip = temp_dir / "notes.zip"
+        not_a_zip.write_text("plain text")
+
+        with pytest.raises(VaultImportError):
+            await importer.import_vault(str(not_a_zip))
+        with pytest.raises(VaultImportError):
+            await importer.import_vault(str(temp_dir / "missing"))
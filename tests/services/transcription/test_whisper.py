@@ -7,6 +7,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from src.nescordbot.config import BotConfig
+from src.nescordbot.services.database import DatabaseService
+from src.nescordbot.services.llm_cache import LLMCache
 from src.nescordbot.services.transcription.whisper import WhisperTranscriptionService
 
 
@@ -62,6 +65,32 @@ class TestWhisperTranscriptionService:
                     # 一時ファイルを削除
                     os.unlink(temp_file_path)
 
+    @pytest.mark.asyncio
+    async def test_transcribe_uses_llm_cache(self):
+        """同じ音声ファイルはキャッシュから返すテスト。"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            database_service = DatabaseService(f"sqlite:///{temp_dir}/cache.db")
+            await database_service.initialize()
+            try:
+                llm_cache = LLMCache(MagicMock(spec=BotConfig), database_service)
+                with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
+                    service = WhisperTranscriptionService(llm_cache)
+
+                mock_transcript = MagicMock()
+                mock_transcript.text = "キャッシュされる結果"
+                service.client = MagicMock()
+                service.client.audio.transcriptions.create.return_value = mock_transcript
+
+                audio_path = os.path.join(temp_dir, "voice.wav")
+                with open(audio_path, "wb") as f:
+                    f.write(b"fake audio data")
+
+                assert await service.transcribe(audio_path) == "キャッシュされる結果"
+                assert await service.transcribe(audio_path) == "キャッシュされる結果"
+                service.client.audio.transcriptions.create.assert_called_once()
+            finally:
+                await database_service.close()
+
     @pytest.mark.asyncio
     async def test_transcribe_unavailable_service(self):
         """サービス利用不可時のテスト。"""
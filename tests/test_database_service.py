@@ -179,6 +179,47 @@ class TestDatabaseService:
         assert last_seen == "2024-01-01T00:00:00Z"
         assert total_users == "1"
 
+    async def test_transaction_rolls_back_on_error(self, temp_db):
+        """Test a failing transaction leaves no partial writes behind."""
+        await temp_db.set("kept", "1")
+
+        with pytest.raises(ValueError):
+            async with temp_db.transaction() as conn:
+                await conn.execute("UPDATE kv_store SET value = '2' WHERE key = 'kept'")
+                await conn.execute("INSERT INTO kv_store (key, value) VALUES ('added', '1')")
+                raise ValueError("boom")
+
+        assert await temp_db.get("kept") == "1"
+        assert await temp_db.get("added") is None
+
+        async with temp_db.transaction() as conn:
+            await conn.execute("INSERT INTO kv_store (key, value) VALUES ('added', '1')")
+
+        assert await temp_db.get("added") == "1"
+
+    async def test_transaction_is_isolated_from_concurrent_writers(self, temp_db):
+        """Test other coroutines cannot write between a transaction's statements."""
+        entered = asyncio.Event()
+
+        async def failing_transaction():
+            async with temp_db.transaction() as conn:
+                await conn.execute("INSERT INTO kv_store (key, value) VALUES ('tx', '1')")
+                entered.set()
+                await asyncio.sleep(0.05)
+                raise ValueError("boom")
+
+        async def concurrent_writer():
+            await entered.wait()
+            await temp_db.set("other", "1")
+
+        results = await asyncio.gather(
+            failing_transaction(), concurrent_writer(), return_exceptions=True
+        )
+
+        assert isinstance(results[0], ValueError)
+        assert await temp_db.get("tx") is None
+        assert await temp_db.get("other") == "1"
+
 
 class TestIDataStoreInterface:
     """Test the IDataStore interface compliance."""
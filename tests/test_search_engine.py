@@ -104,7 +104,7 @@ class TestSearchEngine:
                     "2025-01-03T10:00:00",  # updated_at
                     "user1",  # user_id
                     "permanent",  # content_type
-                    8.5,  # score
+                    -8.5,  # score
                 ),
                 (
                     "note4",  # id
@@ -115,7 +115,7 @@ class TestSearchEngine:
                     "2025-01-04T10:00:00",  # updated_at
                     "user1",  # user_id
                     "fleeting",  # content_type
-                    6.2,  # score
+                    -6.2,  # score
                 ),
             ]
         )
@@ -124,9 +124,11 @@ class TestSearchEngine:
         mock_connection.execute = AsyncMock(return_value=mock_cursor)
         mock_connection.commit = AsyncMock()
 
-        # Create a proper mock for get_connection
-        mock_get_connection = AsyncMock(return_value=mock_connection)
-        mock_service.get_connection = mock_get_connection
+        # get_connection() is an async context manager yielding the connection
+        mock_context = MagicMock()
+        mock_context.__aenter__ = AsyncMock(return_value=mock_connection)
+        mock_context.__aexit__ = AsyncMock(return_value=False)
+        mock_service.get_connection = MagicMock(return_value=mock_context)
 
         # Mock execute is now handled by connection mock above
 
@@ -218,6 +220,82 @@ class TestSearchEngine:
         assert result.source == "vector"
         assert result.score > 0.0  # Distance converted to score
 
+    @pytest.mark.asyncio
+    async def test_vector_search_aggregates_chunks(self, search_engine: SearchEngine) -> None:
+        """Test that chunk hits of the same note collapse to the best chunk."""
+        from src.nescordbot.services.chromadb_service import DocumentMetadata
+        from src.nescordbot.services.chromadb_service import SearchResult as ChromaSearchResult
+
+        search_engine.chroma.search_documents = AsyncMock(
+            return_value=[
+                ChromaSearchResult(
+                    document_id=f"note_long#{i}",
+                    content=f"chunk {i}",
+                    score=score,
+                    metadata=DocumentMetadata(document_id="long", title="Long Note", chunk_index=i),
+                )
+                for i, score in enumerate([0.6, 0.9, 0.5])
+            ]
+            + [
+                ChromaSearchResult(
+                    document_id="note_short",
+                    content="short",
+                    score=0.7,
+                    metadata=DocumentMetadata(document_id="short", title="Short Note"),
+                )
+            ]
+        )
+
+        results = await search_engine.vector_search("chunked", limit=5)
+
+        assert [r.note_id for r in results] == ["long", "short"]
+        assert results[0].content == "chunk 1"
+        assert results[0].score == 0.9
+        call_kwargs = search_engine.chroma.search_documents.call_args.kwargs
+        assert call_kwargs["n_results"] == 5 * search_engine.chunk_overfetch
+        assert call_kwargs["max_results"] == 5 * search_engine.chunk_overfetch
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_loads_contents_for_final_page(
+        self, search_engine: SearchEngine, tmp_path
+    ) -> None:
+        """Test that hybrid search fetches only metadata and loads contents from SQLite."""
+        from src.nescordbot.services.chromadb_service import DocumentMetadata
+        from src.nescordbot.services.chromadb_service import SearchResult as ChromaSearchResult
+        from src.nescordbot.services.database import DatabaseService
+
+        db = DatabaseService(f"sqlite:///{tmp_path}/search.db")
+        await db.initialize()
+        try:
+            async with db.get_connection() as conn:
+                await conn.execute(
+                    """
+                    INSERT INTO knowledge_notes (id, title, content, user_id)
+                    VALUES ('note5', 'Vector Only', 'Full note content from SQLite', 'user1')
+                    """
+                )
+                await conn.commit()
+            search_engine.db = db
+            search_engine._keyword_search = AsyncMock(return_value=[])
+            search_engine.chroma.search_documents = AsyncMock(
+                return_value=[
+                    ChromaSearchResult(
+                        document_id="note5",
+                        content="",
+                        score=0.8,
+                        metadata=DocumentMetadata(document_id="note5", title="Vector Only"),
+                    )
+                ]
+            )
+
+            results = await search_engine.hybrid_search("projection", mode=SearchMode.HYBRID)
+        finally:
+            await db.close()
+
+        assert search_engine.chroma.search_documents.call_args.kwargs["include"] == ("metadatas",)
+        vector_only = next(r for r in results if r.note_id == "note5")
+        assert vector_only.content == "Full note content from SQLite"
+
     @pytest.mark.asyncio
     async def test_keyword_search(self, search_engine: SearchEngine) -> None:
         """Test keyword search with FTS5."""
@@ -251,6 +329,73 @@ class TestSearchEngine:
         for result in results:
             assert result.score >= 0.3
 
+    @pytest.fixture
+    async def note_database(self, tmp_path):
+        """Create a real database holding notes in two guilds."""
+        from src.nescordbot.services.database import DatabaseService
+
+        db = DatabaseService(f"sqlite:///{tmp_path}/search.db")
+        await db.initialize()
+        async with db.get_connection() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO knowledge_notes
+                (id, title, content, tags, source_type, user_id, guild_id, created_at)
+                VALUES (?, ?, ?, ?, ?, 'user1', ?, '2025-01-01T10:00:00')
+                """,
+                [
+                    ("n1", "Guild query", "First guild notes", '["Python"]', "permanent", "g1"),
+                    ("n2", "Guild query", "Second guild notes", '["python"]', "permanent", "g2"),
+                    ("n3", "Draft", "Guild query draft", '["Rust"]', "fleeting", "g1"),
+                ],
+            )
+            await conn.commit()
+        yield db
+        await db.close()
+
+    @pytest.mark.asyncio
+    async def test_search_scoped_to_guild(self, search_engine: SearchEngine, note_database) -> None:
+        """Test that a guild filter scopes both the vector and the FTS5 query."""
+        filters = SearchFilters(user_id="user1", guild_id="g1")
+
+        await search_engine.vector_search("guild query", limit=3, filters=filters)
+        where = search_engine.chroma.search_documents.call_args.kwargs["where"]
+        assert where == {"$and": [{"guild_id": "g1"}, {"user_id": "user1"}]}
+
+        search_engine.db = note_database
+        results = await search_engine.keyword_search("guild query", limit=3, filters=filters)
+        assert {r.note_id for r in results} == {"n1", "n3"}
+        assert all(r.score > 0.0 for r in results)
+
+        permanent = SearchFilters(guild_id="g1", content_type="permanent")
+        results = await search_engine.keyword_search("guild query", limit=3, filters=permanent)
+        assert [r.note_id for r in results] == ["n1"]
+        assert results[0].metadata["content_type"] == "permanent"
+
+        # Query terms only match note text, not the guild_id column
+        assert await search_engine.keyword_search("g2", limit=3) == []
+
+    @pytest.mark.asyncio
+    async def test_keyword_search_tag_filter_ignores_case(
+        self, search_engine: SearchEngine, note_database
+    ) -> None:
+        """Test that a tag filter matches every stored spelling of the tag."""
+        from src.nescordbot.services.tag_vocabulary import TagVocabulary
+
+        search_engine.db = note_database
+        search_engine.tag_vocabulary = TagVocabulary()
+        await search_engine.tag_vocabulary.load(note_database)
+
+        results = await search_engine.keyword_search(
+            "guild query", limit=3, filters=SearchFilters(tags=["PYTHON"])
+        )
+        assert {r.note_id for r in results} == {"n1", "n2"}
+
+        results = await search_engine.keyword_search(
+            "guild query", limit=3, filters=SearchFilters(tags=["PYTHON"], guild_id="g1")
+        )
+        assert [r.note_id for r in results] == ["n1"]
+
     @pytest.mark.asyncio
     async def test_search_history(self, search_engine: SearchEngine) -> None:
         """Test search history functionality."""
@@ -301,8 +446,9 @@ class TestSearchEngine:
         history_connection = AsyncMock()
         history_connection.execute = AsyncMock(return_value=history_cursor)
 
-        # Use patch to temporarily replace get_connection for this test
-        with patch.object(search_engine.db, "get_connection", return_value=history_connection):
+        # Use patch to temporarily replace the connection for this test
+        context = search_engine.db.get_connection.return_value
+        with patch.object(context, "__aenter__", AsyncMock(return_value=history_connection)):
             history = await search_engine.get_search_history(user_id, limit=10)
 
             assert isinstance(history, list)